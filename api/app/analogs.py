@@ -0,0 +1,228 @@
+"""
+Поиск аналогов подшипников по таблицам data/analogs и мастер-каталогу.
+
+Таблицы полных аналогов (import_analogs.csv, gost_to_iso.csv,
+iso_to_gost.csv, master_catalog.csv) задают строки эквивалентных
+обозначений ГОСТ / ISO / брендов. Строки объединяются системой
+непересекающихся множеств (union-find) в классы эквивалентности, поэтому
+аналоги транзитивны: обозначение любого бренда сразу дает весь класс.
+
+Центр класса — обозначение ISO. Если обозначение встречается в строках
+с разными ISO (в мастер-каталоге "180" соответствует 6000, 6200 и
+6300), оно в классы не объединяется, а связывается с каждым из них как
+неоднозначное — иначе транзитивность склеила бы разные подшипники.
+Частичные аналоги из gost_iso.csv (замена с оговорками) тоже не
+транзитивны и хранятся как прямые связи.
+
+Ключи поиска нормализуются: верхний регистр, без пробелов и дефисов,
+кириллические буквы, похожие на латинские, заменены латинскими
+("7205А" и "7205A" — один ключ).
+"""
+
+import csv
+import os
+from collections import defaultdict
+from collections.abc import Iterable
+
+from .reference_db import read_reference_rows
+
+# Колонки таблиц полных аналогов: колонка → (стандарт, производитель)
+CODE_COLUMNS = {
+    "GOST": ("ГОСТ", ""),
+    "ISO": ("ISO", ""),
+    "SKF": ("ISO", "SKF"),
+    "FAG": ("ISO", "FAG"),
+    "NSK": ("ISO", "NSK"),
+    "NTN": ("ISO", "NTN"),
+    "KOYO": ("ISO", "KOYO"),
+}
+
+EQUIVALENCE_TABLES = ["import_analogs.csv", "gost_to_iso.csv", "iso_to_gost.csv"]
+PARTIAL_TABLES = ["gost_iso.csv"]
+
+# Порядок вывода: ISO, ГОСТ, затем бренды
+STANDARD_ORDER = {"ISO": 0, "ГОСТ": 1}
+
+_LOOKALIKES = str.maketrans("АВЕКМНОРСТУХ", "ABEKMHOPCTYX")
+
+
+def normalize_code(code: str) -> str:
+    """Ключ поиска обозначения"""
+    return "".join(code.upper().split()).replace("-", "").translate(_LOOKALIKES)
+
+
+class AnalogIndex:
+    """
+    Индекс аналогов подшипников
+
+    Args:
+        analogs_dir: Каталог с таблицами аналогов
+        catalog_path: Мастер-каталог с колонками GOST/ISO/SKF/FAG/NSK/NTN/KOYO
+    """
+
+    def __init__(self, analogs_dir: str = "data/analogs", catalog_path: str = "data/csv/master_catalog.csv"):
+        # Узел — обозначение в конкретной системе: (стандарт, производитель, ключ)
+        self._nodes: dict[tuple[str, str, str], int] = {}
+        self._rows: list[dict] = []  # Строка вывода для каждого узла
+        self._by_key: dict[str, list[int]] = defaultdict(list)
+        self._parent: list[int] = []
+        self._size: list[int] = []
+
+        self._members: dict[int, list[int]] = {}
+        self._ambiguous: dict[int, set[int]] = {}
+        self._ambiguous_by_iso: dict[int, list[int]] = defaultdict(list)
+        self._partial: dict[int, list[tuple[int, str]]] = defaultdict(list)
+
+        self.load(
+            [os.path.join(analogs_dir, name) for name in EQUIVALENCE_TABLES] + [catalog_path],
+            [os.path.join(analogs_dir, name) for name in PARTIAL_TABLES],
+        )
+
+    @staticmethod
+    def _read_csv(path: str) -> list[dict]:
+        rows = read_reference_rows(path)
+        if rows is not None:
+            return rows
+        if not os.path.exists(path):
+            print(f"Таблица аналогов не найдена: {path}")
+            return []
+        with open(path, encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
+
+    def _node(self, standard: str, manufacturer: str, code: str, notes: str = "") -> int:
+        node_key = (standard, manufacturer, normalize_code(code))
+        node = self._nodes.get(node_key)
+        if node is None:
+            node = len(self._rows)
+            self._nodes[node_key] = node
+            self._rows.append(
+                {"code": code, "standard": standard, "manufacturer": manufacturer, "compatibility": "", "notes": notes}
+            )
+            self._by_key[node_key[2]].append(node)
+            self._parent.append(node)
+            self._size.append(1)
+        elif notes and not self._rows[node]["notes"]:
+            self._rows[node]["notes"] = notes
+        return node
+
+    def _find(self, node: int) -> int:
+        root = node
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[node] != root:
+            self._parent[node], node = root, self._parent[node]
+        return root
+
+    def _union(self, a: int, b: int):
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return
+        if self._size[a] < self._size[b]:
+            a, b = b, a
+        self._parent[b] = a
+        self._size[a] += self._size[b]
+
+    def load(self, equivalence_paths: Iterable[str], partial_paths: Iterable[str]):
+        """Загрузить таблицы и построить классы эквивалентности"""
+        rows: list[tuple[int, list[int]]] = []  # (узел ISO, остальные узлы строки)
+        iso_links: dict[int, set[int]] = defaultdict(set)
+
+        for path in equivalence_paths:
+            for row in self._read_csv(path):
+                notes = (row.get("Notes") or "").strip()
+                nodes = [
+                    self._node(standard, manufacturer, row[column].strip(), notes)
+                    for column, (standard, manufacturer) in CODE_COLUMNS.items()
+                    if (row.get(column) or "").strip()
+                ]
+                iso = (row.get("ISO") or "").strip()
+                if not iso:
+                    continue
+                iso_node = self._node("ISO", "", iso)
+                rows.append((iso_node, nodes))
+                for node in nodes:
+                    iso_links[node].add(iso_node)
+
+        for iso_node, nodes in rows:
+            for node in nodes:
+                if len(iso_links[node]) == 1:
+                    self._union(iso_node, node)
+        self._ambiguous = {node: isos for node, isos in iso_links.items() if len(isos) > 1}
+        for node, isos in self._ambiguous.items():
+            for iso_node in isos:
+                self._ambiguous_by_iso[iso_node].append(node)
+
+        for path in partial_paths:
+            for row in self._read_csv(path):
+                gost, iso = (row.get("gost") or "").strip(), (row.get("iso") or "").strip()
+                if not gost or not iso:
+                    continue
+                notes = (row.get("notes") or "").strip()
+                gost_node, iso_node = self._node("ГОСТ", "", gost), self._node("ISO", "", iso)
+                self._partial[gost_node].append((iso_node, notes))
+                self._partial[iso_node].append((gost_node, notes))
+
+        members = defaultdict(list)
+        for node in range(len(self._rows)):
+            if node not in self._ambiguous:
+                members[self._find(node)].append(node)
+        for nodes in members.values():
+            nodes.sort(key=self._sort_key)
+        self._members = dict(members)
+
+    def _sort_key(self, node: int):
+        row = self._rows[node]
+        return STANDARD_ORDER.get(row["manufacturer"] or row["standard"], 2), row["manufacturer"], row["code"]
+
+    def _class(self, node: int) -> list[int]:
+        return self._members.get(self._find(node), [])
+
+    def lookup(self, code: str) -> list[dict]:
+        """
+        Аналоги обозначения
+
+        Returns:
+            Строки [code, standard, manufacturer, compatibility, notes]: весь класс
+            полных аналогов ("100%"), затем неоднозначные и частичные соответствия
+        """
+        found = self._by_key.get(normalize_code(code), [])
+        # Само запрошенное обозначение не выводится, обозначения брендов с тем же кодом — выводятся
+        seen = {node for node in found if not self._rows[node]["manufacturer"]}
+        results = []
+
+        def add(node: int, compatibility: str, notes: str = ""):
+            if node in seen:
+                return
+            seen.add(node)
+            row = dict(self._rows[node], compatibility=compatibility)
+            if notes:
+                row["notes"] = notes
+            results.append(row)
+
+        for node in found:
+            if node in self._ambiguous:
+                for iso_node in sorted(self._ambiguous[node], key=self._sort_key):
+                    for member in self._class(iso_node):
+                        add(member, "требует проверки", f"{code} соответствует нескольким обозначениям ISO")
+            else:
+                for member in self._class(node):
+                    add(member, "100%")
+        for node in list(seen):
+            for other in self._ambiguous_by_iso.get(node, []):
+                add(other, "требует проверки", "Обозначение соответствует нескольким обозначениям ISO")
+        for node in found:
+            for other, notes in self._partial.get(node, []):
+                add(other, "частичный", notes)
+
+        return results
+
+    def lookup_many(self, codes: Iterable[str]) -> dict[str, list[dict]]:
+        """Аналоги для списка обозначений"""
+        return {code: self.lookup(code) for code in dict.fromkeys(codes)}
+
+    def codes(self) -> dict[str, str]:
+        """Ключ поиска → обозначение (первое встреченное написание) для всех известных обозначений"""
+        return {key: self._rows[nodes[0]]["code"] for key, nodes in self._by_key.items()}
+
+    def __len__(self) -> int:
+        return len(self._rows)
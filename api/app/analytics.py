@@ -0,0 +1,182 @@
+"""
+Аналитика поисковых запросов по предагрегированным окнам.
+
+Каждый поиск сразу учитывается в трех уровнях корзин: минутных, часовых
+и суточных. Запрос за произвольное окно собирается из корзин без обхода
+сырой истории: начало окна добирается минутами и часами до ближайших
+границ, остальное покрывается сутками. Граница окна точна до минуты, пока
+она попадает в хранимые минутные корзины (2 часа), дальше — до часа:
+часовых корзин хранится 31 сутки, поэтому и окно "30d" начинается с
+точностью до часа, а не до суток.
+
+Корзины живут в памяти процесса: при нескольких воркерах каждый считает
+только свои поиски, после перезапуска статистика начинается заново.
+Это так и при заданном DATABASE_URL — в БД пишется история запросов,
+но не эти агрегаты.
+
+Объем памяти ограничен числом корзин каждого уровня и числом запросов
+в корзине (редкие запросы отсекаются, их счетчики становятся приближенными).
+"""
+
+import time
+from collections import Counter, deque
+from datetime import timedelta
+
+# Границы гистограммы количества результатов: (подпись, максимум включительно)
+RESULT_BINS = [("0", 0), ("1", 1), ("2-5", 5), ("6-10", 10), ("11-20", 20), ("21-50", 50), ("51-100", 100)]
+RESULT_BIN_OVERFLOW = ">100"
+
+# Уровни: (название, длительность корзины в секундах, сколько корзин хранить)
+DEFAULT_TIERS = [
+    ("minute", 60, 120),
+    ("hour", 3600, 31 * 24),
+    ("day", 86400, 92),
+]
+
+
+def _result_bin(results_count: int) -> int:
+    for index, (_, upper) in enumerate(RESULT_BINS):
+        if results_count <= upper:
+            return index
+    return len(RESULT_BINS)
+
+
+class _Bucket:
+    """Агрегаты за один интервал"""
+
+    __slots__ = ("start", "searches", "results_total", "queries", "zero_results", "distribution")
+
+    def __init__(self, start: int):
+        self.start = start
+        self.searches = 0
+        self.results_total = 0
+        self.queries: Counter = Counter()
+        self.zero_results: Counter = Counter()
+        self.distribution = [0] * (len(RESULT_BINS) + 1)
+
+    def add(self, query: str, results_count: int, max_queries: int):
+        self.searches += 1
+        self.results_total += results_count
+        self.queries[query] += 1
+        if results_count == 0:
+            self.zero_results[query] += 1
+        self.distribution[_result_bin(results_count)] += 1
+
+        # Отсекаем хвост редких запросов, когда счетчиков становится вдвое больше лимита
+        for counter in (self.queries, self.zero_results):
+            if len(counter) > 2 * max_queries:
+                kept = counter.most_common(max_queries)
+                counter.clear()
+                counter.update(dict(kept))
+
+
+class _Tier:
+    """Кольцо корзин одной длительности"""
+
+    def __init__(self, name: str, seconds: int, keep: int):
+        self.name = name
+        self.seconds = seconds
+        self.keep = keep
+        self.buckets: deque[_Bucket] = deque()
+
+    def bucket_for(self, now: float) -> _Bucket:
+        start = int(now // self.seconds) * self.seconds
+        if not self.buckets or self.buckets[-1].start != start:
+            self.buckets.append(_Bucket(start))
+            while len(self.buckets) > self.keep or self.buckets[0].start <= start - self.keep * self.seconds:
+                self.buckets.popleft()
+        return self.buckets[-1]
+
+    def covered_from(self, now: float) -> int:
+        """Начало интервала, который уровень покрывает целиком"""
+        return (int(now // self.seconds) - self.keep + 1) * self.seconds
+
+    def select(self, start: int, end: int | None) -> list[_Bucket]:
+        """Корзины, начинающиеся в [start, end)"""
+        return [b for b in self.buckets if b.start >= start and (end is None or b.start < end)]
+
+
+def _ceil(value: float, step: int) -> int:
+    return -int(-value // step) * step
+
+
+class SearchAnalytics:
+    """
+    Аналитика поиска в реальном времени
+
+    Пример:
+        analytics = SearchAnalytics()
+        analytics.record("6205", results_count=12)
+        summary = analytics.summary(timedelta(days=7))
+    """
+
+    def __init__(self, tiers: list[tuple[str, int, int]] = None, max_queries_per_bucket: int = 1000, clock=time.time):
+        self.tiers = [_Tier(*tier) for tier in (tiers or DEFAULT_TIERS)]
+        self.max_queries_per_bucket = max_queries_per_bucket
+        self._clock = clock
+
+    @property
+    def max_window(self) -> timedelta:
+        """Самое длинное окно, которое можно посчитать по корзинам"""
+        coarsest = self.tiers[-1]
+        return timedelta(seconds=(coarsest.keep - 1) * coarsest.seconds)
+
+    def record(self, query: str, results_count: int):
+        """Учесть поиск во всех уровнях"""
+        now = self._clock()
+        query = query.strip().lower()
+        for tier in self.tiers:
+            tier.bucket_for(now).add(query, results_count, self.max_queries_per_bucket)
+
+    def _window_buckets(self, window: timedelta) -> list[_Bucket]:
+        """
+        Покрыть окно корзинами: крупный уровень берется с ближайшей своей
+        границы, промежуток до нее добирает более мелкий уровень. Если
+        мелкий уровень так далеко не хранится, крупный берется вместе с
+        неполной корзиной на границе окна.
+        """
+        now = self._clock()
+        tiers = self.tiers[::-1]  # от крупных к мелким
+        start = max(now - window.total_seconds(), tiers[0].covered_from(now))
+
+        buckets = []
+        end = None
+        for index, tier in enumerate(tiers):
+            finer = tiers[index + 1] if index + 1 < len(tiers) else None
+            if finer is not None and finer.covered_from(now) <= _ceil(start, finer.seconds):
+                tier_start = _ceil(start, tier.seconds)
+            else:
+                tier_start = int(start // tier.seconds) * tier.seconds
+                finer = None
+
+            buckets.extend(tier.select(tier_start, end))
+            if finer is None:
+                break
+            end = tier_start
+        return buckets
+
+    def summary(self, window: timedelta, top: int = 10) -> dict:
+        """Сводка за последние window"""
+        queries: Counter = Counter()
+        zero_results: Counter = Counter()
+        distribution = [0] * (len(RESULT_BINS) + 1)
+        searches = 0
+        results_total = 0
+
+        for bucket in self._window_buckets(window):
+            searches += bucket.searches
+            results_total += bucket.results_total
+            queries.update(bucket.queries)
+            zero_results.update(bucket.zero_results)
+            for index, count in enumerate(bucket.distribution):
+                distribution[index] += count
+
+        labels = [label for label, _ in RESULT_BINS] + [RESULT_BIN_OVERFLOW]
+        return {
+            "total_searches": searches,
+            "unique_queries": len(queries),
+            "top_queries": [{"query": q, "count": c} for q, c in queries.most_common(top)],
+            "zero_results_queries": [{"query": q, "count": c} for q, c in zero_results.most_common(top)],
+            "avg_results_per_query": round(results_total / searches, 2) if searches else 0,
+            "results_distribution": dict(zip(labels, distribution)),
+        }
@@ -8,16 +8,31 @@ API endpoints для работы с подшипниками.
 - Доступа к справочным данным
 """
 
+import asyncio
+import codecs
 import io
-import json
+import os
 import re
-from datetime import datetime
+from collections.abc import Iterable, Iterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from itertools import islice
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import JSONResponse, StreamingResponse
 
-from .export_utils import AnalogsExporter, SearchResultsExporter
-from .logic import AutocompleteEngine, DocumentSearchEngine, SearchHistory
+from .analogs import AnalogIndex
+from .analytics import SearchAnalytics
+from .catalog_search import CatalogSearch
+from .db import Database
+from .designation import DesignationParser
+from .dimensions import DimensionIndex
+from .executors import ExecutorLayer
+from .export_utils import AnalogsExporter, BatchExcelWriter, SearchResultsExporter
+from .history_store import PersistentSearchHistory
+from .index_manager import IndexManager
+from .logic import SearchHistory
+from .reference_db import default_reference_db
 
 
 def _sanitize_filename(text: str, max_length: int = 50) -> str:
@@ -30,18 +45,142 @@ def _sanitize_filename(text: str, max_length: int = 50) -> str:
     return sanitized[:max_length] if sanitized else "export"
 
 
+def _env_int(name: str) -> int | None:
+    """Read an optional integer setting from the environment"""
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+# Инициализация движков
+# Индексы перезагружаются без рестарта при изменении файлов (INDEX_RELOAD_INTERVAL=0 отключает отслеживание)
+# INDEX_TRACE_MEMORY=1 — замер памяти поколения через tracemalloc (медленно, для отладки)
+index_manager = IndexManager(
+    poll_interval=float(os.getenv("INDEX_RELOAD_INTERVAL", "10")),
+    trace_memory=os.getenv("INDEX_TRACE_MEMORY") == "1",
+)
+# История поиска в памяти ограничена: кольцевой буфер на пользователя и период хранения
+search_history = SearchHistory(
+    max_per_user=_env_int("HISTORY_MAX_PER_USER") or 200,
+    max_users=_env_int("HISTORY_MAX_USERS") or 10000,
+    retention_days=_env_int("HISTORY_RETENTION_DAYS") or 30,
+)
+
+# При заданном DATABASE_URL история пишется в БД (postgresql://... или sqlite:///...); пул один на процесс
+database = (
+    Database(
+        os.environ["DATABASE_URL"],
+        min_size=_env_int("DB_POOL_MIN_SIZE") or 1,
+        max_size=_env_int("DB_POOL_MAX_SIZE") or 10,
+    )
+    if os.getenv("DATABASE_URL")
+    else None
+)
+history_store = PersistentSearchHistory(database) if database else None
+
+# SEARCH_BACKEND=postgres: /search, /autocomplete и аналоги читаются из PostgreSQL (тот же пул)
+catalog_search = CatalogSearch(database) if database and os.getenv("SEARCH_BACKEND") == "postgres" else None
+
+# Аналитика считается по агрегатам в памяти, которые обновляются при каждом поиске
+search_analytics = SearchAnalytics()
+
+# Разбор обозначений подшипников по таблицам data/iso (с кешем разобранных обозначений)
+designation_parser = DesignationParser()
+
+# Аналоги из data/analogs и мастер-каталога (классы эквивалентности строятся при запуске)
+analog_index = AnalogIndex()
+
+# Максимум обозначений в одном запросе /analogs/batch
+ANALOGS_BATCH_LIMIT = 1000
+
+# Сводная таблица размеров d/D/B для подбора замены
+dimension_index = DimensionIndex()
+
+# Максимум размеров в одном запросе /dimensions/match/batch
+DIMENSIONS_BATCH_LIMIT = 10000
+
+ANALYTICS_PERIODS = {
+    "1h": timedelta(hours=1),
+    "1d": timedelta(days=1),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+}
+
+# Максимум строк для XLSX-экспорта (файл собирается в памяти целиком)
+XLSX_EXPORT_LIMIT = 1000
+
+# Сколько запросов /export/batch обрабатывается одной задачей пула
+BATCH_CHUNK_SIZE = 100
+
+# Синхронная CPU-работа выполняется в пулах, а не в event loop
+executors = ExecutorLayer(
+    thread_workers=_env_int("EXECUTOR_THREAD_WORKERS"),
+    process_workers=_env_int("EXECUTOR_PROCESS_WORKERS"),
+)
+
+
+def _search_with_similar(engine, query: str, limit: int, include_similar: bool) -> list[dict]:
+    """Поиск с добавлением похожих документов (выполняется в пуле потоков)"""
+    results = engine.search(query, limit=limit)
+
+    if include_similar:
+        for result in results:
+            result["similar_documents"] = engine.get_similar_documents(result["id"], limit=3)
+
+    return results
+
+
+def _iter_search_results(query: str, limit: int) -> Iterator[dict]:
+    """
+    Результаты поиска для потокового экспорта
+
+    Поколение индекса удерживается, пока поток не будет дочитан.
+    Синхронные генераторы StreamingResponse итерирует в пуле потоков.
+    """
+    with index_manager.acquire() as index:
+        results = index.search.iter_search(query)
+        yield from islice(results, limit) if limit else results
+
+
+async def _lookup_analogs(code: str) -> list[dict]:
+    """Аналоги из PostgreSQL (SEARCH_BACKEND=postgres) или из индекса в памяти"""
+    if catalog_search:
+        return await catalog_search.lookup_analogs(code)
+    return analog_index.lookup(code)
+
+
+def _encode_stream(chunks: Iterable[str], bom: bool = False) -> Iterator[bytes]:
+    """Кодировать текстовый поток в UTF-8 (с BOM для Excel при необходимости)"""
+    if bom:
+        yield codecs.BOM_UTF8
+    for chunk in chunks:
+        yield chunk.encode("utf-8")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Запуск и остановка фоновых задач приложения"""
+    index_manager.start_watching()
+    if database:
+        await database.connect()
+    if history_store:
+        await history_store.start()
+    yield
+    if history_store:
+        await history_store.stop()
+    if database:
+        await database.disconnect()
+    index_manager.stop_watching()
+    executors.shutdown()
+
+
 # Инициализация приложения
 app = FastAPI(
     title="Справочник подшипников - API поиска",
     description="API для поиска подшипников с автодополнением, похожими документами, историей и экспортом",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
-# Инициализация движков
-autocomplete_engine = AutocompleteEngine()
-search_engine = DocumentSearchEngine()
-search_history = SearchHistory()
-
 
 @app.get("/")
 async def root():
@@ -53,8 +192,12 @@ async def root():
             "autocomplete": "/autocomplete",
             "search": "/search",
             "similar": "/similar/{document_id}",
+            "designation": "/designation/{code}",
+            "analogs": "/analogs/{bearing_code}",
+            "dimensions": "/dimensions/match",
             "history": "/history",
             "export": "/search/export",
+            "reload": "/admin/reload",
         },
     }
 
@@ -86,7 +229,11 @@ async def autocomplete(
       ]
     }
     """
-    suggestions = autocomplete_engine.suggest(q, limit=limit, types=types)
+    if catalog_search:
+        suggestions = await catalog_search.suggest(q, limit=limit, types=types)
+    else:
+        with index_manager.acquire() as index:
+            suggestions = index.autocomplete.suggest(q, limit=limit, types=types)
 
     return {"query": q, "suggestions": suggestions, "count": len(suggestions)}
 
@@ -94,7 +241,8 @@ async def autocomplete(
 @app.get("/autocomplete/popular")
 async def get_popular_autocomplete(limit: int = Query(10, ge=1, le=50, description="Количество результатов")):
     """Получить самые популярные термины для автодополнения"""
-    popular = autocomplete_engine.get_popular_searches(limit=limit)
+    with index_manager.acquire() as index:
+        popular = index.autocomplete.get_popular_searches(limit=limit)
 
     return {"popular": popular, "count": len(popular)}
 
@@ -131,18 +279,23 @@ async def search(
       ]
     }
     """
-    # Выполнить поиск
-    results = search_engine.search(q, limit=limit)
-
-    # Добавить похожие документы
-    if include_similar:
-        for result in results:
-            similar_docs = search_engine.get_similar_documents(result["id"], limit=3)
-            result["similar_documents"] = similar_docs
+    # Выполнить поиск и добавить похожие документы
+    if catalog_search:
+        results = await catalog_search.search(q, limit=limit)
+        if include_similar:
+            # Матрица схожести остается в памяти: это поиск по словарю, без обращения к БД
+            with index_manager.acquire() as index:
+                for result in results:
+                    result["similar_documents"] = index.search.get_similar_documents(result["id"], limit=3)
+    else:
+        with index_manager.acquire() as index:
+            results = await executors.run("search", _search_with_similar, index.search, q, limit, include_similar)
+
+    search_analytics.record(q, len(results))
 
     # Сохранить в историю
     if user_id:
-        search_history.add_search(user_id, q, len(results), session_id)
+        (history_store or search_history).add_search(user_id, q, len(results), session_id)
 
     return {"query": q, "total": len(results), "results": results}
 
@@ -158,7 +311,8 @@ async def get_similar_documents(
 
     Возвращает список документов отсортированных по схожести
     """
-    similar = search_engine.get_similar_documents(document_id, limit=limit)
+    with index_manager.acquire() as index:
+        similar = index.search.get_similar_documents(document_id, limit=limit)
 
     if not similar:
         raise HTTPException(status_code=404, detail="Документ не найден или нет похожих документов")
@@ -166,6 +320,111 @@ async def get_similar_documents(
     return {"document_id": document_id, "similar": similar, "count": len(similar)}
 
 
+@app.get("/designation/{code:path}")
+async def parse_designation(code: str):
+    """
+    Разобрать обозначение подшипника
+
+    Пример: /designation/6205-2RS1/C3
+
+    Возвращает:
+    {
+      "designation": "6205-2RS1/C3",
+      "prefix": null,
+      "series": "62",
+      "bore_code": "05",
+      "bore_diameter": 25.0,
+      "suffixes": [{"code": "2RS1", "type": "sealing", ...}, {"code": "C3", "type": "clearance", ...}],
+      "seals": ["2RS1"],
+      "clearance": "C3",
+      "precision": null,
+      "unknown": []
+    }
+    """
+    parsed = designation_parser.parse(code)
+    if parsed is None:
+        raise HTTPException(status_code=422, detail="Не удалось разобрать обозначение подшипника")
+
+    return parsed.to_dict()
+
+
+@app.get("/reference/search")
+async def search_reference(
+    q: str = Query(..., min_length=1, description="Обозначение или текст"),
+    limit: int = Query(20, ge=1, le=100, description="Максимум строк на таблицу"),
+):
+    """
+    Поиск по read-модели справочника (data/reference.db)
+
+    exact — строки, где q совпадает с обозначением, брендом или ключом таблицы
+    (запросы по индексам); text — полнотекстовый поиск по описаниям (FTS5).
+
+    Возвращает:
+    {
+      "query": "6205",
+      "exact": {"master_catalog": [{"GOST": "205", "ISO": "6205", ...}], ...},
+      "text": {"iso_suffixes": [...], ...}
+    }
+    """
+    reference = default_reference_db()
+    if reference is None:
+        raise HTTPException(
+            status_code=503, detail="Read-модель справочника не собрана (python scripts/build_reference_db.py)"
+        )
+
+    exact = await executors.run("search", reference.find, q, limit)
+    text = await executors.run("search", reference.search_all, q, limit)
+    return {"query": q, "exact": exact, "text": text}
+
+
+@app.get("/dimensions/match")
+async def match_dimensions(
+    d: float | None = Query(None, gt=0, description="Внутренний диаметр, мм"),
+    D: float | None = Query(None, gt=0, description="Наружный диаметр, мм"),
+    B: float | None = Query(None, gt=0, description="Ширина, мм"),
+    tol: float = Query(0.0, ge=0, description="Допуск по каждому размеру, мм"),
+    bearing_type: str | None = Query(None, alias="type", description="Тип подшипника"),
+    limit: int = Query(50, ge=1, le=500, description="Количество результатов"),
+):
+    """
+    Подбор подшипников по размерам
+
+    Пример: /dimensions/match?d=25&D=52&B=15&tol=0.5
+
+    Возвращает подшипники с размерами в пределах ±tol, по возрастанию отклонения
+    """
+    if d is None and D is None and B is None:
+        raise HTTPException(status_code=400, detail="Укажите хотя бы один размер: d, D или B")
+
+    matches = dimension_index.match(d, D, B, tol=tol, bearing_type=bearing_type, limit=limit)
+    return {"d": d, "D": D, "B": B, "tol": tol, "matches": matches, "count": len(matches)}
+
+
+@app.post("/dimensions/match/batch")
+async def match_dimensions_batch(
+    sizes: list[list[float | None]],
+    tol: float = Query(0.0, ge=0, description="Допуск по каждому размеру, мм"),
+    bearing_type: str | None = Query(None, alias="type", description="Тип подшипника"),
+    limit: int = Query(10, ge=1, le=100, description="Результатов на размер"),
+):
+    """
+    Подбор по списку размеров
+
+    Тело запроса: [[25, 52, 15], [30, 62, null]] — null означает любой размер
+
+    Возвращает {"results": [[...], [...]]} в порядке запроса
+    """
+    if not sizes:
+        raise HTTPException(status_code=400, detail="Список размеров не может быть пустым")
+    if len(sizes) > DIMENSIONS_BATCH_LIMIT:
+        raise HTTPException(status_code=400, detail=f"Слишком много размеров (максимум {DIMENSIONS_BATCH_LIMIT})")
+    if any(len(size) > 3 for size in sizes):
+        raise HTTPException(status_code=400, detail="Размер задается как [d, D, B]")
+
+    results = await executors.run("search", dimension_index.match_many, sizes, tol, bearing_type, limit)
+    return {"results": results, "count": len(results)}
+
+
 @app.get("/history")
 async def get_search_history(
     user_id: str = Query(..., description="ID пользователя"),
@@ -185,7 +444,10 @@ async def get_search_history(
       ]
     }
     """
-    history = search_history.get_user_history(user_id, limit=limit)
+    if history_store:
+        history = await history_store.get_user_history(user_id, limit=limit)
+    else:
+        history = search_history.get_user_history(user_id, limit=limit)
 
     return {"user_id": user_id, "history": history, "count": len(history)}
 
@@ -193,7 +455,10 @@ async def get_search_history(
 @app.delete("/history")
 async def clear_search_history(user_id: str = Query(..., description="ID пользователя")):
     """Очистить историю поиска"""
-    search_history.clear_user_history(user_id)
+    if history_store:
+        await history_store.clear_user_history(user_id)
+    else:
+        search_history.clear_user_history(user_id)
 
     return {"message": f"История пользователя {user_id} очищена", "status": "success"}
 
@@ -208,43 +473,42 @@ async def get_popular_queries(limit: int = Query(10, ge=1, le=50, description="
     - Улучшения автодополнения
     - Аналитики
     """
-    popular = search_history.get_popular_queries(limit=limit)
+    if history_store:
+        popular = await history_store.get_popular_queries(limit=limit)
+    else:
+        popular = search_history.get_popular_queries(limit=limit)
 
     return {"popular": popular, "count": len(popular)}
 
 
 @app.get("/analytics/search")
-async def get_search_analytics(period: str = Query("7d", regex="^(1d|7d|30d)$", description="Период: 1d, 7d, 30d")):
+async def get_search_analytics(
+    period: str = Query("7d", regex="^(1h|1d|7d|30d)$", description="Период: 1h, 1d, 7d, 30d"),
+):
     """
-    Аналитика поисковых запросов
+    Аналитика поисковых запросов за период (по минутным/часовым/суточным агрегатам)
+
+    Агрегаты хранятся в памяти процесса (и при заданном DATABASE_URL):
+    каждый воркер отдает статистику только своих поисков с момента запуска.
 
     Возвращает:
     {
       "total_searches": 1240,
       "unique_queries": 456,
       "top_queries": [...],
-      "zero_results_queries": [],
-      "avg_results_per_query": 12.5
+      "zero_results_queries": [...],
+      "avg_results_per_query": 12.5,
+      "results_distribution": {"0": 10, "1": 4, "2-5": 30, ...}
     }
     """
-    # Заглушка для аналитики
-    # В реальной системе здесь должна быть работа с БД
-
-    return {
-        "period": period,
-        "total_searches": len(search_history.history),
-        "unique_queries": len(set(h["query"] for h in search_history.history)),
-        "top_queries": search_history.get_popular_queries(limit=10),
-        "zero_results_queries": [],
-        "avg_results_per_query": 0,
-    }
+    return {"period": period, **search_analytics.summary(ANALYTICS_PERIODS[period])}
 
 
 @app.get("/search/export")
 async def export_search_results(
     q: str = Query(..., description="Поисковый запрос"),
-    export_format: str = Query("json", regex="^(json|csv|xlsx)$", description="Формат: json, csv, xlsx"),
-    limit: int = Query(100, ge=1, le=1000, description="Количество результатов"),
+    export_format: str = Query("json", regex="^(json|ndjson|csv|xlsx)$", description="Формат: json, ndjson, csv, xlsx"),
+    limit: int = Query(100, ge=0, description="Количество результатов (0 — все найденные)"),
 ):
     """
     Экспорт результатов поиска
@@ -253,29 +517,50 @@ async def export_search_results(
     - /search/export?q=подшипник&export_format=json
     - /search/export?q=6205&export_format=csv
     - /search/export?q=SKF&export_format=xlsx
+    - /search/export?q=подшипник&export_format=ndjson&limit=0 — полная выгрузка
+
+    JSON, NDJSON и CSV отдаются потоком по мере поиска: память не зависит
+    от объема выгрузки, первый байт уходит сразу. XLSX собирается целиком,
+    поэтому ограничен XLSX_EXPORT_LIMIT строками.
 
     Возвращает файл для скачивания
     """
-    # Выполняем поиск
-    results = search_engine.search(q, limit=limit)
-
     # Sanitize query for filename
     safe_query = _sanitize_filename(q, max_length=20)
 
     if export_format == "json":
-        json_data = SearchResultsExporter.to_json(results, pretty=True)
-        return JSONResponse(content=json.loads(json_data))
+        return StreamingResponse(
+            _encode_stream(SearchResultsExporter.iter_json(_iter_search_results(q, limit))),
+            media_type="application/json",
+        )
+
+    elif export_format == "ndjson":
+        return StreamingResponse(
+            _encode_stream(SearchResultsExporter.iter_ndjson(_iter_search_results(q, limit))),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": f"attachment; filename=search_results_{safe_query}.ndjson"},
+        )
 
     elif export_format == "csv":
-        csv_data = SearchResultsExporter.to_csv(results)
         return StreamingResponse(
-            io.BytesIO(csv_data.encode("utf-8-sig")),  # BOM для корректного отображения в Excel
+            # BOM для корректного отображения в Excel
+            _encode_stream(SearchResultsExporter.iter_csv(_iter_search_results(q, limit)), bom=True),
             media_type="text/csv; charset=utf-8",
             headers={"Content-Disposition": f"attachment; filename=search_results_{safe_query}.csv"},
         )
 
     elif export_format == "xlsx":
-        excel_data = SearchResultsExporter.to_excel(results)
+        if limit == 0 or limit > XLSX_EXPORT_LIMIT:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Экспорт в XLSX ограничен {XLSX_EXPORT_LIMIT} строками, используйте csv или ndjson",
+            )
+
+        # Выполняем поиск
+        with index_manager.acquire() as index:
+            results = await executors.run("search", index.search.search, q, limit=limit)
+
+        excel_data = await executors.run("export", SearchResultsExporter.to_excel, results, cpu_bound=True)
         if excel_data is None:
             raise HTTPException(status_code=500, detail="Ошибка при создании Excel файла")
 
@@ -299,17 +584,9 @@ async def export_analogs(
     - CSV: таблица с колонками [code, standard, manufacturer, compatibility]
     - XLSX: Excel файл с форматированием
     """
-    # Заглушка для аналогов
-    # В реальной системе здесь должна быть работа с БД
-    analogs = [
-        {
-            "code": bearing_code,
-            "standard": "ГОСТ",
-            "manufacturer": "SKF",
-            "compatibility": "100%",
-            "notes": "Прямой аналог",
-        }
-    ]
+    analogs = await _lookup_analogs(bearing_code)
+    if not analogs:
+        raise HTTPException(status_code=404, detail="Аналоги не найдены")
 
     # Sanitize bearing_code for filename
     safe_code = _sanitize_filename(bearing_code)
@@ -318,7 +595,7 @@ async def export_analogs(
         return JSONResponse(content=analogs)
 
     elif export_format == "csv":
-        csv_data = AnalogsExporter.to_csv(analogs)
+        csv_data = await executors.run("export", AnalogsExporter.to_csv, analogs, cpu_bound=True)
         return StreamingResponse(
             io.BytesIO(csv_data.encode("utf-8-sig")),
             media_type="text/csv; charset=utf-8",
@@ -326,7 +603,7 @@ async def export_analogs(
         )
 
     elif export_format == "xlsx":
-        excel_data = AnalogsExporter.to_excel(analogs)
+        excel_data = await executors.run("export", AnalogsExporter.to_excel, analogs, cpu_bound=True)
         return StreamingResponse(
             excel_data,
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
@@ -334,6 +611,47 @@ async def export_analogs(
         )
 
 
+@app.get("/analogs/{bearing_code:path}")
+async def get_analogs(bearing_code: str):
+    """
+    Аналоги подшипника
+
+    Пример: /analogs/6205
+
+    Возвращает полные аналоги (compatibility "100%"), неоднозначные
+    соответствия ("требует проверки") и частичные аналоги ("частичный")
+    """
+    analogs = await _lookup_analogs(bearing_code)
+    if not analogs:
+        raise HTTPException(status_code=404, detail="Аналоги не найдены")
+
+    return {"code": bearing_code, "analogs": analogs, "count": len(analogs)}
+
+
+@app.post("/analogs/batch")
+async def get_analogs_batch(codes: list[str]):
+    """
+    Аналоги для списка обозначений
+
+    Тело запроса: ["6205", "180", "7205B"]
+
+    Возвращает {"results": {"6205": [...], "180": [...]}, "not_found": [...]}
+    """
+    if not codes:
+        raise HTTPException(status_code=400, detail="Список обозначений не может быть пустым")
+    if len(codes) > ANALOGS_BATCH_LIMIT:
+        raise HTTPException(status_code=400, detail=f"Слишком много обозначений (максимум {ANALOGS_BATCH_LIMIT})")
+
+    if catalog_search:
+        results = await catalog_search.lookup_analogs_many(codes)
+    else:
+        results = analog_index.lookup_many(codes)
+    return {
+        "results": {code: analogs for code, analogs in results.items() if analogs},
+        "not_found": [code for code, analogs in results.items() if not analogs],
+    }
+
+
 @app.post("/export/batch")
 async def export_batch(
     queries: list[str], export_format: str = Query("xlsx", regex="^(json|xlsx)$", description="Формат: json, xlsx")
@@ -351,24 +669,71 @@ async def export_batch(
     if not queries:
         raise HTTPException(status_code=400, detail="Список запросов не может быть пустым")
 
-    # Выполняем поиск для каждого запроса
-    batch_results = {}
-    for query in queries:
-        results = search_engine.search(query, limit=50)
-        batch_results[query] = results
+    # Поиск выполняется порциями за один проход по индексу на порцию.
+    # Порции идут в пул потоков: в пул процессов пришлось бы на каждую
+    # порцию передавать (pickle) весь индекс документов
+    chunks = [queries[i : i + BATCH_CHUNK_SIZE] for i in range(0, len(queries), BATCH_CHUNK_SIZE)]
+
+    with index_manager.acquire() as index:
+        tasks = [
+            asyncio.ensure_future(executors.run("batch_search", index.search.search_batch, chunk, 50))
+            for chunk in chunks
+        ]
+
+        try:
+            if export_format == "json":
+                batch_results = {}
+                for task in tasks:
+                    batch_results.update(await task)
+                return JSONResponse(content=batch_results)
+
+            # Листы дописываются в книгу по мере готовности порций, в порядке запросов
+            writer = BatchExcelWriter()
+            for task in tasks:
+                await executors.run("batch_export", writer.add_sheets, await task)
+            excel_data = await executors.run("batch_export", writer.close)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"batch_export_{timestamp}.xlsx"
+    return StreamingResponse(
+        excel_data,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
 
-    if export_format == "json":
-        return JSONResponse(content=batch_results)
 
-    elif export_format == "xlsx":
-        excel_data = SearchResultsExporter.create_batch_excel(batch_results)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"batch_export_{timestamp}.xlsx"
-        return StreamingResponse(
-            excel_data,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+@app.post("/admin/reload")
+async def reload_indexes(force: bool = Query(False, description="Перезагрузить даже без изменений файлов")):
+    """
+    Перезагрузить индексы поиска и автодополнения без рестарта
+
+    Новое поколение загружается в фоне и подменяет текущее атомарно;
+    запросы, начатые на старом поколении, дорабатывают на нем.
+
+    Возвращает:
+    {
+      "reloaded": true,
+      "current": {"generation": 2, "load_time_ms": 35.2, "index_bytes": 1048576, "memory_bytes": null, ...},
+      "retired": [{"generation": 1, "active_readers": 1, ...}]
+    }
+    """
+    reloaded = await asyncio.to_thread(index_manager.reload, force)
+
+    return {"reloaded": reloaded, **index_manager.stats()}
+
+
+@app.get("/admin/executors")
+async def get_executor_stats():
+    """
+    Статистика пулов исполнителей
+
+    Для каждого типа запроса: лимит параллелизма, число задач в работе
+    и перцентили времени ожидания в очереди (queue_ms_p50/p95/max).
+    """
+    return executors.stats()
 
 
 # Обработчик ошибок
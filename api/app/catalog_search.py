@@ -0,0 +1,116 @@
+"""
+Поиск, автодополнение и аналоги из PostgreSQL (SEARCH_BACKEND=postgres).
+
+В режиме памяти каждый процесс uvicorn держит свою копию индексов из
+JSON-файлов. В режиме БД данные загружаются в таблицы documents,
+autocomplete_terms и bearing_analogs (api/scripts/import_to_postgres.py),
+а процессы обращаются к ним через общий пул asyncpg приложения.
+
+Запросы — постоянные строки с параметрами $1, $2, ...: asyncpg готовит
+каждую строку один раз на подключение пула (кеш prepared statements), и
+план не зависит от текста запроса пользователя. Подстроки и префиксы ищутся
+через LIKE по триграммным индексам pg_trgm, морфология — через tsvector.
+"""
+
+from collections.abc import Iterable
+
+from .analogs import normalize_code
+from .db import Database
+
+# Совместимость аналога (api/app/analogs.py) <-> compatibility_score в bearing_analogs
+COMPATIBILITY_SCORES = {"100%": 1.0, "частичный": 0.75, "требует проверки": 0.5}
+_COMPATIBILITY_BY_SCORE = {score: label for label, score in COMPATIBILITY_SCORES.items()}
+
+# Совпадение в названии — 1.0, в описании — 0.5 (как в режиме памяти),
+# только по словоформам (полнотекстовый поиск) — 0.25; внутри уровня — порядок индекса
+SEARCH_DOCUMENTS = """
+SELECT id, title, path, excerpt,
+    CASE WHEN lower(title) LIKE $1 THEN 1.0
+         WHEN lower(excerpt) LIKE $1 THEN 0.5
+         ELSE 0.25 END::float8 AS relevance
+FROM documents
+WHERE lower(title) LIKE $1 OR lower(excerpt) LIKE $1 OR search_vector @@ plainto_tsquery('russian', $2)
+ORDER BY relevance DESC, position
+LIMIT $3
+"""
+
+SUGGEST_TERMS = """
+SELECT value, type, frequency
+FROM autocomplete_terms
+WHERE lower(value) LIKE $1 AND (cardinality($2::text[]) = 0 OR type = ANY($2::text[]))
+ORDER BY frequency DESC, value
+LIMIT $3
+"""
+
+LOOKUP_ANALOGS = """
+SELECT original_code, analog_code, standard, manufacturer, compatibility_score, notes
+FROM bearing_analogs
+WHERE original_code = ANY($1::text[])
+ORDER BY original_code, id
+"""
+
+
+def like_pattern(text: str, prefix: bool = False) -> str:
+    """Шаблон LIKE для подстроки (или префикса) в нижнем регистре с экранированием % и _"""
+    escaped = text.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix else f"%{escaped}%"
+
+
+def highlight_prefix(value: str, prefix: str) -> str:
+    """Подсветка префикса, как в AutocompleteEngine"""
+    return f"<b>{value[: len(prefix)]}</b>{value[len(prefix) :]}" if prefix else value
+
+
+class CatalogSearch:
+    """
+    Поиск по данным каталога в PostgreSQL
+
+    Ответы совпадают по формату с DocumentSearchEngine.search,
+    AutocompleteEngine.suggest и AnalogIndex.lookup.
+
+    Args:
+        db: Подключение приложения (общий пул asyncpg)
+    """
+
+    def __init__(self, db: Database):
+        if db.dialect != "postgresql":
+            raise ValueError("Поиск в БД требует PostgreSQL (DATABASE_URL=postgresql://...)")
+        self.db = db
+
+    async def search(self, query: str, limit: int = 20) -> list[dict]:
+        """Поиск документов по подстроке названия/описания и словоформам"""
+        if not query:
+            return []
+        return await self.db.fetch(SEARCH_DOCUMENTS, like_pattern(query), query, limit)
+
+    async def suggest(self, prefix: str, limit: int = 10, types: list[str] | None = None) -> list[dict]:
+        """Предложения автодополнения по префиксу, по убыванию частоты"""
+        prefix = prefix.strip()
+        if not prefix:
+            return []
+        rows = await self.db.fetch(SUGGEST_TERMS, like_pattern(prefix, prefix=True), list(types or []), limit)
+        for row in rows:
+            row["highlight"] = highlight_prefix(row["value"], prefix)
+        return rows
+
+    async def lookup_analogs(self, code: str) -> list[dict]:
+        """Аналоги обозначения (строки как у AnalogIndex.lookup)"""
+        return (await self.lookup_analogs_many([code]))[code]
+
+    async def lookup_analogs_many(self, codes: Iterable[str]) -> dict[str, list[dict]]:
+        """Аналоги для списка обозначений одним запросом"""
+        codes = list(dict.fromkeys(codes))
+        keys = {code: normalize_code(code) for code in codes}
+        found: dict[str, list[dict]] = {key: [] for key in keys.values()}
+        for row in await self.db.fetch(LOOKUP_ANALOGS, list(found)):
+            score = float(row["compatibility_score"]) if row["compatibility_score"] is not None else None
+            found[row["original_code"]].append(
+                {
+                    "code": row["analog_code"],
+                    "standard": row["standard"] or "",
+                    "manufacturer": row["manufacturer"] or "",
+                    "compatibility": _COMPATIBILITY_BY_SCORE.get(score, ""),
+                    "notes": row["notes"] or "",
+                }
+            )
+        return {code: found[keys[code]] for code in codes}
@@ -0,0 +1,324 @@
+"""
+Разбор обозначений подшипников.
+
+Обозначение вида "NU2205ECP" или "6205-2RS1/C3" раскладывается на
+префикс, основное обозначение (серия и код отверстия) и суффиксы
+(уплотнения, зазор, класс точности и т.д.).
+
+Префиксы и суффиксы берутся из data/iso/prefixes.csv и
+data/iso/suffixes.csv и компилируются в префиксные деревья: в каждой
+позиции выбирается самый длинный известный код ("2RS1", а не "2RS" и
+"1"). Общепринятые суффиксы ISO, которых нет в таблицах (C3, 2Z, P6
+...), заданы в STANDARD_SUFFIXES. Результаты разбора кешируются (LRU),
+поэтому повторяющиеся обозначения каталога разбираются один раз.
+"""
+
+import csv
+import os
+import re
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, replace
+from functools import lru_cache
+
+from .reference_db import read_reference_rows
+
+# Общепринятые суффиксы ISO: (код, тип, описание)
+STANDARD_SUFFIXES = [
+    ("Z", "shielding", "Одна металлическая защитная шайба"),
+    ("2Z", "shielding", "Две металлические защитные шайбы"),
+    ("RS", "sealing", "Одно контактное резиновое уплотнение"),
+    ("2RS", "sealing", "Два контактных резиновых уплотнения"),
+    ("RS1", "sealing", "Одно контактное уплотнение из бутадиен-нитрильного каучука"),
+    ("2RS1", "sealing", "Два контактных уплотнения из бутадиен-нитрильного каучука"),
+    ("RZ", "sealing", "Одно бесконтактное уплотнение"),
+    ("2RZ", "sealing", "Два бесконтактных уплотнения"),
+    ("C2", "clearance", "Радиальный зазор меньше нормального"),
+    ("CN", "clearance", "Нормальный радиальный зазор"),
+    ("C3", "clearance", "Радиальный зазор больше нормального"),
+    ("C4", "clearance", "Радиальный зазор больше C3"),
+    ("C5", "clearance", "Радиальный зазор больше C4"),
+    ("P6", "precision", "Класс точности 6 по ISO 492"),
+    ("P5", "precision", "Класс точности 5 по ISO 492"),
+    ("P4", "precision", "Класс точности 4 по ISO 492"),
+    ("P2", "precision", "Класс точности 2 по ISO 492"),
+    ("K", "design", "Коническое отверстие, конусность 1:12"),
+    ("N", "retaining", "Канавка под стопорное кольцо на наружном кольце"),
+    ("NR", "retaining", "Канавка и стопорное кольцо на наружном кольце"),
+    ("E", "design", "Оптимизированная внутренняя конструкция"),
+    ("EC", "design", "Оптимизированная конструкция с усиленными роликами"),
+    ("CA", "design", "Сферический роликоподшипник с бортами на внутреннем кольце"),
+    ("CC", "design", "Сферический роликоподшипник с плавающим направляющим кольцом"),
+    ("M", "cage", "Массивный латунный сепаратор"),
+    ("J", "cage", "Штампованный стальной сепаратор"),
+    ("TN9", "cage", "Сепаратор из полиамида 6.6, армированного стекловолокном"),
+    ("P", "cage", "Сепаратор из полиамида, армированного стекловолокном"),
+]
+
+# Типы суффиксов, которые относятся к защите подшипника
+SEAL_TYPES = {"sealing", "shielding"}
+
+# Разделители между частями обозначения
+SEPARATORS = " -/."
+
+# Код отверстия 00-03 не кратен 5
+BORE_CODES = {"00": 10, "01": 12, "02": 15, "03": 17}
+
+# Категории префиксов, после которых трёхзначный номер — серия + код отверстия (NJ 205),
+# а не миниатюрный подшипник (608)
+ROLLER_PREFIX_CATEGORIES = {"cylindrical_roller"}
+
+# Диаметр после косой черты (62/22, 320/28) — только после серии из 2-3 цифр и если
+# за числом не следуют буквы: в 6205/2Z и 608/2RS после черты идет суффикс
+BASE_PATTERN = re.compile(r"(\d+)(?:/(\d+(?:\.\d+)?)(?![A-Z\d]))?")
+MAX_SLASH_SERIES_DIGITS = 3
+
+
+@dataclass(frozen=True)
+class DesignationPart:
+    """Префикс или суффикс обозначения"""
+
+    code: str
+    type: str
+    description: str
+    manufacturers: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class Designation:
+    """Разобранное обозначение подшипника"""
+
+    designation: str
+    normalized: str
+    manufacturer: str | None
+    prefix: DesignationPart | None
+    base: str
+    series: str
+    bore_code: str
+    bore_diameter: float | None
+    suffixes: tuple[DesignationPart, ...]
+    unknown: tuple[str, ...]
+
+    @property
+    def seals(self) -> list[str]:
+        return [part.code for part in self.suffixes if part.type in SEAL_TYPES]
+
+    @property
+    def clearance(self) -> str | None:
+        return next((part.code for part in self.suffixes if part.type == "clearance"), None)
+
+    @property
+    def precision(self) -> str | None:
+        return next((part.code for part in self.suffixes if part.type == "precision"), None)
+
+    def to_dict(self) -> dict:
+        """Словарь для ответа API (новый объект на каждый вызов)"""
+        result = asdict(self)
+        result.update(seals=self.seals, clearance=self.clearance, precision=self.precision)
+        return result
+
+
+class _Trie:
+    """Префиксное дерево кодов с поиском самых длинных совпадений"""
+
+    def __init__(self):
+        self.root: dict = {}
+
+    def insert(self, code: str, value):
+        node = self.root
+        for char in code:
+            node = node.setdefault(char, {})
+        node[None] = value
+
+    def matches(self, text: str, start: int) -> list[tuple[int, object]]:
+        """Все коды, начинающиеся в позиции start: (конец, значение), от самого длинного"""
+        found = []
+        node = self.root
+        for pos in range(start, len(text)):
+            node = node.get(text[pos])
+            if node is None:
+                break
+            if None in node:
+                found.append((pos + 1, node[None]))
+        found.reverse()
+        return found
+
+
+def normalize_designation(code: str) -> str:
+    """Верхний регистр, без лишних пробелов"""
+    return " ".join(code.upper().split())
+
+
+def bore_diameter(bore_code: str) -> float | None:
+    """Диаметр отверстия (мм) по коду: 00-03 → 10/12/15/17, 04-99 → код × 5"""
+    if bore_code in BORE_CODES:
+        return BORE_CODES[bore_code]
+    if len(bore_code) == 2 and bore_code.isdigit():
+        return int(bore_code) * 5
+    return None
+
+
+class DesignationParser:
+    """
+    Парсер обозначений подшипников
+
+    Args:
+        prefixes_path: CSV префиксов (code, category, description)
+        suffixes_path: CSV суффиксов (code, manufacturer, type, description)
+        cache_size: Размер LRU-кеша разобранных обозначений
+    """
+
+    def __init__(
+        self,
+        prefixes_path: str = "data/iso/prefixes.csv",
+        suffixes_path: str = "data/iso/suffixes.csv",
+        cache_size: int = 65536,
+    ):
+        self.prefixes = _Trie()
+        self.suffixes = _Trie()
+        self.load_tables(prefixes_path, suffixes_path)
+        self._parse_cached = lru_cache(maxsize=cache_size)(self._parse)
+
+    @staticmethod
+    def _read_csv(path: str) -> list[dict]:
+        rows = read_reference_rows(path)
+        if rows is not None:
+            return rows
+        if not os.path.exists(path):
+            print(f"Таблица обозначений не найдена: {path}")
+            return []
+        with open(path, encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
+
+    def load_tables(self, prefixes_path: str, suffixes_path: str):
+        """Построить деревья префиксов и суффиксов"""
+        for row in self._read_csv(prefixes_path):
+            code = row["code"].strip().upper()
+            self.prefixes.insert(code, DesignationPart(code, row.get("category") or "", row.get("description") or ""))
+
+        # Суффикс может встречаться у нескольких производителей: описание — из первой строки
+        suffixes: dict[str, dict] = {
+            code: {"type": kind, "description": description, "manufacturers": ["ISO"]}
+            for code, kind, description in STANDARD_SUFFIXES
+        }
+        for row in self._read_csv(suffixes_path):
+            code = row["code"].strip().upper()
+            entry = suffixes.setdefault(
+                code, {"type": row.get("type") or "", "description": row.get("description") or "", "manufacturers": []}
+            )
+            manufacturer = (row.get("manufacturer") or "").strip()
+            if manufacturer and manufacturer not in entry["manufacturers"]:
+                entry["manufacturers"].append(manufacturer)
+
+        for code, entry in suffixes.items():
+            self.suffixes.insert(
+                code, DesignationPart(code, entry["type"], entry["description"], tuple(entry["manufacturers"]))
+            )
+
+    def _split_prefix(self, text: str) -> tuple[DesignationPart | None, int]:
+        """Самый длинный префикс, за которым следует номер (с разделителем или без)"""
+        for end, part in self.prefixes.matches(text, 0):
+            pos = end + 1 if end < len(text) and text[end] in SEPARATORS else end
+            if pos < len(text) and text[pos].isdigit():
+                return part, pos
+        return None, 0
+
+    def _split_suffixes(self, tail: str) -> tuple[tuple[DesignationPart, ...], tuple[str, ...]]:
+        parts = []
+        unknown = []
+        for token in re.split(r"[ \-/.]+", tail):
+            pos = 0
+            pending = ""
+            while pos < len(token):
+                found = self.suffixes.matches(token, pos)
+                if found:
+                    if pending:
+                        unknown.append(pending)
+                        pending = ""
+                    end, part = found[0]
+                    parts.append(part)
+                    pos = end
+                else:
+                    pending += token[pos]
+                    pos += 1
+            if pending:
+                unknown.append(pending)
+        return tuple(parts), tuple(unknown)
+
+    def _parse(self, normalized: str) -> Designation | None:
+        manufacturer = None
+        prefix, pos = self._split_prefix(normalized)
+        base_match = BASE_PATTERN.match(normalized, pos)
+        if base_match is None:
+            # "SKF 6205", "FAG NU2205": первое слово — производитель
+            head, _, rest = normalized.partition(" ")
+            if not rest or not head.isalpha():
+                return None
+            result = self._parse(rest)
+            return replace(result, normalized=normalized, manufacturer=head) if result else None
+
+        digits, slash_bore = base_match.groups()
+        base_end = base_match.end()
+        if slash_bore and len(digits) > MAX_SLASH_SERIES_DIGITS:
+            # 6205/22: номер полный, число после черты — не диаметр
+            slash_bore, base_end = None, base_match.end(1)
+        if len(digits) < 3 and not slash_bore:
+            # Одна-две цифры — не номер подшипника ("2RS", "C3")
+            return None
+        if slash_bore:
+            # 62/22: диаметр отверстия указан после косой черты
+            series, bore_code, diameter = digits, f"/{slash_bore}", float(slash_bore)
+        elif len(digits) >= 4:
+            series, bore_code = digits[:-2], digits[-2:]
+            diameter = bore_diameter(bore_code)
+        elif prefix is not None and prefix.type in ROLLER_PREFIX_CATEGORIES:
+            # NJ 205, N 306: одна цифра серии и двузначный код отверстия
+            series, bore_code = digits[:1], digits[1:]
+            diameter = bore_diameter(bore_code)
+        else:
+            # Миниатюрные подшипники: 608 — серия 60, отверстие 8 мм
+            series, bore_code, diameter = digits[:2], digits[2], float(digits[2])
+
+        suffixes, unknown = self._split_suffixes(normalized[base_end:])
+        return Designation(
+            designation=normalized,
+            normalized=normalized,
+            manufacturer=manufacturer,
+            prefix=prefix,
+            base=normalized[base_match.start() : base_end],
+            series=series,
+            bore_code=bore_code,
+            bore_diameter=float(diameter) if diameter is not None else None,
+            suffixes=suffixes,
+            unknown=unknown,
+        )
+
+    def parse(self, code: str) -> Designation | None:
+        """
+        Разобрать обозначение
+
+        Returns:
+            Designation или None, если в обозначении нет номера
+        """
+        result = self._parse_cached(normalize_designation(code))
+        if result is not None and result.designation != code:
+            # В кеше хранится разбор нормализованного обозначения; исходное — как передано
+            result = replace(result, designation=code)
+        return result
+
+    def parse_many(self, codes: Iterable[str]) -> list[Designation | None]:
+        """
+        Разобрать колонку обозначений каталога
+
+        Повторяющиеся обозначения разбираются один раз.
+        """
+        parsed: dict[str, Designation | None] = {}
+        results = []
+        for code in codes:
+            if code not in parsed:
+                parsed[code] = self.parse(code) if isinstance(code, str) else None
+            results.append(parsed[code])
+        return results
+
+    def cache_info(self):
+        """Статистика LRU-кеша разборов"""
+        return self._parse_cached.cache_info()
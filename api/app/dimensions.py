@@ -0,0 +1,202 @@
+"""
+Подбор взаимозаменяемых подшипников по размерам d/D/B.
+
+Таблицы размеров (data/dimensions/bearing_dimensions.csv,
+data/gost/dimensions.csv, data/iso/dimensions.csv и мастер-каталог)
+сводятся в одну таблицу с колонками numpy. Для каждой из колонок d, D, B
+хранится отсортированная копия и перестановка строк: запрос "d/D/B ±tol"
+находит бинарным поиском диапазон по самой избирательной колонке и
+проверяет остальные условия векторно только для строк этого диапазона.
+"""
+
+import csv
+import os
+from collections.abc import Iterable
+
+import numpy as np
+
+from .reference_db import read_reference_rows
+
+# Источники размеров: (путь, стандарт, колонка обозначения, колонка типа)
+DIMENSION_SOURCES = [
+    ("data/dimensions/bearing_dimensions.csv", "ISO", "Designation", "Type"),
+    ("data/iso/dimensions.csv", "ISO", "designation", None),
+    ("data/gost/dimensions.csv", "ГОСТ", "designation", None),
+    ("data/csv/master_catalog.csv", "ISO", "ISO", "Type"),
+    ("data/csv/master_catalog.csv", "ГОСТ", "GOST", "Type"),
+]
+
+# Типы подшипников для таблиц без колонки типа
+TYPE_SOURCES = {"ISO": "data/iso/bearings.csv", "ГОСТ": "data/gost/bearings.csv"}
+
+COLUMNS = ("d", "D", "B")
+
+
+def _read_csv(path: str) -> list[dict]:
+    rows = read_reference_rows(path)
+    if rows is not None:
+        return rows
+    if not os.path.exists(path):
+        print(f"Таблица размеров не найдена: {path}")
+        return []
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _number(value: str | None) -> float | None:
+    try:
+        return float((value or "").replace(",", "."))
+    except ValueError:
+        return None
+
+
+class DimensionIndex:
+    """
+    Поиск подшипников по размерам
+
+    Args:
+        sources: Таблицы размеров (путь, стандарт, колонка обозначения, колонка типа)
+        type_sources: Справочники типов по стандарту для таблиц без колонки типа
+    """
+
+    def __init__(self, sources=DIMENSION_SOURCES, type_sources=TYPE_SOURCES):
+        self.designations: list[str] = []
+        self.standards: list[str] = []
+        self.types: list[str] = []
+        self.sources: list[str] = []
+        self.load(sources, type_sources)
+
+    def load(self, sources, type_sources):
+        """Свести таблицы в колонки и построить отсортированные индексы"""
+        known_types = {
+            (standard, row["designation"].strip()): row["type"].strip()
+            for standard, path in type_sources.items()
+            for row in _read_csv(path)
+            if row.get("designation") and row.get("type")
+        }
+
+        rows: dict[tuple, int] = {}
+        sizes = []
+        for path, standard, code_column, type_column in sources:
+            for row in _read_csv(path):
+                code = (row.get(code_column) or "").strip()
+                size = tuple(_number(row.get(column)) for column in COLUMNS)
+                if not code or None in size:
+                    continue
+                bearing_type = (row.get(type_column) or "").strip() if type_column else ""
+                bearing_type = bearing_type or known_types.get((standard, code), "")
+
+                key = (standard, code.upper(), size)
+                if key in rows:
+                    # Одинаковые строки из разных таблиц — одна запись; тип дополняется
+                    position = rows[key]
+                    if not self.types[position]:
+                        self.types[position] = bearing_type
+                    continue
+                rows[key] = len(self.designations)
+                self.designations.append(code)
+                self.standards.append(standard)
+                self.types.append(bearing_type)
+                self.sources.append(path)
+                sizes.append(size)
+
+        self.sizes = np.array(sizes, dtype=np.float64).reshape(-1, 3)
+        self.type_names = sorted(set(self.types))
+        self._type_ids = {name.casefold(): idx for idx, name in enumerate(self.type_names)}
+        self.type_codes = np.array([self._type_ids[name.casefold()] for name in self.types], dtype=np.int32)
+
+        # Для каждой колонки: перестановка строк и отсортированные значения
+        self._order = [np.argsort(self.sizes[:, column], kind="stable") for column in range(3)]
+        self._sorted = [self.sizes[order, column] for column, order in enumerate(self._order)]
+
+    def _candidates(self, size: tuple, tol: float) -> np.ndarray:
+        """Строки, попадающие в допуск по самой избирательной из заданных колонок"""
+        best = None
+        for column, value in enumerate(size):
+            if value is None:
+                continue
+            values = self._sorted[column]
+            lo = np.searchsorted(values, value - tol, side="left")
+            hi = np.searchsorted(values, value + tol, side="right")
+            if best is None or hi - lo < best[2] - best[1]:
+                best = (column, lo, hi)
+        if best is None:
+            return np.arange(len(self.designations))
+        column, lo, hi = best
+        return self._order[column][lo:hi]
+
+    def match(
+        self,
+        d: float | None = None,
+        D: float | None = None,
+        B: float | None = None,
+        tol: float = 0.0,
+        bearing_type: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """
+        Подшипники с размерами d/D/B в пределах ±tol мм
+
+        Незаданный размер не ограничивает поиск. Результаты отсортированы
+        по суммарному отклонению размеров.
+        """
+        size = (d, D, B)
+        rows = self._candidates(size, tol)
+
+        mask = np.ones(len(rows), dtype=bool)
+        for column, value in enumerate(size):
+            if value is not None:
+                mask &= np.abs(self.sizes[rows, column] - value) <= tol
+        if bearing_type:
+            type_id = self._type_ids.get(bearing_type.strip().casefold(), -1)
+            mask &= self.type_codes[rows] == type_id
+        rows = rows[mask]
+
+        deviation = np.zeros(len(rows))
+        for column, value in enumerate(size):
+            if value is not None:
+                deviation += np.abs(self.sizes[rows, column] - value)
+        order = np.lexsort((rows, deviation))
+        if limit:
+            order = order[:limit]
+
+        return [
+            {
+                "designation": self.designations[row],
+                "standard": self.standards[row],
+                "type": self.types[row],
+                "d": float(self.sizes[row, 0]),
+                "D": float(self.sizes[row, 1]),
+                "B": float(self.sizes[row, 2]),
+                "deviation": round(float(deviation[idx]), 6),
+            }
+            for idx, row in zip(order, rows[order])
+        ]
+
+    def match_many(
+        self,
+        sizes: Iterable[tuple],
+        tol: float = 0.0,
+        bearing_type: str | None = None,
+        limit: int | None = None,
+    ) -> list[list[dict]]:
+        """
+        Поиск для списка размеров (d, D, B); None в размере — любое значение
+
+        Одинаковые размеры ищутся один раз.
+        """
+        found: dict[tuple, list[dict]] = {}
+        results = []
+        for size in sizes:
+            size = tuple(size) + (None,) * (3 - len(size))
+            if size not in found:
+                found[size] = self.match(*size, tol=tol, bearing_type=bearing_type, limit=limit)
+            results.append(found[size])
+        return results
+
+    def known_types(self) -> list[str]:
+        """Известные типы подшипников"""
+        return [name for name in self.type_names if name]
+
+    def __len__(self) -> int:
+        return len(self.designations)
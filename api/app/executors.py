@@ -0,0 +1,174 @@
+"""
+Вынос синхронной CPU-работы из event loop.
+
+Эндпоинты объявлены как async, но поиск и генерация файлов экспорта —
+синхронная CPU-работа. Здесь она распределяется по пулам:
+- пул потоков для легкой работы (поиск, похожие документы)
+- пул процессов для генерации Excel/CSV
+
+Для каждого типа запроса действует собственный лимит параллелизма,
+а время ожидания в очереди собирается в статистику.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Лимиты одновременно выполняемых задач по типам запросов
+DEFAULT_LIMITS = {
+    "search": 16,
+    "export": 4,
+    "batch_search": 4,
+    "batch_export": 2,
+}
+
+# Сколько последних замеров хранить для перцентилей
+LATENCY_WINDOW = 1000
+
+
+def _timed_call(fn, args, kwargs):
+    """Выполнить задачу и вернуть момент ее фактического старта (вызывается внутри пула)"""
+    started = time.time()
+    return started, fn(*args, **kwargs)
+
+
+class _KindStats:
+    """Статистика по одному типу запросов"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.queue_latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.run_times: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    @staticmethod
+    def _percentile(values: deque[float], percent: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        index = min(int(len(ordered) * percent), len(ordered) - 1)
+        return round(ordered[index] * 1000, 2)
+
+    def to_dict(self) -> dict:
+        return {
+            "limit": self.limit,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "queue_ms_p50": self._percentile(self.queue_latencies, 0.5),
+            "queue_ms_p95": self._percentile(self.queue_latencies, 0.95),
+            "queue_ms_max": self._percentile(self.queue_latencies, 1.0),
+            "run_ms_p50": self._percentile(self.run_times, 0.5),
+            "run_ms_p95": self._percentile(self.run_times, 0.95),
+        }
+
+
+class ExecutorLayer:
+    """
+    Слой исполнителей для синхронной работы из async эндпоинтов
+
+    Пример:
+        results = await executors.run("search", engine.search, query, limit=20)
+        excel = await executors.run("export", SearchResultsExporter.to_excel, results, cpu_bound=True)
+
+    Для cpu_bound задач функция и аргументы должны сериализоваться pickle.
+    При process_workers=0 такие задачи выполняются в пуле потоков.
+    """
+
+    def __init__(
+        self,
+        thread_workers: int | None = None,
+        process_workers: int | None = None,
+        limits: dict[str, int] | None = None,
+    ):
+        self.thread_workers = thread_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.process_workers = (os.cpu_count() or 1) if process_workers is None else process_workers
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+
+        self._threads: ThreadPoolExecutor | None = None
+        self._processes: ProcessPoolExecutor | None = None
+        self._stats: dict[str, _KindStats] = {}
+        # Семафоры asyncio привязаны к циклу событий, поэтому храним их по циклам
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="api-worker")
+        return self._threads
+
+    def _process_pool(self) -> Executor:
+        if self.process_workers <= 0:
+            return self._thread_pool()
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(max_workers=self.process_workers)
+        return self._processes
+
+    def _kind_stats(self, kind: str) -> _KindStats:
+        if kind not in self._stats:
+            self._stats[kind] = _KindStats(self.limits.get(kind, self.thread_workers))
+        return self._stats[kind]
+
+    def _semaphore(self, kind: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        per_loop = self._semaphores.setdefault(loop, {})
+        if kind not in per_loop:
+            per_loop[kind] = asyncio.Semaphore(self._kind_stats(kind).limit)
+        return per_loop[kind]
+
+    async def run(self, kind: str, fn, *args, cpu_bound: bool = False, **kwargs):
+        """
+        Выполнить fn(*args, **kwargs) в пуле с учетом лимита для типа запроса
+
+        Args:
+            kind: Тип запроса (search, export, batch_export, ...)
+            fn: Синхронная функция
+            cpu_bound: Выполнить в пуле процессов
+        """
+        stats = self._kind_stats(kind)
+        stats.submitted += 1
+        enqueued = time.time()
+
+        async with self._semaphore(kind):
+            stats.in_flight += 1
+            pool = self._process_pool() if cpu_bound else self._thread_pool()
+            loop = asyncio.get_running_loop()
+            try:
+                started, result = await loop.run_in_executor(pool, _timed_call, fn, args, kwargs)
+            except Exception:
+                stats.failed += 1
+                raise
+            finally:
+                stats.in_flight -= 1
+
+        finished = time.time()
+        stats.completed += 1
+        stats.queue_latencies.append(max(started - enqueued, 0.0))
+        stats.run_times.append(max(finished - started, 0.0))
+        return result
+
+    def stats(self) -> dict:
+        """Статистика очередей по типам запросов"""
+        return {
+            "thread_workers": self.thread_workers,
+            "process_workers": self.process_workers,
+            "kinds": {kind: stats.to_dict() for kind, stats in sorted(self._stats.items())},
+        }
+
+    def shutdown(self):
+        """Остановить пулы"""
+        if self._threads is not None:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+            self._threads = None
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+            self._processes = None
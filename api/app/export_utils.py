@@ -2,10 +2,158 @@
 Утилиты для экспорта результатов поиска
 """
 
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator
 import json
 import csv
 import io
+import re
+from itertools import chain, islice
+
+# Сколько строк CSV собирать в один фрагмент потока
+STREAM_CHUNK_ROWS = 500
+
+
+def _flatten(result: Dict) -> Dict:
+    """Сериализовать вложенные объекты в JSON-строки для табличных форматов"""
+    flat_result = {}
+    for key, value in result.items():
+        if isinstance(value, (dict, list)):
+            flat_result[key] = json.dumps(value, ensure_ascii=False)
+        else:
+            flat_result[key] = value
+    return flat_result
+
+
+# Максимальная ширина колонки Excel в символах
+MAX_COLUMN_WIDTH = 50
+
+# Сколько первых строк листа просматривается для колонок и их ширины
+WIDTH_SAMPLE_ROWS = 1000
+
+# Символы, недопустимые в именах листов Excel
+_INVALID_SHEET_CHARS = re.compile(r'[\\/:*?\[\]]')
+
+# Цветовое кодирование релевантности: (оператор, порог, цвет)
+_RELEVANCE_RULES = [
+    ('greaterThanOrEqual', '0.8', 'C6EFCE'),  # Зеленый для высокой релевантности
+    ('greaterThanOrEqual', '0.5', 'FFEB9C'),  # Желтый для средней
+    ('lessThan', '0.5', 'FFC7CE'),  # Красный для низкой
+]
+
+
+def _new_workbook():
+    """Книга в режиме write-only: строки сразу сериализуются, ячейки не хранятся в памяти"""
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ImportError("Для экспорта в Excel требуется openpyxl")
+    
+    return Workbook(write_only=True)
+
+
+def _save_workbook(workbook) -> io.BytesIO:
+    output = io.BytesIO()
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
+def _sheet_title(query: str) -> str:
+    """Имя листа: не длиннее 31 символа и без недопустимых символов"""
+    return _INVALID_SHEET_CHARS.sub('_', query)[:31] or 'Запрос'
+
+
+def _write_sheet(
+    workbook,
+    title: str,
+    rows: Iterable[Dict],
+    header_fill: bool = False,
+    relevance_colors: bool = True,
+    auto_filter: bool = True,
+):
+    """
+    Записать лист в write-only книгу
+    
+    Строки выравниваются и дописываются по одной, лист не собирается в памяти.
+    Колонки и их ширина определяются по первым WIDTH_SAMPLE_ROWS строкам:
+    в write-only режиме ширину нельзя задать после первой строки. Ключи,
+    впервые встретившиеся позже, дописываются колонками справа (без
+    заголовка). Раскраска релевантности задается правилами условного
+    форматирования на весь столбец вместо заливки каждой ячейки.
+    """
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.formatting.rule import CellIsRule
+    from openpyxl.styles import Font, PatternFill
+    from openpyxl.utils import get_column_letter
+    
+    rows = iter(rows)
+    sample = [_flatten(row) for row in islice(rows, WIDTH_SAMPLE_ROWS)]
+    
+    # Колонки — объединение ключей в порядке появления (как у DataFrame)
+    fieldnames: List[str] = []
+    known = set()
+    for flat_row in sample:
+        for key in flat_row:
+            if key not in known:
+                known.add(key)
+                fieldnames.append(key)
+    
+    # Ширина колонок по выборке
+    widths = [len(str(name)) for name in fieldnames]
+    for flat_row in sample:
+        for idx, name in enumerate(fieldnames):
+            value = flat_row.get(name)
+            if value is not None:
+                widths[idx] = max(widths[idx], len(str(value)))
+    
+    worksheet = workbook.create_sheet(title)
+    for idx, width in enumerate(widths, start=1):
+        worksheet.column_dimensions[get_column_letter(idx)].width = min(width + 2, MAX_COLUMN_WIDTH)
+    
+    # Заголовки
+    header_font = Font(bold=True)
+    header_background = PatternFill(start_color='CCCCCC', end_color='CCCCCC', fill_type='solid')
+    header = []
+    for name in fieldnames:
+        cell = WriteOnlyCell(worksheet, value=name)
+        cell.font = header_font
+        if header_fill:
+            cell.fill = header_background
+        header.append(cell)
+    worksheet.append(header)
+    
+    count = 0
+    for flat_row in chain(sample, map(_flatten, rows)):
+        for key in flat_row:
+            if key not in known:
+                known.add(key)
+                fieldnames.append(key)
+        worksheet.append([flat_row.get(name) for name in fieldnames])
+        count += 1
+    
+    last_row = count + 1
+    last_column = get_column_letter(max(len(fieldnames), 1))
+    
+    # Цветовое кодирование по релевантности (если есть колонка relevance)
+    if relevance_colors and 'relevance' in fieldnames and count:
+        column = get_column_letter(fieldnames.index('relevance') + 1)
+        cell_range = f'{column}2:{column}{last_row}'
+        for operator, threshold, color in _RELEVANCE_RULES:
+            worksheet.conditional_formatting.add(
+                cell_range,
+                CellIsRule(
+                    operator=operator,
+                    formula=[threshold],
+                    stopIfTrue=True,
+                    fill=PatternFill(start_color=color, end_color=color, fill_type='solid'),
+                ),
+            )
+    
+    # Добавляем фильтры
+    if auto_filter:
+        worksheet.auto_filter.ref = f'A1:{last_column}{last_row}'
+    
+    return worksheet
 
 
 class SearchResultsExporter:
@@ -20,28 +168,52 @@ class SearchResultsExporter:
     @staticmethod
     def to_csv(results: List[Dict]) -> str:
         """Экспорт в CSV"""
-        if not results:
-            return ""
+        return "".join(SearchResultsExporter.iter_csv(results))
+    
+    @staticmethod
+    def iter_csv(results: Iterable[Dict], chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[str]:
+        """
+        Потоковый экспорт в CSV
         
+        Поля определяются по первой записи; строки отдаются фрагментами
+        по chunk_rows, поэтому память не зависит от числа результатов.
+        """
         output = io.StringIO()
-        
-        # Определяем поля по первой записи
-        fieldnames = list(results[0].keys())
-        
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
+        writer = None
+        buffered = 0
         
         for result in results:
-            # Убираем вложенные объекты для CSV
-            flat_result = {}
-            for key, value in result.items():
-                if isinstance(value, (dict, list)):
-                    flat_result[key] = json.dumps(value, ensure_ascii=False)
-                else:
-                    flat_result[key] = value
-            writer.writerow(flat_result)
+            if writer is None:
+                writer = csv.DictWriter(output, fieldnames=list(result.keys()))
+                writer.writeheader()
+            
+            writer.writerow(_flatten(result))
+            buffered += 1
+            
+            if buffered >= chunk_rows:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
+                buffered = 0
         
-        return output.getvalue()
+        if output.tell():
+            yield output.getvalue()
+    
+    @staticmethod
+    def iter_ndjson(results: Iterable[Dict]) -> Iterator[str]:
+        """Потоковый экспорт в NDJSON: один JSON-объект на строку"""
+        for result in results:
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+    
+    @staticmethod
+    def iter_json(results: Iterable[Dict]) -> Iterator[str]:
+        """Потоковый экспорт в JSON-массив без сборки всего документа в памяти"""
+        yield "["
+        separator = "\n"
+        for result in results:
+            yield separator + json.dumps(result, ensure_ascii=False, indent=2)
+            separator = ",\n"
+        yield "\n]" if separator != "\n" else "]"
     
     @staticmethod
     def to_excel(results: List[Dict], filename: str = None):
@@ -52,92 +224,13 @@ class SearchResultsExporter:
         - Фильтры
         - Цветовое кодирование по релевантности
         """
-        try:
-            import pandas as pd
-            from openpyxl import load_workbook
-            from openpyxl.styles import Font, PatternFill
-        except ImportError:
-            raise ImportError("Для экспорта в Excel требуются pandas и openpyxl")
-        
         if not results:
             return None
         
-        # Преобразуем в DataFrame
-        # Убираем вложенные объекты
-        flat_results = []
-        for result in results:
-            flat_result = {}
-            for key, value in result.items():
-                if isinstance(value, (dict, list)):
-                    flat_result[key] = json.dumps(value, ensure_ascii=False)
-                else:
-                    flat_result[key] = value
-            flat_results.append(flat_result)
-        
-        df = pd.DataFrame(flat_results)
-        
-        # Создаем Excel файл в памяти
-        output = io.BytesIO()
-        
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Результаты поиска', index=False)
-            
-            # Получаем лист
-            worksheet = writer.sheets['Результаты поиска']
-            
-            # Форматирование заголовков
-            header_font = Font(bold=True)
-            header_fill = PatternFill(start_color='CCCCCC', end_color='CCCCCC', fill_type='solid')
-            
-            for cell in worksheet[1]:
-                cell.font = header_font
-                cell.fill = header_fill
-            
-            # Автоширина колонок
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                
-                for cell in column:
-                    try:
-                        cell_str = str(cell.value)
-                    except Exception:
-                        # Игнорируем ошибки преобразования значения ячейки в строку при расчете ширины колонки
-                        continue
-
-                    if len(cell_str) > max_length:
-                        max_length = len(cell_str)
-                
-                adjusted_width = min(max_length + 2, 50)  # Максимум 50 символов
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-            
-            # Цветовое кодирование по релевантности (если есть колонка relevance)
-            if 'relevance' in df.columns:
-                relevance_col_idx = list(df.columns).index('relevance') + 1
-                
-                for row_idx in range(2, len(df) + 2):  # Начинаем со 2-й строки (после заголовка)
-                    cell = worksheet.cell(row=row_idx, column=relevance_col_idx)
-                    try:
-                        relevance = float(cell.value)
-                        
-                        # Зеленый для высокой релевантности
-                        if relevance >= 0.8:
-                            cell.fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
-                        # Желтый для средней
-                        elif relevance >= 0.5:
-                            cell.fill = PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid')
-                        # Красный для низкой
-                        else:
-                            cell.fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
-                    except Exception:
-                        # Игнорируем ошибки при вычислении релевантности для цветового кодирования
-                        pass
-            
-            # Добавляем фильтры
-            worksheet.auto_filter.ref = worksheet.dimensions
+        workbook = _new_workbook()
+        _write_sheet(workbook, 'Результаты поиска', results, header_fill=True)
         
-        output.seek(0)
-        return output
+        return _save_workbook(workbook)
     
     @staticmethod
     def create_batch_excel(batch_results: Dict[str, List[Dict]], filename: str = None):
@@ -147,58 +240,40 @@ class SearchResultsExporter:
         Args:
             batch_results: Словарь {query: results}
         """
-        try:
-            import pandas as pd
-        except ImportError:
-            raise ImportError("Для экспорта в Excel требуется pandas")
-        
-        output = io.BytesIO()
-        
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            for query, results in batch_results.items():
-                if not results:
-                    continue
-                
-                # Убираем вложенные объекты
-                flat_results = []
-                for result in results:
-                    flat_result = {}
-                    for key, value in result.items():
-                        if isinstance(value, (dict, list)):
-                            flat_result[key] = json.dumps(value, ensure_ascii=False)
-                        else:
-                            flat_result[key] = value
-                    flat_results.append(flat_result)
-                
-                df = pd.DataFrame(flat_results)
-                
-                # Имя листа (первые 31 символ, т.к. Excel ограничивает длину)
-                sheet_name = query[:31] if len(query) > 31 else query
-                # Заменяем недопустимые символы
-                sheet_name = sheet_name.replace('/', '_').replace('\\', '_').replace(':', '_')
-                
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-                
-                # Форматирование
-                worksheet = writer.sheets[sheet_name]
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    
-                    for cell in column:
-                        try:
-                            cell_value = str(cell.value)
-                        except Exception:
-                            # Если значение ячейки не приводится к строке, пропускаем его при расчёте ширины столбца
-                            continue
-                        if len(cell_value) > max_length:
-                            max_length = len(cell_value)
-                    
-                    adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
+        writer = BatchExcelWriter()
+        writer.add_sheets(batch_results)
+        return writer.close()
+
+
+class BatchExcelWriter:
+    """
+    Пошаговая сборка книги массового экспорта
+    
+    Листы дописываются по мере готовности результатов поиска
+    (add_sheets можно вызывать для каждой порции запросов), а строки
+    сразу сериализуются write-only книгой.
+    """
+    
+    def __init__(self):
+        self.workbook = _new_workbook()
+        self.sheets_written = 0
+    
+    def add_sheets(self, batch_results: Dict[str, List[Dict]]):
+        """Добавить по листу на каждый запрос с непустыми результатами"""
+        for query, results in batch_results.items():
+            if not results:
+                continue
+            
+            _write_sheet(self.workbook, _sheet_title(query), results)
+            self.sheets_written += 1
+    
+    def close(self) -> io.BytesIO:
+        """Завершить книгу и вернуть содержимое файла"""
+        # Книга без листов не открывается в Excel
+        if not self.sheets_written:
+            self.workbook.create_sheet('Нет результатов').append(['Результаты не найдены'])
         
-        output.seek(0)
-        return output
+        return _save_workbook(self.workbook)
 
 
 class AnalogsExporter:
@@ -231,40 +306,10 @@ class AnalogsExporter:
     @staticmethod
     def to_excel(analogs: List[Dict], filename: str = None):
         """Экспорт аналогов в Excel"""
-        try:
-            import pandas as pd
-        except ImportError:
-            raise ImportError("Для экспорта в Excel требуется pandas")
-        
         if not analogs:
             return None
         
-        df = pd.DataFrame(analogs)
-        
-        output = io.BytesIO()
-        
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Аналоги', index=False)
-            
-            worksheet = writer.sheets['Аналоги']
-            
-            # Автоширина колонок
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                
-                for cell in column:
-                    try:
-                        cell_str = str(cell.value)
-                    except Exception:
-                        # Игнорируем ошибки при вычислении длины значения ячейки
-                        continue
-                    
-                    if len(cell_str) > max_length:
-                        max_length = len(cell_str)
-                
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
+        workbook = _new_workbook()
+        _write_sheet(workbook, 'Аналоги', analogs, relevance_colors=False, auto_filter=False)
         
-        output.seek(0)
-        return output
+        return _save_workbook(workbook)
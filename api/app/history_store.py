@@ -0,0 +1,182 @@
+"""
+Постоянная история поиска в БД (таблицы search_history и popular_queries).
+
+Запросы не пишут в БД напрямую: записи копятся в буфере HistoryWriter
+и сбрасываются пачками — COPY (PostgreSQL) или пакетная вставка (SQLite).
+Счетчики popular_queries обновляются в той же транзакции одним upsert
+на каждый уникальный запрос пачки, а не на каждую строку истории.
+
+Чтение идет по индексам из sql/init_catalog.sql; записи, еще не
+сброшенные из буфера, появляются в выдаче через flush_interval секунд.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime
+
+from .db import Database
+
+logger = logging.getLogger(__name__)
+
+HISTORY_COLUMNS = ["user_id", "query", "results_count", "session_id", "timestamp"]
+
+UPSERT_POPULAR_QUERY = """
+INSERT INTO popular_queries (query, search_count, last_searched, updated_at)
+VALUES ($1, $2, $3, CURRENT_TIMESTAMP)
+ON CONFLICT (query) DO UPDATE SET
+    search_count = popular_queries.search_count + EXCLUDED.search_count,
+    last_searched = EXCLUDED.last_searched,
+    updated_at = CURRENT_TIMESTAMP
+"""
+
+
+class HistoryWriter:
+    """
+    Буферизованная запись истории поиска
+
+    Буфер сбрасывается фоновой задачей раз в flush_interval секунд или
+    сразу по достижении batch_size записей. При недоступности БД записи
+    возвращаются в буфер; сверх max_buffer самые старые отбрасываются.
+    """
+
+    def __init__(self, db: Database, batch_size: int = 500, flush_interval: float = 1.0, max_buffer: int = 50000):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+
+        self._buffer: list[tuple] = []
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.written = 0
+        self.dropped = 0
+
+    @property
+    def pending(self) -> int:
+        """Количество записей, ожидающих сброса"""
+        return len(self._buffer)
+
+    def add(self, user_id: str, query: str, results_count: int, session_id: str = None, timestamp: datetime = None):
+        """Поставить запись в очередь на запись (без обращения к БД)"""
+        self._buffer.append((user_id, query, results_count, session_id, timestamp or datetime.now()))
+        self._trim()
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def _trim(self):
+        overflow = len(self._buffer) - self.max_buffer
+        if overflow > 0:
+            del self._buffer[:overflow]
+            self.dropped += overflow
+            logger.warning("Буфер истории поиска переполнен: отброшено %d записей", overflow)
+
+    async def flush(self) -> int:
+        """Записать накопленные записи; возвращает количество записанных"""
+        async with self._flush_lock:
+            rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+
+            # Агрегация счетчиков популярных запросов по пачке
+            counts = Counter(row[1] for row in rows)
+            last_searched = {row[1]: row[4] for row in rows}
+            popular = [(query, count, last_searched[query]) for query, count in counts.items()]
+
+            try:
+                async with self.db.transaction() as conn:
+                    await conn.copy_records("search_history", HISTORY_COLUMNS, rows)
+                    await conn.executemany(UPSERT_POPULAR_QUERY, popular)
+            except Exception as e:
+                logger.error(f"Ошибка записи истории поиска: {e}")
+                self._buffer[:0] = rows
+                self._trim()
+                return 0
+
+            self.written += len(rows)
+            return len(rows)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self):
+        """Запустить фоновый сброс буфера"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Остановить фоновый сброс и записать остаток буфера"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+class PersistentSearchHistory:
+    """
+    История поиска в БД с тем же набором операций, что и SearchHistory
+
+    Пример:
+        history = PersistentSearchHistory(Database("sqlite:///data/history.db"))
+        await history.start()
+        history.add_search("u1", "6205", 12)
+        popular = await history.get_popular_queries(limit=10)
+    """
+
+    def __init__(self, db: Database, batch_size: int = 500, flush_interval: float = 1.0):
+        self.db = db
+        self.writer = HistoryWriter(db, batch_size=batch_size, flush_interval=flush_interval)
+
+    async def start(self):
+        await self.db.connect()
+        self.writer.start()
+
+    async def stop(self):
+        await self.writer.stop()
+        await self.db.disconnect()
+
+    def add_search(self, user_id: str, query: str, results_count: int, session_id: str = None):
+        """Добавить запись в историю поиска (запись в БД — пачками)"""
+        self.writer.add(user_id, query, results_count, session_id)
+
+    async def get_user_history(self, user_id: str, limit: int = 50) -> list[dict]:
+        """Получить историю поиска пользователя (новые записи первыми)"""
+        rows = await self.db.fetch(
+            """
+            SELECT user_id, query, results_count, session_id, timestamp
+            FROM search_history
+            WHERE user_id = $1
+            ORDER BY timestamp DESC, id DESC
+            LIMIT $2
+            """,
+            user_id,
+            limit,
+        )
+        for row in rows:
+            if isinstance(row["timestamp"], datetime):
+                row["timestamp"] = row["timestamp"].isoformat()
+        return rows
+
+    async def clear_user_history(self, user_id: str):
+        """Очистить историю поиска пользователя"""
+        # Сначала сбрасываем буфер, чтобы удалить и еще не записанные поиски
+        await self.writer.flush()
+        await self.db.execute("DELETE FROM search_history WHERE user_id = $1", user_id)
+
+    async def get_popular_queries(self, limit: int = 10) -> list[dict]:
+        """Получить популярные поисковые запросы (по индексу search_count)"""
+        return await self.db.fetch(
+            "SELECT query, search_count AS count FROM popular_queries ORDER BY search_count DESC LIMIT $1",
+            limit,
+        )
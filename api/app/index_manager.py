@@ -0,0 +1,249 @@
+"""
+Горячая перезагрузка поисковых индексов.
+
+Индексы (словарь автодополнения, индекс документов, матрица схожести)
+загружаются поколениями. Новое поколение строится в фоне, после чего
+ссылка на текущее поколение атомарно подменяется — читатели никогда не
+ждут загрузки. Старое поколение освобождается, когда его отпускает
+последний запрос.
+
+Поколение, в котором пропали все документы или все термины (например,
+файл индекса перезаписывается в момент чтения), не подменяет текущее.
+"""
+
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+
+from .logic import AutocompleteEngine, DocumentSearchEngine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IndexGeneration:
+    """Одно загруженное поколение индексов"""
+
+    number: int
+    autocomplete: AutocompleteEngine
+    search: DocumentSearchEngine
+    stamps: dict[str, tuple[int, int] | None]
+    loaded_at: datetime
+    load_time_ms: float
+    index_bytes: int
+    memory_bytes: int | None = None
+    readers: int = 0
+    retired: bool = False
+
+    def to_dict(self) -> dict:
+        """Статистика поколения для /admin/reload"""
+        return {
+            "generation": self.number,
+            "loaded_at": self.loaded_at.isoformat(),
+            "load_time_ms": round(self.load_time_ms, 2),
+            "index_bytes": self.index_bytes,
+            "memory_bytes": self.memory_bytes,
+            "documents": len(self.search.documents),
+            "terms": len(self.autocomplete.terms),
+            "active_readers": self.readers,
+            "retired": self.retired,
+        }
+
+
+class IndexManager:
+    """
+    Менеджер поколений индексов
+
+    Изменения файлов отслеживаются по отметкам (mtime_ns, size): либо
+    фоновым потоком с интервалом poll_interval, либо явным вызовом reload().
+
+    Размер поколения оценивается по размеру файлов индексов; точный замер
+    памяти через tracemalloc (trace_memory=True) замедляет загрузку в разы
+    и предназначен для отладки.
+    """
+
+    def __init__(
+        self,
+        dict_path: str = "data/autocomplete_dict.json",
+        index_path: str = "data/document_index.json",
+        similarity_path: str = "data/similarity_matrix.json",
+        poll_interval: float = 10.0,
+        trace_memory: bool = False,
+    ):
+        self.dict_path = dict_path
+        self.index_path = index_path
+        self.similarity_path = similarity_path
+        self.poll_interval = poll_interval
+        self.trace_memory = trace_memory
+
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watcher: threading.Thread | None = None
+        self._retired: list[IndexGeneration] = []
+        self._next_number = 1
+        # Отметки файлов, поколение из которых было отклонено: не перечитываем их повторно
+        self._rejected_stamps: dict[str, tuple[int, int] | None] | None = None
+        self._current = self._load_generation()
+
+    @property
+    def current(self) -> IndexGeneration:
+        """Текущее поколение (без учета читателей)"""
+        return self._current
+
+    @contextmanager
+    def acquire(self):
+        """
+        Захватить текущее поколение на время обработки запроса
+
+        Пока поколение захвачено, оно не освобождается даже после подмены.
+        """
+        with self._lock:
+            generation = self._current
+            generation.readers += 1
+        try:
+            yield generation
+        finally:
+            with self._lock:
+                generation.readers -= 1
+                if generation.retired and generation.readers == 0 and generation in self._retired:
+                    self._retired.remove(generation)
+
+    def _file_stamps(self) -> dict[str, tuple[int, int] | None]:
+        """Отметки версий файлов индексов"""
+        stamps = {}
+        for path in (self.dict_path, self.index_path, self.similarity_path):
+            try:
+                stat = os.stat(path)
+                stamps[path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                stamps[path] = None
+        return stamps
+
+    def _load_generation(self) -> IndexGeneration:
+        """Загрузить новое поколение с замером времени (и памяти при trace_memory)"""
+        stamps = self._file_stamps()
+
+        # tracemalloc может быть уже запущен (например, профилировщиком) — тогда не останавливаем его
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if self.trace_memory and not tracing:
+            tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        started = time.perf_counter()
+
+        autocomplete = AutocompleteEngine(self.dict_path)
+        search = DocumentSearchEngine(self.index_path, self.similarity_path)
+
+        load_time_ms = (time.perf_counter() - started) * 1000
+        memory_bytes = None
+        if self.trace_memory:
+            memory_bytes = max(tracemalloc.get_traced_memory()[0] - baseline, 0)
+            if not tracing:
+                tracemalloc.stop()
+
+        number = self._next_number
+        self._next_number += 1
+
+        return IndexGeneration(
+            number=number,
+            autocomplete=autocomplete,
+            search=search,
+            stamps=stamps,
+            loaded_at=datetime.now(),
+            load_time_ms=load_time_ms,
+            index_bytes=sum(stamp[1] for stamp in stamps.values() if stamp),
+            memory_bytes=memory_bytes,
+        )
+
+    @staticmethod
+    def _lost_data(generation: IndexGeneration, previous: IndexGeneration) -> list[str]:
+        """Что было в предыдущем поколении и пропало в новом"""
+        lost = []
+        if previous.search.documents and not generation.search.documents:
+            lost.append("документы")
+        if previous.autocomplete.terms and not generation.autocomplete.terms:
+            lost.append("термины")
+        return lost
+
+    def has_changes(self) -> bool:
+        """Изменились ли файлы индексов с момента загрузки текущего поколения"""
+        stamps = self._file_stamps()
+        return stamps != self._current.stamps and stamps != self._rejected_stamps
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Загрузить новое поколение и подменить текущее
+
+        Returns:
+            True, если поколение было заменено; False, если файлы не менялись
+            или в новом поколении нет документов либо терминов, которые были
+            в текущем (текущее остается в работе)
+        """
+        with self._reload_lock:
+            if not force and not self.has_changes():
+                return False
+
+            generation = self._load_generation()
+
+            lost = self._lost_data(generation, self._current)
+            if lost:
+                self._rejected_stamps = generation.stamps
+                logger.warning(
+                    "Поколение %d отклонено: пусто (%s), остается поколение %d",
+                    generation.number,
+                    ", ".join(lost),
+                    self._current.number,
+                )
+                return False
+            self._rejected_stamps = None
+
+            with self._lock:
+                previous = self._current
+                self._current = generation
+                previous.retired = True
+                if previous.readers > 0:
+                    self._retired.append(previous)
+
+        logger.info(
+            "Индексы перезагружены: поколение %d за %.1f мс (%d документов)",
+            generation.number,
+            generation.load_time_ms,
+            len(generation.search.documents),
+        )
+        return True
+
+    def stats(self) -> dict:
+        """Статистика текущего и еще не освобожденных поколений"""
+        with self._lock:
+            return {
+                "current": self._current.to_dict(),
+                "retired": [generation.to_dict() for generation in self._retired],
+            }
+
+    def _watch_loop(self):
+        while not self._stop_event.wait(self.poll_interval):
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"Ошибка при перезагрузке индексов: {e}")
+
+    def start_watching(self):
+        """Запустить фоновое отслеживание изменений файлов индексов"""
+        if self.poll_interval <= 0 or (self._watcher and self._watcher.is_alive()):
+            return
+
+        self._stop_event.clear()
+        self._watcher = threading.Thread(target=self._watch_loop, name="index-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        """Остановить фоновое отслеживание"""
+        self._stop_event.set()
+        if self._watcher:
+            self._watcher.join(timeout=self.poll_interval + 1)
+            self._watcher = None
@@ -10,6 +10,13 @@
 
 import json
 import os
+import re
+import time
+from bisect import bisect_right
+from collections import Counter, OrderedDict, deque
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from itertools import islice
 
 
 class AutocompleteEngine:
@@ -118,6 +125,77 @@ class AutocompleteEngine:
         return sorted_terms[:limit]
 
 
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Регулярное выражение-префиксное дерево: в каждой позиции находит самое длинное слово"""
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+class _TextCorpus:
+    """Тексты документов, склеенные в одну строку для поиска подстрок за один проход"""
+
+    SEPARATOR = "\x00"
+
+    def __init__(self, texts: list[str]):
+        self.text = self.SEPARATOR.join(texts)
+        self.starts = []
+        offset = 0
+        for text in texts:
+            self.starts.append(offset)
+            offset += len(text) + len(self.SEPARATOR)
+
+    def find_all(self, substring: str) -> Iterator[int]:
+        """Номера текстов, содержащих подстроку, по возрастанию"""
+        if not substring or self.SEPARATOR in substring:
+            return
+
+        position = self.text.find(substring)
+        while position != -1:
+            index = bisect_right(self.starts, position) - 1
+            yield index
+            # Следующее вхождение ищем уже со следующего текста
+            if index + 1 >= len(self.starts):
+                return
+            position = self.text.find(substring, self.starts[index + 1])
+
+    def find_many(self, substrings: Iterable[str]) -> Iterator[tuple[str, int]]:
+        """
+        Пары (подстрока, номер текста) для всех подстрок за один проход по корпусу
+
+        Номера текстов не убывают, каждая пара отдается один раз. Подстроки
+        собраны в префиксное дерево: в каждой позиции оно находит самую
+        длинную из них, остальные совпавшие там же — ее префиксы.
+        """
+        wanted = {substring for substring in substrings if substring and self.SEPARATOR not in substring}
+        if not wanted:
+            return
+        prefixes = {
+            substring: [substring[:end] for end in range(1, len(substring) + 1) if substring[:end] in wanted]
+            for substring in wanted
+        }
+
+        last_index: dict[str, int] = {}
+        for match in re.finditer(f"(?=({_trie_pattern(wanted)}))", self.text):
+            index = bisect_right(self.starts, match.start()) - 1
+            for substring in prefixes[match.group(1)]:
+                if last_index.get(substring) != index:
+                    last_index[substring] = index
+                    yield substring, index
+
+
 class DocumentSearchEngine:
     """Движок поиска документов"""
 
@@ -128,6 +206,11 @@ class DocumentSearchEngine:
         self.similarity_path = similarity_path
         self.documents = {}
         self.similarity_matrix = {}
+        # Названия и описания всех документов в нижнем регистре, склеенные через
+        # разделитель: поиск подстроки — один проход str.find по всему корпусу
+        self._doc_items = []
+        self._titles = _TextCorpus([])
+        self._excerpts = _TextCorpus([])
         self.load_data()
 
     def load_data(self):
@@ -148,6 +231,10 @@ class DocumentSearchEngine:
             except Exception as e:
                 print(f"Ошибка при загрузке матрицы схожести: {e}")
 
+        self._doc_items = list(self.documents.items())
+        self._titles = _TextCorpus([doc["title"].lower() for _, doc in self._doc_items])
+        self._excerpts = _TextCorpus([doc.get("excerpt", "").lower() for _, doc in self._doc_items])
+
     def search(self, query: str, limit: int = 20) -> list[dict]:
         """
         Простой поиск по документам
@@ -155,35 +242,79 @@ class DocumentSearchEngine:
         В реальной системе здесь должен быть полнотекстовый поиск
         (Elasticsearch, PostgreSQL Full-Text Search, etc.)
         """
+        return list(islice(self.iter_search(query), limit))
+
+    def iter_search(self, query: str) -> Iterator[dict]:
+        """
+        Потоковый поиск: результаты отдаются по мере нахождения
+
+        Релевантность принимает два значения, поэтому порядок по убыванию
+        релевантности получается двумя проходами без накопления списка:
+        сначала совпадения в названии (1.0), затем только в описании (0.5).
+        """
         if not query:
-            return []
+            return
 
         query_lower = query.lower()
-        results = []
 
-        for doc_id, doc in self.documents.items():
-            # Простой поиск по названию и описанию
-            if query_lower in doc["title"].lower() or query_lower in doc.get("excerpt", "").lower():
+        # Первый проход: совпадение в названии
+        title_matches = set()
+        for position in self._titles.find_all(query_lower):
+            title_matches.add(position)
+            doc_id, doc = self._doc_items[position]
+            yield self._make_result(doc_id, doc, 1.0)
 
-                # Вычисление релевантности (упрощенно)
-                relevance = 0.5
-                if query_lower in doc["title"].lower():
-                    relevance += 0.5
-
-                results.append(
-                    {
-                        "id": doc_id,
-                        "title": doc["title"],
-                        "path": doc["path"],
-                        "excerpt": doc.get("excerpt", ""),
-                        "relevance": relevance,
-                    }
-                )
+        # Второй проход: совпадение только в описании
+        for position in self._excerpts.find_all(query_lower):
+            if position not in title_matches:
+                doc_id, doc = self._doc_items[position]
+                yield self._make_result(doc_id, doc, 0.5)
 
-        # Сортировка по релевантности
-        results.sort(key=lambda x: x["relevance"], reverse=True)
+    def search_batch(self, queries: list[str], limit: int = 20) -> dict[str, list[dict]]:
+        """
+        Поиск по списку запросов
 
-        return results[:limit]
+        Результат совпадает с {query: search(query, limit)}, но корпус названий
+        и корпус описаний просматриваются по одному разу для всех запросов
+        (одинаковые без учета регистра запросы считаются одним). Просмотр
+        останавливается, когда каждый запрос набрал limit результатов.
+        """
+        computed: dict[str, list[dict]] = {query.lower(): [] for query in queries}
+        pending = {query for query in computed if query} if limit > 0 else set()
+
+        # Первый проход: совпадения в названии (1.0)
+        title_matches: dict[str, set[int]] = {query: set() for query in pending}
+        for query, position in self._titles.find_many(pending):
+            if query in pending:
+                title_matches[query].add(position)
+                self._collect(computed[query], position, 1.0, limit, pending, query)
+                if not pending:
+                    break
+
+        # Второй проход: совпадения только в описании (0.5) для запросов, не набравших limit
+        for query, position in self._excerpts.find_many(pending):
+            if query in pending and position not in title_matches[query]:
+                self._collect(computed[query], position, 0.5, limit, pending, query)
+                if not pending:
+                    break
+
+        return {query: computed[query.lower()] for query in queries}
+
+    def _collect(self, results: list[dict], position: int, relevance: float, limit: int, pending: set, query: str):
+        doc_id, doc = self._doc_items[position]
+        results.append(self._make_result(doc_id, doc, relevance))
+        if len(results) >= limit:
+            pending.discard(query)
+
+    @staticmethod
+    def _make_result(doc_id: str, doc: dict, relevance: float) -> dict:
+        return {
+            "id": doc_id,
+            "title": doc["title"],
+            "path": doc["path"],
+            "excerpt": doc.get("excerpt", ""),
+            "relevance": relevance,
+        }
 
     def get_similar_documents(self, document_id: str, limit: int = 5) -> list[dict]:
         """Получить похожие документы для конкретного документа"""
@@ -209,45 +340,202 @@ class DocumentSearchEngine:
         return result
 
 
-class SearchHistory:
-    """Управление историей поиска (заглушка для работы без БД)"""
+class _CountBucket:
+    """Узел списка счетчиков: все запросы с одинаковым числом поисков"""
+
+    __slots__ = ("count", "queries", "prev", "next")
+
+    def __init__(self, count: int):
+        self.count = count
+        self.queries: dict[str, None] = {}
+        self.prev: _CountBucket | None = None
+        self.next: _CountBucket | None = None
+
+
+class _QueryCounter:
+    """
+    Счетчик запросов с выдачей top-k за O(k)
+
+    Запросы сгруппированы в корзины по числу поисков, корзины связаны
+    в список по возрастанию счетчика. Изменение на ±1 переносит запрос
+    в соседнюю корзину за O(1), а top-k читается с конца списка.
+    """
 
     def __init__(self):
-        self.history = []
+        self._buckets: dict[str, _CountBucket] = {}
+        self._head: _CountBucket | None = None  # Наименьший счетчик
+        self._tail: _CountBucket | None = None  # Наибольший счетчик
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _link_after(self, bucket: _CountBucket, after: _CountBucket | None):
+        """Вставить корзину после after (None — в начало списка)"""
+        bucket.prev = after
+        bucket.next = after.next if after else self._head
+        if bucket.next:
+            bucket.next.prev = bucket
+        else:
+            self._tail = bucket
+        if after:
+            after.next = bucket
+        else:
+            self._head = bucket
+
+    def _unlink(self, bucket: _CountBucket):
+        if bucket.prev:
+            bucket.prev.next = bucket.next
+        else:
+            self._head = bucket.next
+        if bucket.next:
+            bucket.next.prev = bucket.prev
+        else:
+            self._tail = bucket.prev
+
+    def _position(self, count: int, start: _CountBucket | None) -> _CountBucket | None:
+        """Последняя корзина со счетчиком <= count (поиск от start, обычно на 1 шаг)"""
+        node = start or self._head
+        while node and node.count > count:
+            node = node.prev
+        if node is None:
+            return None
+        while node.next and node.next.count <= count:
+            node = node.next
+        return node
+
+    def add(self, query: str, delta: int = 1):
+        """Изменить счетчик запроса на delta (запрос удаляется при счетчике 0)"""
+        current = self._buckets.pop(query, None)
+        count = (current.count if current else 0) + delta
+
+        if count > 0:
+            after = self._position(count, current)
+            if after and after.count == count:
+                target = after
+            else:
+                target = _CountBucket(count)
+                self._link_after(target, after)
+            target.queries[query] = None
+            self._buckets[query] = target
+
+        if current:
+            del current.queries[query]
+            if not current.queries:
+                self._unlink(current)
+
+    def most_common(self, limit: int) -> list[tuple[str, int]]:
+        """Самые частые запросы (при равенстве — в порядке достижения счетчика)"""
+        result = []
+        bucket = self._tail
+        while bucket and len(result) < limit:
+            for query in bucket.queries:
+                result.append((query, bucket.count))
+                if len(result) >= limit:
+                    break
+            bucket = bucket.prev
+        return result
+
+
+class SearchHistory:
+    """
+    Управление историей поиска (хранилище в памяти для работы без БД)
+
+    - История пользователя — кольцевой буфер на max_per_user записей;
+      пользователи сверх max_users вытесняются по давности обращения
+    - Популярные запросы — счетчик с выдачей top-k за O(k)
+    - Счетчики разбиты по минутам: корзины старше retention_days
+      вычитаются из популярных запросов, так что объем памяти ограничен
+    """
+
+    def __init__(
+        self,
+        max_per_user: int = 200,
+        max_users: int = 10000,
+        retention_days: float = 30,
+        clock=time.time,
+    ):
+        self.max_per_user = max_per_user
+        self.max_users = max_users
+        self.retention_seconds = retention_days * 86400
+        self._clock = clock
+
+        # user_id -> deque[(минута, запись)], порядок OrderedDict — давность обращения
+        self._users: OrderedDict[str, deque] = OrderedDict()
+        self._popular = _QueryCounter()
+        # (минута, Counter запросов) по возрастанию времени
+        self._minutes: deque[tuple[int, Counter]] = deque()
+        self.total_searches = 0
+
+    @property
+    def unique_queries(self) -> int:
+        """Количество различных запросов за период хранения"""
+        return len(self._popular)
+
+    def _expire(self, now: float):
+        """Вычесть из счетчиков минутные корзины старше периода хранения"""
+        oldest_minute = int((now - self.retention_seconds) // 60)
+        while self._minutes and self._minutes[0][0] < oldest_minute:
+            _, counts = self._minutes.popleft()
+            for query, count in counts.items():
+                self._popular.add(query, -count)
+                self.total_searches -= count
 
     def add_search(self, user_id: str, query: str, results_count: int, session_id: str = None):
         """Добавить запись в историю поиска"""
-        from datetime import datetime
-
-        self.history.append(
-            {
-                "user_id": user_id,
-                "query": query,
-                "results_count": results_count,
-                "session_id": session_id,
-                "timestamp": datetime.now().isoformat(),
-            }
-        )
+        now = self._clock()
+        minute = int(now // 60)
+        self._expire(now)
+
+        entry = {
+            "user_id": user_id,
+            "query": query,
+            "results_count": results_count,
+            "session_id": session_id,
+            "timestamp": datetime.fromtimestamp(now).isoformat(),
+        }
+
+        user_entries = self._users.get(user_id)
+        if user_entries is None:
+            user_entries = self._users[user_id] = deque(maxlen=self.max_per_user)
+            if len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(user_id)
+        user_entries.append((minute, entry))
+
+        if not self._minutes or self._minutes[-1][0] != minute:
+            self._minutes.append((minute, Counter()))
+        self._minutes[-1][1][query] += 1
+        self._popular.add(query)
+        self.total_searches += 1
 
     def get_user_history(self, user_id: str, limit: int = 50) -> list[dict]:
-        """Получить историю поиска пользователя"""
-        user_searches = [h for h in self.history if h["user_id"] == user_id]
-        user_searches.sort(key=lambda x: x["timestamp"], reverse=True)
-        return user_searches[:limit]
+        """Получить историю поиска пользователя (новые записи первыми)"""
+        user_entries = self._users.get(user_id)
+        if not user_entries:
+            return []
 
-    def clear_user_history(self, user_id: str):
-        """Очистить историю поиска пользователя"""
-        self.history = [h for h in self.history if h["user_id"] != user_id]
+        oldest_minute = int((self._clock() - self.retention_seconds) // 60)
+        while user_entries and user_entries[0][0] < oldest_minute:
+            user_entries.popleft()
 
-    def get_popular_queries(self, limit: int = 10) -> list[dict]:
-        """Получить популярные поисковые запросы"""
-        from collections import Counter
+        return [entry for _, entry in islice(reversed(user_entries), limit)]
 
-        queries = [h["query"] for h in self.history]
-        counter = Counter(queries)
+    def clear_user_history(self, user_id: str):
+        """Очистить историю поиска пользователя (и ее вклад в популярные запросы)"""
+        user_entries = self._users.pop(user_id, None)
+        if not user_entries:
+            return
 
-        popular = []
-        for query, count in counter.most_common(limit):
-            popular.append({"query": query, "count": count})
+        minutes = {minute: counts for minute, counts in self._minutes}
+        for minute, entry in user_entries:
+            counts = minutes.get(minute)
+            if counts and counts[entry["query"]] > 0:
+                counts[entry["query"]] -= 1
+                self._popular.add(entry["query"], -1)
+                self.total_searches -= 1
 
-        return popular
+    def get_popular_queries(self, limit: int = 10) -> list[dict]:
+        """Получить популярные поисковые запросы"""
+        self._expire(self._clock())
+        return [{"query": query, "count": count} for query, count in self._popular.most_common(limit)]
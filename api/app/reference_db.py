@@ -0,0 +1,202 @@
+"""
+Встраиваемая read-модель справочника: все таблицы в одном файле SQLite.
+
+scripts/build_reference_db.py собирает таблицы schemas/*.yaml и остальные
+CSV справочника (мастер-каталог, аналоги, бренды) в data/reference.db:
+строки хранятся текстом один в один с CSV, колонки обозначений и ключи
+таблиц проиндексированы, по текстовым колонкам построены таблицы FTS5.
+
+Файл открывается только для чтения с отображением в память (mmap), поэтому
+при старте API вместо десятка CSV читается один файл, а соединения таблиц
+ГОСТ/ISO/брендов выполняются запросами по индексам. /reference/search
+ищет обозначение по индексам всех таблиц (find) и текст — по FTS5 (search_all).
+
+Для каждой таблицы в файле записаны размер и время изменения исходного CSV.
+Если CSV изменился после сборки, read_reference_rows возвращает None и
+модуль читает CSV напрямую — устаревший файл не подменяет данные.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+REFERENCE_DB_PATH = os.getenv("REFERENCE_DB", "data/reference.db")
+MMAP_SIZE = 256 * 1024 * 1024
+
+
+def quote_identifier(name: str) -> str:
+    """Имя таблицы/колонки в кавычках SQL (в заголовках CSV есть пробелы и кириллица)"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def fts_query(text: str) -> str:
+    """Запрос MATCH: каждое слово — префикс в кавычках, без операторов FTS5 из ввода пользователя"""
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in text.split())
+
+
+class ReferenceDB:
+    """
+    Read-модель справочника (только чтение)
+
+    Args:
+        path: Файл, собранный scripts/build_reference_db.py
+        mmap_size: Размер отображения файла в память, байт
+    """
+
+    def __init__(self, path: str = REFERENCE_DB_PATH, mmap_size: int = MMAP_SIZE):
+        self.path = os.path.abspath(path)
+        uri = f"file:{self.path}?mode=ro"
+        self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+        self._conn.execute("PRAGMA query_only = 1")
+        # Соединение используется из пулов потоков executors
+        self._lock = threading.Lock()
+
+        meta = dict(self._conn.execute("SELECT key, value FROM _meta").fetchall())
+        self.root = os.path.normpath(os.path.join(os.path.dirname(self.path), meta.get("root", "..")))
+        self.tables: dict[str, dict] = {}
+        self._by_path: dict[str, str] = {}
+        for row in self._conn.execute("SELECT * FROM _tables ORDER BY name"):
+            table = dict(row)
+            table["columns"] = json.loads(table["columns"])
+            table["sql_columns"] = json.loads(table["sql_columns"])
+            table["fts_columns"] = json.loads(table["fts_columns"])
+            table["indexed_columns"] = self._indexed_columns(table["name"])
+            self.tables[table["name"]] = table
+            self._by_path[table["path"]] = table["name"]
+
+    def _indexed_columns(self, name: str) -> list[str]:
+        """Колонки, с которых начинается индекс таблицы (индексы по CAST(...) не учитываются)"""
+        columns = []
+        for index in self._conn.execute(f"PRAGMA index_list({quote_identifier(name)})").fetchall():
+            first = self._conn.execute(f"PRAGMA index_info({quote_identifier(index['name'])})").fetchone()
+            if first is not None and first["name"] and first["name"] not in columns:
+                columns.append(first["name"])
+        return columns
+
+    def close(self):
+        self._conn.close()
+
+    def query(self, sql: str, params: tuple | list = ()) -> list[dict]:
+        """Выполнить запрос, строки — словари"""
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def table_for(self, path: str) -> str | None:
+        """Таблица, собранная из CSV по пути (относительно корня репозитория или абсолютному)"""
+        relative = os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, "/")
+        return self._by_path.get(relative)
+
+    def is_fresh(self, name: str) -> bool:
+        """CSV таблицы не менялся после сборки (или отсутствует — тогда источник только файл БД)"""
+        table = self.tables[name]
+        try:
+            stat = os.stat(os.path.join(self.root, table["path"]))
+        except FileNotFoundError:
+            return True
+        return stat.st_size == table["source_size"] and stat.st_mtime_ns == table["source_mtime_ns"]
+
+    def rows(self, name: str) -> list[dict]:
+        """Все строки таблицы в порядке CSV, как csv.DictReader"""
+        table = self.tables[name]
+        columns = ", ".join(quote_identifier(column) for column in table["sql_columns"])
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {columns} FROM {quote_identifier(name)} ORDER BY rowid").fetchall()
+        return [dict(zip(table["columns"], row)) for row in rows]
+
+    def read_csv(self, path: str) -> list[dict] | None:
+        """Строки CSV из файла БД или None, если таблицы нет или CSV изменился после сборки"""
+        name = self.table_for(path)
+        if name is None or not self.is_fresh(name):
+            return None
+        return self.rows(name)
+
+    def search(self, name: str, text: str, limit: int = 20) -> list[dict]:
+        """
+        Полнотекстовый поиск по текстовым колонкам таблицы (FTS5, префиксы слов)
+
+        Returns:
+            Строки таблицы (ключи — колонки CSV) по убыванию релевантности (bm25)
+        """
+        table = self.tables.get(name)
+        if table is None:
+            raise ValueError(f"Таблица не найдена в read-модели: {name}")
+        if not table["fts_columns"] or not text.strip():
+            return []
+        columns = ", ".join(f"t.{quote_identifier(column)}" for column in table["sql_columns"])
+        fts = quote_identifier(f"{name}_fts")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM {fts} JOIN {quote_identifier(name)} t ON t.rowid = {fts}.rowid "
+                f"WHERE {fts} MATCH ? ORDER BY bm25({fts}) LIMIT ?",
+                (fts_query(text), limit),
+            ).fetchall()
+        return [dict(zip(table["columns"], row)) for row in rows]
+
+    def find(self, code: str, limit: int = 20) -> dict[str, list[dict]]:
+        """
+        Строки с обозначением code в проиндексированных колонках (ключи таблиц, ГОСТ/ISO/бренды)
+
+        Каждая колонка проверяется запросом по ее индексу; значение ищется как
+        передано и в верхнем регистре ("nu205" → "NU205").
+
+        Returns:
+            Таблица -> строки (ключи — колонки CSV); таблицы без совпадений не выводятся
+        """
+        code = code.strip()
+        if not code:
+            return {}
+        values = list(dict.fromkeys([code, code.upper()]))
+        placeholders = ", ".join("?" for _ in values)
+        found = {}
+        with self._lock:
+            for name, table in self.tables.items():
+                columns = ", ".join(quote_identifier(column) for column in table["sql_columns"])
+                rows = {}
+                for column in table["indexed_columns"]:
+                    for row in self._conn.execute(
+                        f"SELECT rowid, {columns} FROM {quote_identifier(name)} "
+                        f"WHERE {quote_identifier(column)} IN ({placeholders}) LIMIT ?",
+                        (*values, limit),
+                    ):
+                        rows.setdefault(row[0], dict(zip(table["columns"], tuple(row)[1:])))
+                if rows:
+                    found[name] = [rows[rowid] for rowid in sorted(rows)][:limit]
+        return found
+
+    def search_all(self, text: str, limit: int = 20) -> dict[str, list[dict]]:
+        """Полнотекстовый поиск по всем таблицам с FTS5: таблица -> строки по убыванию релевантности"""
+        found = {}
+        for name, table in self.tables.items():
+            if table["fts_columns"]:
+                rows = self.search(name, text, limit)
+                if rows:
+                    found[name] = rows
+        return found
+
+
+_default: ReferenceDB | None = None
+_default_loaded = False
+_default_lock = threading.Lock()
+
+
+def default_reference_db() -> ReferenceDB | None:
+    """Read-модель по REFERENCE_DB (по умолчанию data/reference.db), если файл собран"""
+    global _default, _default_loaded
+    with _default_lock:
+        if not _default_loaded:
+            _default_loaded = True
+            if REFERENCE_DB_PATH and os.path.exists(REFERENCE_DB_PATH):
+                try:
+                    _default = ReferenceDB(REFERENCE_DB_PATH)
+                except sqlite3.Error as e:
+                    print(f"Read-модель справочника не открыта ({REFERENCE_DB_PATH}): {e}")
+        return _default
+
+
+def read_reference_rows(path: str) -> list[dict] | None:
+    """Строки CSV из read-модели; None — читать CSV напрямую"""
+    db = default_reference_db()
+    return db.read_csv(path) if db is not None else None
@@ -0,0 +1,104 @@
+"""
+Бенчмарк генерации XLSX для /export/batch.
+
+Сравнивает write-only экспорт (SearchResultsExporter.create_batch_excel)
+с прежней схемой pandas.DataFrame → ExcelWriter(openpyxl) с двумя
+проходами по ячейкам (автоширина и заливка релевантности).
+
+Использование (из корня репозитория):
+    python api/scripts/benchmark_export.py --sheets 50 --rows 1000
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from api.app.export_utils import SearchResultsExporter  # noqa: E402
+
+
+def make_batch(sheets: int, rows: int) -> dict[str, list[dict]]:
+    """Синтетические результаты поиска: sheets запросов по rows строк"""
+    batch = {}
+    for sheet in range(sheets):
+        query = f"{6200 + sheet}"
+        batch[query] = [
+            {
+                "id": f"doc_{sheet}_{row}",
+                "title": f"Подшипник {query}-2RS/C3 вариант {row}",
+                "path": f"Каталоги/{query}/{row}.md",
+                "excerpt": "Радиальный шариковый подшипник с двумя уплотнениями " * 2,
+                "relevance": (1.0, 0.5, 0.3)[row % 3],
+                "similar_documents": [{"id": f"doc_{row}", "title": "Аналог", "similarity": 0.8}],
+            }
+            for row in range(rows)
+        ]
+    return batch
+
+
+def legacy_batch_excel(batch_results: dict[str, list[dict]]) -> io.BytesIO:
+    """Прежняя реализация: DataFrame → ExcelWriter и повторные проходы по ячейкам"""
+    import pandas as pd
+    from openpyxl.styles import PatternFill
+
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+        for query, results in batch_results.items():
+            flat = [
+                {k: json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else v for k, v in r.items()}
+                for r in results
+            ]
+            df = pd.DataFrame(flat)
+            df.to_excel(writer, sheet_name=query[:31], index=False)
+            worksheet = writer.sheets[query[:31]]
+            for column in worksheet.columns:
+                max_length = max(len(str(cell.value)) for cell in column)
+                worksheet.column_dimensions[column[0].column_letter].width = min(max_length + 2, 50)
+            relevance_col = list(df.columns).index("relevance") + 1
+            for row_idx in range(2, len(df) + 2):
+                cell = worksheet.cell(row=row_idx, column=relevance_col)
+                color = "C6EFCE" if cell.value >= 0.8 else "FFEB9C" if cell.value >= 0.5 else "FFC7CE"
+                cell.fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+    output.seek(0)
+    return output
+
+
+def measure(name: str, fn, batch, trace_memory: bool = False) -> None:
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    output = fn(batch)
+    elapsed = time.perf_counter() - started
+    line = f"{name:<12} {elapsed:8.2f} s   file {len(output.getvalue()) / 2**20:6.1f} MiB"
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f"   peak {peak / 2**20:8.1f} MiB"
+    print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark batch XLSX export")
+    parser.add_argument("--sheets", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--memory", action="store_true", help="Замерять пиковую память (tracemalloc замедляет прогон)")
+    parser.add_argument("--skip-legacy", action="store_true", help="Не запускать прежнюю реализацию (pandas)")
+    args = parser.parse_args()
+
+    batch = make_batch(args.sheets, args.rows)
+    print(f"/export/batch: {args.sheets} листов × {args.rows} строк")
+    measure("write-only", SearchResultsExporter.create_batch_excel, batch, args.memory)
+    if not args.skip_legacy:
+        measure("legacy", legacy_batch_excel, batch, args.memory)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
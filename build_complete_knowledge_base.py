@@ -13,9 +13,12 @@ from datetime import datetime
 from typing import Dict, List, Tuple, Set
 from collections import defaultdict
 
+from scripts.corpus import Corpus
+
 class ComprehensiveKnowledgeBaseBuilder:
-    def __init__(self, root_dir: str = "."):
+    def __init__(self, root_dir: str = ".", corpus: Corpus = None):
         self.root_dir = Path(root_dir)
+        self.corpus = corpus or Corpus(self.root_dir)
         self.sections = {
             "terms": defaultdict(list),           # Термины по категориям
             "processes": defaultdict(list),       # Процессы и алгоритмы
@@ -30,11 +33,12 @@ class ComprehensiveKnowledgeBaseBuilder:
         self.file_count = 0
         self.total_lines = 0
         
-    def extract_from_markdown(self, file_path: Path) -> Dict:
-        """Извлечение информации из markdown файла"""
+    def extract_from_markdown(self, file_path: Path, content: str = None) -> Dict:
+        """Извлечение информации из markdown файла (content - уже прочитанное содержимое)"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if content is None:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
                 
             relative_path = file_path.relative_to(self.root_dir)
             self.file_count += 1
@@ -242,10 +246,10 @@ class ComprehensiveKnowledgeBaseBuilder:
             dir_path = self.root_dir / dir_name
             if dir_path.exists():
                 print(f"Scanning {dir_name}...")
-                for md_file in dir_path.rglob('*.md'):
-                    data = self.extract_from_markdown(md_file)
+                for document in self.corpus.iter_documents(dirs=[dir_name]):
+                    data = self.extract_from_markdown(document.path, document.content)
                     if data:
-                        self.categorize_content(data, md_file)
+                        self.categorize_content(data, document.path)
                         self.sections['sources'].append(data['path'])
                         
     def build_knowledge_base(self) -> str:
@@ -11,9 +11,12 @@ from datetime import datetime
 from typing import Dict, List
 from collections import defaultdict
 
+from scripts.corpus import Corpus
+
 class UltraComprehensiveKB:
-    def __init__(self, root_dir: str = "."):
+    def __init__(self, root_dir: str = ".", corpus: Corpus = None):
         self.root_dir = Path(root_dir)
+        self.corpus = corpus or Corpus(self.root_dir)
         self.all_files = {}  # Полное содержимое всех файлов
         self.stats = {
             'files': 0,
@@ -48,18 +51,14 @@ class UltraComprehensiveKB:
             dir_path = self.root_dir / dir_name
             if dir_path.exists():
                 print(f"📁 Загрузка: {dir_name}")
-                for md_file in dir_path.rglob('*.md'):
-                    try:
-                        with open(md_file, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        
-                        rel_path = str(md_file.relative_to(self.root_dir))
-                        self.all_files[rel_path] = content
-                        self.stats['files'] += 1
-                        self.stats['lines'] += len(content.split('\n'))
-                        
-                    except Exception as e:
-                        print(f"  ⚠️  Ошибка {md_file}: {e}")
+                for document in self.corpus.iter_documents(dirs=[dir_name]):
+                    if document.content is None:
+                        print(f"  ⚠️  Ошибка {document.path}: не удалось декодировать UTF-8")
+                        continue
+
+                    self.all_files[document.rel_path] = document.content
+                    self.stats['files'] += 1
+                    self.stats['lines'] += len(document.content.split('\n'))
                         
         print(f"\n✅ Загружено файлов: {self.stats['files']}")
         print(f"✅ Всего строк: {self.stats['lines']:,}\n")
@@ -207,7 +206,7 @@ class UltraComprehensiveKB:
         for dir_name, description in structure_desc:
             dir_path = self.root_dir / dir_name
             if dir_path.exists():
-                file_count = len(list(dir_path.rglob('*.md')))
+                file_count = len(self.corpus.entries(dirs=[dir_name]))
                 lines.append(f"- **{dir_name}** ({file_count} файлов) - {description}")
                 
         lines.append(f"\n### 1.4. Статистика")
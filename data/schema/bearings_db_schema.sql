@@ -2,6 +2,10 @@
 -- Version 1.0
 -- Created: 2026-01-20
 
+-- Unique indexes uq_* define natural keys: scripts/import_bearings_to_db.py
+-- merges data on them (INSERT ... ON CONFLICT), so a re-import updates rows
+-- instead of duplicating them.
+
 -- ======================================================
 -- Table: bearings (Master catalog)
 -- Description: Main bearing catalog with all designations
@@ -32,10 +36,11 @@ CREATE TABLE IF NOT EXISTS bearings (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_bearings_gost ON bearings(gost_designation);
-CREATE INDEX idx_bearings_iso ON bearings(iso_designation);
-CREATE INDEX idx_bearings_type ON bearings(bearing_type);
-CREATE INDEX idx_bearings_dimensions ON bearings(bore_diameter_d, outer_diameter_D, width_B);
+CREATE INDEX IF NOT EXISTS idx_bearings_gost ON bearings(gost_designation);
+CREATE INDEX IF NOT EXISTS idx_bearings_iso ON bearings(iso_designation);
+CREATE INDEX IF NOT EXISTS idx_bearings_type ON bearings(bearing_type);
+CREATE INDEX IF NOT EXISTS idx_bearings_dimensions ON bearings(bore_diameter_d, outer_diameter_D, width_B);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_bearings_iso ON bearings(iso_designation);
 
 -- ======================================================
 -- Table: manufacturers
@@ -56,9 +61,9 @@ CREATE TABLE IF NOT EXISTS manufacturers (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_manufacturers_brand ON manufacturers(brand);
-CREATE INDEX idx_manufacturers_country ON manufacturers(country);
-CREATE INDEX idx_manufacturers_quality ON manufacturers(quality_level);
+CREATE INDEX IF NOT EXISTS idx_manufacturers_brand ON manufacturers(brand);
+CREATE INDEX IF NOT EXISTS idx_manufacturers_country ON manufacturers(country);
+CREATE INDEX IF NOT EXISTS idx_manufacturers_quality ON manufacturers(quality_level);
 
 -- ======================================================
 -- Table: analogs
@@ -80,8 +85,9 @@ CREATE TABLE IF NOT EXISTS analogs (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_analogs_source ON analogs(source_standard, source_designation);
-CREATE INDEX idx_analogs_target ON analogs(target_standard, target_designation);
+CREATE INDEX IF NOT EXISTS idx_analogs_source ON analogs(source_standard, source_designation);
+CREATE INDEX IF NOT EXISTS idx_analogs_target ON analogs(target_standard, target_designation);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_analogs_pair ON analogs(source_standard, source_designation, target_standard, target_designation);
 
 -- ======================================================
 -- Table: additional_designations
@@ -101,8 +107,9 @@ CREATE TABLE IF NOT EXISTS additional_designations (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_additional_gost ON additional_designations(gost_suffix);
-CREATE INDEX idx_additional_iso ON additional_designations(iso_suffix);
+CREATE INDEX IF NOT EXISTS idx_additional_gost ON additional_designations(gost_suffix);
+CREATE INDEX IF NOT EXISTS idx_additional_iso ON additional_designations(iso_suffix);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_additional_suffixes ON additional_designations(gost_suffix, iso_suffix);
 
 -- ======================================================
 -- Table: tolerance_classes
@@ -119,8 +126,9 @@ CREATE TABLE IF NOT EXISTS tolerance_classes (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_tolerance_gost ON tolerance_classes(gost_class);
-CREATE INDEX idx_tolerance_iso ON tolerance_classes(iso_class);
+CREATE INDEX IF NOT EXISTS idx_tolerance_gost ON tolerance_classes(gost_class);
+CREATE INDEX IF NOT EXISTS idx_tolerance_iso ON tolerance_classes(iso_class);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_tolerance_classes ON tolerance_classes(gost_class, iso_class);
 
 -- ======================================================
 -- Table: tn_ved_codes
@@ -136,7 +144,7 @@ CREATE TABLE IF NOT EXISTS tn_ved_codes (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_tn_ved_code ON tn_ved_codes(code);
+CREATE INDEX IF NOT EXISTS idx_tn_ved_code ON tn_ved_codes(code);
 
 -- ======================================================
 -- Table: bearing_units
@@ -154,7 +162,8 @@ CREATE TABLE IF NOT EXISTS bearing_units (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_units_type ON bearing_units(unit_type);
+CREATE INDEX IF NOT EXISTS idx_units_type ON bearing_units(unit_type);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_units_type_series ON bearing_units(unit_type, series);
 
 -- ======================================================
 -- Table: standards
@@ -174,8 +183,27 @@ CREATE TABLE IF NOT EXISTS standards (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX idx_standards_type ON standards(standard_type);
-CREATE INDEX idx_standards_number ON standards(standard_number);
+CREATE INDEX IF NOT EXISTS idx_standards_type ON standards(standard_type);
+CREATE INDEX IF NOT EXISTS idx_standards_number ON standards(standard_number);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_standards_number ON standards(standard_type, standard_number);
+
+-- ======================================================
+-- Tables: import_sources, import_manifest
+-- Description: State of incremental sync (import_bearings_to_db.py --sync)
+-- ======================================================
+
+CREATE TABLE IF NOT EXISTS import_sources (
+    table_name VARCHAR(100) PRIMARY KEY,
+    source_hash VARCHAR(40) NOT NULL,
+    synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS import_manifest (
+    table_name VARCHAR(100) NOT NULL,
+    row_key TEXT NOT NULL,
+    row_hash VARCHAR(40) NOT NULL,
+    PRIMARY KEY (table_name, row_key)
+);
 
 -- ======================================================
 -- Views for common queries
@@ -194,8 +222,8 @@ SELECT
     b.koyo_designation,
     b.bearing_type,
     b.bore_diameter_d AS d,
-    b.outer_diameter_D AS D,
-    b.width_B AS B,
+    b.outer_diameter_D AS "D",
+    b.width_B AS "B",
     b.chamfer_r_min AS r,
     b.weight_kg,
     b.dynamic_load_C_kN,
@@ -291,6 +319,8 @@ COMMENT ON TABLE tolerance_classes IS 'Классы точности ГОСТ/IS
 COMMENT ON TABLE tn_ved_codes IS 'Коды ТН ВЭД для таможенного оформления';
 COMMENT ON TABLE bearing_units IS 'Подшипниковые узлы в корпусах';
 COMMENT ON TABLE standards IS 'Справочник стандартов ГОСТ и ISO';
+COMMENT ON TABLE import_sources IS 'Хеши исходных CSV по таблицам на момент последней синхронизации';
+COMMENT ON TABLE import_manifest IS 'Хеши строк по естественному ключу на момент последней синхронизации';
 
 -- ======================================================
 -- Grant permissions (adjust as needed)
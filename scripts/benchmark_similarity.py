@@ -0,0 +1,93 @@
+"""
+Бенчмарк поиска похожих документов для build_search_index.py.
+
+Сравнивает блочный top-k (scripts/similarity.py) с прежней схемой:
+плотная cosine_similarity N×N и argsort каждой строки. Прежняя схема
+запускается только до --legacy-max документов — дальше матрица N×N
+не помещается в память (20k документов → 3 ГиБ, 100k → ~75 ГиБ float64).
+
+Использование (из корня репозитория):
+    python scripts/benchmark_similarity.py --docs 2000 20000 100000
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.similarity import top_k_similar  # noqa: E402
+
+
+def make_tfidf(n_docs: int, seed: int = 0):
+    """TF-IDF синтетического корпуса: словарь 5000 слов с распределением Ципфа"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"w{i}" for i in range(5000)])
+    lengths = rng.integers(50, 300, size=n_docs)
+    words = np.minimum(rng.zipf(1.3, size=int(lengths.sum())), len(vocabulary)) - 1
+
+    texts = []
+    offset = 0
+    for length in lengths:
+        texts.append(" ".join(vocabulary[words[offset : offset + length]]))
+        offset += length
+
+    vectorizer = TfidfVectorizer(max_features=1000, ngram_range=(1, 2))
+    return vectorizer.fit_transform(texts)
+
+
+def legacy_top_k(matrix, k: int = 5):
+    """Прежняя реализация: плотная матрица N×N и полный argsort строк"""
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    similarity = cosine_similarity(matrix)
+    return np.array([row.argsort()[::-1][1 : k + 1] for row in similarity])
+
+
+def measure(name: str, fn, trace_memory: bool):
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    line = f"  {name:<10} {elapsed:8.2f} s"
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f"   peak {peak / 2**20:8.1f} MiB"
+    print(line)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark top-k document similarity")
+    parser.add_argument("--docs", type=int, nargs="+", default=[2000, 20000, 100000])
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Число процессов (по умолчанию — число ядер, не больше 4)"
+    )
+    parser.add_argument("--legacy-max", type=int, default=10000, help="Максимум документов для прежней реализации")
+    parser.add_argument("--memory", action="store_true", help="Замерять пиковую память (только текущий процесс)")
+    args = parser.parse_args()
+
+    for n_docs in args.docs:
+        matrix = make_tfidf(n_docs)
+        print(f"{n_docs} документов, k={args.k}")
+        indices, _ = measure("top-k", lambda: top_k_similar(matrix, k=args.k, workers=args.workers), args.memory)
+        if n_docs <= args.legacy_max:
+            legacy = measure("legacy", lambda: legacy_top_k(matrix, k=args.k), args.memory)
+            same = np.mean([set(a) == set(b) for a, b in zip(indices, legacy)])
+            print(f"  совпадение соседей: {same:.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,119 +7,344 @@
 - Серий (60, 62, 63 и т.д.)
 """
 
+import csv
+import glob
 import json
 import os
 import re
-from collections import Counter, defaultdict
+import sys
+from collections import Counter, defaultdict, deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.corpus import Corpus, CorpusDocument  # noqa: E402
+
+# Коды подшипников: с префиксом бренда (SKF 6205), простые числовые (6205, 180205)
+# и комбинированные (62RS205). Цифры кода с префиксом через пробел учитываются
+# и как простой код — так же, как при отдельном поиске по каждому виду.
+CODE_PATTERN = r"(?P<prefixed>[A-Z]{2,4}(?P<gap>\s*)(?P<digits>\d{4,7}))|(?P<code>\d{4,7}|\d{1,3}[A-Z]{1,2}\d{2,5})"
+
+# Термином считается целое слово из строчных русских букв длиной от 4 символов
+TERM_WORD_PATTERN = re.compile(r"[а-яё]{4,}")
+
+# Сколько документов передается процессу за раз
+SCAN_BATCH = 32
+
+# Технические термины для подшипников
+TECHNICAL_TERMS = [
+    "подшипник",
+    "подшипники",
+    "подшипниковый",
+    "подшипниковые",
+    "сепаратор",
+    "зазор",
+    "посадка",
+    "преднатяг",
+    "шариковый",
+    "роликовый",
+    "игольчатый",
+    "конический",
+    "радиальный",
+    "упорный",
+    "упорно-радиальный",
+    "уплотнение",
+    "уплотнения",
+    "уплотнительный",
+    "втулка",
+    "втулки",
+    "вал",
+    "корпус",
+    "нагрузка",
+    "скорость",
+    "температура",
+    "смазка",
+    "монтаж",
+    "демонтаж",
+    "ресурс",
+    "износ",
+    "качение",
+    "скольжение",
+    "трение",
+    "серия",
+    "стандарт",
+    "гост",
+    "iso",
+    "диаметр",
+    "ширина",
+    "высота",
+    "размер",
+    "аналог",
+    "взаимозаменяемость",
+    "замена",
+    "каталог",
+    "маркировка",
+    "обозначение",
+]
+
+# Известные бренды подшипников (дополняются брендами из data/brands/*.csv)
+KNOWN_BRANDS = {
+    "SKF",
+    "FAG",
+    "NSK",
+    "NTN",
+    "TIMKEN",
+    "INA",
+    "KOYO",
+    "NACHI",
+    "THK",
+    "SNR",
+    "RHP",
+    "ZVL",
+    "URB",
+    "GPZ",
+    "UBC",
+    "APTM",
+    "HEIM",
+}
+
+
+# Слова в конце названия, которые обозначают регион или форму компании, а не бренд
+BRAND_SUFFIXES = {
+    "EUROPE",
+    "ASIA",
+    "AMERICA",
+    "USA",
+    "CHINA",
+    "JAPAN",
+    "GROUP",
+    "COMPANY",
+    "CORPORATION",
+    "CORP",
+    "LTD",
+    "LLC",
+    "INC",
+    "GMBH",
+    "AG",
+    "CO",
+}
+
+# Бренды короче этого ищутся с учетом регистра: "CU" не должен совпадать со словом "cu" (медь)
+MIN_CASELESS_BRAND = 3
+
+
+def canonical_brand(name: str) -> str:
+    """
+    Единое написание бренда: верхний регистр без региона и формы компании
+
+    "Timken" и "TIMKEN" дают TIMKEN, "NSK Europe" — NSK, "SKF Group" — SKF.
+    """
+    words = name.upper().split()
+    while len(words) > 1 and words[-1].strip(".,") in BRAND_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def _char_pattern(char: str) -> str:
+    upper, lower = char.upper(), char.lower()
+    if upper == lower or len(upper) != 1 or len(lower) != 1:
+        return re.escape(char)
+    return f"[{re.escape(lower)}{re.escape(upper)}]"
+
+
+def trie_pattern(words: Iterable[str], ignore_case: bool = True) -> str:
+    """
+    Регулярное выражение-префиксное дерево для набора слов (по умолчанию без учета регистра)
+
+    Альтернатива вида "NTN|NSK|NACHI" проверяет каждое слово в каждой
+    позиции текста; дерево "N(?:ACHI|SK|TN)" проходит общий префикс один
+    раз, поэтому стоимость поиска почти не зависит от числа слов (как у
+    автомата Ахо-Корасик, но внутри движка re). Регистр задается классами
+    символов ([sS]) — флаг IGNORECASE заметно медленнее на кириллице.
+    Ветви жадные — при совпадении нескольких слов выбирается самое длинное.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word.lower() if ignore_case else word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    char_pattern = _char_pattern if ignore_case else re.escape
+
+    def emit(node: dict) -> str:
+        branches = [char_pattern(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return emit(trie)
+
+
+def load_brands(brands_dir: str) -> set[str]:
+    """
+    Бренды из CSV справочников (колонки brand/Brand/Brands) в едином написании (canonical_brand)
+
+    "FAG/INA (Schaeffler)" дает FAG и INA, "SKF, FAG" — оба бренда.
+    """
+    brands = set()
+    for path in sorted(glob.glob(os.path.join(brands_dir, "*.csv"))):
+        with open(path, encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f)
+            columns = [name for name in reader.fieldnames or [] if name.lower() in ("brand", "brands")]
+            for row in reader:
+                for column in columns:
+                    value = re.sub(r"\(.*?\)", "", row[column] or "")
+                    brands.update(canonical_brand(name) for name in re.split(r"[,/]", value) if name.strip())
+    return brands
+
+
+class EntityMatcher:
+    """
+    Однопроходный поиск терминов, кодов подшипников и брендов
+
+    Все виды сущностей собраны в одно регулярное выражение, поэтому
+    документ просматривается один раз. Бренд проверяется опережающей
+    проверкой в той же позиции, что и код: "SKF 6205" дает и бренд SKF,
+    и код "SKF 6205". Бренды приводятся к canonical_brand и считаются под
+    этим написанием; короткие (меньше MIN_CASELESS_BRAND символов) ищутся
+    с учетом регистра.
+    """
+
+    def __init__(self, brands: Iterable[str], terms: Iterable[str] = TECHNICAL_TERMS):
+        brands = {canonical_brand(brand) for brand in brands}
+        caseless = {brand for brand in brands if len(brand) >= MIN_CASELESS_BRAND}
+        # Длинные бренды первыми: при совпадении нескольких выбирается самый длинный
+        brand_pattern = (
+            "|".join(
+                pattern
+                for pattern in (trie_pattern(caseless), trie_pattern(brands - caseless, ignore_case=False))
+                if pattern
+            )
+            or "(?!)"
+        )
+        # Термины, которые не могут быть целым словом из русских букв, в тексте не встречаются
+        terms = {term for term in terms if TERM_WORD_PATTERN.fullmatch(term)}
+        # Быстрый отсев позиций, с которых не начинается ни одна сущность
+        first = {char for word in brands | terms for char in (word[0].lower(), word[0].upper())}
+        guard = r"[\dA-Z" + "".join(re.escape(char) for char in sorted(first)) + "]"
+        # Пустой набор дал бы пустой шаблон, совпадающий в каждой позиции
+        term_pattern = trie_pattern(terms) or "(?!)"
+        self.pattern = re.compile(
+            rf"(?={guard})\b(?:(?=(?P<brand>{brand_pattern})\b))?"
+            rf"(?:(?:{CODE_PATTERN}|(?P<term>{term_pattern}))\b|(?(brand)(?P=brand)|(?!)))"
+        )
+
+    def count(self, content: str, terms: Counter, codes: Counter, brands: Counter):
+        """Добавить в счетчики сущности из текста"""
+        for match in self.pattern.finditer(content):
+            brand, prefixed, code, term = match.group("brand", "prefixed", "code", "term")
+            if brand:
+                brands[brand.upper()] += 1
+            if prefixed:
+                codes[prefixed] += 1
+                if match.group("gap"):
+                    codes[match.group("digits")] += 1
+            elif code:
+                codes[code] += 1
+            elif term:
+                terms[term.lower()] += 1
+
+
+_worker_matcher: EntityMatcher | None = None
+
+
+def _init_worker(matcher: EntityMatcher):
+    global _worker_matcher
+    _worker_matcher = matcher
+
+
+def _count_batch(contents: list[str]) -> tuple[Counter, Counter, Counter]:
+    terms, codes, brands = Counter(), Counter(), Counter()
+    for content in contents:
+        _worker_matcher.count(content, terms, codes, brands)
+    return terms, codes, brands
+
+
+def _batches(documents: Iterable[CorpusDocument], size: int) -> Iterator[list[str]]:
+    batch = []
+    for document in documents:
+        if document.content is None:
+            continue
+        batch.append(document.content)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
 
 class AutocompleteDictBuilder:
     """Построитель словаря автодополнения"""
 
-    def __init__(self, repo_root: str = None):
-        self.repo_root = repo_root or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    def __init__(self, repo_root: str = None, corpus: Corpus = None, workers: int | None = None):
+        self.repo_root = repo_root or REPO_ROOT
+        self.corpus = corpus or Corpus(self.repo_root)
+        self.workers = workers or os.cpu_count() or 1
+        self._scanned = False
         self.terms = Counter()
         self.bearing_codes = Counter()
         self.brands = Counter()
         self.series = Counter()
 
-        # Известные бренды подшипников
-        self.known_brands = {
-            "SKF",
-            "FAG",
-            "NSK",
-            "NTN",
-            "TIMKEN",
-            "INA",
-            "KOYO",
-            "NACHI",
-            "THK",
-            "SNR",
-            "RHP",
-            "ZVL",
-            "URB",
-            "GPZ",
-            "UBC",
-            "APTM",
-            "HEIM",
-        }
+        # Известные бренды подшипников (в едином написании, без дублей по регистру)
+        self.known_brands = {canonical_brand(brand) for brand in KNOWN_BRANDS} | load_brands(
+            os.path.join(self.repo_root, "data", "brands")
+        )
+        self.matcher = EntityMatcher(self.known_brands)
+
+    def add_document(self, document: CorpusDocument):
+        """Учесть термины, коды подшипников и бренды одного документа"""
+        if document.content is not None:
+            self.matcher.count(document.content, self.terms, self.bearing_codes, self.brands)
+
+    def _merge(self, counts: tuple[Counter, Counter, Counter]):
+        terms, codes, brands = counts
+        self.terms.update(terms)
+        self.bearing_codes.update(codes)
+        self.brands.update(brands)
+
+    def scan_documents(self, documents: Iterable[CorpusDocument] = None):
+        """
+        Один проход по документам для терминов, кодов и брендов
+
+        По умолчанию документы берутся из корпуса; повторный вызов ничего не делает.
+        Документы пачками по SCAN_BATCH распределяются по процессам; в работе
+        держится не больше двух пачек на процесс, чтобы не читать корпус в память целиком.
+        """
+        if self._scanned:
+            return
+        self._scanned = True
+
+        print("Сканирование документов...")
+        documents = documents if documents is not None else self.corpus.iter_documents()
+        if self.workers <= 1:
+            for document in documents:
+                self.add_document(document)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.matcher,)) as pool:
+            pending = deque()
+            for batch in _batches(documents, SCAN_BATCH):
+                pending.append(pool.submit(_count_batch, batch))
+                if len(pending) >= 2 * self.workers:
+                    self._merge(pending.popleft().result())
+            while pending:
+                self._merge(pending.popleft().result())
 
     def extract_terms_from_documents(self) -> dict[str, int]:
         """Извлечь термины из всех документов"""
         print("Извлечение терминов из документов...")
 
-        # Технические термины для подшипников
-        technical_terms = [
-            "подшипник",
-            "подшипники",
-            "подшипниковый",
-            "подшипниковые",
-            "сепаратор",
-            "зазор",
-            "посадка",
-            "преднатяг",
-            "шариковый",
-            "роликовый",
-            "игольчатый",
-            "конический",
-            "радиальный",
-            "упорный",
-            "упорно-радиальный",
-            "уплотнение",
-            "уплотнения",
-            "уплотнительный",
-            "втулка",
-            "втулки",
-            "вал",
-            "корпус",
-            "нагрузка",
-            "скорость",
-            "температура",
-            "смазка",
-            "монтаж",
-            "демонтаж",
-            "ресурс",
-            "износ",
-            "качение",
-            "скольжение",
-            "трение",
-            "серия",
-            "стандарт",
-            "гост",
-            "iso",
-            "диаметр",
-            "ширина",
-            "высота",
-            "размер",
-            "аналог",
-            "взаимозаменяемость",
-            "замена",
-            "каталог",
-            "маркировка",
-            "обозначение",
-        ]
-
-        for term in technical_terms:
+        for term in TECHNICAL_TERMS:
             self.terms[term] += 100  # Базовый приоритет
 
-        # Сканирование документов
-        for root, dirs, files in os.walk(self.repo_root):
-            # Пропускаем служебные директории
-            dirs[:] = [d for d in dirs if not d.startswith(".") and d not in ["node_modules", "__pycache__"]]
-
-            for file in files:
-                if file.endswith(".md"):
-                    file_path = os.path.join(root, file)
-                    try:
-                        with open(file_path, encoding="utf-8") as f:
-                            content = f.read().lower()
-                            # Извлекаем слова
-                            words = re.findall(r"\b[а-яё]{4,}\b", content)
-                            for word in words:
-                                if word in technical_terms:
-                                    self.terms[word] += 1
-                    except Exception as e:
-                        print(f"Ошибка при чтении {file_path}: {e}")
+        self.scan_documents()
 
         return dict(self.terms)
 
@@ -127,32 +352,7 @@ class AutocompleteDictBuilder:
         """Извлечь коды подшипников из базы данных и документов"""
         print("Извлечение кодов подшипников...")
 
-        # Паттерны для распознавания кодов подшипников
-        patterns = [
-            r"\b\d{4,7}\b",  # Простые числовые коды: 6205, 180205
-            r"\b[A-Z]{2,4}\s*\d{4,7}\b",  # С префиксом бренда: SKF 6205
-            r"\b\d{1,3}[A-Z]{1,2}\d{2,5}\b",  # Комбинированные: 62RS205
-        ]
-
-        for root, dirs, files in os.walk(self.repo_root):
-            dirs[:] = [d for d in dirs if not d.startswith(".") and d not in ["node_modules", "__pycache__"]]
-
-            for file in files:
-                if file.endswith(".md"):
-                    file_path = os.path.join(root, file)
-                    try:
-                        with open(file_path, encoding="utf-8") as f:
-                            content = f.read()
-                            # Ищем коды подшипников
-                            for pattern in patterns:
-                                matches = re.findall(pattern, content)
-                                for match in matches:
-                                    # Фильтруем слишком общие числа
-                                    if len(match) >= 4 and not match.isspace():
-                                        self.bearing_codes[match] += 1
-                    except Exception as e:
-                        # Пропускаем файлы с ошибками чтения
-                        print(f"Ошибка при чтении {file_path}: {e}")
+        self.scan_documents()
 
         # Добавляем популярные серии подшипников
         common_series = [
@@ -211,28 +411,11 @@ class AutocompleteDictBuilder:
         """Извлечь бренды из документов"""
         print("Извлечение брендов...")
 
+        # Бренды считаются под тем же написанием, что и упоминания в документах
         for brand in self.known_brands:
             self.brands[brand] += 100  # Базовый приоритет
-            self.brands[brand.lower()] += 50
-
-        # Сканирование для подсчета упоминаний
-        for root, dirs, files in os.walk(self.repo_root):
-            dirs[:] = [d for d in dirs if not d.startswith(".") and d not in ["node_modules", "__pycache__"]]
-
-            for file in files:
-                if file.endswith(".md"):
-                    file_path = os.path.join(root, file)
-                    try:
-                        with open(file_path, encoding="utf-8") as f:
-                            content = f.read()
-                            for brand in self.known_brands:
-                                # Подсчет упоминаний бренда
-                                count = len(re.findall(r"\b" + re.escape(brand) + r"\b", content, re.IGNORECASE))
-                                if count > 0:
-                                    self.brands[brand] += count
-                    except Exception:
-                        # Пропускаем файлы с ошибками чтения
-                        continue
+
+        self.scan_documents()
 
         return dict(self.brands)
 
@@ -258,7 +441,7 @@ class AutocompleteDictBuilder:
         for term, freq in self.terms.items():
             for i in range(1, len(term) + 1):
                 prefix = term[:i].lower()
-                if term not in [t["value"] for t in index[prefix]]:
+                if term not in index[prefix]:
                     index[prefix].append(term)
 
         # Индексируем коды подшипников
@@ -341,8 +524,11 @@ class AutocompleteDictBuilder:
 
         # Сохраняем
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
+        # Пишем во временный файл и атомарно подменяем, чтобы API не подхватил недописанный индекс
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(result, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, output_path)
 
         print(f"Словарь сохранен в {output_path}")
         print(f"Всего терминов: {len(all_terms)}")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Построение всех индексов API за один проход по репозиторию:
+- словарь автодополнения (data/autocomplete_dict.json)
+- индекс документов и матрица схожести (data/document_index.json, data/similarity_matrix.json)
+
+Каждый .md файл читается один раз: документы корпуса передаются обоим
+построителям по мере чтения.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.build_autocomplete_dict import AutocompleteDictBuilder  # noqa: E402
+from scripts.build_search_index import SearchIndexBuilder  # noqa: E402
+from scripts.corpus import Corpus  # noqa: E402
+
+
+def build_indexes(repo_root: str = REPO_ROOT, data_dir: str = None, full: bool = False) -> Corpus:
+    """Построить словарь автодополнения и поисковый индекс"""
+    data_dir = data_dir or os.path.join(repo_root, "data")
+    corpus = Corpus(repo_root)
+    autocomplete = AutocompleteDictBuilder(repo_root, corpus=corpus)
+    search = SearchIndexBuilder(repo_root, data_dir=data_dir, corpus=corpus)
+
+    def documents():
+        for document in corpus.iter_documents():
+            search.add_document(document)
+            yield document
+
+    started = time.perf_counter()
+    autocomplete.scan_documents(documents())
+    search.finish_extraction()
+    print(f"Прочитано файлов: {corpus.reads} за {time.perf_counter() - started:.1f} с")
+
+    autocomplete.extract_terms_from_documents()
+    autocomplete.extract_bearing_codes()
+    autocomplete.extract_brands()
+    autocomplete.extract_series()
+    autocomplete.save_autocomplete_dict(os.path.join(data_dir, "autocomplete_dict.json"))
+
+    search.compute_document_similarity(full=full)
+    search.save_similarity_matrix(os.path.join(data_dir, "similarity_matrix.json"))
+    search.save_document_index(os.path.join(data_dir, "document_index.json"))
+    search.save_manifest()
+    return corpus
+
+
+def main():
+    """Основная функция"""
+    parser = argparse.ArgumentParser(description="Построение индексов API")
+    parser.add_argument("--full", action="store_true", help="Пересобрать поисковый индекс целиком")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Построение индексов API")
+    print("=" * 60)
+
+    build_indexes(full=args.full)
+
+    print("=" * 60)
+    print("Готово!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,13 +9,19 @@ Knowledge Base Builder (MAX CONTEXT MODE)
 """
 
 import json
-import os
 import re
+import sys
 from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.corpus import Corpus  # noqa: E402
+
 
 class KnowledgeBaseBuilder:
     """
@@ -202,10 +208,11 @@ class KnowledgeBaseBuilder:
 
         return structures
 
-    def analyze_file(self, file_path: Path) -> dict[str, Any]:
-        """Анализирует отдельный файл."""
+    def analyze_file(self, file_path: Path, content: str | None = None) -> dict[str, Any]:
+        """Анализирует отдельный файл (content — уже прочитанное содержимое)."""
         file_type = self.get_file_type(file_path)
-        content = self.read_file_content(file_path)
+        if content is None:
+            content = self.read_file_content(file_path)
 
         # Относительный путь от корня репозитория
         rel_path = file_path.relative_to(self.repo_path)
@@ -304,24 +311,29 @@ class KnowledgeBaseBuilder:
         """Сканирует весь репозиторий."""
         print("🔍 Сканирование репозитория...")
 
-        for root, dirs, files in os.walk(self.repo_path):
-            # Фильтрация директорий
-            dirs[:] = [d for d in dirs if d not in self.exclude_dirs]
-
-            root_path = Path(root)
-
-            for file in files:
-                file_path = root_path / file
-
-                if self.should_process_file(file_path):
-                    try:
-                        file_info = self.analyze_file(file_path)
-                        self.file_inventory.append(file_info)
+        # Один обход дерева, файлы читаются пулом потоков
+        corpus = Corpus(
+            self.repo_path,
+            suffixes=None,
+            exclude_dirs=self.exclude_dirs,
+            skip_hidden=False,
+            encodings=("utf-8", "cp1251"),
+            cache_bytes=0,
+        )
+        entries = [entry for entry in corpus.entries() if self.should_process_file(entry.path)]
 
-                        if len(self.file_inventory) % 100 == 0:
-                            print(f"   Обработано файлов: {len(self.file_inventory)}")
-                    except Exception as e:
-                        print(f"   ⚠️ Ошибка при обработке {file_path}: {e}")
+        for document in corpus.iter_documents(entries=entries):
+            try:
+                content = document.content
+                if content is None:
+                    content = f"[[BINARY FILE: {document.stamp[1]} bytes]]"
+                file_info = self.analyze_file(document.path, content)
+                self.file_inventory.append(file_info)
+
+                if len(self.file_inventory) % 100 == 0:
+                    print(f"   Обработано файлов: {len(self.file_inventory)}")
+            except Exception as e:
+                print(f"   ⚠️ Ошибка при обработке {document.path}: {e}")
 
         print(f"✅ Всего обработано файлов: {len(self.file_inventory)}")
 
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Сборка read-модели справочника: все таблицы в одном файле SQLite.
+
+Таблицы schemas/*.yaml и остальные CSV справочника (EXTRA_TABLES)
+записываются в data/reference.db:
+- строки хранятся текстом без изменений (чтение совпадает с csv.DictReader);
+  имена колонок в SQLite не различают регистр, поэтому вторая из колонок
+  d и D называется D_2 (соответствие — в _tables.sql_columns);
+- ключ таблицы (unique из схемы) и колонки обозначений/брендов
+  проиндексированы, числовые колонки — индексом по CAST(... AS REAL);
+- по строковым колонкам построена таблица FTS5 <таблица>_fts
+  (external content, токенизатор unicode61);
+- в _tables записаны путь, колонки и размер/время изменения исходного CSV.
+
+Файл собирается во временный и заменяет прежний атомарно, поэтому
+запущенный API продолжает читать старую версию до переоткрытия.
+Читает файл api/app/reference_db.py (режим только чтения, mmap).
+
+Использование (из корня репозитория):
+    python scripts/build_reference_db.py [--output data/reference.db] [--schemas schemas]
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.validate.schema import TableSchema, load_schemas  # noqa: E402
+
+SCHEMA_DIR = REPO_ROOT / "schemas"
+OUTPUT_PATH = REPO_ROOT / "data" / "reference.db"
+
+# CSV справочника вне schemas/*.yaml: типы колонок определяются по данным
+EXTRA_TABLES = [
+    ("master_catalog", "data/csv/master_catalog.csv", ["GOST", "ISO"]),
+    ("bearing_units", "data/csv/bearing_units.csv", ["Unit_Type", "Series"]),
+    ("tn_ved_codes", "data/csv/tn_ved_codes.csv", ["Code"]),
+    ("tolerance_classes", "data/csv/tolerance_classes.csv", ["GOST", "ISO"]),
+    ("bearing_dimensions", "data/dimensions/bearing_dimensions.csv", ["Designation"]),
+    ("analogs_import", "data/analogs/import_analogs.csv", ["GOST", "ISO"]),
+    ("analogs_gost_to_iso", "data/analogs/gost_to_iso.csv", ["GOST", "ISO"]),
+    ("analogs_iso_to_gost", "data/analogs/iso_to_gost.csv", ["ISO", "GOST"]),
+    ("analogs_additional_designations", "data/analogs/additional_designations.csv", ["GOST_Suffix", "ISO_Suffix"]),
+    ("brand_comparison", "data/brands/brand_comparison.csv", ["Quality_Level"]),
+    ("manufacturers_asia", "data/brands/manufacturers_asia.csv", ["Brand"]),
+    ("manufacturers_china", "data/brands/manufacturers_china.csv", ["Brand"]),
+    ("manufacturers_cis", "data/brands/manufacturers_cis.csv", ["Brand"]),
+    ("manufacturers_europe", "data/brands/manufacturers_europe.csv", ["Brand"]),
+]
+
+# Колонки соединений между таблицами ГОСТ/ISO/брендов (без учета регистра имени)
+JOIN_COLUMNS = {"designation", "gost", "iso", "code", "brand", "skf", "fag", "nsk", "ntn", "koyo"}
+
+SCHEMA_VERSION = "1"
+
+
+def _is_number(value: str) -> bool:
+    try:
+        float(value.replace(",", "."))
+    except ValueError:
+        return False
+    return True
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def sql_columns(header: list[str]) -> list[str]:
+    """Имена колонок SQLite: имена без учета регистра, поэтому d и D различаются суффиксом (D_2)"""
+    names, seen = [], set()
+    for column in header:
+        name, n = column, 1
+        while name.lower() in seen:
+            n += 1
+            name = f"{column}_{n}"
+        seen.add(name.lower())
+        names.append(name)
+    return names
+
+
+def read_csv(path: Path) -> tuple[list[str], list[dict]]:
+    """Заголовок и строки CSV (строки — как у csv.DictReader, лишние поля отбрасываются)"""
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+        return list(reader.fieldnames or []), rows
+
+
+def column_types(header: list[str], rows: list[dict], declared: dict[str, str]) -> dict[str, str]:
+    """Типы колонок: из схемы, иначе "number", если все непустые значения — числа"""
+    types = {}
+    for column in header:
+        if column in declared:
+            types[column] = declared[column]
+            continue
+        values = [row[column] for row in rows if row.get(column)]
+        types[column] = "number" if values and all(_is_number(value) for value in values) else "string"
+    return types
+
+
+def table_sources(schema_dir: Path = SCHEMA_DIR, extra_tables=EXTRA_TABLES) -> list[TableSchema]:
+    """Таблицы read-модели: схемы из schema_dir и дополнительные CSV (без повторов путей)"""
+    tables = load_schemas(schema_dir)
+    paths = {table.path.as_posix() for table in tables}
+    for name, path, unique in extra_tables:
+        if path not in paths:
+            tables.append(TableSchema(name=name, path=Path(path), columns={}, unique=unique, sort_by=[]))
+            paths.add(path)
+    return tables
+
+
+def create_table(conn: sqlite3.Connection, table: TableSchema, header: list[str], names: list[str]) -> list[str]:
+    """Создать таблицу, индексы и FTS5; возвращает колонки (имена SQLite) полнотекстового поиска"""
+    name = quote_identifier(table.name)
+    conn.execute(f"CREATE TABLE {name} ({', '.join(f'{quote_identifier(column)} TEXT' for column in names)})")
+
+    sql_name = dict(zip(header, names))
+    indexed = set()
+    key = [sql_name[column] for column in table.unique if column in sql_name]
+    if key:
+        columns = ", ".join(quote_identifier(column) for column in key)
+        conn.execute(f"CREATE INDEX {quote_identifier(f'idx_{table.name}_key')} ON {name} ({columns})")
+        indexed.add(key[0])
+    for column, column_name in sql_name.items():
+        if column.lower() in JOIN_COLUMNS and column_name not in indexed:
+            index = quote_identifier(f"idx_{table.name}_{column_name}")
+            conn.execute(f"CREATE INDEX {index} ON {name} ({quote_identifier(column_name)})")
+        elif table.columns.get(column) == "number":
+            index = quote_identifier(f"idx_{table.name}_{column_name}_num")
+            conn.execute(f"CREATE INDEX {index} ON {name} (CAST({quote_identifier(column_name)} AS REAL))")
+
+    fts_columns = [sql_name[column] for column in header if table.columns.get(column, "string") == "string"]
+    if fts_columns:
+        conn.execute(
+            f"CREATE VIRTUAL TABLE {quote_identifier(f'{table.name}_fts')} USING fts5("
+            f"{', '.join(quote_identifier(column) for column in fts_columns)}, "
+            f"content={quote_identifier(table.name)}, content_rowid='rowid', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+    return fts_columns
+
+
+def load_table(conn: sqlite3.Connection, table: TableSchema, source: Path) -> int:
+    """Загрузить CSV в таблицу read-модели и записать ее в _tables"""
+    data = source.read_bytes()
+    header, rows = read_csv(source)
+    names = sql_columns(header)
+    table = replace(table, columns=column_types(header, rows, table.columns))
+    fts_columns = create_table(conn, table, header, names)
+
+    placeholders = ", ".join("?" for _ in header)
+    conn.executemany(
+        f"INSERT INTO {quote_identifier(table.name)} VALUES ({placeholders})",
+        ([row.get(column) for column in header] for row in rows),
+    )
+    if fts_columns:
+        fts = quote_identifier(f"{table.name}_fts")
+        conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    stat = source.stat()
+    conn.execute(
+        "INSERT INTO _tables VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            table.name,
+            table.path.as_posix(),
+            json.dumps(header, ensure_ascii=False),
+            json.dumps(names, ensure_ascii=False),
+            json.dumps(fts_columns, ensure_ascii=False),
+            len(rows),
+            stat.st_size,
+            stat.st_mtime_ns,
+            hashlib.sha256(data).hexdigest(),
+        ),
+    )
+    return len(rows)
+
+
+def build_reference_db(
+    output: Path = OUTPUT_PATH, schema_dir: Path = SCHEMA_DIR, root: Path = REPO_ROOT, extra_tables=EXTRA_TABLES
+) -> dict[str, int]:
+    """
+    Собрать read-модель
+
+    Args:
+        output: Файл SQLite
+        schema_dir: Каталог схем schemas/*.yaml
+        root: Корень, от которого отсчитываются пути таблиц
+        extra_tables: Дополнительные CSV (имя, путь, ключ)
+
+    Returns:
+        Количество строк по таблицам
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(output.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    counts = {}
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("CREATE TABLE _meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute(
+            "CREATE TABLE _tables (name TEXT PRIMARY KEY, path TEXT UNIQUE, columns TEXT, sql_columns TEXT, "
+            "fts_columns TEXT, row_count INTEGER, source_size INTEGER, source_mtime_ns INTEGER, source_hash TEXT)"
+        )
+        conn.executemany(
+            "INSERT INTO _meta VALUES (?, ?)",
+            [
+                ("version", SCHEMA_VERSION),
+                ("root", os.path.relpath(root, output.parent)),
+                ("built_at", time.strftime("%Y-%m-%dT%H:%M:%S")),
+            ],
+        )
+        for table in table_sources(schema_dir, extra_tables):
+            source = root / table.path
+            if not source.exists():
+                print(f"Пропущена таблица {table.name}: нет файла {table.path}")
+                continue
+            counts[table.name] = load_table(conn, table, source)
+        conn.commit()
+        conn.execute("ANALYZE")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, output)
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build the SQLite read model of the reference tables")
+    parser.add_argument("--output", default=str(OUTPUT_PATH), help="Файл SQLite")
+    parser.add_argument("--schemas", default=str(SCHEMA_DIR), help="Каталог схем")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = build_reference_db(Path(args.output), Path(args.schemas))
+    for name, count in counts.items():
+        print(f"  {name}: {count}")
+    print(
+        f"Собрано таблиц: {len(counts)}, строк: {sum(counts.values())} "
+        f"за {time.perf_counter() - started:.2f} с → {args.output}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
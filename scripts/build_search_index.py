@@ -1,73 +1,195 @@
 #!/usr/bin/env python3
 """
 Построение поискового индекса и вычисление схожести документов
+
+Сборка инкрементальная: идентификатор документа выводится из пути, а
+в манифесте (data/search_index_manifest.json) хранятся хеши содержимого,
+словарь и IDF последней полной сборки. При повторном запуске читаются
+только файлы с новой отметкой (mtime, размер), а TF-IDF и соседи
+пересчитываются только для изменившихся документов. Полная сборка
+выполняется при первом запуске, с флагом --full или когда изменилось
+больше INCREMENTAL_MAX_CHANGED документов (словарь и IDF устаревают).
 """
 
+import argparse
+import hashlib
 import json
 import os
 import re
+import sys
+from pathlib import Path
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.corpus import Corpus, CorpusDocument, CorpusEntry  # noqa: E402
+
+MANIFEST_VERSION = 1
+
+# Доля изменившихся документов, начиная с которой индекс строится заново
+INCREMENTAL_MAX_CHANGED = 0.25
+
+# Каталоги (на любой глубине) и файлы, не попадающие в поисковый индекс
+EXCLUDED_DIRS = {"api", "scripts", "data"}
+EXCLUDED_FILES = {"README.md"}
+
+# Порог схожести для списка похожих документов
+MIN_SIMILARITY = 0.1
+
+VECTORIZER_PARAMS = {
+    "max_features": 1000,
+    "stop_words": None,  # Для русского языка нужен отдельный список стоп-слов
+    "ngram_range": (1, 2),
+}
+
+
+def document_id(rel_path: str) -> str:
+    """Стабильный идентификатор документа по относительному пути"""
+    return "doc_" + hashlib.sha1(rel_path.replace(os.sep, "/").encode("utf-8")).hexdigest()[:12]
 
 
 class SearchIndexBuilder:
     """Построитель поискового индекса"""
 
-    def __init__(self, repo_root: str = None):
-        self.repo_root = repo_root or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    def __init__(
+        self, repo_root: str = None, top_k: int = 5, workers: int = None, data_dir: str = None, corpus: Corpus = None
+    ):
+        self.repo_root = repo_root or REPO_ROOT
+        self.corpus = corpus or Corpus(self.repo_root)
+        self.data_dir = data_dir or os.path.join(self.repo_root, "data")
+        self.top_k = top_k
+        self.workers = workers
         self.documents = {}
         self.similarity_matrix = {}
 
+        self.manifest_path = os.path.join(self.data_dir, "search_index_manifest.json")
+        self.vectors_path = os.path.join(self.data_dir, "search_index_vectors.npz")
+        self.manifest = self._load_manifest()
+        self.changed_ids: set[str] = set()
+        self.removed_ids: set[str] = set()
+        # (порядок строк, словарь, IDF, матрица TF-IDF) для манифеста; матрица None — не изменилась
+        self._vectors = None
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return manifest if manifest.get("version") == MANIFEST_VERSION else {}
+
+    @staticmethod
+    def is_indexed(entry: CorpusEntry) -> bool:
+        """Попадает ли файл корпуса в поисковый индекс"""
+        *dirs, name = entry.rel_path.split("/")
+        return name not in EXCLUDED_FILES and not EXCLUDED_DIRS.intersection(dirs)
+
+    def _unchanged(self, entry: CorpusEntry) -> dict | None:
+        """Запись манифеста, если отметка файла не изменилась"""
+        known = self.manifest.get("documents", {}).get(document_id(entry.rel_path))
+        if known and known["stamp"] == list(entry.stamp):
+            return dict(known)
+        return None
+
+    def add_document(self, document: CorpusDocument):
+        """Добавить прочитанный документ корпуса (при потоковом обходе)"""
+        if not self.is_indexed(document.entry):
+            return
+
+        doc_id = document_id(document.rel_path)
+        if document.content is None:
+            print(f"Ошибка при чтении {document.path}: не удалось декодировать UTF-8")
+            return
+
+        known = self.manifest.get("documents", {}).get(doc_id)
+        doc = self._unchanged(document.entry) or self._make_document(document)
+        doc["content"] = document.content
+        if not known or known["hash"] != document.hash:
+            self.changed_ids.add(doc_id)
+        self.documents[doc_id] = doc
+
+    def _make_document(self, document: CorpusDocument) -> dict:
+        content = document.content
+
+        # Извлекаем заголовок
+        title_match = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
+        title = title_match.group(1) if title_match else document.path.name.replace(".md", "")
+
+        return {
+            "id": document_id(document.rel_path),
+            "title": title,
+            # Относительный путь от корня репозитория
+            "path": os.path.relpath(document.path, self.repo_root),
+            "word_count": len(content.split()),
+            "excerpt": content[:200] + "..." if len(content) > 200 else content,
+            "hash": document.hash,
+            "stamp": list(document.stamp),
+        }
+
     def extract_documents(self) -> dict:
-        """Извлечь все документы из репозитория"""
-        print("Извлечение документов...")
+        """
+        Извлечь документы из репозитория
 
-        doc_id = 0
-        for root, dirs, files in os.walk(self.repo_root):
-            # Пропускаем служебные директории
-            dirs[:] = [
-                d
-                for d in dirs
-                if not d.startswith(".") and d not in ["node_modules", "__pycache__", "api", "scripts", "data"]
-            ]
+        Файлы с прежней отметкой (mtime, размер) не читаются — их данные
+        берутся из манифеста. Изменившиеся по хешу документы попадают в
+        changed_ids, исчезнувшие — в removed_ids.
+        """
+        print("Извлечение документов...")
 
-            for file in files:
-                if file.endswith(".md") and file not in ["README.md"]:
-                    file_path = os.path.join(root, file)
-                    try:
-                        with open(file_path, encoding="utf-8") as f:
-                            content = f.read()
-
-                            # Извлекаем заголовок
-                            title_match = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
-                            title = title_match.group(1) if title_match else file.replace(".md", "")
-
-                            # Относительный путь от корня репозитория
-                            rel_path = os.path.relpath(file_path, self.repo_root)
-
-                            self.documents[f"doc_{doc_id}"] = {
-                                "id": f"doc_{doc_id}",
-                                "title": title,
-                                "path": rel_path,
-                                "content": content,
-                                "word_count": len(content.split()),
-                            }
-                            doc_id += 1
-                    except Exception as e:
-                        print(f"Ошибка при чтении {file_path}: {e}")
-
-        print(f"Извлечено {len(self.documents)} документов")
+        to_read = []
+        for entry in self.corpus.entries():
+            if not self.is_indexed(entry):
+                continue
+            known = self._unchanged(entry)
+            if known:
+                self.documents[known["id"]] = known
+            else:
+                to_read.append(entry)
+
+        for document in self.corpus.iter_documents(entries=to_read):
+            self.add_document(document)
+
+        return self.finish_extraction()
+
+    def finish_extraction(self) -> dict:
+        """Завершить извлечение: найти удаленные документы"""
+        self.documents = dict(sorted(self.documents.items(), key=lambda item: item[1]["path"]))
+        self.removed_ids = set(self.manifest.get("documents", {})) - set(self.documents)
+
+        print(
+            f"Извлечено {len(self.documents)} документов "
+            f"(изменено {len(self.changed_ids)}, удалено {len(self.removed_ids)})"
+        )
         return self.documents
 
-    def compute_document_similarity(self):
+    def _document_text(self, doc_id: str) -> str:
+        doc = self.documents[doc_id]
+        if "content" not in doc:
+            path = os.path.join(self.repo_root, doc["path"])
+            stat = os.stat(path)
+            entry = CorpusEntry(Path(path), doc["path"].replace(os.sep, "/"), (stat.st_mtime_ns, stat.st_size))
+            doc["content"] = self.corpus.read(entry).content
+        return doc["content"]
+
+    def _needs_full_rebuild(self) -> bool:
+        if not self.manifest or not os.path.exists(self.vectors_path) or self.manifest.get("top_k") != self.top_k:
+            return True
+        changes = len(self.changed_ids) + len(self.removed_ids)
+        return changes > INCREMENTAL_MAX_CHANGED * max(len(self.manifest.get("rows", [])), 1)
+
+    def compute_document_similarity(self, full: bool = False):
         """
         Вычислить схожесть между документами методом TF-IDF + косинусное расстояние
 
-        Для каждого документа найти 5 наиболее похожих
+        Для каждого документа найти top_k наиболее похожих. Плотная матрица
+        N×N не строится: соседи считаются блоками (см. scripts/similarity.py)
         """
         print("Вычисление схожести документов...")
 
         try:
-            from sklearn.feature_extraction.text import TfidfVectorizer
-            from sklearn.metrics.pairwise import cosine_similarity
+            import numpy  # noqa: F401
+            import sklearn  # noqa: F401
         except ImportError:
             print("Для вычисления схожести требуются библиотеки scikit-learn и numpy")
             print("Установите их: pip install scikit-learn numpy")
@@ -76,53 +198,150 @@ class SearchIndexBuilder:
         if not self.documents:
             self.extract_documents()
 
-        # Подготовка текстов
-        doc_ids = list(self.documents.keys())
-        texts = [self.documents[doc_id]["content"] for doc_id in doc_ids]
+        if full or self._needs_full_rebuild():
+            self._full_similarity()
+        elif self.changed_ids or self.removed_ids:
+            self._incremental_similarity()
+        else:
+            print("Документы не изменились")
+            self.similarity_matrix = self._load_similarity()
+            self._vectors = (self.manifest["rows"], self.manifest["vocabulary"], self.manifest["idf"], None)
+
+        print(f"Вычислена схожесть для {len(self.similarity_matrix)} документов")
+        return self.similarity_matrix
+
+    def _full_similarity(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        from scripts.similarity import top_k_similar
+
+        doc_ids = list(self.documents)
+        texts = [self._document_text(doc_id) for doc_id in doc_ids]
 
         # Построение TF-IDF матрицы
         print("Построение TF-IDF матрицы...")
-        vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words=None,  # Для русского языка нужен отдельный список стоп-слов
-            ngram_range=(1, 2),
-        )
-
+        vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
         try:
             tfidf_matrix = vectorizer.fit_transform(texts)
         except Exception as e:
             print(f"Ошибка при построении TF-IDF матрицы: {e}")
-            return {}
+            return
 
-        # Вычисление косинусного расстояния
-        print("Вычисление косинусного расстояния...")
-        similarity_matrix = cosine_similarity(tfidf_matrix)
-
-        # Для каждого документа сохранить топ-5 похожих
-        for i, doc_id in enumerate(doc_ids):
-            # Получаем индексы похожих документов (исключая сам документ)
-            similar_indices = similarity_matrix[i].argsort()[::-1][1:6]  # Топ-5, исключая себя
-
-            similar_docs = []
-            for idx in similar_indices:
-                if idx < len(doc_ids):  # Проверка границ
-                    similar_doc_id = doc_ids[idx]
-                    score = float(similarity_matrix[i][idx])
-
-                    # Добавляем только если score > 0.1
-                    if score > 0.1:
-                        similar_docs.append(
-                            {
-                                "doc_id": similar_doc_id,
-                                "title": self.documents[similar_doc_id]["title"],
-                                "score": round(score, 4),
-                            }
-                        )
-
-            self.similarity_matrix[doc_id] = {"similar": similar_docs}
+        # Поиск ближайших соседей блоками, без матрицы N×N
+        print("Поиск похожих документов...")
+        indices, scores = top_k_similar(tfidf_matrix, k=self.top_k, workers=self.workers)
 
-        print(f"Вычислена схожесть для {len(self.similarity_matrix)} документов")
-        return self.similarity_matrix
+        self.similarity_matrix = {
+            doc_id: self._similar_entries([(doc_ids[j], float(s)) for j, s in zip(indices[i], scores[i])])
+            for i, doc_id in enumerate(doc_ids)
+        }
+
+        vocabulary = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+        self._vectors = (doc_ids, vocabulary, vectorizer.idf_.tolist(), tfidf_matrix)
+
+    def _incremental_similarity(self):
+        """
+        Обновить векторы и соседей только для изменившихся документов
+
+        Словарь и IDF берутся из последней полной сборки. Соседи
+        пересчитываются целиком для измененных документов и для тех, у кого
+        в списке был измененный или удаленный документ; остальным
+        изменившиеся документы добавляются как новые кандидаты.
+        """
+        import numpy as np
+        import scipy.sparse as sp
+
+        from scripts.similarity import top_k_similar
+
+        print(f"Инкрементальное обновление: {len(self.changed_ids)} изменено, {len(self.removed_ids)} удалено")
+
+        old_rows = {doc_id: row for row, doc_id in enumerate(self.manifest["rows"])}
+        old_matrix = sp.load_npz(self.vectors_path).tocsr()
+        vocabulary = self.manifest["vocabulary"]
+        idf = self.manifest["idf"]
+
+        doc_ids = list(self.documents)
+        changed = [doc_id for doc_id in doc_ids if doc_id in self.changed_ids or doc_id not in old_rows]
+        changed_vectors = self._vectorize([self._document_text(doc_id) for doc_id in changed], vocabulary, idf)
+        changed_rows = {doc_id: row for row, doc_id in enumerate(changed)}
+
+        blocks = []
+        for doc_id in doc_ids:
+            if doc_id in changed_rows:
+                blocks.append(changed_vectors[changed_rows[doc_id]])
+            else:
+                blocks.append(old_matrix[old_rows[doc_id]])
+        tfidf_matrix = sp.vstack(blocks, format="csr") if blocks else old_matrix[:0]
+        positions = {doc_id: row for row, doc_id in enumerate(doc_ids)}
+
+        previous = self._load_similarity()
+        stale = self.changed_ids | self.removed_ids
+        recompute = [
+            doc_id
+            for doc_id in doc_ids
+            if doc_id in changed_rows
+            or doc_id not in previous
+            or any(sim["doc_id"] in stale for sim in previous[doc_id].get("similar", []))
+        ]
+        recompute_set = set(recompute)
+
+        self.similarity_matrix = {}
+        if recompute:
+            rows = [positions[doc_id] for doc_id in recompute]
+            indices, scores = top_k_similar(tfidf_matrix, k=self.top_k, rows=rows, workers=self.workers)
+            for i, doc_id in enumerate(recompute):
+                self.similarity_matrix[doc_id] = self._similar_entries(
+                    [(doc_ids[j], float(s)) for j, s in zip(indices[i], scores[i])]
+                )
+
+        # Остальным документам — схожесть только с изменившимися
+        rest = [doc_id for doc_id in doc_ids if doc_id not in recompute_set]
+        if rest:
+            candidate_scores = (tfidf_matrix[[positions[d] for d in rest]] @ changed_vectors.T).toarray()
+            for i, doc_id in enumerate(rest):
+                current = [(sim["doc_id"], sim["score"]) for sim in previous[doc_id]["similar"]]
+                new = [(changed[j], float(candidate_scores[i, j])) for j in np.flatnonzero(candidate_scores[i])]
+                self.similarity_matrix[doc_id] = self._similar_entries(current + new)
+
+        self.similarity_matrix = {doc_id: self.similarity_matrix[doc_id] for doc_id in doc_ids}
+        self._vectors = (doc_ids, vocabulary, idf, tfidf_matrix)
+
+    @staticmethod
+    def _vectorize(texts: list[str], vocabulary: list[str], idf: list[float]):
+        """TF-IDF для новых текстов с зафиксированными словарем и IDF"""
+        import numpy as np
+        import scipy.sparse as sp
+        from sklearn.feature_extraction.text import CountVectorizer
+        from sklearn.preprocessing import normalize
+
+        if not texts:
+            return sp.csr_matrix((0, len(vocabulary)))
+
+        params = {key: value for key, value in VECTORIZER_PARAMS.items() if key != "max_features"}
+        counts = CountVectorizer(vocabulary=vocabulary, **params).transform(texts)
+        return normalize(counts.astype(np.float64) @ sp.diags(idf), norm="l2").tocsr()
+
+    def _similar_entries(self, candidates: list[tuple[str, float]]) -> dict:
+        """Топ-k кандидатов выше порога, с актуальными заголовками"""
+        best = {}
+        for doc_id, score in candidates:
+            if score > MIN_SIMILARITY and doc_id in self.documents:
+                best[doc_id] = max(score, best.get(doc_id, 0.0))
+
+        ranked = sorted(best.items(), key=lambda item: -item[1])[: self.top_k]
+        return {
+            "similar": [
+                {"doc_id": doc_id, "title": self.documents[doc_id]["title"], "score": round(score, 4)}
+                for doc_id, score in ranked
+            ]
+        }
+
+    def _load_similarity(self) -> dict:
+        try:
+            with open(os.path.join(self.data_dir, "similarity_matrix.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
 
     def save_similarity_matrix(self, output_path: str):
         """
@@ -139,8 +358,10 @@ class SearchIndexBuilder:
         print("Сохранение матрицы схожести...")
 
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(self.similarity_matrix, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, output_path)
 
         print(f"Матрица схожести сохранена в {output_path}")
 
@@ -156,18 +377,56 @@ class SearchIndexBuilder:
                 "title": doc["title"],
                 "path": doc["path"],
                 "word_count": doc["word_count"],
-                "excerpt": doc["content"][:200] + "..." if len(doc["content"]) > 200 else doc["content"],
+                "excerpt": doc["excerpt"],
             }
 
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, "w", encoding="utf-8") as f:
+        # Пишем во временный файл и атомарно подменяем, чтобы API не подхватил недописанный индекс
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, output_path)
 
         print(f"Индекс документов сохранен в {output_path}")
 
+    def save_manifest(self):
+        """Сохранить манифест и векторы для следующей инкрементальной сборки"""
+        if self._vectors is None:
+            return
+
+        doc_ids, vocabulary, idf, tfidf_matrix = self._vectors
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        if tfidf_matrix is not None:
+            import scipy.sparse as sp
+
+            tmp_vectors = f"{self.vectors_path}.tmp.npz"
+            sp.save_npz(tmp_vectors, tfidf_matrix.tocsr())
+            os.replace(tmp_vectors, self.vectors_path)
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "top_k": self.top_k,
+            "vocabulary": vocabulary,
+            "idf": idf,
+            "rows": doc_ids,
+            "documents": {
+                doc_id: {key: value for key, value in doc.items() if key != "content"}
+                for doc_id, doc in self.documents.items()
+            },
+        }
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
 
 def main():
     """Основная функция"""
+    parser = argparse.ArgumentParser(description="Построение поискового индекса")
+    parser.add_argument("--full", action="store_true", help="Пересобрать индекс целиком, без манифеста")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Построение поискового индекса")
     print("=" * 60)
@@ -178,12 +437,12 @@ def main():
     builder.extract_documents()
 
     # Вычисляем схожесть
-    builder.compute_document_similarity()
+    builder.compute_document_similarity(full=args.full)
 
     # Сохраняем результаты
-    data_dir = os.path.join(builder.repo_root, "data")
-    builder.save_similarity_matrix(os.path.join(data_dir, "similarity_matrix.json"))
-    builder.save_document_index(os.path.join(data_dir, "document_index.json"))
+    builder.save_similarity_matrix(os.path.join(builder.data_dir, "similarity_matrix.json"))
+    builder.save_document_index(os.path.join(builder.data_dir, "document_index.json"))
+    builder.save_manifest()
 
     print("=" * 60)
     print("Готово!")
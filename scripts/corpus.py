@@ -0,0 +1,243 @@
+"""
+Общий слой загрузки корпуса документов репозитория.
+
+Построители индексов и базы знаний раньше обходили дерево и читали
+каждый .md файл самостоятельно (автодополнение — трижды). Corpus
+обходит дерево один раз (каталоги верхнего уровня — параллельно),
+читает файлы пулом потоков и кеширует декодированное содержимое с
+проверкой по отметке (mtime, размер), поэтому несколько построителей в
+одном процессе читают каждый файл один раз.
+
+Пример:
+    corpus = Corpus(repo_root)
+    for doc in corpus.iter_documents():
+        print(doc.rel_path, len(doc.content))
+"""
+
+import hashlib
+import os
+import sys
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_EXCLUDE_DIRS = frozenset({"node_modules", "__pycache__"})
+
+# Предел кеша декодированного содержимого
+DEFAULT_CACHE_BYTES = 512 * 2**20
+
+# Сколько файлов читается пулом наперед при потоковом обходе
+READ_AHEAD = 64
+
+
+@dataclass(frozen=True)
+class CorpusEntry:
+    """Файл корпуса без содержимого"""
+
+    path: Path
+    rel_path: str  # Относительный путь с разделителем "/"
+    stamp: tuple[int, int]  # (mtime_ns, size)
+
+    @property
+    def top_dir(self) -> str:
+        """Каталог верхнего уровня ("" для файлов в корне)"""
+        head, sep, _ = self.rel_path.partition("/")
+        return head if sep else ""
+
+
+@dataclass(frozen=True)
+class CorpusDocument:
+    """Прочитанный файл корпуса"""
+
+    entry: CorpusEntry
+    content: str | None  # None — файл не удалось декодировать как текст
+    hash: str  # sha256 исходных байтов
+
+    @property
+    def path(self) -> Path:
+        return self.entry.path
+
+    @property
+    def rel_path(self) -> str:
+        return self.entry.rel_path
+
+    @property
+    def stamp(self) -> tuple[int, int]:
+        return self.entry.stamp
+
+
+def _decode(raw: bytes, encodings: tuple[str, ...]) -> str | None:
+    for encoding in encodings:
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return None
+
+
+class Corpus:
+    """
+    Файлы репозитория с кешем содержимого
+
+    Args:
+        root: Корень репозитория
+        suffixes: Расширения файлов (None — все файлы)
+        exclude_dirs: Имена каталогов, пропускаемых на любой глубине
+        skip_hidden: Пропускать каталоги, начинающиеся с точки
+        encodings: Кодировки для декодирования по очереди
+        workers: Размер пула потоков для обхода и чтения
+        cache_bytes: Предел кеша содержимого (0 — без кеша)
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        suffixes: Iterable[str] | None = (".md",),
+        exclude_dirs: Iterable[str] = DEFAULT_EXCLUDE_DIRS,
+        skip_hidden: bool = True,
+        encodings: tuple[str, ...] = ("utf-8",),
+        workers: int | None = None,
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+    ):
+        self.root = Path(root)
+        self.suffixes = tuple(suffixes) if suffixes is not None else None
+        self.exclude_dirs = frozenset(exclude_dirs)
+        self.skip_hidden = skip_hidden
+        self.encodings = encodings
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.cache_bytes = cache_bytes
+
+        self._entries: list[CorpusEntry] | None = None
+        self._cache: OrderedDict[str, CorpusDocument] = OrderedDict()
+        self._cached_bytes = 0
+        self.reads = 0
+
+    def _skip_dir(self, name: str) -> bool:
+        return name in self.exclude_dirs or (self.skip_hidden and name.startswith("."))
+
+    def _wants(self, name: str) -> bool:
+        return self.suffixes is None or name.endswith(self.suffixes)
+
+    def _walk(self, directory: str) -> list[CorpusEntry]:
+        entries = []
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as items:
+                    items = sorted(items, key=lambda item: item.name)
+            except OSError:
+                continue
+            subdirs = []
+            for item in items:
+                try:
+                    if item.is_dir(follow_symlinks=False):
+                        if not self._skip_dir(item.name):
+                            subdirs.append(item.path)
+                    elif item.is_file() and self._wants(item.name):
+                        stat = item.stat()
+                        rel_path = os.path.relpath(item.path, self.root).replace(os.sep, "/")
+                        entries.append(CorpusEntry(Path(item.path), rel_path, (stat.st_mtime_ns, stat.st_size)))
+                except OSError:
+                    continue
+            stack.extend(reversed(subdirs))
+        return entries
+
+    def entries(self, dirs: Iterable[str] | None = None) -> list[CorpusEntry]:
+        """
+        Файлы корпуса (дерево обходится один раз за время жизни объекта)
+
+        Args:
+            dirs: Только файлы из этих каталогов верхнего уровня, в заданном порядке
+        """
+        if self._entries is None:
+            top_files = []
+            top_dirs = []
+            with os.scandir(self.root) as items:
+                for item in sorted(items, key=lambda item: item.name):
+                    if item.is_dir(follow_symlinks=False):
+                        if not self._skip_dir(item.name):
+                            top_dirs.append(item.path)
+                    elif item.is_file() and self._wants(item.name):
+                        stat = item.stat()
+                        top_files.append(CorpusEntry(Path(item.path), item.name, (stat.st_mtime_ns, stat.st_size)))
+
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                walked = list(pool.map(self._walk, top_dirs))
+            self._entries = top_files + [entry for entries in walked for entry in entries]
+
+        if dirs is None:
+            return list(self._entries)
+
+        by_dir: dict[str, list[CorpusEntry]] = {}
+        for entry in self._entries:
+            by_dir.setdefault(entry.top_dir, []).append(entry)
+        return [entry for name in dirs for entry in by_dir.get(name, [])]
+
+    def _load(self, entry: CorpusEntry) -> CorpusDocument:
+        with open(entry.path, "rb") as f:
+            raw = f.read()
+        return CorpusDocument(entry, _decode(raw, self.encodings), hashlib.sha256(raw).hexdigest())
+
+    def _remember(self, document: CorpusDocument):
+        if not self.cache_bytes or document.content is None:
+            return
+        size = sys.getsizeof(document.content)
+        if size > self.cache_bytes:
+            return
+        previous = self._cache.pop(document.rel_path, None)
+        if previous is not None:
+            self._cached_bytes -= sys.getsizeof(previous.content)
+        self._cache[document.rel_path] = document
+        self._cached_bytes += size
+        while self._cached_bytes > self.cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= sys.getsizeof(evicted.content)
+
+    def _cached(self, entry: CorpusEntry) -> CorpusDocument | None:
+        document = self._cache.get(entry.rel_path)
+        if document is None or document.stamp != entry.stamp:
+            return None
+        self._cache.move_to_end(entry.rel_path)
+        return document
+
+    def read(self, entry: CorpusEntry) -> CorpusDocument:
+        """Прочитать файл (из кеша, если отметка не изменилась)"""
+        document = self._cached(entry)
+        if document is None:
+            document = self._load(entry)
+            self.reads += 1
+            self._remember(document)
+        return document
+
+    def iter_documents(
+        self, dirs: Iterable[str] | None = None, entries: Iterable[CorpusEntry] | None = None
+    ) -> Iterator[CorpusDocument]:
+        """
+        Потоковый обход документов в порядке entries()
+
+        Файлы читаются пулом потоков на READ_AHEAD вперед; ошибки чтения
+        выводятся и пропускаются.
+        """
+        pending = list(entries) if entries is not None else self.entries(dirs)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for start in range(0, len(pending), READ_AHEAD):
+                window = pending[start : start + READ_AHEAD]
+                cached = [self._cached(entry) for entry in window]
+                futures = [
+                    None if document is not None else pool.submit(self._load, entry)
+                    for entry, document in zip(window, cached)
+                ]
+                for entry, document, future in zip(window, cached, futures):
+                    if future is not None:
+                        try:
+                            document = future.result()
+                        except OSError as e:
+                            print(f"Ошибка при чтении {entry.path}: {e}")
+                            continue
+                        self.reads += 1
+                        self._remember(document)
+                    yield document
@@ -1,893 +1,95 @@
 """Curated datasets extracted from source documents.
 
 Each dataset lists normalized rows with explicit sort and uniqueness rules.
+Definitions live in ``datasets/index.json`` and the rows of every dataset in
+``datasets/<name>.csv`` (header = ``columns``, rows in curation order: the
+first row of a duplicate key wins). Loading the index does not read any rows;
+``DatasetSpec.rows()`` streams them from the data file on demand.
+
+Usage:
+    python scripts/extract/raw_datasets.py   # check data files and list datasets
 """
 
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass
 from pathlib import Path
-from typing import TypedDict
+
+DATASETS_DIR = Path(__file__).resolve().parent / "datasets"
+INDEX_FILE = "index.json"
 
 
-class DatasetSpec(TypedDict):
+@dataclass
+class DatasetSpec:
+    """Definition of one curated dataset; rows stay in ``source`` until read."""
+
+    name: str
     output: Path
     columns: list[str]
     unique: list[str]
     sort_by: list[str]
-    rows: list[dict[str, str]]
+    source: Path
+
+    def rows(self) -> Iterator[dict[str, str]]:
+        """Stream rows of the data file as dicts keyed by ``columns``."""
+        with self.source.open(encoding="utf-8", newline="") as handle:
+            reader = csv.reader(handle)
+            header = next(reader, None)
+            if header != self.columns:
+                raise ValueError(f"{self.source}: header {header} does not match columns {self.columns}")
+            for row in reader:
+                if row:
+                    yield dict(zip(self.columns, row + [""] * (len(self.columns) - len(row))))
+
+    def fingerprint(self) -> str:
+        """Hash of the definition and the data file: the output depends on nothing else."""
+        digest = hashlib.sha256()
+        payload = [self.name, str(self.output), self.columns, self.unique, self.sort_by]
+        digest.update(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+        with self.source.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+
+def load_datasets(directory: Path = DATASETS_DIR) -> dict[str, DatasetSpec]:
+    """Dataset definitions from ``index.json`` (rows are not read)."""
+    payload = json.loads((directory / INDEX_FILE).read_text(encoding="utf-8"))
+    datasets: dict[str, DatasetSpec] = {}
+    for entry in payload.get("datasets", []):
+        datasets[entry["name"]] = DatasetSpec(
+            name=entry["name"],
+            output=Path(entry["output"]),
+            columns=list(entry["columns"]),
+            unique=list(entry.get("unique", [])),
+            sort_by=list(entry.get("sort_by", [])),
+            source=directory / entry.get("rows", f"{entry['name']}.csv"),
+        )
+    return datasets
+
+
+def main() -> int:
+    errors = 0
+    for spec in load_datasets().values():
+        unknown = [name for name in [*spec.unique, *spec.sort_by] if name not in spec.columns]
+        if unknown:
+            print(f"{spec.name}: unknown columns in rules: {', '.join(unknown)}", file=sys.stderr)
+            errors += 1
+            continue
+        try:
+            count = sum(1 for _ in spec.rows())
+        except (OSError, ValueError) as e:
+            print(f"{spec.name}: {e}", file=sys.stderr)
+            errors += 1
+            continue
+        print(f"{spec.name}: {count} rows -> {spec.output}")
+    return 1 if errors else 0
 
 
-RAW_DATASETS: dict[str, DatasetSpec] = {
-    "analogs_gost_iso": {
-        "output": Path("data/analogs/gost_iso.csv"),
-        "columns": ["source", "gost", "iso", "brand", "notes"],
-        "unique": ["gost", "iso"],
-        "sort_by": ["gost", "iso", "brand"],
-        "rows": [
-            {
-                "source": "Аналоги/ГОСТ_ISО.md".replace("ISО", "ISO"),
-                "gost": "2205",
-                "iso": "NU 205",
-                "brand": "",
-                "notes": "Цилиндрический роликовый аналог с совпадающими d/D/B; требуется контроль буртов и зазора.",
-            },
-            {
-                "source": "Аналоги/ГОСТ_ISО.md".replace("ISО", "ISO"),
-                "gost": "2205",
-                "iso": "22205",
-                "brand": "",
-                "notes": (
-                    "Сферический роликовый шире базового цилиндрического: "
-                    "замена не рекомендуется без перерасчёта посадок."
-                ),
-            },
-            {
-                "source": "Аналоги/ГОСТ_ISО.md".replace("ISО", "ISO"),
-                "gost": "3205",
-                "iso": "22205",
-                "brand": "",
-                "notes": "Сферический роликовый двухрядный, выдерживает перекосы; применим при ударных нагрузках.",
-            },
-            {
-                "source": "Аналоги/ГОСТ_ISО.md".replace("ISО", "ISO"),
-                "gost": "3306",
-                "iso": "22306",
-                "brand": "",
-                "notes": "Сферический роликовый, совпадение габаритов; требует усиленной смазки.",
-            },
-            {
-                "source": "docs/bearings/analogues/complete_analogues_table.md",
-                "gost": "3632",
-                "iso": "22332EAW33",
-                "brand": "SNR",
-                "notes": "Размеры совпадают; усиленная конструкция и смазочная канавка.",
-            },
-            {
-                "source": "docs/bearings/analogues/complete_analogues_table.md",
-                "gost": "3634",
-                "iso": "22334EAW33",
-                "brand": "SNR",
-                "notes": "Габариты соответствуют серии; уточнить исполнение W33 при подборе корпуса.",
-            },
-            {
-                "source": "Аналоги/ГОСТ_ISО.md".replace("ISО", "ISO"),
-                "gost": "3636",
-                "iso": "22336EA/W33",
-                "brand": "",
-                "notes": "Условная замена: требуется проверка D/B и наличия смазочных каналов.",
-            },
-            {
-                "source": "docs/bearings/analogues/complete_analogues_table.md",
-                "gost": "3636",
-                "iso": "22336EAW33",
-                "brand": "SNR",
-                "notes": "Размеры подтверждены в каталоге; смазочные отверстия обязательны.",
-            },
-            {
-                "source": "docs/bearings/analogues/complete_analogues_table.md",
-                "gost": "3636У1",
-                "iso": "22336EAW33",
-                "brand": "SNR",
-                "notes": "Исполнение У1 соответствует усиленному аналогу с W33.",
-            },
-            {
-                "source": "docs/bearings/analogues/complete_analogues_table.md",
-                "gost": "3640",
-                "iso": "22340EAW33",
-                "brand": "SNR",
-                "notes": "Сферический роликовый с усилением EA и смазочными каналами.",
-            },
-            {
-                "source": "docs/bearings/analogues/complete_analogues_table.md",
-                "gost": "3652",
-                "iso": "22352",
-                "brand": "SNR",
-                "notes": "Сферический роликовый тяжёлой серии; уточнить группу зазора перед заменой.",
-            },
-            {
-                "source": "docs/bearings/analogues/complete_analogues_table.md",
-                "gost": "3756205",
-                "iso": "3205",
-                "brand": "KOYO",
-                "notes": "Конический роликовый узел; требует настройки преднатяга.",
-            },
-            {
-                "source": "docs/bearings/analogues/complete_analogues_table.md",
-                "gost": "38204",
-                "iso": "52204",
-                "brand": "KOYO",
-                "notes": "Двухрядный упорный шариковый аналог по размерам.",
-            },
-            {
-                "source": "docs/bearings/analogues/complete_analogues_table.md",
-                "gost": "405",
-                "iso": "6405",
-                "brand": "KOYO;FAG;SNR;SKF",
-                "notes": "Допустима прямая замена при совпадении зазора и посадок.",
-            },
-            {
-                "source": "docs/bearings/analogues/complete_analogues_table.md",
-                "gost": "406",
-                "iso": "6406",
-                "brand": "SKF;KOYO;FAG;SNR",
-                "notes": "Стандартный шариковый аналог; проверить класс точности.",
-            },
-            {
-                "source": "docs/bearings/analogues/complete_analogues_table.md",
-                "gost": "407",
-                "iso": "6407",
-                "brand": "SKF;KOYO;FAG;SNR",
-                "notes": "Размеры совпадают; учитывать требования к смазке.",
-            },
-            {
-                "source": "docs/bearings/analogues/complete_analogues_table.md",
-                "gost": "408",
-                "iso": "6408",
-                "brand": "KOYO;SKF;FAG;SNR",
-                "notes": "Прямая замена по габаритам; проверить массу и скорость.",
-            },
-            {
-                "source": "docs/bearings/analogues/complete_analogues_table.md",
-                "gost": "409",
-                "iso": "6409",
-                "brand": "SKF;KOYO",
-                "notes": "Совпадают размеры и тип; уточнить зазор.",
-            },
-            {
-                "source": "Аналоги/ГОСТ_ISО.md".replace("ISО", "ISO"),
-                "gost": "6205",
-                "iso": "6305",
-                "brand": "",
-                "notes": "Неверная замена: увеличены D и B, требуется другой корпус.",
-            },
-            {
-                "source": "Аналоги/ГОСТ_ISО.md".replace("ISО", "ISO"),
-                "gost": "7205",
-                "iso": "30205",
-                "brand": "",
-                "notes": "Конический роликовый, размеры совпадают; обязательна регулировка преднатяга.",
-            },
-            {
-                "source": "Аналоги/ГОСТ_ISО.md".replace("ISО", "ISO"),
-                "gost": "7505",
-                "iso": "32005",
-                "brand": "",
-                "notes": "Конический роликовый узкой серии; рассчитан на высокие скорости.",
-            },
-        ],
-    },
-    "analogs_units": {
-        "output": Path("data/analogs/units.csv"),
-        "columns": ["source", "gost", "iso", "brand", "notes"],
-        "unique": ["gost", "iso"],
-        "sort_by": ["gost", "iso", "brand"],
-        "rows": [
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELF",
-                "iso": "FYJ-FM / FY-CB",
-                "brand": "SKF",
-                "notes": "Фланцевый узел; требуется проверка посадочных размеров корпуса.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELF",
-                "iso": "VCJ",
-                "brand": "FAFNIR",
-                "notes": "Эквивалент для корпусных узлов с эксцентрическим кольцом.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELF",
-                "iso": "PCF/PCJ",
-                "brand": "INA",
-                "notes": "Прямой аналог для фланцевых узлов; проверьте способ фиксации.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELF",
-                "iso": "SAFC",
-                "brand": "FYH",
-                "notes": "Совместимый корпусный узел; уточнить смазочные отверстия.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELF",
-                "iso": "ENF",
-                "brand": "NSK",
-                "notes": "Самоцентрирующийся вариант; подходит для валов с перекосом.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELF",
-                "iso": "VFE",
-                "brand": "SEAL",
-                "notes": "Аналогичный узел, требует сверки материала корпуса.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELF",
-                "iso": "FG16200",
-                "brand": "FAG",
-                "notes": "Каталожный аналог FAG; сохранены габариты крепления.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELF",
-                "iso": "SF-EC",
-                "brand": "RHP",
-                "notes": "Исполнение с эксцентриковой втулкой; проверить допуски отверстий.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELF",
-                "iso": "KHF",
-                "brand": "ASAHI",
-                "notes": "Корпусный узел с эксцентриковой втулкой; соответствует коду NTN.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELFD",
-                "iso": "FYTF-CA",
-                "brand": "SKF",
-                "notes": "Фланцевый корпус; уточните тип подшипника в комплекте.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELFD",
-                "iso": "FLCT",
-                "brand": "FAFNIR",
-                "notes": "Каталожный аналог под фланцевый монтаж; проверить отверстия.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELFD",
-                "iso": "FLCTE",
-                "brand": "INA",
-                "notes": "Фланцевый узел INA; совпадают габариты и схема крепления.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELFD",
-                "iso": "ALF",
-                "brand": "FYH",
-                "notes": "Фланцевый корпус FYH; уточнить тип стопорного кольца.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELFD",
-                "iso": "ENFD",
-                "brand": "NSK",
-                "notes": "Исполнение с эксцентриковой втулкой; совместимо с NTN AELFD.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELFD",
-                "iso": "LFT",
-                "brand": "SEAL",
-                "notes": "Аналогичный фланцевый корпус; проверить уплотнения.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELFD",
-                "iso": "FGF16200",
-                "brand": "FAG",
-                "notes": "Фланцевый корпус FAG; смазочные каналы уточняются по каталогу.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELFD",
-                "iso": "LFTC-EC",
-                "brand": "RHP",
-                "notes": "Каталожный аналог RHP; просверленные отверстия совпадают.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELFD",
-                "iso": "KHCTE",
-                "brand": "ASAHI",
-                "notes": "Исполнение с эксцентриком; подходит для тех же валов.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "UCFL",
-                "iso": "FYTB-TF / FYTJ-TF",
-                "brand": "SKF",
-                "notes": "Двух- и трёхболтовые фланцы; проверить шаг отверстий.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "UCFL",
-                "iso": "RCJTC",
-                "brand": "FAFNIR",
-                "notes": "Фланцевый корпус; требуется сверка размеров болтов.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "UCFL",
-                "iso": "RCJTY",
-                "brand": "INA",
-                "notes": "Каталожный аналог INA; одинаковая схема крепления.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "UCFL",
-                "iso": "UCFL",
-                "brand": "FYH;NSK",
-                "notes": "Стандартный фланцевый корпус; совместим с кодом NTN UCFL.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "UCFL",
-                "iso": "SFT",
-                "brand": "SEAL;RHP",
-                "notes": "Фланцевый корпус с аналогичными размерами; проверить обработку отверстий.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "UCFL",
-                "iso": "FL56205",
-                "brand": "FAG",
-                "notes": "Каталожный аналог FAG; совпадают посадочные размеры.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "UCFL",
-                "iso": "*FC2-25/UCFL*",
-                "brand": "ASAHI",
-                "notes": "Рекомендованный аналог; требуется проверка материала корпуса.",
-            },
-        ],
-    },
-    "analogs_housings": {
-        "output": Path("data/analogs/housings.csv"),
-        "columns": ["source", "gost", "iso", "brand", "notes"],
-        "unique": ["gost", "iso"],
-        "sort_by": ["gost", "iso", "brand"],
-        "rows": [
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELP",
-                "iso": "SYJ-FM / SYP / SY-CB",
-                "brand": "SKF",
-                "notes": "Самоцентрирующийся блок с эксцентриковым кольцом; подобрать смазку под режим работы.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELP",
-                "iso": "VAS",
-                "brand": "FAFNIR",
-                "notes": "Каталожный аналог для сельхозтехники; проверить тип уплотнения.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELP",
-                "iso": "PASE",
-                "brand": "INA",
-                "notes": "Фланцевый корпус; размеры совпадают по каталогу INA.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "AELP",
-                "iso": "SAP",
-                "brand": "FYH",
-                "notes": "Самоцентрирующийся узел; уточните материалы корпуса.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "UCFC",
-                "iso": "FYC-TF / FYGF-TF",
-                "brand": "SKF",
-                "notes": "Круглый фланцевый корпус; подобрать под требуемый диаметр крепления.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "UCFC",
-                "iso": "RMEY",
-                "brand": "INA",
-                "notes": "Сферический корпус INA; проверить совместимость втулки.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "UELF",
-                "iso": "FYJ-WM",
-                "brand": "SKF",
-                "notes": "Радиальный узел с эксцентриком; учитывать требуемый зазор подшипника.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "UELF",
-                "iso": "RCJ",
-                "brand": "FAFNIR",
-                "notes": "Корпусный узел с эксцентриковым кольцом; совместим по габаритам.",
-            },
-            {
-                "source": "docs/bearings/analogues/bearing_units.md",
-                "gost": "UELF",
-                "iso": "EWF",
-                "brand": "FYH",
-                "notes": "Эквивалентный корпус FYH; уточните смазочные отверстия.",
-            },
-        ],
-    },
-    "brands": {
-        "output": Path("data/brands/brands.csv"),
-        "columns": ["brand", "country", "segment", "categories", "notes", "source"],
-        "unique": ["brand"],
-        "sort_by": ["brand"],
-        "rows": [
-            {
-                "brand": "FAG/INA (Schaeffler)",
-                "country": "Германия",
-                "segment": "премиум",
-                "categories": "прецизионные; высокотемпературные; сферические",
-                "notes": "Полиамидные сепараторы P и смазки W64 требуют контроля температурных условий",
-                "source": "Бренды/премиум.md",
-            },
-            {
-                "brand": "ISB",
-                "country": "Италия",
-                "segment": "бюджет",
-                "categories": "стандарт ISO; нержавеющие",
-                "notes": "Базовые исполнения ISO и серии SS для пищевой промышленности",
-                "source": "Бренды/бюджет.md",
-            },
-            {
-                "brand": "KOYO",
-                "country": "Япония",
-                "segment": "средний",
-                "categories": "уплотнения SR/SRL; виброисполнения ROVS",
-                "notes": "Поддерживает комплектность QB/QF/QU и уплотнения SR/SRL",
-                "source": "Бренды/средний_класс.md",
-            },
-            {
-                "brand": "NKE",
-                "country": "Австрия",
-                "segment": "бюджет",
-                "categories": "стандарт ISO; железнодорожные серии",
-                "notes": "Использует стандартные обозначения ISO и отраслевые серии",
-                "source": "Бренды/бюджет.md",
-            },
-            {
-                "brand": "NSK",
-                "country": "Япония",
-                "segment": "премиум",
-                "categories": "уплотнения DDU/DU; комплекты DB/DF/DT",
-                "notes": "Высокоточная линейка HG и полиамидные сепараторы",
-                "source": "Бренды/премиум.md",
-            },
-            {
-                "brand": "NTN",
-                "country": "Япония",
-                "segment": "средний",
-                "categories": "уплотнения VV/LLB; высокотемпературные TS1–TS4",
-                "notes": "Требуется сверять температурные ограничения и зазор",
-                "source": "Бренды/средний_класс.md",
-            },
-            {
-                "brand": "SKF",
-                "country": "Швеция",
-                "segment": "премиум",
-                "categories": "Explorer; W33; VA**; комплекты DB/DF/DT",
-                "notes": "Серии Explorer и специальные суффиксы VA/HT для вибронагруженных узлов",
-                "source": "Бренды/премиум.md",
-            },
-            {
-                "brand": "SNR",
-                "country": "Франция",
-                "segment": "средний",
-                "categories": "сферические роликовые; аналоги ISO",
-                "notes": "Применяется в таблицах соответствий ГОСТ ↔ ISO с усилениями EA/W33",
-                "source": "Бренды/средний_класс.md",
-            },
-        ],
-    },
-    "gost_bearings": {
-        "output": Path("data/gost/bearings.csv"),
-        "columns": ["designation", "type", "description", "source"],
-        "unique": ["designation"],
-        "sort_by": ["designation"],
-        "rows": [
-            {
-                "designation": "180205",
-                "type": "Двухрядный самоустанавливающийся шариковый",
-                "description": "Серия диаметров 8, код 205; допускает перекос и требует контроля зазора.",
-                "source": "ГОСТ/README.md",
-            },
-            {
-                "designation": "6205",
-                "type": "Радиальный шариковый",
-                "description": "Тип 6, серия диаметров 2, серия ширины 0; d=25 мм по коду 05.",
-                "source": "ГОСТ/README.md",
-            },
-            {
-                "designation": "7205",
-                "type": "Конический роликовый",
-                "description": "Тип 7 с коническим отверстием; требует настройки преднатяга при монтаже.",
-                "source": "Аналоги/ГОСТ_ISО.md".replace("ISО", "ISO"),
-            },
-            {
-                "designation": "7505",
-                "type": "Конический роликовый узкой серии",
-                "description": "Узкое исполнение для высоких скоростей; контролируйте посадку по конусу.",
-                "source": "Аналоги/ГОСТ_ISО.md".replace("ISО", "ISO"),
-            },
-            {
-                "designation": "7805",
-                "type": "Конический роликовый",
-                "description": "Серия диаметров 8, код 05; ширина определяется серией 0.",
-                "source": "ГОСТ/README.md",
-            },
-        ],
-    },
-    "gost_dimensions": {
-        "output": Path("data/gost/dimensions.csv"),
-        "columns": ["designation", "d", "D", "B", "source"],
-        "unique": ["designation", "d", "D", "B"],
-        "sort_by": ["designation", "d", "D"],
-        "rows": [
-            {"designation": "30205", "d": "25", "D": "52", "B": "16.25", "source": "Таблицы/размеры.md"},
-            {"designation": "32005", "d": "25", "D": "47", "B": "15", "source": "Таблицы/размеры.md"},
-            {"designation": "6205", "d": "25", "D": "52", "B": "15", "source": "Таблицы/размеры.md"},
-            {"designation": "6305", "d": "25", "D": "62", "B": "17", "source": "Таблицы/размеры.md"},
-            {"designation": "NU 205", "d": "25", "D": "52", "B": "15", "source": "Таблицы/размеры.md"},
-            {"designation": "22205", "d": "25", "D": "52", "B": "18", "source": "Таблицы/размеры.md"},
-            {"designation": "22306", "d": "30", "D": "72", "B": "27", "source": "Таблицы/размеры.md"},
-        ],
-    },
-    "gost_series": {
-        "output": Path("data/gost/series.csv"),
-        "columns": ["designation", "width_series", "diameter_series", "type", "source"],
-        "unique": ["designation"],
-        "sort_by": ["designation"],
-        "rows": [
-            {
-                "designation": "6205",
-                "width_series": "0",
-                "diameter_series": "2",
-                "type": "Радиальный шариковый",
-                "source": "ГОСТ/README.md",
-            },
-            {
-                "designation": "7805",
-                "width_series": "0",
-                "diameter_series": "8",
-                "type": "Конический роликовый",
-                "source": "ГОСТ/README.md",
-            },
-        ],
-    },
-    "gost_tolerances": {
-        "output": Path("data/gost/tolerances.csv"),
-        "columns": ["class", "description", "source"],
-        "unique": ["class"],
-        "sort_by": ["class"],
-        "rows": [
-            {"class": "0", "description": "Нормальный класс точности по ГОСТ 3189-89", "source": "ГОСТ/README.md"},
-            {"class": "2", "description": "Сверхпрецизионный класс точности", "source": "ГОСТ/README.md"},
-            {"class": "4", "description": "Прецизионный класс точности", "source": "ГОСТ/README.md"},
-            {"class": "5", "description": "Высокий класс точности", "source": "ГОСТ/README.md"},
-            {"class": "6", "description": "Повышенный класс точности", "source": "ГОСТ/README.md"},
-        ],
-    },
-    "iso_bearings": {
-        "output": Path("data/iso/bearings.csv"),
-        "columns": ["designation", "type", "description", "source"],
-        "unique": ["designation"],
-        "sort_by": ["designation"],
-        "rows": [
-            {
-                "designation": "22215 CCK/W33",
-                "type": "Сферический роликовый",
-                "description": "Код 15 → d=75 мм; коническое отверстие K и смазочная канавка W33.",
-                "source": "ISO/система_обозначений.md",
-            },
-            {
-                "designation": "30205",
-                "type": "Конический роликовый",
-                "description": "Серия 2, код 05; требует регулировки преднатяга.",
-                "source": "ISO/система_обозначений.md",
-            },
-            {
-                "designation": "6205",
-                "type": "Радиальный шариковый",
-                "description": "Серия 2, ширина 0, код 05 → d=25 мм; базовое исполнение ISO.",
-                "source": "ISO/система_обозначений.md",
-            },
-            {
-                "designation": "7205 BECBP",
-                "type": "Радиально-упорный шариковый",
-                "description": "Угол контакта 40°, код 05; полиамидный сепаратор и повышенная точность.",
-                "source": "ISO/система_обозначений.md",
-            },
-            {
-                "designation": "NU 305 E C3",
-                "type": "Цилиндрический роликовый",
-                "description": "Бурты на наружном кольце, серия 3, код 05; зазор C3.",
-                "source": "ISO/система_обозначений.md",
-            },
-        ],
-    },
-    "iso_dimensions": {
-        "output": Path("data/iso/dimensions.csv"),
-        "columns": ["designation", "d", "D", "B", "source"],
-        "unique": ["designation", "d", "D", "B"],
-        "sort_by": ["designation", "d", "D"],
-        "rows": [
-            {"designation": "30205", "d": "25", "D": "52", "B": "16.25", "source": "Таблицы/размеры.md"},
-            {"designation": "32005", "d": "25", "D": "47", "B": "15", "source": "Таблицы/размеры.md"},
-            {"designation": "6205", "d": "25", "D": "52", "B": "15", "source": "Таблицы/размеры.md"},
-            {"designation": "6305", "d": "25", "D": "62", "B": "17", "source": "Таблицы/размеры.md"},
-            {"designation": "NU 205", "d": "25", "D": "52", "B": "15", "source": "Таблицы/размеры.md"},
-            {"designation": "22306", "d": "30", "D": "72", "B": "27", "source": "Таблицы/размеры.md"},
-        ],
-    },
-    "iso_prefixes": {
-        "output": Path("data/iso/prefixes.csv"),
-        "columns": ["code", "category", "description", "source"],
-        "unique": ["code"],
-        "sort_by": ["code"],
-        "rows": [
-            {
-                "code": "AH",
-                "category": "mounting",
-                "description": "Стяжная втулка стандартного исполнения",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "AHX",
-                "category": "mounting",
-                "description": "Стяжная втулка стандарта ISO",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "AOH",
-                "category": "mounting",
-                "description": "Стяжная втулка с масляными каналами",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "AOHX",
-                "category": "mounting",
-                "description": "Стяжная втулка ISO с масляными каналами",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "B",
-                "category": "special",
-                "description": "Заводской чертёж специального исполнения",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "F",
-                "category": "special",
-                "description": "Специальное обозначение производителя перед номером",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "G",
-                "category": "special",
-                "description": "Специальное обозначение производителя перед номером",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "H",
-                "category": "mounting",
-                "description": "Закрепительная втулка метрическая",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "HA",
-                "category": "mounting",
-                "description": "Закрепительная втулка для дюймовых валов 1/16''",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "HE",
-                "category": "mounting",
-                "description": "Закрепительная втулка для дюймовых валов 1/4''",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "HM",
-                "category": "fastener",
-                "description": "Гайка с трапецеидальной резьбой ISO",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "HML",
-                "category": "fastener",
-                "description": "Гайка уменьшенного сечения",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "HMV",
-                "category": "fastener",
-                "description": "Гидравлическая гайка для монтажа",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "HS",
-                "category": "mounting",
-                "description": "Закрепительная втулка для дюймовых валов 1/8''",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "K",
-                "category": "special",
-                "description": "Специальное обозначение производителя перед номером",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "N",
-                "category": "cylindrical_roller",
-                "description": "Бурты на внутреннем кольце",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "NF",
-                "category": "cylindrical_roller",
-                "description": "Два бурта на внутреннем кольце и два на наружном",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "NH",
-                "category": "cylindrical_roller",
-                "description": "Втулка вместо внутреннего кольца",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "NJ",
-                "category": "cylindrical_roller",
-                "description": "Бурты на внутреннем кольце и один на наружном",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "NU",
-                "category": "cylindrical_roller",
-                "description": "Бурты на наружном кольце",
-                "source": "ISO/префиксы.md",
-            },
-            {
-                "code": "NUP",
-                "category": "cylindrical_roller",
-                "description": "NU с дополнительным свободным кольцом",
-                "source": "ISO/префиксы.md",
-            },
-        ],
-    },
-    "iso_suffixes": {
-        "output": Path("data/iso/suffixes.csv"),
-        "columns": ["code", "manufacturer", "type", "description", "snr_equivalent", "notes", "source"],
-        "unique": ["code", "manufacturer"],
-        "sort_by": ["code", "manufacturer"],
-        "rows": [
-            {
-                "code": "2RS",
-                "manufacturer": "KOYO",
-                "type": "sealing",
-                "description": "Две контактные резиновые манжеты",
-                "snr_equivalent": "2RS",
-                "notes": "Стандартная защита для шариковых подшипников",
-                "source": "Таблицы/суффиксы_производителей.md",
-            },
-            {
-                "code": "2RU",
-                "manufacturer": "KOYO",
-                "type": "sealing",
-                "description": "Две неконтактные манжеты",
-                "snr_equivalent": "",
-                "notes": "Для высоких скоростей",
-                "source": "Таблицы/суффиксы_производителей.md",
-            },
-            {
-                "code": "CM",
-                "manufacturer": "NSK",
-                "type": "clearance",
-                "description": "Специальный зазор для электродвигателей",
-                "snr_equivalent": "",
-                "notes": "Используется для снижения вибраций",
-                "source": "Таблицы/суффиксы_производителей.md",
-            },
-            {
-                "code": "DDU",
-                "manufacturer": "NSK",
-                "type": "sealing",
-                "description": "Две бесконтактные манжеты",
-                "snr_equivalent": "N/A",
-                "notes": "Рекомендуется для высоких оборотов",
-                "source": "Таблицы/суффиксы_производителей.md",
-            },
-            {
-                "code": "LLB",
-                "manufacturer": "NTN",
-                "type": "sealing",
-                "description": "Две неконтактные манжеты",
-                "snr_equivalent": "",
-                "notes": "Контактное уплотнение по схеме производителя",
-                "source": "Таблицы/суффиксы_производителей.md",
-            },
-            {
-                "code": "LLU",
-                "manufacturer": "NTN",
-                "type": "sealing",
-                "description": "Две резиновые уплотнения",
-                "snr_equivalent": "2RU",
-                "notes": "Повышенная защита от загрязнений",
-                "source": "Таблицы/суффиксы_производителей.md",
-            },
-            {
-                "code": "NR",
-                "manufacturer": "NSK",
-                "type": "retaining",
-                "description": "Канавка и стопорное кольцо на наружном кольце",
-                "snr_equivalent": "",
-                "notes": "Требует проверки посадочных канавок",
-                "source": "Таблицы/суффиксы_производителей.md",
-            },
-            {
-                "code": "P5",
-                "manufacturer": "ISO",
-                "type": "precision",
-                "description": "Повышенная точность по ISO 492",
-                "snr_equivalent": "",
-                "notes": "Применяется в высокоскоростных узлах",
-                "source": "ISO/суффиксы.md",
-            },
-            {
-                "code": "VA405",
-                "manufacturer": "SKF",
-                "type": "application",
-                "description": "Исполнение для вибронагруженных узлов",
-                "snr_equivalent": "",
-                "notes": "Используется в виброустановках",
-                "source": "ISO/суффиксы.md",
-            },
-            {
-                "code": "VV",
-                "manufacturer": "NSK",
-                "type": "sealing",
-                "description": "Две контактные манжеты",
-                "snr_equivalent": "",
-                "notes": "Стандартное исполнение для пыльных условий",
-                "source": "Таблицы/суффиксы_производителей.md",
-            },
-            {
-                "code": "W33",
-                "manufacturer": "SKF",
-                "type": "lubrication",
-                "description": "Смазочная канавка и отверстия",
-                "snr_equivalent": "",
-                "notes": "Требует подачи смазки через корпус",
-                "source": "ISO/суффиксы.md",
-            },
-            {
-                "code": "ZZ",
-                "manufacturer": "NSK",
-                "type": "shielding",
-                "description": "Две металлические защитные шайбы",
-                "snr_equivalent": "2Z",
-                "notes": "Защита от пыли при умеренных скоростях",
-                "source": "Таблицы/суффиксы_производителей.md",
-            },
-        ],
-    },
-}
+if __name__ == "__main__":
+    sys.exit(main())
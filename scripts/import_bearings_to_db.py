@@ -1,16 +1,41 @@
 #!/usr/bin/env python3
 """
 Скрипт импорта данных справочника подшипников в PostgreSQL
-Использование: python import_bearings_to_db.py
+Использование: python import_bearings_to_db.py [--workers N] [--sync]
+
+Строки CSV передаются потоком через COPY FROM STDIN во временную таблицу
+и сливаются в целевую одним запросом INSERT ... ON CONFLICT по
+естественному ключу таблицы (уникальные индексы uq_* в схеме). Повторный
+импорт обновляет записи, а не дублирует их. Независимые таблицы
+загружаются параллельно, каждая в своем подключении.
+
+Режим --sync применяет только изменения. Хеш исходных файлов каждой
+таблицы хранится в import_sources: если файлы не менялись, таблица не
+читается. Для измененных таблиц строки сравниваются по хешам с манифестом
+import_manifest (ключ строки -> хеш), и в БД попадают только новые и
+измененные строки; строки, исчезнувшие из CSV, удаляются. Полный импорт
+записывает манифест и хеши файлов в той же транзакции, что и данные,
+поэтому следующая синхронизация после него применяет только изменения.
+
+Уникальные индексы uq_* появились позже прежнего построчного импорта,
+который дубли не отсеивал. Перед созданием такого индекса в уже
+существующей таблице дубли по его ключу удаляются (остается строка с
+наибольшим id, то есть загруженная последней).
 """
 
+import argparse
+import csv
+import hashlib
+import io
+import json
 import os
+import re
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from decimal import Decimal, InvalidOperation
 from pathlib import Path
 
-import pandas as pd
-import psycopg2
-
 # Настройки подключения к базе данных
 DB_CONFIG = {
     "host": os.getenv("DB_HOST", "localhost"),
@@ -23,103 +48,165 @@ DB_CONFIG = {
 # Путь к каталогу с данными
 DATA_DIR = Path(__file__).parent.parent / "data"
 
+# Имя временной таблицы для COPY
+STAGE_TABLE = "import_stage"
 
-def connect_db():
-    """Подключение к базе данных"""
-    try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        print(f"✅ Подключено к базе данных: {DB_CONFIG['database']}")
-        return conn
-    except Exception as e:
-        print(f"❌ Ошибка подключения к БД: {e}")
-        sys.exit(1)
-
-
-def create_schema(conn):
-    """Создание схемы базы данных"""
-    schema_file = DATA_DIR / "schema" / "bearings_db_schema.sql"
+# CREATE UNIQUE INDEX в схеме: имя индекса, таблица, столбцы ключа
+UNIQUE_INDEX_PATTERN = re.compile(r"CREATE UNIQUE INDEX IF NOT EXISTS (\w+) ON (\w+)\s*\(([^)]*)\)", re.IGNORECASE)
 
-    if not schema_file.exists():
-        print(f"❌ Файл схемы не найден: {schema_file}")
-        return False
+# Размер пакета удалений и обновлений манифеста при синхронизации
+SYNC_BATCH = 1000
 
-    try:
-        with open(schema_file, encoding="utf-8") as f:
-            schema_sql = f.read()
-
-        cursor = conn.cursor()
-        cursor.execute(schema_sql)
-        conn.commit()
-        cursor.close()
+MANUFACTURER_COLUMNS = {
+    "Brand": "brand",
+    "Country": "country",
+    "Company": "company_name",
+    "Type": "manufacturer_type",
+    "Quality_Level": "quality_level",
+    "Specialization": "specialization",
+    "Website": "website",
+    "Notes": "notes",
+}
 
-        print("✅ Схема базы данных создана")
-        return True
-    except Exception as e:
-        print(f"❌ Ошибка создания схемы: {e}")
-        return False
+# Столбцы таблицы bearings: master_catalog.csv + нагрузки и скорости из bearing_dimensions.csv
+BEARING_COLUMNS = {
+    "GOST": "gost_designation",
+    "ISO": "iso_designation",
+    "SKF": "skf_designation",
+    "FAG": "fag_designation",
+    "NSK": "nsk_designation",
+    "NTN": "ntn_designation",
+    "KOYO": "koyo_designation",
+    "Type": "bearing_type",
+    "d": "bore_diameter_d",
+    "D": "outer_diameter_D",
+    "B": "width_B",
+    "r_min": "chamfer_r_min",
+    "Weight_kg": "weight_kg",
+    "Dynamic_Load_C_kN": "dynamic_load_C_kN",
+    "Static_Load_C0_kN": "static_load_C0_kN",
+    "Limiting_Speed_rpm": "limiting_speed_rpm",
+    "Reference_Speed_rpm": "reference_speed_rpm",
+    "Category": "category",
+    "Status": "status",
+}
+# Числовые столбцы bearings: столбец БД -> (точность, масштаб) как в схеме; масштаб 0 — INTEGER
+BEARING_TYPES = {
+    "bore_diameter_d": (10, 3),
+    "outer_diameter_D": (10, 3),
+    "width_B": (10, 3),
+    "chamfer_r_min": (10, 3),
+    "weight_kg": (10, 6),
+    "dynamic_load_C_kN": (10, 3),
+    "static_load_C0_kN": (10, 3),
+    "limiting_speed_rpm": (10, 0),
+    "reference_speed_rpm": (10, 0),
+}
+DIMENSION_COLUMNS = ["Dynamic_Load_C_kN", "Static_Load_C0_kN", "Limiting_Speed_rpm", "Reference_Speed_rpm"]
 
 
-def import_csv_to_table(conn, csv_file, table_name, column_mapping=None):
+class ImportJob:
     """
-    Импорт CSV файла в таблицу
+    Загрузка одной таблицы
 
     Args:
-        conn: Подключение к БД
-        csv_file: Путь к CSV файлу
-        table_name: Имя таблицы
-        column_mapping: Словарь соответствия столбцов CSV -> БД
+        table: Целевая таблица
+        files: CSV файлы (относительно каталога данных)
+        columns: Соответствие столбцов CSV -> БД (остальные столбцы CSV не загружаются)
+        key: Естественный ключ таблицы (уникальный индекс для ON CONFLICT)
+        required: Столбцы NOT NULL: строки без них пропускаются
+        constants: Значения столбцов, одинаковые для всех строк
+        updated_at: В таблице есть столбец updated_at
+        types: Числовые столбцы БД -> (точность, масштаб): значения приводятся
+            к виду, который примет COPY, строки с неверными значениями пропускаются
     """
-    if not csv_file.exists():
-        print(f"⚠️  Файл не найден: {csv_file}")
-        return False
 
-    try:
-        # Чтение CSV
-        df = pd.read_csv(csv_file, encoding="utf-8")
-
-        # Переименование столбцов если нужно
-        if column_mapping:
-            df = df.rename(columns=column_mapping)
+    def __init__(
+        self,
+        table: str,
+        files: list[str],
+        columns: dict[str, str],
+        key: tuple[str, ...],
+        required: tuple[str, ...] = (),
+        constants: dict[str, str] | None = None,
+        updated_at: bool = False,
+        types: dict[str, tuple[int, int]] | None = None,
+    ):
+        self.table = table
+        self.files = files
+        self.columns = columns
+        self.key = key
+        self.required = required
+        self.constants = constants or {}
+        self.updated_at = updated_at
+        self.types = types or {}
+
+    @property
+    def db_columns(self) -> list[str]:
+        return list(self.columns.values()) + list(self.constants)
+
+    def source_files(self) -> list[str]:
+        """Все файлы, из которых читаются строки таблицы"""
+        return list(self.files)
+
+    def prepare(self, row: dict) -> bool:
+        """
+        Проверить строку перед COPY: обязательные столбцы заполнены, числа приводятся к типам БД
 
-        # Подготовка данных для вставки
-        cursor = conn.cursor()
+        Одно неверное значение иначе прервало бы COPY всей таблицы.
 
-        # Формирование SQL запроса
-        columns = ", ".join(df.columns)
-        placeholders = ", ".join(["%s"] * len(df.columns))
-        insert_sql = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+        Returns:
+            False, если строку нужно пропустить
+        """
+        if any(row.get(column) is None for column in self.required):
+            return False
+        try:
+            for column, (precision, scale) in self.types.items():
+                row[column] = coerce_number(row.get(column), precision, scale)
+        except ValueError:
+            return False
+        return True
 
-        # Вставка данных
-        rows_inserted = 0
-        for _, row in df.iterrows():
-            try:
-                cursor.execute(insert_sql, tuple(row))
-                rows_inserted += 1
-            except Exception as e:
-                print(f"⚠️  Ошибка вставки строки: {e}")
+    def read_rows(self, data_dir: Path):
+        """Строки для загрузки: словари по столбцам БД"""
+        for name in self.files:
+            path = data_dir / name
+            if not path.exists():
+                print(f"⚠️  Файл не найден: {path}")
                 continue
+            with open(path, encoding="utf-8", newline="") as f:
+                for row in csv.DictReader(f):
+                    values = {column: clean_value(row.get(source)) for source, column in self.columns.items()}
+                    values.update(self.constants)
+                    yield values
 
-        conn.commit()
-        cursor.close()
 
-        print(f"✅ Импортировано {rows_inserted}/{len(df)} записей в {table_name}")
-        return True
+class BearingsImportJob(ImportJob):
+    """Основной каталог: master_catalog.csv, дополненный нагрузками и скоростями по обозначению ISO"""
 
-    except Exception as e:
-        print(f"❌ Ошибка импорта {csv_file.name}: {e}")
-        return False
+    dimensions_file = "dimensions/bearing_dimensions.csv"
 
+    def source_files(self) -> list[str]:
+        return super().source_files() + [self.dimensions_file]
 
-def import_all_data(conn):
-    """Импорт всех данных из CSV файлов"""
+    def read_rows(self, data_dir: Path):
+        dimensions_path = data_dir / self.dimensions_file
+        dimensions = {}
+        if dimensions_path.exists():
+            with open(dimensions_path, encoding="utf-8", newline="") as f:
+                dimensions = {row["Designation"]: row for row in csv.DictReader(f)}
+
+        for row in super().read_rows(data_dir):
+            extra = dimensions.get(row["iso_designation"], {})
+            for source in DIMENSION_COLUMNS:
+                row[self.columns[source]] = clean_value(extra.get(source))
+            yield row
 
-    print("\n📊 Начало импорта данных...")
 
-    # 1. Импорт классов точности
-    import_csv_to_table(
-        conn,
-        DATA_DIR / "csv" / "tolerance_classes.csv",
+IMPORT_JOBS = [
+    ImportJob(
         "tolerance_classes",
+        ["csv/tolerance_classes.csv"],
         {
             "GOST": "gost_class",
             "ISO": "iso_class",
@@ -127,81 +214,25 @@ def import_all_data(conn):
             "Описание": "description",
             "Применение": "applications",
         },
-    )
-
-    # 2. Импорт производителей СНГ
-    import_csv_to_table(
-        conn,
-        DATA_DIR / "brands" / "manufacturers_cis.csv",
-        "manufacturers",
-        {
-            "Brand": "brand",
-            "Country": "country",
-            "Company": "company_name",
-            "Type": "manufacturer_type",
-            "Quality_Level": "quality_level",
-            "Specialization": "specialization",
-            "Website": "website",
-            "Notes": "notes",
-        },
-    )
-
-    # 3. Импорт производителей Европы
-    import_csv_to_table(
-        conn,
-        DATA_DIR / "brands" / "manufacturers_europe.csv",
-        "manufacturers",
-        {
-            "Brand": "brand",
-            "Country": "country",
-            "Company": "company_name",
-            "Type": "manufacturer_type",
-            "Quality_Level": "quality_level",
-            "Specialization": "specialization",
-            "Website": "website",
-            "Notes": "notes",
-        },
-    )
-
-    # 4. Импорт производителей Азии
-    import_csv_to_table(
-        conn,
-        DATA_DIR / "brands" / "manufacturers_asia.csv",
-        "manufacturers",
-        {
-            "Brand": "brand",
-            "Country": "country",
-            "Company": "company_name",
-            "Type": "manufacturer_type",
-            "Quality_Level": "quality_level",
-            "Specialization": "specialization",
-            "Website": "website",
-            "Notes": "notes",
-        },
-    )
-
-    # 5. Импорт производителей Китая
-    import_csv_to_table(
-        conn,
-        DATA_DIR / "brands" / "manufacturers_china.csv",
+        key=("gost_class", "iso_class"),
+        required=("gost_class", "iso_class"),
+    ),
+    ImportJob(
         "manufacturers",
-        {
-            "Brand": "brand",
-            "Country": "country",
-            "Company": "company_name",
-            "Type": "manufacturer_type",
-            "Quality_Level": "quality_level",
-            "Specialization": "specialization",
-            "Website": "website",
-            "Notes": "notes",
-        },
-    )
-
-    # 6. Импорт аналогов ГОСТ -> ISO
-    import_csv_to_table(
-        conn,
-        DATA_DIR / "analogs" / "gost_to_iso.csv",
+        [
+            "brands/manufacturers_cis.csv",
+            "brands/manufacturers_europe.csv",
+            "brands/manufacturers_asia.csv",
+            "brands/manufacturers_china.csv",
+        ],
+        MANUFACTURER_COLUMNS,
+        key=("brand",),
+        required=("brand", "country", "company_name"),
+        updated_at=True,
+    ),
+    ImportJob(
         "analogs",
+        ["analogs/gost_to_iso.csv"],
         {
             "GOST": "source_designation",
             "ISO": "target_designation",
@@ -209,25 +240,14 @@ def import_all_data(conn):
             "Notes": "notes",
             "Source": "source_reference",
         },
-    )
-
-    # Добавить source_standard и target_standard для аналогов
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        UPDATE analogs
-        SET source_standard = 'GOST', target_standard = 'ISO'
-        WHERE source_standard IS NULL AND target_standard IS NULL
-    """
-    )
-    conn.commit()
-    cursor.close()
-
-    # 7. Импорт дополнительных обозначений
-    import_csv_to_table(
-        conn,
-        DATA_DIR / "analogs" / "additional_designations.csv",
+        key=("source_standard", "source_designation", "target_standard", "target_designation"),
+        required=("source_designation", "target_designation"),
+        constants={"source_standard": "GOST", "target_standard": "ISO"},
+        updated_at=True,
+    ),
+    ImportJob(
         "additional_designations",
+        ["analogs/additional_designations.csv"],
         {
             "GOST_Suffix": "gost_suffix",
             "ISO_Suffix": "iso_suffix",
@@ -238,21 +258,19 @@ def import_all_data(conn):
             "Description": "description",
             "Notes": "notes",
         },
-    )
-
-    # 8. Импорт кодов ТН ВЭД
-    import_csv_to_table(
-        conn,
-        DATA_DIR / "csv" / "tn_ved_codes.csv",
+        key=("gost_suffix", "iso_suffix"),
+        required=("gost_suffix", "iso_suffix", "description"),
+    ),
+    ImportJob(
         "tn_ved_codes",
+        ["csv/tn_ved_codes.csv"],
         {"Code": "code", "Description": "description", "Type": "bearing_type", "Notes": "notes"},
-    )
-
-    # 9. Импорт подшипниковых узлов
-    import_csv_to_table(
-        conn,
-        DATA_DIR / "csv" / "bearing_units.csv",
+        key=("code",),
+        required=("code", "description"),
+    ),
+    ImportJob(
         "bearing_units",
+        ["csv/bearing_units.csv"],
         {
             "Unit_Type": "unit_type",
             "Series": "series",
@@ -261,89 +279,548 @@ def import_all_data(conn):
             "Shaft_Fixing": "shaft_fixing",
             "Typical_Applications": "typical_applications",
         },
+        key=("unit_type", "series"),
+        required=("unit_type", "series"),
+    ),
+    BearingsImportJob(
+        "bearings",
+        ["csv/master_catalog.csv"],
+        BEARING_COLUMNS,
+        key=("iso_designation",),
+        required=("iso_designation", "bearing_type", "bore_diameter_d", "outer_diameter_D", "width_B"),
+        updated_at=True,
+        types=BEARING_TYPES,
+    ),
+]
+
+
+def clean_value(value: str | None) -> str | None:
+    """Пустое значение CSV -> NULL"""
+    if value is None:
+        return None
+    value = value.strip()
+    return value or None
+
+
+def coerce_number(value: str | None, precision: int, scale: int) -> str | None:
+    """
+    Число из CSV -> текст для COPY в NUMERIC(precision, scale) или INTEGER (scale=0)
+
+    Допускаются запятая вместо точки и пробелы между разрядами ("1 234,5").
+
+    Raises:
+        ValueError: не число или не помещается в столбец
+    """
+    if value is None:
+        return None
+    text = value.replace(" ", "").replace("\u00a0", "").replace(",", ".")
+    try:
+        number = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"не число: {value!r}") from None
+    if not number.is_finite() or abs(number) >= 10 ** (precision - scale):
+        raise ValueError(f"вне диапазона: {value!r}")
+    if scale == 0:
+        if number != number.to_integral_value() or abs(number) > 2**31 - 1:
+            raise ValueError(f"не целое: {value!r}")
+        return str(int(number))
+    return format(number, "f")
+
+
+class CopyStream:
+    """
+    Файлоподобный поток строк в формате CSV для COPY FROM STDIN
+
+    Строки формируются по мере чтения, поэтому таблица не собирается в памяти.
+    """
+
+    def __init__(self, rows, columns: list[str]):
+        self._rows = iter(rows)
+        self._columns = columns
+        self._buffer = ""
+        self._line = io.StringIO()
+        self._writer = csv.writer(self._line, lineterminator="\n")
+        self.count = 0
+
+    def _next_line(self) -> str | None:
+        row = next(self._rows, None)
+        if row is None:
+            return None
+        self._line.seek(0)
+        self._line.truncate()
+        self._writer.writerow([row.get(column) for column in self._columns])
+        self.count += 1
+        return self._line.getvalue()
+
+    def read(self, size: int = -1) -> str:
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            line = self._next_line()
+            if line is None:
+                break
+            chunks.append(line)
+            length += len(line)
+        data = "".join(chunks)
+        if size < 0:
+            size = len(data)
+        self._buffer = data[size:]
+        return data[:size]
+
+    def readline(self, size: int = -1) -> str:
+        if self._buffer:
+            line, self._buffer = self._buffer, ""
+            return line
+        return self._next_line() or ""
+
+
+def stage_sql(table: str, columns: list[str]) -> list[str]:
+    """Временная таблица со столбцами целевой (те же типы) и номером строки"""
+    return [
+        f"CREATE TEMP TABLE {STAGE_TABLE} ON COMMIT DROP AS SELECT {', '.join(columns)} FROM {table} WITH NO DATA",
+        f"ALTER TABLE {STAGE_TABLE} ADD COLUMN _line BIGSERIAL",
+    ]
+
+
+def copy_sql(columns: list[str]) -> str:
+    return f"COPY {STAGE_TABLE} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+
+
+def merge_sql(table: str, columns: list[str], key: tuple[str, ...], updated_at: bool = False) -> str:
+    """
+    Слияние временной таблицы с целевой
+
+    Из строк с одинаковым ключом берется последняя; существующие записи обновляются.
+    """
+    column_list = ", ".join(columns)
+    key_list = ", ".join(key)
+    updates = [f"{column} = EXCLUDED.{column}" for column in columns if column not in key]
+    if updated_at:
+        updates.append("updated_at = CURRENT_TIMESTAMP")
+    action = f"DO UPDATE SET {', '.join(updates)}" if updates else "DO NOTHING"
+    return (
+        f"INSERT INTO {table} ({column_list}) "
+        f"SELECT DISTINCT ON ({key_list}) {column_list} FROM {STAGE_TABLE} ORDER BY {key_list}, _line DESC "
+        f"ON CONFLICT ({key_list}) {action}"
     )
 
-    # 10. Импорт основного каталога подшипников
-    # Этот импорт более сложный, так как нужно объединить данные из master_catalog и bearing_dimensions
+
+def connect_db():
+    """Подключение к базе данных"""
+    import psycopg2
+
+    return psycopg2.connect(**DB_CONFIG)
+
+
+def unique_indexes(schema_sql: str) -> list[tuple[str, str, list[str]]]:
+    """Уникальные индексы схемы: (индекс, таблица, столбцы ключа)"""
+    return [
+        (index, table, [column.strip() for column in columns.split(",")])
+        for index, table, columns in UNIQUE_INDEX_PATTERN.findall(schema_sql)
+    ]
+
+
+def dedupe_sql(table: str, key: list[str]) -> str:
+    """Удалить строки, у которых есть более поздняя (больший id) с тем же ключом"""
+    condition = " AND ".join(f"newer.{column} = t.{column}" for column in key)
+    return f"DELETE FROM {table} AS t WHERE EXISTS (SELECT 1 FROM {table} newer WHERE {condition} AND newer.id > t.id)"
+
+
+def remove_duplicates(cursor, schema_sql: str) -> dict[str, int]:
+    """
+    Миграция БД прежнего импорта: убрать дубли по ключу каждого еще не созданного уникального индекса
+
+    Returns:
+        Таблица -> число удаленных строк
+    """
+    removed = {}
+    for index, table, key in unique_indexes(schema_sql):
+        cursor.execute("SELECT to_regclass(%s), to_regclass(%s)", (table, index))
+        table_exists, index_exists = cursor.fetchone()
+        if table_exists is None or index_exists is not None:
+            continue
+        cursor.execute(dedupe_sql(table, key))
+        if cursor.rowcount:
+            removed[table] = cursor.rowcount
+    return removed
+
+
+def create_schema(conn):
+    """Создание схемы базы данных (с удалением дублей перед новыми уникальными индексами)"""
+    schema_file = DATA_DIR / "schema" / "bearings_db_schema.sql"
+
+    if not schema_file.exists():
+        print(f"❌ Файл схемы не найден: {schema_file}")
+        return False
+
     try:
-        master = pd.read_csv(DATA_DIR / "csv" / "master_catalog.csv")
-        dimensions = pd.read_csv(DATA_DIR / "dimensions" / "bearing_dimensions.csv")
-
-        # Объединение по ISO обозначению
-        combined = master.merge(
-            dimensions[
-                ["Designation", "Dynamic_Load_C_kN", "Static_Load_C0_kN", "Limiting_Speed_rpm", "Reference_Speed_rpm"]
-            ],
-            left_on="ISO",
-            right_on="Designation",
-            how="left",
-        )
+        with open(schema_file, encoding="utf-8") as f:
+            schema_sql = f.read()
 
         cursor = conn.cursor()
+        removed = remove_duplicates(cursor, schema_sql)
+        cursor.execute(schema_sql)
+        conn.commit()
+        cursor.close()
+
+        for table, count in removed.items():
+            print(f"🧹 {table}: удалено дублей по ключу уникального индекса: {count}")
+
+        print("✅ Схема базы данных создана")
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Ошибка создания схемы: {e}")
+        return False
+
+
+def _copy_merge(cursor, job: ImportJob, rows) -> tuple[int, int]:
+    """COPY строк во временную таблицу и слияние с целевой; возвращает (загружено, слито)"""
+    columns = job.db_columns
+    stream = CopyStream(rows, columns)
+    for statement in stage_sql(job.table, columns):
+        cursor.execute(statement)
+    cursor.copy_expert(copy_sql(columns), stream)
+    cursor.execute(merge_sql(job.table, columns, job.key, job.updated_at))
+    return stream.count, cursor.rowcount
+
+
+def import_table(conn, job: ImportJob, data_dir: Path = DATA_DIR) -> dict:
+    """
+    Загрузить таблицу: COPY во временную таблицу и INSERT ... ON CONFLICT в целевую
+
+    Манифест таблицы заменяется хешами загруженных строк, хеш исходных
+    файлов сохраняется в import_sources — как после синхронизации.
+
+    Returns:
+        Статистика: rows (загружено), skipped (без обязательных столбцов или с неверными числами), merged, seconds
+    """
+    started = time.perf_counter()
+    # Хеш до чтения: если файлы изменятся во время импорта, следующая синхронизация это увидит
+    digest = source_hash(job, data_dir)
+    columns = job.db_columns
+    hashes: dict[str, str] = {}
+    kept: set[str] = set()
+    skipped = 0
+
+    def rows():
+        nonlocal skipped
+        for row in job.read_rows(data_dir):
+            if not job.prepare(row):
+                skipped += 1
+                key = skipped_key(job, row)
+                if key is not None:
+                    kept.add(key)
+                continue
+            # Из строк с одинаковым ключом действует последняя — как в merge_sql
+            hashes[row_key(row, job.key)] = row_hash(row, columns)
+            yield row
+
+    try:
+        with conn.cursor() as cursor:
+            count, merged = _copy_merge(cursor, job, rows())
+            # Записи пропущенных строк остаются в манифесте с прежним хешем — как при синхронизации
+            cursor.execute(
+                "DELETE FROM import_manifest WHERE table_name = %s AND NOT (row_key = ANY(%s))",
+                (job.table, list(hashes.keys() | kept)),
+            )
+            _save_manifest(cursor, job.table, hashes)
+            _save_source_hash(cursor, job.table, digest)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return {
+        "table": job.table,
+        "rows": count,
+        "skipped": skipped,
+        "merged": merged,
+        "seconds": time.perf_counter() - started,
+    }
+
 
-        for _, row in combined.iterrows():
+def _run_job(job: ImportJob, data_dir: Path, connect) -> dict:
+    conn = connect()
+    try:
+        return import_table(conn, job, data_dir)
+    finally:
+        conn.close()
+
+
+def import_all_data(jobs=IMPORT_JOBS, data_dir: Path = DATA_DIR, workers: int = 4, connect=connect_db) -> list[dict]:
+    """Импорт всех таблиц: каждая таблица в отдельном подключении, до workers одновременно"""
+
+    print("\n📊 Начало импорта данных...")
+
+    started = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_run_job, job, data_dir, connect): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
             try:
+                stats = future.result()
+            except Exception as e:
+                print(f"❌ Ошибка импорта {job.table}: {e}")
+                continue
+            rate = stats["rows"] / stats["seconds"] if stats["seconds"] else 0
+            message = f"✅ {stats['table']}: {stats['rows']} записей за {stats['seconds']:.2f} с ({rate:.0f} записей/с)"
+            if stats["skipped"]:
+                message += f", пропущено с пустыми обязательными полями или неверными числами: {stats['skipped']}"
+            print(message)
+            results.append(stats)
+
+    total = sum(stats["rows"] for stats in results)
+    print(f"\n✅ Импорт данных завершён: {total} записей за {time.perf_counter() - started:.2f} с")
+    return results
+
+
+def source_hash(job: ImportJob, data_dir: Path = DATA_DIR) -> str:
+    """Хеш исходных файлов таблицы и описания загрузки (смена столбцов тоже считается изменением)"""
+    digest = hashlib.sha1(repr((job.table, job.columns, job.key, job.constants)).encode("utf-8"))
+    for name in job.source_files():
+        path = data_dir / name
+        digest.update(name.encode("utf-8"))
+        if not path.exists():
+            continue
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def row_key(row: dict, key: tuple[str, ...]) -> str:
+    return json.dumps([row[column] for column in key], ensure_ascii=False)
+
+
+def row_hash(row: dict, columns: list[str]) -> str:
+    return hashlib.sha1(json.dumps([row.get(column) for column in columns], ensure_ascii=False).encode()).hexdigest()
+
+
+def skipped_key(job: ImportJob, row: dict) -> str | None:
+    """
+    Ключ строки, не прошедшей prepare, если ключевые столбцы заполнены
+
+    Запись с таким ключом в БД не трогается ни полным импортом, ни
+    синхронизацией: неверная строка CSV не удаляет существующую запись.
+    """
+    if any(row.get(column) is None for column in job.key):
+        return None
+    return row_key(row, job.key)
+
+
+def diff_rows(job: ImportJob, rows, manifest: dict[str, str]) -> dict:
+    """
+    Сравнить строки CSV с манифестом таблицы
+
+    Args:
+        rows: Строки из job.read_rows
+        manifest: Ключ строки -> хеш, сохраненные при прошлой синхронизации
+
+    Returns:
+        upserts (новые и измененные строки), inserted, updated, deleted (ключи),
+        hashes (ключ -> хеш для upserts), skipped (без обязательных столбцов или с неверными числами).
+        Ключи пропущенных строк считаются неизмененными и в deleted не попадают.
+    """
+    columns = job.db_columns
+    current: dict[str, dict] = {}
+    kept: set[str] = set()
+    skipped = 0
+    for row in rows:
+        if not job.prepare(row):
+            skipped += 1
+            key = skipped_key(job, row)
+            if key is not None:
+                kept.add(key)
+            continue
+        # Из строк с одинаковым ключом действует последняя, как и при полном импорте
+        current[row_key(row, job.key)] = row
+
+    upserts, hashes, inserted, updated = [], {}, 0, 0
+    for key, row in current.items():
+        digest = row_hash(row, columns)
+        previous = manifest.get(key)
+        if previous == digest:
+            continue
+        if previous is None:
+            inserted += 1
+        else:
+            updated += 1
+        upserts.append(row)
+        hashes[key] = digest
+
+    return {
+        "upserts": upserts,
+        "hashes": hashes,
+        "inserted": inserted,
+        "updated": updated,
+        "deleted": [key for key in manifest if key not in current and key not in kept],
+        "skipped": skipped,
+    }
+
+
+def _batches(items: list, size: int = SYNC_BATCH):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _save_manifest(cursor, table: str, hashes: dict[str, str]):
+    """Записать хеши строк таблицы в import_manifest (ключ строки -> хеш)"""
+    from psycopg2.extras import execute_values
+
+    for batch in _batches(list(hashes.items())):
+        execute_values(
+            cursor,
+            "INSERT INTO import_manifest (table_name, row_key, row_hash) VALUES %s "
+            "ON CONFLICT (table_name, row_key) DO UPDATE SET row_hash = EXCLUDED.row_hash",
+            [(table, key, value) for key, value in batch],
+            page_size=SYNC_BATCH,
+        )
+
+
+def _save_source_hash(cursor, table: str, digest: str):
+    cursor.execute(
+        "INSERT INTO import_sources (table_name, source_hash) VALUES (%s, %s) "
+        "ON CONFLICT (table_name) DO UPDATE SET source_hash = EXCLUDED.source_hash, "
+        "synced_at = CURRENT_TIMESTAMP",
+        (table, digest),
+    )
+
+
+def sync_table(conn, job: ImportJob, data_dir: Path = DATA_DIR, digest: str | None = None) -> dict:
+    """
+    Применить к таблице изменения CSV относительно манифеста (одна транзакция)
+
+    Returns:
+        Статистика: inserted, updated, deleted, skipped, seconds
+    """
+    from psycopg2.extras import execute_values
+
+    started = time.perf_counter()
+    digest = digest or source_hash(job, data_dir)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT row_key, row_hash FROM import_manifest WHERE table_name = %s", (job.table,))
+            diff = diff_rows(job, job.read_rows(data_dir), dict(cursor.fetchall()))
+
+            if diff["upserts"]:
+                _copy_merge(cursor, job, diff["upserts"])
+                _save_manifest(cursor, job.table, diff["hashes"])
+
+            key_columns = ", ".join(job.key)
+            condition = " AND ".join(f"t.{column} = v.{column}" for column in job.key)
+            for batch in _batches(diff["deleted"]):
+                execute_values(
+                    cursor,
+                    f"DELETE FROM {job.table} t USING (VALUES %s) AS v ({key_columns}) WHERE {condition}",
+                    [json.loads(key) for key in batch],
+                    page_size=SYNC_BATCH,
+                )
                 cursor.execute(
-                    """
-                    INSERT INTO bearings (
-                        gost_designation, iso_designation, skf_designation,
-                        fag_designation, nsk_designation, ntn_designation,
-                        koyo_designation, bearing_type, bore_diameter_d,
-                        outer_diameter_D, width_B, chamfer_r_min, weight_kg,
-                        dynamic_load_C_kN, static_load_C0_kN,
-                        limiting_speed_rpm, reference_speed_rpm, category, status
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                    (
-                        row["GOST"],
-                        row["ISO"],
-                        row["SKF"],
-                        row["FAG"],
-                        row["NSK"],
-                        row["NTN"],
-                        row["KOYO"],
-                        row["Type"],
-                        row["d"],
-                        row["D"],
-                        row["B"],
-                        row["r_min"],
-                        row["Weight_kg"],
-                        row.get("Dynamic_Load_C_kN"),
-                        row.get("Static_Load_C0_kN"),
-                        row.get("Limiting_Speed_rpm"),
-                        row.get("Reference_Speed_rpm"),
-                        row["Category"],
-                        row["Status"],
-                    ),
+                    "DELETE FROM import_manifest WHERE table_name = %s AND row_key = ANY(%s)", (job.table, batch)
                 )
+
+            _save_source_hash(cursor, job.table, digest)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return {
+        "table": job.table,
+        "inserted": diff["inserted"],
+        "updated": diff["updated"],
+        "deleted": len(diff["deleted"]),
+        "skipped": diff["skipped"],
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def _run_sync(job: ImportJob, data_dir: Path, digest: str, connect) -> dict:
+    conn = connect()
+    try:
+        return sync_table(conn, job, data_dir, digest)
+    finally:
+        conn.close()
+
+
+def sync_all_data(jobs=IMPORT_JOBS, data_dir: Path = DATA_DIR, workers: int = 4, connect=connect_db) -> list[dict]:
+    """
+    Синхронизация: загружаются только таблицы с измененными файлами и только измененные строки
+
+    Перед синхронизацией выполняется DDL схемы (идемпотентный, IF NOT EXISTS): в БД, созданной
+    старой схемой, появляются таблицы манифеста import_manifest и import_sources.
+    """
+    print("\n🔄 Синхронизация данных...")
+
+    started = time.perf_counter()
+    conn = connect()
+    try:
+        if not create_schema(conn):
+            return []
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT table_name, source_hash FROM import_sources")
+            synced = dict(cursor.fetchall())
+        conn.commit()
+    finally:
+        conn.close()
+
+    digests = {job.table: source_hash(job, data_dir) for job in jobs}
+    changed = [job for job in jobs if synced.get(job.table) != digests[job.table]]
+    if not changed:
+        print(f"✅ Изменений нет ({time.perf_counter() - started:.2f} с)")
+        return []
+
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_run_sync, job, data_dir, digests[job.table], connect): job for job in changed}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                stats = future.result()
             except Exception as e:
-                print(f"⚠️  Ошибка вставки подшипника {row['ISO']}: {e}")
+                print(f"❌ Ошибка синхронизации {job.table}: {e}")
                 continue
+            print(
+                f"✅ {stats['table']}: добавлено {stats['inserted']}, обновлено {stats['updated']}, "
+                f"удалено {stats['deleted']} за {stats['seconds']:.2f} с"
+            )
+            results.append(stats)
 
-        conn.commit()
-        cursor.close()
-        print(f"✅ Импортировано подшипников в основной каталог: {len(combined)}")
+    print(f"\n✅ Синхронизация завершена за {time.perf_counter() - started:.2f} с")
+    return results
 
-    except Exception as e:
-        print(f"❌ Ошибка импорта основного каталога: {e}")
 
-    print("\n✅ Импорт данных завершён!")
+def full_import(workers: int = 4) -> list[dict]:
+    """Полный импорт: создание схемы отдельным подключением, затем загрузка всех таблиц"""
+    conn = connect_db()
+    print(f"✅ Подключено к базе данных: {DB_CONFIG['database']}")
+    try:
+        if not create_schema(conn):
+            return []
+    finally:
+        conn.close()
+    return import_all_data(workers=workers)
 
 
 def main():
     """Главная функция"""
+    parser = argparse.ArgumentParser(description="Импорт справочника подшипников в PostgreSQL")
+    parser.add_argument("--workers", type=int, default=4, help="Число таблиц, загружаемых одновременно")
+    parser.add_argument("--sync", action="store_true", help="Применить только изменения CSV с прошлой синхронизации")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Импорт данных справочника подшипников в PostgreSQL")
     print("=" * 60)
 
-    # Подключение к БД
-    conn = connect_db()
-
     try:
-        # Создание схемы
-        if create_schema(conn):
-            # Импорт данных
-            import_all_data(conn)
+        if args.sync:
+            # Синхронизация сама открывает подключения и дополняет схему
+            sync_all_data(workers=args.workers)
+        else:
+            full_import(workers=args.workers)
 
         print("\n" + "=" * 60)
         print("✅ Процесс завершён успешно!")
@@ -351,10 +828,7 @@ def main():
 
     except Exception as e:
         print(f"\n❌ Критическая ошибка: {e}")
-
-    finally:
-        conn.close()
-        print("\n🔌 Подключение к БД закрыто")
+        sys.exit(1)
 
 
 if __name__ == "__main__":
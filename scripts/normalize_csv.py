@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""Streaming sort and deduplication of large CSV files (external merge sort).
+
+Rows are read in chunks of ``chunk_rows``. Worker processes sort each chunk and
+spill it to a temporary run file; the runs are then merged with a k-way
+``heapq.merge``. Memory is bounded by a few chunks plus one block per run,
+whatever the size of the input.
+
+Rules are the same as in ``schemas/*.yaml`` and ``DatasetSpec``:
+
+- ``unique``: the first row (in input order) of every unique key is kept;
+- ``sort_by``: rows are ordered by these columns, ties keep input order;
+  number columns (``numeric``) compare as floats, empty cells as 0, as in
+  the schema validator.
+
+Deduplication happens while merging runs ordered by the unique key. When
+``sort_by`` is the unique key itself, that merge already produces the final
+order; otherwise the surviving rows go through a second external sort.
+
+Usage:
+    python scripts/normalize_csv.py --table nomenclature
+    python scripts/normalize_csv.py input.csv -o output.csv --sort-by Brand "Product Name" --unique Brand
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import functools
+import heapq
+import itertools
+import operator
+import os
+import pickle
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.validate.schema import TableSchema, load_schemas  # noqa: E402
+
+CHUNK_ROWS = 200_000
+# Rows per pickled block of a run file: one block per run is held in memory while merging
+BLOCK_ROWS = 2_000
+# Runs merged at once; more runs are first merged in groups into longer runs
+MAX_FANIN = 64
+
+# Key part of one column: (column index, compare as number, strip whitespace)
+KeySpec = list[tuple[int, bool, bool]]
+
+
+@dataclass
+class NormalizeStats:
+    """Counters of one normalization."""
+
+    rows: int = 0
+    written: int = 0
+    removed: int = 0
+    runs: int = 0
+    # (line, unique key) of removed duplicates with the smallest line numbers
+    duplicates: list[tuple[int, tuple]] = field(default_factory=list)
+
+
+def _number_key(value: str) -> tuple:
+    try:
+        number = float(value or 0)
+    except ValueError:
+        number = None
+    # Invalid numbers (and NaN, which has no order) sort after all numbers, as text
+    return (0, number) if number is not None and number == number else (1, value)
+
+
+def _row_key(row: list[str], spec: KeySpec) -> tuple:
+    parts = []
+    for index, numeric, strip in spec:
+        value = row[index] if index < len(row) else ""
+        if strip:
+            value = value.strip()
+        parts.append(_number_key(value) if numeric else value)
+    return tuple(parts)
+
+
+def _key_function(spec: KeySpec) -> Callable[[list[str]], tuple]:
+    """Key of a row; plain text columns of full rows are taken with itemgetter"""
+    if not spec or any(numeric or strip for _, numeric, strip in spec):
+        return functools.partial(_row_key, spec=spec)
+    getter = operator.itemgetter(*(index for index, _, _ in spec))
+    return getter if len(spec) > 1 else lambda row: (getter(row),)
+
+
+def _write_blocks(items: Iterable[tuple], tmp_dir: str | None) -> str:
+    handle, path = tempfile.mkstemp(prefix="run-", suffix=".pickle", dir=tmp_dir)
+    with os.fdopen(handle, "wb") as out:
+        block = []
+        for item in items:
+            block.append(item)
+            if len(block) >= BLOCK_ROWS:
+                pickle.dump(block, out, pickle.HIGHEST_PROTOCOL)
+                block = []
+        if block:
+            pickle.dump(block, out, pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _sort_run(chunk: list[tuple[int, list[str]]], spec: KeySpec, tmp_dir: str | None) -> str:
+    """Sort a chunk of (line, row) by (key, line) and spill it to a run file (runs in worker processes)."""
+    key = _key_function(spec)
+    # Line numbers are unique, so plain tuple order is (key, line) and rows are never compared
+    items = [(key(row), line, row) for line, row in chunk]
+    items.sort()
+    return _write_blocks(items, tmp_dir)
+
+
+def _read_run(path: str) -> Iterator[tuple]:
+    try:
+        with open(path, "rb") as run:
+            while True:
+                try:
+                    block = pickle.load(run)
+                except EOFError:
+                    return
+                yield from block
+    finally:
+        os.unlink(path)
+
+
+def _merge(paths: list[str]) -> Iterator[tuple]:
+    return heapq.merge(*(_read_run(path) for path in paths))
+
+
+class ExternalSorter:
+    """
+    External merge sort of CSV rows
+
+    Args:
+        chunk_rows: Rows sorted in memory per run
+        workers: Processes generating runs (CPU count by default; 1 sorts in this process)
+        tmp_dir: Directory for run files (system temp by default)
+    """
+
+    def __init__(self, chunk_rows: int = CHUNK_ROWS, workers: int | None = None, tmp_dir: str | None = None):
+        self.chunk_rows = chunk_rows
+        self.workers = workers or os.cpu_count() or 1
+        self.tmp_dir = tmp_dir
+        self.rows = 0
+        self.runs = 0
+
+    def _runs(self, rows: Iterable[tuple[int, list[str]]], spec: KeySpec) -> list[str]:
+        chunks = map(self._counted, iter(lambda: list(itertools.islice(rows, self.chunk_rows)), []))
+        head = list(itertools.islice(chunks, 2)) if self.workers > 1 else []
+        if len(head) < 2:
+            paths = [_sort_run(chunk, spec, self.tmp_dir) for chunk in itertools.chain(head, chunks)]
+        else:
+            paths = []
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                # At most workers + 1 chunks are in flight, so memory stays bounded
+                pending = []
+                for chunk in itertools.chain(head, chunks):
+                    pending.append(pool.submit(_sort_run, chunk, spec, self.tmp_dir))
+                    if len(pending) > self.workers:
+                        paths.append(pending.pop(0).result())
+                paths.extend(future.result() for future in pending)
+        self.runs += len(paths)
+
+        while len(paths) > MAX_FANIN:
+            groups = [paths[i : i + MAX_FANIN] for i in range(0, len(paths), MAX_FANIN)]
+            paths = [_write_blocks(_merge(group), self.tmp_dir) for group in groups]
+        return paths
+
+    def _counted(self, chunk: list) -> list:
+        self.rows += len(chunk)
+        return chunk
+
+    def sort(self, rows: Iterable[tuple[int, list[str]]], spec: KeySpec) -> Iterator[tuple]:
+        """(key, line, row) ordered by (key, line)"""
+        return _merge(self._runs(iter(rows), spec))
+
+
+def normalize_rows(
+    rows: Iterable[list[str]],
+    header: list[str],
+    sort_by: list[str],
+    unique: list[str],
+    numeric: Iterable[str] = (),
+    strip_keys: bool = False,
+    stats: NormalizeStats | None = None,
+    sample: int = 10,
+    first_line: int = 2,
+    **options,
+) -> Iterator[list[str]]:
+    """
+    Deduplicate and sort rows with bounded memory
+
+    Args:
+        rows: Data rows (lists of cells in header order)
+        header: Column names
+        sort_by: Sort columns
+        unique: Unique key columns (the first row of each key is kept)
+        numeric: Columns compared as numbers
+        strip_keys: Compare unique key cells without surrounding whitespace
+        stats: Counters to fill in
+        sample: How many removed duplicates to record in stats
+        first_line: Line number of the first row (for duplicate reports)
+        options: ExternalSorter options (chunk_rows, workers, tmp_dir)
+
+    Yields:
+        Rows in output order
+    """
+    stats = stats if stats is not None else NormalizeStats()
+    numeric = set(numeric)
+    position = {name: index for index, name in enumerate(header)}
+    missing = [name for name in [*sort_by, *unique] if name not in position]
+    if missing:
+        raise ValueError(f"Unknown columns: {', '.join(missing)}")
+    sort_spec = [(position[name], name in numeric, False) for name in sort_by]
+    unique_spec = [(position[name], name in numeric, strip_keys) for name in unique]
+    sorter = ExternalSorter(**options)
+
+    if not sort_by and not unique:
+        for row in rows:
+            stats.rows += 1
+            stats.written += 1
+            yield row
+        return
+
+    items: Iterable[tuple] = sorter.sort(enumerate(rows, start=first_line), unique_spec if unique else sort_spec)
+    stats.rows = sorter.rows
+    if unique:
+        items = _first_of_each_key(items, stats, sample)
+        if sort_spec != unique_spec:
+            # Survivors are ordered by the unique key: sort them by sort_by (or back into input order)
+            items = sorter.sort(((line, row) for _, line, row in items), sort_spec)
+
+    for _, _, row in items:
+        stats.written += 1
+        yield row
+    stats.runs = sorter.runs
+
+
+def _first_of_each_key(items: Iterable[tuple], stats: NormalizeStats, sample: int) -> Iterator[tuple]:
+    """Keep the first row of every key from a stream ordered by (key, line)"""
+    previous = object()
+    duplicates: list[tuple[int, tuple]] = []  # max-heap by line of the first `sample` duplicates
+    for item in items:
+        key, line = item[0], item[1]
+        if key == previous:
+            stats.removed += 1
+            if sample:
+                entry = (-line, key)
+                if len(duplicates) < sample:
+                    heapq.heappush(duplicates, entry)
+                elif entry > duplicates[0]:
+                    heapq.heapreplace(duplicates, entry)
+            continue
+        previous = key
+        yield item
+    stats.duplicates = sorted((-line, _plain_key(key)) for line, key in duplicates)
+
+
+def _plain_key(key: tuple) -> tuple:
+    """Unique key as cell values (number parts are stored as (flag, value))"""
+    return tuple(part[1] if isinstance(part, tuple) else part for part in key)
+
+
+def normalize_csv(
+    input_path: Path,
+    output_path: Path,
+    sort_by: list[str],
+    unique: list[str],
+    numeric: Iterable[str] = (),
+    strip_keys: bool = False,
+    lineterminator: str = "\n",
+    **options,
+) -> NormalizeStats:
+    """
+    Normalize a CSV file; the output replaces ``output_path`` atomically (it may be the input)
+
+    Short rows are padded with empty cells to the header width. Blank lines are
+    skipped and do not count as rows, as with ``csv.DictReader``.
+    """
+    stats = NormalizeStats()
+    with open(input_path, encoding="utf-8", newline="") as source:
+        reader = csv.reader(source)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(f"{input_path} has no header")
+        width = len(header)
+        rows = (row if len(row) >= width else row + [""] * (width - len(row)) for row in reader if row)
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        handle, tmp_path = tempfile.mkstemp(dir=output_path.parent, suffix=".csv")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8", newline="") as out:
+                writer = csv.writer(out, lineterminator=lineterminator)
+                writer.writerow(header)
+                writer.writerows(normalize_rows(rows, header, sort_by, unique, numeric, strip_keys, stats, **options))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    os.replace(tmp_path, output_path)
+    return stats
+
+
+def schema_rules(schema: TableSchema) -> dict:
+    """sort_by / unique / numeric arguments from a table schema"""
+    numeric = [name for name, kind in schema.columns.items() if kind == "number"]
+    return {"sort_by": list(schema.sort_by), "unique": list(schema.unique), "numeric": numeric}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Sort and deduplicate large CSV files with bounded memory")
+    parser.add_argument("input", nargs="?", help="Input CSV (default: the table path with --table)")
+    parser.add_argument("-o", "--output", help="Output CSV (default: rewrite the input)")
+    parser.add_argument("--table", help="Take path and rules from schemas/*.yaml")
+    parser.add_argument("--schemas", default=str(REPO_ROOT / "schemas"))
+    parser.add_argument("--sort-by", nargs="*", default=[])
+    parser.add_argument("--unique", nargs="*", default=[])
+    parser.add_argument("--numeric", nargs="*", default=[])
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--tmp-dir", default=None)
+    args = parser.parse_args()
+
+    rules = {"sort_by": args.sort_by, "unique": args.unique, "numeric": args.numeric}
+    input_path = Path(args.input) if args.input else None
+    if args.table:
+        schema = next((s for s in load_schemas(Path(args.schemas)) if s.name == args.table), None)
+        if schema is None:
+            print(f"Таблица не найдена в схемах: {args.table}", file=sys.stderr)
+            return 1
+        rules = schema_rules(schema)
+        input_path = input_path or REPO_ROOT / schema.path
+    if input_path is None:
+        parser.error("укажите входной файл или --table")
+
+    started = time.perf_counter()
+    stats = normalize_csv(
+        input_path,
+        Path(args.output) if args.output else input_path,
+        **rules,
+        chunk_rows=args.chunk_rows,
+        workers=args.workers,
+        tmp_dir=args.tmp_dir,
+    )
+    print(
+        f"{input_path.name}: строк {stats.rows}, записано {stats.written}, удалено дубликатов {stats.removed}, "
+        f"прогонов {stats.runs}, {time.perf_counter() - started:.1f} с"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Поиск k ближайших документов по косинусной схожести TF-IDF.
+
+Вместо плотной матрицы N×N строки обрабатываются блоками: для блока
+считается произведение X[блок] · Xᵀ, из каждой строки argpartition
+выбирает k лучших, после чего блок освобождается. Память — O(block × N)
+на процесс, независимо от числа документов. Блоки распределяются по
+процессам (по умолчанию не больше DEFAULT_MAX_WORKERS); матрица
+передается каждому процессу один раз.
+
+Если плотные копии транспонированной матрицы во всех процессах вместе
+укладываются в dense_bytes, произведение считается через BLAS (при
+max_features=1000 это в несколько раз быстрее разреженного умножения),
+иначе — разреженно. Так общий объем памяти не растет с числом ядер.
+
+Строки TF-IDF (TfidfVectorizer, norm="l2") нормированы, поэтому
+скалярное произведение равно косинусу.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Сколько ячеек float32 допускается в одном блоке (~64 МиБ)
+DEFAULT_BLOCK_CELLS = 16 * 2**20
+
+# Предел для плотных копий Xᵀ во всех процессах вместе
+DEFAULT_DENSE_BYTES = 512 * 2**20
+
+# Число процессов по умолчанию: не больше ядер и не больше этого значения
+DEFAULT_MAX_WORKERS = 4
+
+_worker_rows = None
+_worker_columns = None
+
+
+def _init_worker(matrix, dense: bool):
+    global _worker_rows, _worker_columns
+    _worker_rows = matrix.astype(np.float32).tocsr()
+    _worker_columns = _worker_rows.T.toarray() if dense else _worker_rows.T.tocsc()
+
+
+def _release_worker():
+    global _worker_rows, _worker_columns
+    _worker_rows = _worker_columns = None
+
+
+def _top_k_block(row_ids: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Top-k для строк row_ids: индексы и оценки, по убыванию оценки"""
+    rows = _worker_rows[row_ids]
+    if isinstance(_worker_columns, np.ndarray):
+        scores = rows.toarray() @ _worker_columns
+    else:
+        scores = (rows @ _worker_columns).toarray()
+    scores[np.arange(len(row_ids)), row_ids] = -np.inf  # Исключаем сам документ
+
+    if k <= 0:
+        return np.empty((len(row_ids), 0), dtype=np.int64), np.empty((len(row_ids), 0), dtype=np.float32)
+
+    candidates = np.argpartition(scores, -k, axis=1)[:, -k:]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_scores, order, axis=1)
+
+
+def top_k_similar(
+    matrix,
+    k: int = 5,
+    rows=None,
+    workers: int | None = None,
+    block_rows: int | None = None,
+    block_cells: int = DEFAULT_BLOCK_CELLS,
+    dense_bytes: int = DEFAULT_DENSE_BYTES,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    k наиболее похожих документов для каждой строки матрицы
+
+    Args:
+        matrix: Разреженная матрица TF-IDF (строки нормированы)
+        k: Сколько соседей оставить
+        rows: Для каких строк искать соседей (по умолчанию — для всех)
+        workers: Число процессов (по умолчанию — число ядер, не больше DEFAULT_MAX_WORKERS; 1 — без пула)
+        block_rows: Размер блока строк (по умолчанию из block_cells)
+        dense_bytes: Предел памяти на плотные копии Xᵀ во всех процессах (0 — всегда разреженно)
+
+    Returns:
+        (indices, scores) формы len(rows)×k, соседи по убыванию схожести
+    """
+    n_docs = matrix.shape[0]
+    row_ids = np.arange(n_docs) if rows is None else np.asarray(rows, dtype=np.int64)
+    k = min(k, max(n_docs - 1, 0))
+    block_rows = block_rows or max(1, min(n_docs, block_cells // max(n_docs, 1)))
+    blocks = [row_ids[start : start + block_rows] for start in range(0, len(row_ids), block_rows)]
+    offsets = range(0, len(row_ids), block_rows)
+    workers = min(workers or min(os.cpu_count() or 1, DEFAULT_MAX_WORKERS), max(len(blocks), 1))
+    # Плотная копия строится в каждом процессе пула: предел делится между ними
+    dense = matrix.shape[0] * matrix.shape[1] * 4 * workers <= dense_bytes
+
+    indices = np.zeros((len(row_ids), k), dtype=np.int64)
+    scores = np.zeros((len(row_ids), k), dtype=np.float32)
+
+    if workers <= 1:
+        _init_worker(matrix, dense)
+        try:
+            results = [_top_k_block(block, k) for block in blocks]
+        finally:
+            _release_worker()
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(matrix, dense)) as pool:
+            results = list(pool.map(_top_k_block, blocks, [k] * len(blocks)))
+
+    for offset, (block_indices, block_scores) in zip(offsets, results):
+        indices[offset : offset + len(block_indices)] = block_indices
+        scores[offset : offset + len(block_scores)] = block_scores
+
+    return indices, scores
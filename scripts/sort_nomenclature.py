@@ -1,30 +1,32 @@
 #!/usr/bin/env python3
-"""Sort nomenclature.csv file by Brand and Product Name columns."""
+"""Sort nomenclature.csv file by Brand and Product Name columns.
+
+The file is sorted with the external merge sort of scripts/normalize_csv.py,
+so memory use does not depend on the size of the export.
+"""
 
 import csv
 import sys
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.normalize_csv import normalize_csv  # noqa: E402
+
 NOMENCLATURE_FILE = REPO_ROOT / "data" / "nomenclature.csv"
 
 
-def sort_nomenclature(input_file: Path, output_file: Path) -> None:
+def sort_nomenclature(input_file: Path, output_file: Path, **options) -> None:
     """Sort nomenclature CSV by Brand (column 0) and Product Name (column 1)."""
     with open(input_file, encoding="utf-8", newline="") as f:
-        reader = csv.reader(f)
-        header = next(reader)
-        rows = list(reader)
+        header = next(csv.reader(f))
 
     # Sort by Brand (column 0), then Product Name (column 1)
-    rows_sorted = sorted(rows, key=lambda r: (r[0], r[1]))
-
-    with open(output_file, "w", encoding="utf-8", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(header)
-        writer.writerows(rows_sorted)
+    stats = normalize_csv(input_file, output_file, sort_by=header[:2], unique=[], lineterminator="\r\n", **options)
 
-    print(f"Sorted {len(rows)} rows in {input_file.name}")
+    print(f"Sorted {stats.rows} rows in {input_file.name}")
 
 
 def verify_sorting(file_path: Path) -> bool:
@@ -32,18 +34,19 @@ def verify_sorting(file_path: Path) -> bool:
     with open(file_path, encoding="utf-8", newline="") as f:
         reader = csv.reader(f)
         next(reader)  # Skip header
-        rows = list(reader)
-
-    for i in range(1, len(rows)):
-        # Skip rows with insufficient columns
-        if len(rows[i - 1]) < 2 or len(rows[i]) < 2:
-            continue
-
-        prev_key = (rows[i - 1][0], rows[i - 1][1])
-        curr_key = (rows[i][0], rows[i][1])
-        if prev_key > curr_key:
-            print(f"ERROR: Sorting violation at line {i+2}: {prev_key} should come before {curr_key}")
-            return False
+
+        prev_key = None
+        for i, row in enumerate(reader):
+            # Skip rows with insufficient columns
+            if len(row) < 2:
+                prev_key = None
+                continue
+
+            curr_key = (row[0], row[1])
+            if prev_key is not None and prev_key > curr_key:
+                print(f"ERROR: Sorting violation at line {i+2}: {prev_key} should come before {curr_key}")
+                return False
+            prev_key = curr_key
 
     print(f"OK: {file_path.name} is correctly sorted")
     return True
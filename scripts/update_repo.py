@@ -4,8 +4,13 @@ from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
 import json
+import os
 import sys
+import tempfile
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from datetime import UTC, datetime
 from pathlib import Path
 
@@ -13,66 +18,144 @@ REPO_ROOT = Path(__file__).resolve().parent.parent
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from scripts.extract.raw_datasets import RAW_DATASETS, DatasetSpec  # noqa: E402
-from scripts.validate.csv_validator import validate_all  # noqa: E402
-
-
-def _dedupe(rows: list[dict[str, str]], unique_keys: list[str]) -> tuple[list[dict[str, str]], int]:
-    if not unique_keys:
-        return rows, 0
-    seen = set()
-    deduped: list[dict[str, str]] = []
-    removed = 0
-    for row in rows:
-        key = tuple(row[k] for k in unique_keys)
-        if key in seen:
-            removed += 1
-            continue
-        seen.add(key)
-        deduped.append(row)
-    return deduped, removed
-
-
-def _sort(rows: list[dict[str, str]], keys: list[str]) -> list[dict[str, str]]:
-    if not keys:
-        return rows
-    return sorted(rows, key=lambda item: tuple(item[k] for k in keys))
-
-
-def _write_csv(dataset: DatasetSpec) -> tuple[int, int, int]:
-    rows = [dict(row) for row in dataset["rows"]]
-    deduped, removed = _dedupe(rows, dataset["unique"])
-    ordered = _sort(deduped, dataset["sort_by"])
-
-    dataset["output"].parent.mkdir(parents=True, exist_ok=True)
-    with dataset["output"].open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=dataset["columns"], lineterminator="\n")
-        writer.writeheader()
-        writer.writerows(ordered)
-
-    return len(rows), len(ordered), removed
+from scripts.extract.raw_datasets import DatasetSpec, load_datasets  # noqa: E402
+from scripts.normalize_csv import NormalizeStats, normalize_rows  # noqa: E402
+
+DEFAULT_STATE_PATH = REPO_ROOT / ".cache" / "datasets.json"
+STATE_VERSION = 1
+
+
+def _file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _write_csv(dataset: DatasetSpec, root: Path = REPO_ROOT) -> dict:
+    """Normalize one dataset into its output file; returns its state entry (runs in worker processes)."""
+    columns = dataset.columns
+    inputs: set[str] = set()
+
+    def records() -> Iterator[list[str]]:
+        for row in dataset.rows():
+            if row.get("source"):
+                inputs.add(row["source"])
+            yield [row[column] for column in columns]
+
+    stats = NormalizeStats()
+    output = root / dataset.output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    handle, tmp_name = tempfile.mkstemp(dir=output.parent, prefix=output.name, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8", newline="") as tmp:
+            writer = csv.writer(tmp, lineterminator="\n")
+            writer.writerow(columns)
+            rows = normalize_rows(records(), columns, dataset.sort_by, dataset.unique, stats=stats, workers=1)
+            writer.writerows(rows)
+        os.replace(tmp_name, output)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+    return {
+        "written": stats.written,
+        "removed": stats.removed,
+        "inputs": sorted(inputs),
+        "output_hash": _file_hash(output),
+    }
 
 
-def _aggregate_report() -> dict[str, int]:
+class DatasetState:
+    """Source fingerprint, output hash and counters of every dataset from the last run, persisted as JSON."""
+
+    def __init__(self, path: Path | None = DEFAULT_STATE_PATH):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        if path is not None and path.exists():
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                payload = {}
+            if isinstance(payload, dict) and payload.get("version") == STATE_VERSION:
+                self.entries = payload.get("entries", {})
+
+    def unchanged(self, name: str, fingerprint: str, output: Path) -> bool:
+        """The dataset was built from this source and its output file was not touched since."""
+        entry = self.entries.get(name)
+        return (
+            entry is not None
+            and entry.get("fingerprint") == fingerprint
+            and output.exists()
+            and entry.get("output_hash") == _file_hash(output)
+        )
+
+    def save(self, names: Iterable[str]):
+        """Write entries of the given datasets (atomically, via a temporary file)."""
+        if self.path is None:
+            return
+        self.entries = {name: self.entries[name] for name in names if name in self.entries}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as tmp:
+                json.dump({"version": STATE_VERSION, "entries": self.entries}, tmp, ensure_ascii=False)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+
+def normalize_datasets(
+    datasets: dict[str, DatasetSpec],
+    root: Path = REPO_ROOT,
+    state: DatasetState | None = None,
+    workers: int | None = None,
+    force: bool = False,
+) -> list[str]:
+    """Write the outputs of all datasets; returns names of the rebuilt ones.
+
+    A dataset is skipped when its definition and data file hash (``fingerprint``)
+    and the hash of its output are the same as after the last run, unless
+    ``force`` is set. The rest are normalized in ``workers`` processes (CPU
+    count by default).
+    """
+    state = state if state is not None else DatasetState()
+    pending: list[tuple[str, str]] = []
+    for name, spec in datasets.items():
+        fingerprint = spec.fingerprint()
+        if force or not state.unchanged(name, fingerprint, root / spec.output):
+            pending.append((name, fingerprint))
+
+    workers = workers or os.cpu_count() or 1
+    specs = [datasets[name] for name, _ in pending]
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            results = list(pool.map(_write_csv, specs, [root] * len(specs)))
+    else:
+        results = [_write_csv(spec, root) for spec in specs]
+
+    for (name, fingerprint), entry in zip(pending, results):
+        state.entries[name] = {"fingerprint": fingerprint, **entry}
+    state.save(datasets)
+    return [name for name, _ in pending]
+
+
+def _aggregate_report(entries: Iterable[dict]) -> dict[str, int]:
     counts = {"rows_total": 0, "rows_added": 0, "rows_deduped": 0}
-    for spec in RAW_DATASETS.values():
-        deduped, removed = _dedupe(spec["rows"], spec["unique"])
-        counts["rows_total"] += len(deduped)
-        counts["rows_added"] += len(deduped)
-        counts["rows_deduped"] += removed
+    for entry in entries:
+        counts["rows_total"] += entry["written"]
+        counts["rows_added"] += entry["written"]
+        counts["rows_deduped"] += entry["removed"]
     return counts
 
 
-def _write_report(path: Path) -> None:
+def _write_report(path: Path, datasets: dict[str, DatasetSpec], state: DatasetState) -> None:
+    entries = [state.entries[name] for name in datasets]
     report_body = {
         "source_name": "normalized_catalog",
         "timestamp": datetime.now(UTC).replace(microsecond=0).isoformat(),
-        "input_files": sorted(
-            {row["source"] for spec in RAW_DATASETS.values() for row in spec["rows"] if "source" in row}
-        ),
-        "output_files": sorted(str(spec["output"]) for spec in RAW_DATASETS.values()),
+        "input_files": sorted({source for entry in entries for source in entry["inputs"]}),
+        "output_files": sorted(str(spec.output) for spec in datasets.values()),
     }
-    report_body.update(_aggregate_report())
+    report_body.update(_aggregate_report(entries))
     report_body["rows_removed"] = 0
     report_body["errors"] = []
 
@@ -80,15 +163,20 @@ def _write_report(path: Path) -> None:
     path.write_text(json.dumps(report_body, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
-def run(normalize_only: bool, report_path: Path | None) -> None:
-    for spec in RAW_DATASETS.values():
-        _write_csv(spec)
+def run(normalize_only: bool, report_path: Path | None, workers: int | None = None, force: bool = False) -> None:
+    datasets = load_datasets()
+    state = DatasetState()
+    rebuilt = normalize_datasets(datasets, state=state, workers=workers, force=force)
+    print(f"Datasets: {len(datasets)}, unchanged: {len(datasets) - len(rebuilt)}, rebuilt: {len(rebuilt)}")
 
     if report_path:
-        _write_report(report_path)
+        _write_report(report_path, datasets, state)
 
     if not normalize_only:
-        errors = validate_all(Path(__file__).resolve().parent.parent / "schemas")
+        # numpy/pandas of the validator are imported only when validation runs
+        from scripts.validate.csv_validator import validate_all
+
+        errors = validate_all(REPO_ROOT / "schemas")
         if errors:
             raise SystemExit("\n".join(errors))
 
@@ -111,10 +199,21 @@ def parse_args() -> argparse.Namespace:
         default=Path("data/reports") / f"{datetime.now().date()}_source.json",
         help="Override the report path (default: data/reports/YYYY-MM-DD_source.json).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes normalizing datasets (default: CPU count).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild every dataset even if its source and output hashes are unchanged.",
+    )
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
     target_report = None if args.no_report else args.report_path
-    run(normalize_only=args.no_validation, report_path=target_report)
+    run(normalize_only=args.no_validation, report_path=target_report, workers=args.workers, force=args.force)
@@ -1,140 +1,393 @@
-"""CSV validation helpers aligned with repository schemas."""
+"""CSV validation helpers aligned with repository schemas.
+
+Each ``TableSchema`` is compiled into a ``TableChecker`` that validates whole
+columns at once: number columns are parsed into float arrays, uniqueness keys
+are found with hashed ``DataFrame.duplicated`` and the sort order is checked
+by comparing adjacent rows as arrays. Per-value Python work is left for the
+rows that fail, to format their error messages.
+
+Schemas are loaded by ``scripts.validate.schema`` (no numpy/pandas), which
+scripts that only need ``TableSchema`` import directly.
+
+``validate_all`` checks tables in parallel processes and keeps results in a
+``ValidationCache`` (``.cache/validation.json``) keyed by schema fingerprint and
+file hash, so tables whose schema and data did not change are not checked again.
+"""
 
 from __future__ import annotations
 
 import csv
+import hashlib
+import io
 import json
-from dataclasses import dataclass
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import zip_longest
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
+from scripts.validate.schema import TableSchema, load_schemas
+
 TYPE_CASTERS = {
     "string": str,
     "number": float,
 }
 
+# Below this size csv.reader is faster than starting the pandas parser
+FAST_PARSE_MIN_BYTES = 64 * 1024
 
-@dataclass
-class TableSchema:
-    """Normalized representation of a table schema."""
+# Worker processes only pay off once there is enough data to amortize the pool start
+PARALLEL_MIN_BYTES = 1 << 20
 
-    name: str
-    path: Path
-    columns: dict[str, str]
-    unique: list[str]
-    sort_by: list[str]
+# Key cell of a short row: equal only to itself, unlike None and NaN in pandas
+MISSING_KEY = "\x00None"
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_PATH = REPO_ROOT / ".cache" / "validation.json"
+CACHE_VERSION = 1
+
+
+def _is_regular(data: bytes) -> bool:
+    """True for plain CSV the pandas C parser reads exactly like csv.DictReader.
+
+    That is no quoting, no CR, no BOM and the header's number of commas on every
+    non-empty line: then rows are neither short nor long and no field holds a
+    separator or a line break.
+    """
+    if not data or b'"' in data or b"\r" in data or data.startswith(b"\xef\xbb\xbf"):
+        return False
+    chars = np.frombuffer(data, dtype=np.uint8)
+    line_ends = np.flatnonzero(chars == ord("\n"))
+    if not len(line_ends) or line_ends[-1] != len(chars) - 1:
+        line_ends = np.append(line_ends, len(chars))
+    commas = np.concatenate(([0], np.cumsum(chars == ord(","))))
+    starts = np.concatenate(([0], line_ends[:-1] + 1))
+    per_line = commas[line_ends] - commas[starts]
+    non_empty = line_ends > starts
+    if per_line[0] == 0:
+        # Single-column tables: whitespace-only lines are rows for csv, but pandas drops them
+        return False
+    return bool((per_line[non_empty] == per_line[0]).all())
+
+
+def _read_columns(data: bytes) -> tuple[list[str] | None, list, int]:
+    """Header, column arrays (cells missing in short rows are None) and the row count.
+
+    Blank lines are skipped and do not advance the line counter, as with csv.DictReader.
+    """
+    if len(data) >= FAST_PARSE_MIN_BYTES and _is_regular(data):
+        frame = pd.read_csv(io.BytesIO(data), header=None, dtype=str, keep_default_na=False, encoding="utf-8")
+        columns = [frame[column].to_numpy(dtype=object) for column in frame.columns]
+        return [column[0] for column in columns], [column[1:] for column in columns], len(frame) - 1
+
+    reader = csv.reader(io.StringIO(data.decode("utf-8"), newline=None))
+    header = next(reader, None)
+    if header is None:
+        return None, [], 0
+    rows = [row for row in reader if row]
+    return header, list(zip_longest(*rows)), len(rows)
 
-def _load_schema_file(path: Path) -> list[TableSchema]:
-    payload = json.loads(path.read_text(encoding="utf-8"))
-    tables: list[TableSchema] = []
-    for table in payload.get("tables", []):
-        # Extract column types from nested column definitions
-        columns = {}
-        for col_name, col_def in table["columns"].items():
-            if isinstance(col_def, dict):
-                columns[col_name] = col_def.get("type", "string")
-            else:
-                columns[col_name] = col_def
-
-        tables.append(
-            TableSchema(
-                name=table["name"],
-                path=Path(table["path"]),
-                columns=columns,
-                unique=table.get("unique", table.get("uniqueKey", [])),
-                sort_by=table.get("sort_by", []),
-            )
-        )
-    return tables
 
+def _parse_numbers(values) -> tuple[np.ndarray, np.ndarray]:
+    """Parse a number column into floats and a mask of invalid cells (empty cells count as 0)."""
+    array = np.asarray(values, dtype=object)
+    missing = np.equal(array, None)
+    array = np.where(np.equal(array, ""), "0", array)
+    if not missing.any():
+        try:
+            # object -> float64 calls float() on every cell in C
+            return array.astype(np.float64), missing
+        except (TypeError, ValueError):
+            pass
+    parsed = np.full(len(array), np.nan)
+    invalid = np.zeros(len(array), dtype=bool)
+    for i, value in enumerate(array):
+        try:
+            parsed[i] = float(value)
+        except (TypeError, ValueError):
+            invalid[i] = True
+    return parsed, invalid
 
-def load_schemas(schema_dir: Path) -> list[TableSchema]:
-    """Load all table schemas from a directory."""
-    schemas: list[TableSchema] = []
-    for schema_file in sorted(schema_dir.glob("*.yaml")):
-        schemas.extend(_load_schema_file(schema_file))
-    return schemas
 
+def _strings(values) -> np.ndarray:
+    """String column as an object array; cells missing in short rows read as 'None' like str(None)."""
+    array = np.asarray(values, dtype=object)
+    missing = np.equal(array, None)
+    return np.where(missing, "None", array) if missing.any() else array
 
-def _coerce(value: str, expected_type: str) -> tuple[bool, str]:
-    caster = TYPE_CASTERS.get(expected_type, str)
-    if value == "" and expected_type == "string":
-        return True, value
+
+def _scalar(value):
+    """Python value of an array cell (numpy floats print differently)."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _less(a, b) -> bool:
     try:
-        coerced = caster(value) if value != "" else caster("0") if expected_type == "number" else caster(value)
-    except Exception:
-        return False, value
-    return True, str(coerced) if expected_type == "number" else str(coerced)
+        return a < b
+    except TypeError:
+        return False
+
+
+class TableChecker:
+    """Vectorized validator compiled from a ``TableSchema``."""
+
+    def __init__(self, schema: TableSchema):
+        self.schema = schema
+        self.expected_fields = list(schema.columns)
+        self.numbers = {column for column, expected_type in schema.columns.items() if expected_type == "number"}
+        # Error slots order messages within a line as the row-by-row validator did
+        self.key_slot = len(self.expected_fields)
+        self.sort_slot = self.key_slot + 1
+
+    def check(self, data: bytes) -> list[str]:
+        """Validate CSV content and return error messages ordered by line."""
+        name = self.schema.name
+        header, columns, count = _read_columns(data)
+        if header is None:
+            return [f"{name}: {self.schema.path} has no header"]
+
+        messages: list[str] = []
+        if header != self.expected_fields:
+            messages.append(f"{name}: header mismatch. expected {self.expected_fields}, found {header}")
+
+        # A repeated header name maps to its last column, as with csv.DictReader
+        positions = {field: i for i, field in enumerate(header)}
+
+        def cells(column: str):
+            index = positions[column]
+            return columns[index] if index < len(columns) else (None,) * count
+
+        errors: list[tuple[int, int, str]] = []
+        numbers: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        for slot, column in enumerate(self.expected_fields):
+            if column not in positions:
+                errors.extend((i, slot, f"{name}: missing column {column} at line {i + 2}") for i in range(count))
+                continue
+            if column in self.numbers:
+                values = cells(column)
+                parsed, invalid = numbers[column] = _parse_numbers(values)
+                errors.extend(
+                    (i, slot, f"{name}: invalid number value '{values[i]}' in column {column} at line {i + 2}")
+                    for i in np.flatnonzero(invalid).tolist()
+                )
+
+        if count:
+            errors.extend(self._check_unique(cells, positions, numbers))
+            errors.extend(self._check_sorted(cells, positions, numbers))
+        errors.sort(key=lambda error: (error[0], error[1]))
+        return messages + [message for _, _, message in errors]
+
+    def _key_cell(self, column: str, values: tuple, numbers: dict, i: int) -> str:
+        """Coerced cell value as the row-by-row validator printed it."""
+        if column in numbers:
+            parsed, invalid = numbers[column]
+            return values[i] if invalid[i] else str(float(parsed[i]))
+        return str(values[i])
+
+    def _check_unique(self, cells, positions: dict, numbers: dict) -> list[tuple[int, int, str]]:
+        unique = self.schema.unique
+        if not unique or any(column not in positions for column in unique):
+            return []
+        arrays = {}
+        for i, column in enumerate(unique):
+            if column in numbers and not numbers[column][1].any():
+                arrays[i] = numbers[column][0]
+            elif column in numbers:
+                # Compared as coerced text, so that invalid cells and short rows do not collapse into NaN
+                values = cells(column)
+                arrays[i] = np.array(
+                    [
+                        MISSING_KEY if value is None else self._key_cell(column, values, numbers, j)
+                        for j, value in enumerate(values)
+                    ],
+                    dtype=object,
+                )
+            else:
+                arrays[i] = _strings(cells(column))
+        duplicated = pd.DataFrame(arrays).duplicated(keep="first").to_numpy()
+
+        errors = []
+        for row in np.flatnonzero(duplicated).tolist():
+            key = tuple(self._key_cell(column, cells(column), numbers, row) for column in unique)
+            errors.append((row, self.key_slot, f"{self.schema.name}: duplicate key {key} at line {row + 2}"))
+        return errors
+
+    def _check_sorted(self, cells, positions: dict, numbers: dict) -> list[tuple[int, int, str]]:
+        sort_by = self.schema.sort_by
+        if not sort_by or any(field not in positions for field in sort_by):
+            return []
+        parts = []
+        for field in sort_by:
+            if self.schema.columns.get(field, "string") == "number" and field in numbers:
+                parsed, invalid = numbers[field]
+                # Invalid cells keep their text in the key, as in the row-by-row validator
+                if invalid.any():
+                    parsed = np.where(invalid, np.asarray(cells(field), dtype=object), parsed.astype(object))
+                parts.append(parsed)
+            else:
+                parts.append(_strings(cells(field)))
+
+        # Lexicographic "current < previous" over the sort key, one comparison per column,
+        # evaluated only for pairs whose earlier key columns are equal
+        before = np.zeros(len(parts[0]) - 1, dtype=bool)
+        equal = np.ones(len(parts[0]) - 1, dtype=bool)
+        for part in parts:
+            pairs = np.flatnonzero(equal)
+            current, previous = part[1:][pairs], part[:-1][pairs]
+            try:
+                with np.errstate(invalid="ignore"):
+                    less, same = current < previous, current == previous
+            except TypeError:
+                # A number next to an invalid (text) cell: such pairs are not ordered
+                less = np.array([_less(a, b) for a, b in zip(current, previous)], dtype=bool)
+                same = np.array([a == b for a, b in zip(current, previous)], dtype=bool)
+            before[pairs[less]] = True
+            equal[pairs[~same]] = False
+
+        errors = []
+        for row in (np.flatnonzero(before) + 1).tolist():
+            current_key = tuple(_scalar(part[row]) for part in parts)
+            prev_key = tuple(_scalar(part[row - 1]) for part in parts)
+            errors.append(
+                (
+                    row,
+                    self.sort_slot,
+                    f"{self.schema.name}: sort order violated at line {row + 2} "
+                    f"(key {current_key} after {prev_key})",
+                )
+            )
+        return errors
+
 
+class ValidationCache:
+    """Validation results keyed by (schema fingerprint, file sha256), persisted as JSON.
 
-def _sort_key(row: dict[str, str], schema: TableSchema) -> tuple:
-    key_parts: list = []
-    for field in schema.sort_by:
-        expected_type = schema.columns.get(field, "string")
-        if expected_type == "number":
+    ``hits`` and ``misses`` count tables of the last ``validate_all`` run. Only
+    entries used by that run are written back, so the file does not grow with
+    every edit of the data.
+    """
+
+    def __init__(self, path: Path | None = DEFAULT_CACHE_PATH):
+        self.path = path
+        self.entries: dict[str, list[str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._used: set[str] = set()
+        if path is not None and path.exists():
             try:
-                key_parts.append(float(row[field]))
-            except ValueError:
-                key_parts.append(row[field])
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                payload = {}
+            if isinstance(payload, dict) and payload.get("version") == CACHE_VERSION:
+                self.entries = payload.get("entries", {})
+
+    @staticmethod
+    def key(fingerprint: str, file_hash: str) -> str:
+        return f"{fingerprint}:{file_hash}"
+
+    def start_run(self):
+        self.hits = self.misses = 0
+        self._used = set()
+
+    def get(self, key: str) -> list[str] | None:
+        errors = self.entries.get(key)
+        if errors is None:
+            self.misses += 1
         else:
-            key_parts.append(row[field])
-    return tuple(key_parts)
+            self.hits += 1
+            self._used.add(key)
+        return errors
+
+    def put(self, key: str, errors: list[str]):
+        self.entries[key] = list(errors)
+        self._used.add(key)
+
+    def save(self):
+        """Write entries used in the last run (atomically, via a temporary file)."""
+        if self.path is None:
+            return
+        self.entries = {key: errors for key, errors in self.entries.items() if key in self._used}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as tmp:
+                json.dump({"version": CACHE_VERSION, "entries": self.entries}, tmp, ensure_ascii=False)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+
+def _check_file(schema: TableSchema) -> tuple[str | None, list[str]]:
+    """Read, hash and validate one table (runs in worker processes)."""
+    if not schema.path.exists():
+        return None, [f"{schema.name}: missing file {schema.path}"]
+    data = schema.path.read_bytes()
+    key = ValidationCache.key(schema.fingerprint(), hashlib.sha256(data).hexdigest())
+    return key, TableChecker(schema).check(data)
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 def validate_table(schema: TableSchema) -> list[str]:
     """Validate a single table against the provided schema."""
-    errors: list[str] = []
-    if not schema.path.exists():
-        return [f"{schema.name}: missing file {schema.path}"]
-
-    with schema.path.open(encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        if reader.fieldnames is None:
-            return [f"{schema.name}: {schema.path} has no header"]
-
-        expected_fields = list(schema.columns.keys())
-        if reader.fieldnames != expected_fields:
-            errors.append(f"{schema.name}: header mismatch. expected {expected_fields}, found {reader.fieldnames}")
-
-        seen_keys = set()
-        prev_key: tuple | None = None
-        for line_number, row in enumerate(reader, start=2):
-            # Column completeness and type validation
-            for column, expected_type in schema.columns.items():
-                if column not in row:
-                    errors.append(f"{schema.name}: missing column {column} at line {line_number}")
-                    continue
-                ok, coerced = _coerce(row[column], expected_type)
-                if not ok:
-                    errors.append(
-                        f"{schema.name}: invalid {expected_type} value '{row[column]}' "
-                        f"in column {column} at line {line_number}"
-                    )
-                row[column] = coerced
-
-            # Uniqueness
-            if schema.unique:
-                key = tuple(row[col] for col in schema.unique)
-                if key in seen_keys:
-                    errors.append(f"{schema.name}: duplicate key {key} at line {line_number}")
-                seen_keys.add(key)
-
-            # Sorting
-            if schema.sort_by:
-                current_key = _sort_key(row, schema)
-                if prev_key is not None and current_key < prev_key:
-                    errors.append(
-                        f"{schema.name}: sort order violated at line {line_number} "
-                        f"(key {current_key} after {prev_key})"
-                    )
-                prev_key = current_key
-
-    return errors
-
-
-def validate_all(schema_dir: Path) -> list[str]:
-    """Validate every schema in the directory and aggregate errors."""
+    return _check_file(schema)[1]
+
+
+def validate_all(
+    schema_dir: Path, workers: int | None = None, cache: ValidationCache | None = None, force: bool = False
+) -> list[str]:
+    """Validate every schema in the directory and aggregate errors.
+
+    Tables whose (schema, file hash) pair is in ``cache`` (``.cache/validation.json``
+    by default) are not checked again unless ``force`` is set. The rest are checked
+    in ``workers`` processes (CPU count by default) when there is at least
+    ``PARALLEL_MIN_BYTES`` of data to check. Missing files are always reported.
+    """
+    cache = cache if cache is not None else ValidationCache()
+    cache.start_run()
+    schemas = load_schemas(schema_dir)
+    results: dict[int, list[str]] = {}
+    pending: list[tuple[int, int]] = []
+    for index, schema in enumerate(schemas):
+        if not schema.path.exists():
+            results[index] = [f"{schema.name}: missing file {schema.path}"]
+            continue
+        if force:
+            cache.misses += 1
+        else:
+            cached = cache.get(ValidationCache.key(schema.fingerprint(), _file_hash(schema.path)))
+            if cached is not None:
+                results[index] = list(cached)
+                continue
+        pending.append((schema.path.stat().st_size, index))
+
+    # Largest tables first, so that one big file does not finish last on its own
+    pending.sort(reverse=True)
+    workers = workers or os.cpu_count() or 1
+    batch = [schemas[index] for _, index in pending]
+    if workers > 1 and len(pending) > 1 and sum(size for size, _ in pending) >= PARALLEL_MIN_BYTES:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            checked = list(pool.map(_check_file, batch))
+    else:
+        checked = [_check_file(schema) for schema in batch]
+
+    for (_, index), (key, errors) in zip(pending, checked):
+        if key is not None:
+            cache.put(key, errors)
+        results[index] = list(errors)
+    cache.save()
+
     all_errors: list[str] = []
-    for schema in load_schemas(schema_dir):
-        all_errors.extend(validate_table(schema))
+    for index in range(len(schemas)):
+        all_errors.extend(results[index])
     return all_errors
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -9,13 +10,20 @@ REPO_ROOT = Path(__file__).resolve().parents[2]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from scripts.validate.csv_validator import validate_all  # noqa: E402
+from scripts.validate.csv_validator import ValidationCache, validate_all  # noqa: E402
 
 
 def main() -> int:
+    parser = argparse.ArgumentParser(description="Validate CSV datasets against schemas/*.yaml")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Revalidate all tables, ignoring .cache/validation.json")
+    args = parser.parse_args()
+
     repo_root = Path(__file__).resolve().parents[2]
     schema_dir = repo_root / "schemas"
-    errors = validate_all(schema_dir)
+    cache = ValidationCache()
+    errors = validate_all(schema_dir, workers=args.workers, cache=cache, force=args.force)
+    print(f"Tables: {cache.hits + cache.misses}, cache hits: {cache.hits}, validated: {cache.misses}")
     if errors:
         for message in errors:
             print(message)
@@ -0,0 +1,60 @@
+"""Table schemas from ``schemas/*.yaml``.
+
+Kept free of numpy and pandas so that scripts which only read schemas
+(normalization, the reference read model) import quickly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class TableSchema:
+    """Normalized representation of a table schema."""
+
+    name: str
+    path: Path
+    columns: dict[str, str]
+    unique: list[str]
+    sort_by: list[str]
+
+    def fingerprint(self) -> str:
+        """Hash of everything that affects validation of the table."""
+        payload = [self.name, str(self.path), list(self.columns.items()), self.unique, self.sort_by]
+        return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _load_schema_file(path: Path) -> list[TableSchema]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    tables: list[TableSchema] = []
+    for table in payload.get("tables", []):
+        # Extract column types from nested column definitions
+        columns = {}
+        for col_name, col_def in table["columns"].items():
+            if isinstance(col_def, dict):
+                columns[col_name] = col_def.get("type", "string")
+            else:
+                columns[col_name] = col_def
+
+        tables.append(
+            TableSchema(
+                name=table["name"],
+                path=Path(table["path"]),
+                columns=columns,
+                unique=table.get("unique", table.get("uniqueKey", [])),
+                sort_by=table.get("sort_by", []),
+            )
+        )
+    return tables
+
+
+def load_schemas(schema_dir: Path) -> list[TableSchema]:
+    """Load all table schemas from a directory."""
+    schemas: list[TableSchema] = []
+    for schema_file in sorted(schema_dir.glob("*.yaml")):
+        schemas.extend(_load_schema_file(schema_file))
+    return schemas
@@ -4,11 +4,17 @@ Scraper for table data that crawls all pagination links and exports the
 resulting rows into a JSON file under sources/.
 
 The script is intentionally dependency-free (stdlib only) to simplify execution
-in restricted environments. Network timeouts, page limits and delays are
-configurable via CLI flags or environment variables:
+in restricted environments. Pages are fetched concurrently by an asyncio crawler
+over keep-alive connections, rate-limited per host with a token bucket; re-crawls
+send conditional requests and reuse cached pages answered with 304. Network
+timeouts, page limits and delays are configurable via CLI flags or environment
+variables:
 
   HTTP_TIMEOUT_SECONDS   - request timeout (default: 10)
-  REQUEST_DELAY_SECONDS  - delay between pages in seconds (default: 0.2)
+  REQUEST_DELAY_SECONDS  - average interval between requests to one host (default: 0.2)
+  TABLE_CONCURRENCY      - pages fetched at once (default: 4)
+  TABLE_HTTP_CACHE_DIR   - cache of pages with ETag/Last-Modified (default: .cache/table_scraper)
+  TABLE_CHECKPOINT_EVERY - pages between checkpoints of an NDJSON crawl (default: 10)
   TABLE_MAX_PAGES        - hard cap for visited pages (default: 250)
   TABLE_SCRAPER_USER_AGENT - optional override for the HTTP User-Agent
   TABLE_MAX_RETRIES      - maximum retry attempts for failed requests (default: 3)
@@ -20,24 +26,35 @@ Example:
         --max-retries 5 \\
         --retry-delay 3.0
 
+With an .ndjson/.jsonl output (or --format ndjson) rows are appended while
+crawling, one JSON object per line, and the crawl state is checkpointed to
+<output>.state.json; --resume continues an interrupted crawl from it.
+
 If network access is blocked, the script will log a warning and exit without
-creating or altering the output file.
+creating or altering the output file (an NDJSON crawl writes to <output>.part
+and replaces the output only when it finishes with rows).
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
+import http.client
 import json
 import logging
 import os
 import re
 import sys
+import tempfile
+import threading
 import time
-from collections import deque
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from html.parser import HTMLParser
+from pathlib import Path
 from urllib.error import HTTPError, URLError
 from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
 from urllib.request import Request, urlopen
@@ -48,6 +65,16 @@ DEFAULT_MAX_PAGES = int(os.getenv("TABLE_MAX_PAGES", "250"))
 DEFAULT_USER_AGENT = os.getenv("TABLE_SCRAPER_USER_AGENT", "TableScraper/1.0")
 DEFAULT_MAX_RETRIES = int(os.getenv("TABLE_MAX_RETRIES", "3"))
 DEFAULT_RETRY_DELAY = float(os.getenv("TABLE_RETRY_DELAY", "2.0"))
+DEFAULT_CONCURRENCY = int(os.getenv("TABLE_CONCURRENCY", "4"))
+DEFAULT_RATE = 1 / DEFAULT_DELAY_SECONDS if DEFAULT_DELAY_SECONDS > 0 else 0
+NDJSON_SUFFIXES = {".ndjson", ".jsonl"}
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = os.getenv("TABLE_HTTP_CACHE_DIR", str(REPO_ROOT / ".cache" / "table_scraper"))
+MAX_REDIRECTS = 5
+DEFAULT_CHECKPOINT_EVERY = int(os.getenv("TABLE_CHECKPOINT_EVERY", "10"))
+# Characters of a page fed to the streaming table parser at once
+STREAM_CHUNK_CHARS = 64 * 1024
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
 
 
 def configure_logging(verbosity: int) -> None:
@@ -77,7 +104,12 @@ class TableCell:
 
 
 class TableHTMLParser(HTMLParser):
-    """Minimal HTML table extractor without external dependencies."""
+    """Minimal HTML table extractor without external dependencies.
+
+    Completed rows and top-level tables go through ``_add_row`` and
+    ``_end_table``; subclasses override them to count or stream rows instead of
+    keeping every table of the page.
+    """
 
     def __init__(self) -> None:
         super().__init__(convert_charrefs=True)
@@ -93,6 +125,7 @@ class TableHTMLParser(HTMLParser):
             self._table_depth += 1
             if self._table_depth == 1:
                 self._current_table = []
+                self._start_table()
         if self._table_depth == 0:
             return
         if tag == "tr":
@@ -115,14 +148,73 @@ class TableHTMLParser(HTMLParser):
             self._current_cell = []
         elif tag == "tr":
             if self._current_table is not None and self._current_row:
-                self._current_table.append(self._current_row)
+                self._add_row(self._current_row)
             self._current_row = None
         elif tag == "table":
-            if self._table_depth == 1 and self._current_table:
-                self.tables.append(self._current_table)
+            if self._table_depth == 1 and self._current_table is not None:
+                self._end_table()
             self._current_table = None
             self._table_depth = max(0, self._table_depth - 1)
 
+    def _start_table(self) -> None:
+        pass
+
+    def _add_row(self, row: list[TableCell]) -> None:
+        self._current_table.append(row)
+
+    def _end_table(self) -> None:
+        if self._current_table:
+            self.tables.append(self._current_table)
+
+
+class TableSizeParser(TableHTMLParser):
+    """First pass of streaming extraction: row count and first header row of every kept table.
+
+    ``ordinals`` holds the position of each kept table among all top-level
+    ``<table>`` starts: an outer table is dropped once a nested table closes
+    inside it, so kept tables cannot be numbered by counting kept ones.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.sizes: list[int] = []
+        self.header_rows: list[int | None] = []
+        self.ordinals: list[int] = []
+        self._started = 0
+        self._rows = 0
+        self._header_row: int | None = None
+
+    def _start_table(self) -> None:
+        self._started += 1
+        self._rows = 0
+        self._header_row = None
+
+    def _add_row(self, row: list[TableCell]) -> None:
+        if self._header_row is None and any(cell.is_header for cell in row):
+            self._header_row = self._rows
+        self._rows += 1
+
+    def _end_table(self) -> None:
+        if self._rows:
+            self.sizes.append(self._rows)
+            self.header_rows.append(self._header_row)
+            self.ordinals.append(self._started - 1)
+
+
+class TableRowStreamer(TableSizeParser):
+    """Second pass: rows of the top-level table number ``ordinal`` collect in ``rows`` as they are parsed."""
+
+    def __init__(self, ordinal: int) -> None:
+        super().__init__()
+        self.ordinal = ordinal
+        self.rows: list[list[TableCell]] = []
+
+    def _add_row(self, row: list[TableCell]) -> None:
+        super()._add_row(row)
+        # The selected table is a kept one, so all of its rows belong to the result
+        if self._started - 1 == self.ordinal:
+            self.rows.append(row)
+
 
 class AnchorParser(HTMLParser):
     """Collect anchor hrefs for pagination discovery."""
@@ -175,6 +267,42 @@ def select_primary_table(tables: list[list[list[TableCell]]]) -> list[list[Table
     return max(tables, key=len)
 
 
+def iter_primary_table_records(html: str, chunk_size: int = STREAM_CHUNK_CHARS) -> Iterator[dict[str, str]]:
+    """
+    Records of the primary table without materializing every table of the page
+
+    Same result as ``table_to_records(select_primary_table(extract_tables(html)))``.
+    The first pass only counts rows per table; the second one feeds the page in
+    chunks and yields rows of the longest table as soon as they are parsed.
+    """
+    sizes = TableSizeParser()
+    sizes.feed(html)
+    if not sizes.sizes:
+        return
+    index = max(range(len(sizes.sizes)), key=sizes.sizes.__getitem__)
+    header_row = sizes.header_rows[index]
+
+    streamer = TableRowStreamer(sizes.ordinals[index])
+    headers: list[str] | None = None
+    pending: list[list[TableCell]] = []
+    for start in range(0, len(html), chunk_size):
+        streamer.feed(html[start : start + chunk_size])
+        rows, streamer.rows = streamer.rows, []
+        for row in rows:
+            if headers is None:
+                # Rows before the header row wait until the headers are known
+                pending.append(row)
+                if header_row is not None and len(pending) <= header_row:
+                    continue
+                headers = derive_headers([pending[-1] if header_row is not None else pending[0]])
+                rows_ready, pending = pending, []
+            else:
+                rows_ready = [row]
+            for ready in rows_ready:
+                if not all(cell.is_header for cell in ready):
+                    yield {header: ready[i].text if i < len(ready) else "" for i, header in enumerate(headers)}
+
+
 def derive_headers(table: list[list[TableCell]]) -> list[str]:
     for row in table:
         if any(cell.is_header for cell in row):
@@ -257,6 +385,330 @@ def fetch_html(
     raise last_error
 
 
+class TokenBucket:
+    """Per-host request rate limit: ``rate`` requests per second with bursts of up to ``burst``.
+
+    Callers reserve a token and sleep off the deficit, so concurrent fetches to
+    one host are spaced out evenly instead of all waiting for the same delay.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated: float | None = None
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        now = asyncio.get_running_loop().time()
+        if self._updated is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+class ConnectionPool:
+    """Idle keep-alive connections per (scheme, host), shared by the fetch threads."""
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self._idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def acquire(self, scheme: str, netloc: str) -> tuple[http.client.HTTPConnection, bool]:
+        """Connection to the host and whether it is a reused one."""
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop(), True
+        return self.connect(scheme, netloc), False
+
+    def connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        """New connection to the host."""
+        with self._lock:
+            self.opened += 1
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def release(self, scheme: str, netloc: str, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.setdefault((scheme, netloc), []).append(connection)
+
+    def close(self) -> None:
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle.clear()
+
+
+class ResponseCache:
+    """Pages with their ETag/Last-Modified validators, one JSON file per URL under ``directory``."""
+
+    def __init__(self, directory: Path | None) -> None:
+        self.directory = directory
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def get(self, url: str) -> dict[str, str] | None:
+        if self.directory is None:
+            return None
+        try:
+            entry = json.loads(self._path(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) and entry.get("url") == url else None
+
+    def put(self, url: str, body: str, etag: str | None, last_modified: str | None) -> None:
+        if self.directory is None or not (etag or last_modified):
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = {"url": url, "etag": etag, "last_modified": last_modified, "body": body}
+        handle, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as tmp:
+                json.dump(entry, tmp, ensure_ascii=False)
+            os.replace(tmp_name, self._path(url))
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+
+class FetchError(Exception):
+    """HTTP error status (or too many redirects) for a page."""
+
+
+@dataclass
+class CrawlStats:
+    fetched: int = 0
+    not_modified: int = 0
+    failed: int = 0
+    connections: int = 0
+
+
+class AsyncCrawler:
+    """
+    Concurrent crawler of table pages (asyncio, stdlib only)
+
+    Pages are fetched by at most ``concurrency`` requests at once over pooled
+    keep-alive connections; every host has its own token bucket of ``rate``
+    requests per second (0 disables the limit). With ``cache_dir``, pages are
+    stored with their ETag/Last-Modified and re-crawls send conditional
+    requests: a 304 answer reuses the stored page.
+
+    Rows are returned in page discovery order (links of a page are queued
+    sorted), so the output does not depend on which request finishes first.
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate: float = DEFAULT_RATE,
+        burst: int = 1,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        cache_dir: Path | None = None,
+        user_agent: str = DEFAULT_USER_AGENT,
+    ) -> None:
+        if max_retries < 0:
+            raise ValueError("max_retries must be at least 0")
+        self.timeout = timeout_seconds
+        self.max_pages = max_pages
+        self.concurrency = max(1, concurrency)
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.cache = ResponseCache(cache_dir)
+        self.user_agent = user_agent
+        self.stats = CrawlStats()
+        self.frontier: dict[str, None] = {}
+        self.failed_urls: list[str] = []
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def _request(self, pool: ConnectionPool, url: str, headers: dict[str, str]) -> tuple[int, str, dict[str, str]]:
+        """Blocking GET over a pooled connection, following redirects (runs in the thread pool)."""
+        for _ in range(MAX_REDIRECTS + 1):
+            parsed = urlparse(url)
+            target = urlunparse(("", "", parsed.path or "/", parsed.params, parsed.query, ""))
+            connection, reused = pool.acquire(parsed.scheme, parsed.netloc)
+            try:
+                try:
+                    connection.request("GET", target, headers=headers)
+                    response = connection.getresponse()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    if not reused:
+                        raise
+                    # The server closed an idle keep-alive connection: retry once on a new one
+                    connection.close()
+                    connection = pool.connect(parsed.scheme, parsed.netloc)
+                    connection.request("GET", target, headers=headers)
+                    response = connection.getresponse()
+                data = response.read()
+            except BaseException:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                pool.release(parsed.scheme, parsed.netloc, connection)
+
+            location = response.getheader("Location")
+            if response.status in REDIRECT_STATUSES and location:
+                url = urljoin(url, location)
+                continue
+            charset = response.headers.get_content_charset("utf-8")
+            validators = {
+                "etag": response.getheader("ETag"),
+                "last_modified": response.getheader("Last-Modified"),
+            }
+            return response.status, data.decode(charset, errors="replace"), validators
+        raise FetchError(f"Too many redirects for {url}")
+
+    def _bucket(self, netloc: str) -> TokenBucket:
+        bucket = self._buckets.get(netloc)
+        if bucket is None:
+            bucket = self._buckets[netloc] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    async def _fetch(self, pool: ConnectionPool, executor: ThreadPoolExecutor, url: str) -> str:
+        """Page HTML with retries; the cached copy when the server answers 304 Not Modified."""
+        cached = self.cache.get(url)
+        headers = {"User-Agent": self.user_agent}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        loop = asyncio.get_running_loop()
+        attempts = max(1, self.max_retries)
+        for attempt in range(attempts):
+            await self._bucket(urlparse(url).netloc).acquire()
+            try:
+                status, html, validators = await loop.run_in_executor(executor, self._request, pool, url, headers)
+                if status == 304 and cached:
+                    self.stats.not_modified += 1
+                    return cached["body"]
+                if status >= 400:
+                    raise FetchError(f"HTTP Error {status} for {url}")
+                self.stats.fetched += 1
+                self.cache.put(url, html, **validators)
+                return html
+            except (OSError, http.client.HTTPException, FetchError) as error:
+                if attempt < attempts - 1:
+                    logging.warning(
+                        "Attempt %d/%d failed for %s: %s. Retrying in %.1fs...",
+                        attempt + 1,
+                        attempts,
+                        url,
+                        error,
+                        self.retry_delay,
+                    )
+                    await asyncio.sleep(self.retry_delay)
+                else:
+                    logging.error("All %d attempts failed for %s: %s", attempts, url, error)
+                    raise
+        raise RuntimeError(f"Unexpected error: fetch failed but no error was captured for {url}")
+
+    async def pages(
+        self, base_url: str, frontier: Sequence[str] = (), done: int = 0
+    ) -> AsyncIterator[tuple[str, list[dict[str, str]]]]:
+        """
+        (url, records) of every page in discovery order, as soon as the page and all earlier ones are done
+
+        Failed pages yield no records (their URLs are in ``failed_urls``). To
+        resume a crawl, pass the saved ``frontier`` and the number of its pages
+        already consumed (``done``): only the rest is fetched again.
+        """
+        # Every URL ever queued, in discovery order: O(1) membership and a stable output order
+        self.frontier = dict.fromkeys(frontier or [normalize_url(base_url)])
+        order = list(self.frontier)
+        queue: asyncio.Queue[tuple[int, str]] = asyncio.Queue()
+        for position in range(done, len(order)):
+            queue.put_nowait((position, order[position]))
+        results: dict[int, list[dict[str, str]]] = {}
+        ready = asyncio.Event()
+        pool = ConnectionPool(self.timeout)
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="table-scraper")
+
+        async def worker() -> None:
+            try:
+                while True:
+                    position, url = await queue.get()
+                    logging.info("Fetching %s", url)
+                    try:
+                        html = await self._fetch(pool, executor, url)
+                    except (OSError, http.client.HTTPException, FetchError) as error:
+                        logging.warning("Failed to fetch %s after %d retries: %s", url, self.max_retries, error)
+                        self.failed_urls.append(url)
+                        results[position] = []
+                        ready.set()
+                        continue
+                    records = list(iter_primary_table_records(html))
+                    if records:
+                        logging.info("Extracted %d rows from %s", len(records), url)
+                    else:
+                        logging.warning("No table rows found on %s", url)
+                    for link in sorted(extract_links(html, url)):
+                        if link not in self.frontier and len(self.frontier) < self.max_pages:
+                            self.frontier[link] = None
+                            order.append(link)
+                            queue.put_nowait((len(order) - 1, link))
+                    results[position] = records
+                    ready.set()
+            finally:
+                # Wake the consumer so that it notices a worker stopped on an unexpected error
+                ready.set()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            # Links of a page are queued before its result is stored, so once every
+            # queued page has been consumed the crawl is complete
+            while done < len(order):
+                if done in results:
+                    records = results.pop(done)
+                    done += 1
+                    yield order[done - 1], records
+                    continue
+                ready.clear()
+                for task in workers:
+                    if task.done():
+                        task.result()  # a worker can only stop on an unexpected error: re-raise it
+                await ready.wait()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            executor.shutdown(wait=True)
+            pool.close()
+            self.stats.failed = len(self.failed_urls)
+            self.stats.connections = pool.opened
+
+        if self.failed_urls:
+            if len(self.failed_urls) <= 5:
+                logging.warning("Failed to fetch %d URLs: %s", len(self.failed_urls), self.failed_urls)
+            else:
+                logging.warning(
+                    "Failed to fetch %d URLs (showing first 5): %s", len(self.failed_urls), self.failed_urls[:5]
+                )
+
+    async def crawl(self, base_url: str) -> list[dict[str, str]]:
+        return [row async for _, records in self.pages(base_url) for row in records]
+
+
+def rate_for_delay(delay_seconds: float) -> float:
+    """Token bucket rate for an average interval between requests (0: no limit)."""
+    return 1 / delay_seconds if delay_seconds > 0 else 0
+
+
 def crawl_all_pages(
     base_url: str,
     timeout_seconds: int,
@@ -264,47 +716,133 @@ def crawl_all_pages(
     max_pages: int,
     max_retries: int = DEFAULT_MAX_RETRIES,
     retry_delay: float = DEFAULT_RETRY_DELAY,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    cache_dir: Path | None = None,
 ) -> list[dict[str, str]]:
-    visited: set[str] = set()
-    queue: deque[str] = deque([normalize_url(base_url)])
-    aggregated_rows: list[dict[str, str]] = []
-    failed_urls: list[str] = []
-
-    while queue and len(visited) < max_pages:
-        url = queue.popleft()
-        if url in visited:
-            continue
-        logging.info("Fetching %s (page %d/%d)", url, len(visited) + 1, max_pages)
-        try:
-            html = fetch_html(url, timeout_seconds, max_retries, retry_delay)
-        except (HTTPError, URLError) as error:
-            logging.warning("Failed to fetch %s after %d retries: %s", url, max_retries, error)
-            failed_urls.append(url)
-            # Continue to next URL instead of breaking
-            continue
-        visited.add(url)
-        tables = extract_tables(html)
-        primary_table = select_primary_table(tables)
-        if primary_table:
-            page_records = table_to_records(primary_table)
-            logging.info("Extracted %d rows from %s", len(page_records), url)
-            aggregated_rows.extend(page_records)
-        else:
-            logging.warning("No tables found on %s", url)
+    """
+    Crawl all pagination pages of the table with AsyncCrawler
 
-        for link in extract_links(html, url):
-            if link not in visited and link not in queue and len(visited) + len(queue) < max_pages:
-                queue.append(link)
+    ``delay_seconds`` is the average interval between requests to one host
+    (token bucket rate ``1 / delay_seconds``; 0 disables the limit).
+    """
+    crawler = AsyncCrawler(
+        timeout_seconds=timeout_seconds,
+        max_pages=max_pages,
+        concurrency=concurrency,
+        rate=rate_for_delay(delay_seconds),
+        max_retries=max_retries,
+        retry_delay=retry_delay,
+        cache_dir=cache_dir,
+    )
+    rows = asyncio.run(crawler.crawl(base_url))
+    stats = crawler.stats
+    logging.info(
+        "Crawl finished: %d fetched, %d not modified, %d failed, %d connections",
+        stats.fetched,
+        stats.not_modified,
+        stats.failed,
+        stats.connections,
+    )
+    return rows
 
-        time.sleep(delay_seconds)
 
-    if failed_urls:
-        if len(failed_urls) <= 5:
-            logging.warning("Failed to fetch %d URLs: %s", len(failed_urls), failed_urls)
-        else:
-            logging.warning("Failed to fetch %d URLs (showing first 5): %s", len(failed_urls), failed_urls[:5])
+def checkpoint_path(output_path: Path) -> Path:
+    """Crawl state saved next to an NDJSON output."""
+    return output_path.with_name(output_path.name + ".state.json")
+
+
+def partial_path(output_path: Path) -> Path:
+    """Rows of an NDJSON crawl in progress; replaces the output when the crawl finishes."""
+    return output_path.with_name(output_path.name + ".part")
 
-    return aggregated_rows
+
+def _save_checkpoint(path: Path, state: dict) -> None:
+    handle, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as tmp:
+            json.dump(state, tmp, ensure_ascii=False)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def crawl_to_ndjson(
+    base_url: str,
+    output_path: Path,
+    resume: bool = False,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    **crawler_options,
+) -> int:
+    """
+    Crawl pages and append their rows as NDJSON while crawling
+
+    Rows are written in page discovery order to ``<output>.part``, so memory does
+    not grow with the crawl; the file replaces ``output_path`` only when the crawl
+    finishes with at least one row, so an existing output is never altered by a
+    failed or empty crawl. Every ``checkpoint_every`` pages the frontier (all
+    discovered URLs in order), the number of pages written and the size of the
+    partial file are saved to ``<output>.state.json``. With ``resume``, the partial
+    file is truncated back to the last checkpoint and only the pages after it are
+    fetched; a finished crawl is not repeated.
+
+    Returns:
+        Number of rows in the output (0: the output was not written)
+
+    Raises:
+        ValueError: If checkpoint_every is less than 1
+    """
+    if checkpoint_every < 1:
+        raise ValueError("checkpoint_every must be at least 1")
+    state_path = checkpoint_path(output_path)
+    part_path = partial_path(output_path)
+    start_url = normalize_url(base_url)
+    state = {"source": start_url, "frontier": [start_url], "done": 0, "rows": 0, "output_bytes": 0}
+    mode = "wb"
+    if resume and state_path.exists():
+        saved = json.loads(state_path.read_text(encoding="utf-8"))
+        if saved.get("source") == start_url and saved.get("complete") and output_path.exists():
+            logging.info("Crawl of %s already finished (%d rows)", start_url, saved["rows"])
+            return saved["rows"]
+        if saved.get("source") == start_url and not saved.get("complete") and part_path.exists():
+            state = saved
+            mode = "r+b"
+            logging.info("Resuming crawl after %d pages (%d rows)", state["done"], state["rows"])
+        else:
+            logging.warning("Checkpoint %s does not match %s; starting over", state_path, start_url)
+
+    crawler = AsyncCrawler(**crawler_options)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    async def run() -> None:
+        with open(part_path, mode) as output:
+            # Rows written after the last checkpoint are fetched and written again
+            output.truncate(state["output_bytes"])
+            output.seek(state["output_bytes"])
+            pages = crawler.pages(start_url, state["frontier"], state["done"])
+            async for _, records in pages:
+                for record in records:
+                    output.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+                state["done"] += 1
+                state["rows"] += len(records)
+                if state["done"] % checkpoint_every == 0:
+                    output.flush()
+                    os.fsync(output.fileno())
+                    state.update(frontier=list(crawler.frontier), output_bytes=output.tell())
+                    _save_checkpoint(state_path, state)
+            output.flush()
+            os.fsync(output.fileno())
+            state.update(frontier=list(crawler.frontier), output_bytes=output.tell())
+
+    asyncio.run(run())
+    if not state["rows"]:
+        part_path.unlink()
+        state_path.unlink(missing_ok=True)
+        return 0
+    os.replace(part_path, output_path)
+    state.update(complete=True, failed=crawler.failed_urls)
+    _save_checkpoint(state_path, state)
+    return state["rows"]
 
 
 def dump_results(rows: list[dict[str, str]], output_path: str, source_url: str) -> None:
@@ -330,6 +868,23 @@ def parse_args(argv: Sequence[str]) -> argparse.Namespace:
         default="sources/table_data.json",
         help="Output JSON path (default: %(default)s)",
     )
+    parser.add_argument(
+        "--format",
+        choices=["json", "ndjson"],
+        default=None,
+        help="Output format; ndjson writes rows while crawling (default: by the output extension)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an NDJSON crawl from its <output>.state.json checkpoint",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=DEFAULT_CHECKPOINT_EVERY,
+        help="Pages between NDJSON crawl checkpoints (default: %(default)s)",
+    )
     parser.add_argument(
         "--timeout",
         type=int,
@@ -340,7 +895,23 @@ def parse_args(argv: Sequence[str]) -> argparse.Namespace:
         "--delay",
         type=float,
         default=DEFAULT_DELAY_SECONDS,
-        help="Delay between requests in seconds (default: %(default)s)",
+        help="Average interval between requests to one host in seconds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Pages fetched at once (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="Directory of cached pages for conditional requests (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not send conditional requests or store pages",
     )
     parser.add_argument(
         "--max-pages",
@@ -367,20 +938,44 @@ def parse_args(argv: Sequence[str]) -> argparse.Namespace:
         default=DEFAULT_RETRY_DELAY,
         help="Delay between retry attempts in seconds (default: %(default)s)",
     )
-    return parser.parse_args(argv)
+    args = parser.parse_args(argv)
+    if args.checkpoint_every < 1:
+        parser.error("--checkpoint-every must be at least 1")
+    return args
 
 
 def main(argv: Sequence[str]) -> int:
     args = parse_args(argv)
     configure_logging(args.verbose)
     logging.info(
-        "Starting crawl: url=%s, max_pages=%d, timeout=%ds, delay=%.2fs, max_retries=%d",
+        "Starting crawl: url=%s, max_pages=%d, timeout=%ds, delay=%.2fs, concurrency=%d, max_retries=%d",
         args.url,
         args.max_pages,
         args.timeout,
         args.delay,
+        args.concurrency,
         args.max_retries,
     )
+    if args.format == "ndjson" or (args.format is None and Path(args.output).suffix in NDJSON_SUFFIXES):
+        count = crawl_to_ndjson(
+            args.url,
+            Path(args.output),
+            resume=args.resume,
+            checkpoint_every=args.checkpoint_every,
+            timeout_seconds=args.timeout,
+            max_pages=args.max_pages,
+            concurrency=args.concurrency,
+            rate=rate_for_delay(args.delay),
+            max_retries=args.max_retries,
+            retry_delay=args.retry_delay,
+            cache_dir=None if args.no_cache else Path(args.cache_dir),
+        )
+        if not count:
+            logging.warning("No rows extracted into %s.", args.output)
+            return 1
+        logging.info("Saved %d rows into %s", count, args.output)
+        return 0
+
     rows = crawl_all_pages(
         base_url=args.url,
         timeout_seconds=args.timeout,
@@ -388,6 +983,8 @@ def main(argv: Sequence[str]) -> int:
         max_pages=args.max_pages,
         max_retries=args.max_retries,
         retry_delay=args.retry_delay,
+        concurrency=args.concurrency,
+        cache_dir=None if args.no_cache else Path(args.cache_dir),
     )
     if not rows:
         logging.warning("No rows extracted; output file will not be created.")
@@ -1,5 +1,9 @@
 -- Инициализация базы данных для каталога подшипников
 -- Включает таблицы для истории поиска и аналитики
+-- Скрипт идемпотентен: api/scripts/import_to_postgres.py применяет его перед загрузкой
+
+-- Триграммные индексы для поиска подстрок (LIKE '%...%') и префиксов
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- Таблица истории поиска
 CREATE TABLE IF NOT EXISTS search_history (
@@ -13,10 +17,10 @@ CREATE TABLE IF NOT EXISTS search_history (
 );
 
 -- Индексы для оптимизации запросов
-CREATE INDEX idx_search_history_user ON search_history(user_id);
-CREATE INDEX idx_search_history_query ON search_history(query);
-CREATE INDEX idx_search_history_timestamp ON search_history(timestamp);
-CREATE INDEX idx_search_history_session ON search_history(session_id);
+CREATE INDEX IF NOT EXISTS idx_search_history_user ON search_history(user_id);
+CREATE INDEX IF NOT EXISTS idx_search_history_query ON search_history(query);
+CREATE INDEX IF NOT EXISTS idx_search_history_timestamp ON search_history(timestamp);
+CREATE INDEX IF NOT EXISTS idx_search_history_session ON search_history(session_id);
 
 -- Таблица для кеширования популярных запросов
 CREATE TABLE IF NOT EXISTS popular_queries (
@@ -27,8 +31,8 @@ CREATE TABLE IF NOT EXISTS popular_queries (
     updated_at TIMESTAMP DEFAULT NOW()
 );
 
-CREATE INDEX idx_popular_queries_count ON popular_queries(search_count DESC);
-CREATE INDEX idx_popular_queries_updated ON popular_queries(updated_at);
+CREATE INDEX IF NOT EXISTS idx_popular_queries_count ON popular_queries(search_count DESC);
+CREATE INDEX IF NOT EXISTS idx_popular_queries_updated ON popular_queries(updated_at);
 
 -- Таблица для хранения метаданных документов
 CREATE TABLE IF NOT EXISTS documents (
@@ -41,8 +45,30 @@ CREATE TABLE IF NOT EXISTS documents (
     updated_at TIMESTAMP DEFAULT NOW()
 );
 
-CREATE INDEX idx_documents_path ON documents(path);
-CREATE INDEX idx_documents_title ON documents(title);
+CREATE INDEX IF NOT EXISTS idx_documents_path ON documents(path);
+CREATE INDEX IF NOT EXISTS idx_documents_title ON documents(title);
+
+-- Поля поиска (SEARCH_BACKEND=postgres, api/app/catalog_search.py):
+-- position — порядок документов в индексе, search_vector — полнотекстовый поиск
+-- lower() по кириллице требует БД с UTF-8 локалью (по умолчанию в образе postgres)
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS excerpt TEXT NOT NULL DEFAULT '';
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS position INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('russian', title || ' ' || excerpt)) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_documents_search_vector ON documents USING GIN (search_vector);
+CREATE INDEX IF NOT EXISTS idx_documents_title_trgm ON documents USING GIN (lower(title) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_documents_excerpt_trgm ON documents USING GIN (lower(excerpt) gin_trgm_ops);
+
+-- Словарь автодополнения (data/autocomplete_dict.json)
+CREATE TABLE IF NOT EXISTS autocomplete_terms (
+    value TEXT PRIMARY KEY,
+    type VARCHAR(20) NOT NULL,
+    frequency INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_autocomplete_terms_trgm ON autocomplete_terms USING GIN (lower(value) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_autocomplete_terms_frequency ON autocomplete_terms(frequency DESC);
 
 -- Таблица для хранения аналогов подшипников
 CREATE TABLE IF NOT EXISTS bearing_analogs (
@@ -56,31 +82,16 @@ CREATE TABLE IF NOT EXISTS bearing_analogs (
     created_at TIMESTAMP DEFAULT NOW()
 );
 
-CREATE INDEX idx_bearing_analogs_original ON bearing_analogs(original_code);
-CREATE INDEX idx_bearing_analogs_analog ON bearing_analogs(analog_code);
-CREATE INDEX idx_bearing_analogs_manufacturer ON bearing_analogs(manufacturer);
-
--- Функция для автоматического обновления популярных запросов
-CREATE OR REPLACE FUNCTION update_popular_queries()
-RETURNS TRIGGER AS $$
-BEGIN
-    INSERT INTO popular_queries (query, search_count, last_searched)
-    VALUES (NEW.query, 1, NEW.timestamp)
-    ON CONFLICT (query) 
-    DO UPDATE SET 
-        search_count = popular_queries.search_count + 1,
-        last_searched = NEW.timestamp,
-        updated_at = NOW();
-    RETURN NEW;
-END;
-$$ LANGUAGE plpgsql;
-
--- Триггер для автоматического обновления популярных запросов
+CREATE INDEX IF NOT EXISTS idx_bearing_analogs_original ON bearing_analogs(original_code);
+CREATE INDEX IF NOT EXISTS idx_bearing_analogs_analog ON bearing_analogs(analog_code);
+CREATE INDEX IF NOT EXISTS idx_bearing_analogs_manufacturer ON bearing_analogs(manufacturer);
+-- original_code хранит ключ поиска (api/app/analogs.py: normalize_code), строки — по порядку выдачи id
+CREATE INDEX IF NOT EXISTS idx_bearing_analogs_original_id ON bearing_analogs(original_code, id);
+
+-- Счетчики popular_queries обновляет приложение (api/app/history_store.py):
+-- одним upsert на уникальный запрос пачки вместо триггера на каждую строку
 DROP TRIGGER IF EXISTS trigger_update_popular_queries ON search_history;
-CREATE TRIGGER trigger_update_popular_queries
-    AFTER INSERT ON search_history
-    FOR EACH ROW
-    EXECUTE FUNCTION update_popular_queries();
+DROP FUNCTION IF EXISTS update_popular_queries();
 
 -- Представление для аналитики поиска
 CREATE OR REPLACE VIEW search_analytics AS
@@ -100,4 +111,5 @@ COMMENT ON TABLE search_history IS 'История поисковых запро
 COMMENT ON TABLE popular_queries IS 'Кеш популярных поисковых запросов';
 COMMENT ON TABLE documents IS 'Метаданные документов для поиска';
 COMMENT ON TABLE bearing_analogs IS 'Таблица аналогов подшипников';
+COMMENT ON TABLE autocomplete_terms IS 'Словарь автодополнения';
 COMMENT ON VIEW search_analytics IS 'Аналитическое представление истории поиска';
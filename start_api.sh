@@ -42,17 +42,8 @@ if [ ! -f "data/autocomplete_dict.json" ] || [ ! -f "data/document_index.json" ]
     echo "Построение индексов (это может занять несколько минут)..."
     echo "=================================================="
     
-    if [ ! -f "data/autocomplete_dict.json" ]; then
-        echo ""
-        echo "Построение словаря автодополнения..."
-        python scripts/build_autocomplete_dict.py
-    fi
-    
-    if [ ! -f "data/document_index.json" ]; then
-        echo ""
-        echo "Построение индекса документов..."
-        python scripts/build_search_index.py
-    fi
+    # Словарь автодополнения и индекс документов строятся за один проход по файлам
+    python scripts/build_indexes.py
     
     echo ""
     echo "✓ Индексы построены"
@@ -0,0 +1,83 @@
+"""Tests for the analog index and /analogs endpoints."""
+
+from fastapi.testclient import TestClient
+
+from api.app import api
+from api.app.analogs import AnalogIndex
+
+
+def _index(tmp_path) -> AnalogIndex:
+    analogs = tmp_path / "analogs"
+    analogs.mkdir()
+    (analogs / "import_analogs.csv").write_text(
+        "GOST,ISO,SKF,FAG,NSK,NTN,KOYO,Notes,Limitations,Source\n"
+        "207 (6205),6205,6205,6205,,,,Полный аналог,,x\n"
+        "7205А,7205,7205B,7205B,,,,Полный аналог,,x\n",
+        encoding="utf-8",
+    )
+    (analogs / "gost_to_iso.csv").write_text(
+        "GOST,ISO,Type,d,D,B,Notes,Source\n7205А,7205,Радиально-упорный,25,52,15,,x\n", encoding="utf-8"
+    )
+    (analogs / "gost_iso.csv").write_text(
+        "source,gost,iso,brand,notes\nx,2205,NU 205,,Требуется контроль буртов\n", encoding="utf-8"
+    )
+    catalog = tmp_path / "master_catalog.csv"
+    catalog.write_text("GOST,ISO,SKF,FAG,NSK,NTN,KOYO\n180,6000,6000,,,,\n180,6200,6200,,,,\n", encoding="utf-8")
+    return AnalogIndex(str(analogs), str(catalog))
+
+
+def _codes(rows: list[dict]) -> set[tuple[str, str, str]]:
+    return {(row["standard"], row["manufacturer"], row["code"]) for row in rows}
+
+
+def test_equivalence_is_transitive(tmp_path) -> None:
+    index = _index(tmp_path)
+
+    # Бренд → ГОСТ через ISO, кириллическая "А" нормализуется
+    assert _codes(index.lookup("7205b")) == {
+        ("ISO", "", "7205"),
+        ("ГОСТ", "", "7205А"),
+        ("ISO", "SKF", "7205B"),
+        ("ISO", "FAG", "7205B"),
+    }
+    assert ("ISO", "", "7205") in _codes(index.lookup("7205A"))
+    assert all(row["compatibility"] == "100%" for row in index.lookup("207 (6205)"))
+
+
+def test_ambiguous_code_does_not_merge_classes(tmp_path) -> None:
+    index = _index(tmp_path)
+
+    assert ("ISO", "", "6200") not in _codes(index.lookup("6000"))
+    ambiguous = index.lookup("180")
+    assert {"6000", "6200"} <= {row["code"] for row in ambiguous}
+    assert {row["compatibility"] for row in ambiguous} == {"требует проверки"}
+    assert ("ГОСТ", "", "180") in _codes(index.lookup("6000"))
+
+
+def test_partial_analogs_are_direct_links(tmp_path) -> None:
+    index = _index(tmp_path)
+
+    (row,) = index.lookup("NU205")
+    assert (row["code"], row["compatibility"], row["notes"]) == ("2205", "частичный", "Требуется контроль буртов")
+    assert index.lookup("unknown") == []
+
+    batch = index.lookup_many(["6205", "unknown", "6205"])
+    assert list(batch) == ["6205", "unknown"]
+    assert ("ГОСТ", "", "207 (6205)") in _codes(batch["6205"])
+
+
+def test_analogs_endpoints() -> None:
+    client = TestClient(api.app)
+
+    response = client.get("/analogs/6205")
+    assert response.status_code == 200
+    assert any(row["manufacturer"] == "SKF" for row in response.json()["analogs"])
+
+    export = client.get("/analogs/6205/export", params={"export_format": "csv"})
+    assert export.status_code == 200
+    assert "6205" in export.content.decode("utf-8-sig")
+
+    batch = client.post("/analogs/batch", json=["6205", "не-подшипник"]).json()
+    assert "6205" in batch["results"] and batch["not_found"] == ["не-подшипник"]
+
+    assert client.get("/analogs/не-подшипник/export").status_code == 404
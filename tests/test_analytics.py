@@ -0,0 +1,88 @@
+"""Tests for rollup-based search analytics."""
+
+from datetime import timedelta
+
+from api.app.analytics import SearchAnalytics
+
+
+class _Clock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+DAY = 86400
+
+
+def test_summary_respects_window() -> None:
+    clock = _Clock(100 * DAY + 12 * 3600)
+    analytics = SearchAnalytics(clock=clock)
+
+    analytics.record("6205", 12)
+    clock.now += 3 * DAY
+    analytics.record("6205", 0)
+    analytics.record("NU 205", 0)
+    clock.now += 30 * 60
+    analytics.record("6305", 3)
+
+    hour = analytics.summary(timedelta(hours=1))
+    assert hour["total_searches"] == 3
+    assert hour["zero_results_queries"] == [{"query": "6205", "count": 1}, {"query": "nu 205", "count": 1}]
+    assert hour["avg_results_per_query"] == 1.0
+    assert hour["results_distribution"]["0"] == 2
+
+    week = analytics.summary(timedelta(days=7))
+    assert week["total_searches"] == 4
+    assert week["unique_queries"] == 3
+    assert week["top_queries"][0] == {"query": "6205", "count": 2}
+    assert week["results_distribution"]["11-20"] == 1
+
+
+def test_window_start_accuracy() -> None:
+    clock = _Clock(100 * DAY)
+    analytics = SearchAnalytics(clock=clock)
+
+    analytics.record("6205", 1)
+    clock.now += 10 * 60
+    analytics.record("6305", 1)
+
+    # В пределах минутных корзин граница окна точна до минуты
+    clock.now += 80 * 60
+    assert [q["query"] for q in analytics.summary(timedelta(minutes=85))["top_queries"]] == ["6305"]
+
+    # Дальше — до часа: начало окна добирается часовыми корзинами
+    clock.now += 20 * 3600
+    assert analytics.summary(timedelta(hours=20, minutes=30))["total_searches"] == 0
+    assert analytics.summary(timedelta(hours=21, minutes=45))["total_searches"] == 2
+
+
+def test_month_window_start_accurate_to_hour() -> None:
+    clock = _Clock(100 * DAY)
+    analytics = SearchAnalytics(clock=clock)
+
+    analytics.record("6205", 1)
+    clock.now += 3600
+    analytics.record("6305", 1)
+
+    # Окно 30d начинается на часовой границе, а не на начале суток
+    clock.now += 30 * DAY - 1
+    assert analytics.summary(timedelta(days=30))["total_searches"] == 2
+    clock.now += 1
+    assert analytics.summary(timedelta(days=30))["total_searches"] == 1
+
+
+def test_memory_bounded_by_buckets_and_queries() -> None:
+    clock = _Clock(100 * DAY)
+    analytics = SearchAnalytics(max_queries_per_bucket=10, clock=clock)
+
+    for minute in range(500):
+        analytics.record(f"q{minute}", 1)
+        analytics.record("6205", 1)
+        clock.now += 60
+
+    minute_tier, hour_tier, day_tier = analytics.tiers
+    assert len(minute_tier.buckets) == minute_tier.keep
+    assert all(len(bucket.queries) <= 20 for tier in analytics.tiers for bucket in tier.buckets)
+    assert analytics.summary(timedelta(days=1))["top_queries"][0] == {"query": "6205", "count": 500}
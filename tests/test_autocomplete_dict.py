@@ -0,0 +1,88 @@
+"""Tests for the single-pass entity matcher of the autocomplete builder."""
+
+import re
+from collections import Counter
+
+from scripts.build_autocomplete_dict import (
+    AutocompleteDictBuilder,
+    EntityMatcher,
+    load_brands,
+    trie_pattern,
+)
+from scripts.corpus import Corpus
+
+TEXT = """
+Подшипник SKF 6205 и skf 6206-2RS, аналог ГПЗ-4 180205.
+NTN-SNR 62RS205 поставляет подшипники; FAG6207 — без пробела.
+ПОДШИПНИК подшипниками, вал, iso, Timken 32210.
+"""
+
+
+def _reference(text: str, brands: set[str], terms: set[str]) -> tuple[Counter, Counter, Counter]:
+    """Отдельный проход на каждый вид сущностей (прежняя реализация)"""
+    found_terms = Counter(w for w in re.findall(r"\b[а-яё]{4,}\b", text.lower()) if w in terms)
+    codes = Counter()
+    for pattern in (r"\b\d{4,7}\b", r"\b[A-Z]{2,4}\s*\d{4,7}\b", r"\b\d{1,3}[A-Z]{1,2}\d{2,5}\b"):
+        codes.update(re.findall(pattern, text))
+    alternatives = "|".join(map(re.escape, sorted(brands, key=len, reverse=True)))
+    found_brands = Counter(m.upper() for m in re.findall(rf"\b({alternatives})\b", text, re.IGNORECASE))
+    return found_terms, codes, found_brands
+
+
+def test_trie_pattern_prefers_longest_word_case_insensitive() -> None:
+    pattern = re.compile(rf"\b(?:{trie_pattern(['NTN', 'NTN-SNR', 'NSK'])})\b")
+
+    assert pattern.findall("ntn-snr NTN nsk NS") == ["ntn-snr", "NTN", "nsk"]
+
+
+def test_matcher_matches_separate_passes() -> None:
+    brands = {"SKF", "FAG", "NTN", "NTN-SNR", "SNR", "ГПЗ-4", "TIMKEN"}
+    terms = {"подшипник", "подшипники", "вал", "iso"}
+    found = Counter(), Counter(), Counter()
+
+    EntityMatcher(brands, terms).count(TEXT, *found)
+
+    assert found == _reference(TEXT, brands, terms)
+    assert found[2]["SKF"] == 2
+    assert found[1]["SKF 6205"] == found[1]["6205"] == 1
+
+
+def test_load_brands_splits_lists(tmp_path) -> None:
+    (tmp_path / "brands.csv").write_text("brand,country\nFAG/INA (Schaeffler),DE\nNTN-SNR,JP\n", encoding="utf-8")
+    (tmp_path / "groups.csv").write_text('Quality,Brands\nПремиум,"SKF, Timken"\n', encoding="utf-8")
+
+    assert load_brands(str(tmp_path)) == {"FAG", "INA", "NTN-SNR", "SKF", "TIMKEN"}
+
+
+def test_brands_are_canonical_and_short_codes_case_sensitive(tmp_path) -> None:
+    (tmp_path / "brands.csv").write_text(
+        "Brand,Country\nTimken,US\nTIMKEN,US\nNSK Europe,UK\nNSK,JP\nCU,CN\nSKF Group,SE\n", encoding="utf-8"
+    )
+    assert load_brands(str(tmp_path)) == {"TIMKEN", "NSK", "CU", "SKF"}
+
+    found = Counter(), Counter(), Counter()
+    EntityMatcher({"Timken", "NSK Europe", "CU"}, set()).count(
+        "Timken TIMKEN timken; NSK Europe и NSK; сплав cu, бренд CU", *found
+    )
+    assert found[2] == Counter({"TIMKEN": 3, "NSK": 2, "CU": 1})
+
+    builder = AutocompleteDictBuilder(str(tmp_path), corpus=Corpus(tmp_path), workers=1)
+    brands = builder.extract_brands()
+    assert len({brand.upper() for brand in brands}) == len(brands)
+    assert brands["TIMKEN"] == 100 and "Timken" not in brands and "NSK EUROPE" not in brands
+
+
+def test_parallel_scan_matches_sequential(tmp_path) -> None:
+    for n in range(40):
+        (tmp_path / f"{n}.md").write_text(f"{TEXT}\nКод {n:04d}", encoding="utf-8")
+    corpus = Corpus(tmp_path)
+
+    sequential = AutocompleteDictBuilder(str(tmp_path), corpus=corpus, workers=1)
+    sequential.scan_documents()
+    parallel = AutocompleteDictBuilder(str(tmp_path), corpus=corpus, workers=2)
+    parallel.scan_documents()
+
+    assert parallel.terms == sequential.terms
+    assert parallel.bearing_codes == sequential.bearing_codes
+    assert parallel.brands == sequential.brands
+    assert sequential.brands["SKF"] == 80
@@ -0,0 +1,61 @@
+"""Tests for single-pass batch search and /export/batch."""
+
+import io
+import json
+import random
+
+import openpyxl
+from fastapi.testclient import TestClient
+
+from api.app import api
+from api.app.index_manager import IndexManager
+from api.app.logic import DocumentSearchEngine
+
+
+def _write_documents(tmp_path, count: int = 300):
+    rng = random.Random(7)
+    documents = {}
+    for idx in range(count):
+        code = rng.choice(["6205", "6305", "6405", "7205", "NU 205"])
+        documents[f"doc_{idx}"] = {
+            "title": f"Подшипник {code}" if idx % 3 else f"Статья {idx}",
+            "path": f"{idx}.md",
+            "excerpt": f"Аналог {rng.choice(['6205', '180205', '2RS'])} для вала",
+        }
+    index_path = tmp_path / "document_index.json"
+    index_path.write_text(json.dumps(documents, ensure_ascii=False), encoding="utf-8")
+    return index_path
+
+
+def test_search_batch_matches_individual_searches(tmp_path) -> None:
+    index_path = _write_documents(tmp_path)
+    engine = DocumentSearchEngine(str(index_path), str(tmp_path / "missing.json"))
+    # "62" и "620" — префиксы "6205": совпадают в тех же позициях корпуса
+    queries = ["6205", "6305", "NU", "2rs", "ПОДШИПНИК", "нет такого", "", "6205", "62", "620", "05"]
+
+    for limit in (0, 1, 5, 50):
+        batch = engine.search_batch(queries, limit=limit)
+        assert batch == {query: engine.search(query, limit=limit) for query in queries}
+
+
+def test_export_batch_chunks_large_lists(tmp_path, monkeypatch) -> None:
+    index_path = _write_documents(tmp_path)
+    manager = IndexManager(
+        dict_path=str(tmp_path / "autocomplete_dict.json"),
+        index_path=str(index_path),
+        similarity_path=str(tmp_path / "similarity_matrix.json"),
+        poll_interval=0,
+    )
+    monkeypatch.setattr(api, "index_manager", manager)
+    monkeypatch.setattr(api, "BATCH_CHUNK_SIZE", 2)
+    client = TestClient(api.app)
+    queries = ["6205", "6305", "6405", "7205", "нет такого"]
+
+    response = client.post("/export/batch?export_format=json", json=queries)
+    assert response.status_code == 200
+    assert response.json() == manager.current.search.search_batch(queries, limit=50)
+
+    response = client.post("/export/batch?export_format=xlsx", json=queries)
+    assert response.status_code == 200
+    workbook = openpyxl.load_workbook(io.BytesIO(response.content))
+    assert workbook.sheetnames == ["6205", "6305", "6405", "7205"]
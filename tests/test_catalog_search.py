@@ -0,0 +1,110 @@
+"""Tests for the PostgreSQL search backend and its import script."""
+
+import asyncio
+import os
+import uuid
+from pathlib import Path
+
+import pytest
+
+from api.app.analogs import AnalogIndex
+from api.app.catalog_search import CatalogSearch, highlight_prefix, like_pattern
+from api.app.db import Database
+from api.scripts.import_to_postgres import analog_records, document_records, import_catalog, term_records
+
+
+def test_like_pattern_escapes_wildcards() -> None:
+    assert like_pattern("6205") == "%6205%"
+    assert like_pattern("SK", prefix=True) == "sk%"
+    assert like_pattern("100%_a\\b") == "%100\\%\\_a\\\\b%"
+    assert highlight_prefix("SKF", "sk") == "<b>SK</b>F"
+
+
+def test_requires_postgres() -> None:
+    with pytest.raises(ValueError):
+        CatalogSearch(Database("sqlite:///:memory:"))
+
+
+def test_import_records() -> None:
+    documents = {
+        "doc_2": {"title": "Подшипник 6205", "path": "a.md", "excerpt": "Радиальный\x00 шариковый"},
+        "doc_1": {"title": "Подшипник 6305", "path": "b.md"},
+    }
+    records = document_records(documents)
+    assert [(record[0], record[3], record[6]) for record in records] == [
+        ("doc_2", "Радиальный шариковый", 0),
+        ("doc_1", "", 1),
+    ]
+
+    terms = [
+        {"value": "SKF", "type": "brand", "frequency": 5},
+        {"value": "SKF", "type": "brand", "frequency": 9},
+        {"value": "6205", "type": "bearing_code", "frequency": 3},
+    ]
+    assert term_records(terms) == [("SKF", "brand", 9), ("6205", "bearing_code", 3)]
+
+
+def test_analog_records_match_lookup(data_dir) -> None:
+    index = AnalogIndex(str(data_dir / "analogs"), str(data_dir / "csv" / "master_catalog.csv"))
+    records = analog_records(index)
+
+    rows = [record for record in records if record[0] == "6205"]
+    assert [(code, standard, manufacturer) for _, code, standard, manufacturer, _, _ in rows] == [
+        (row["code"], row["standard"], row["manufacturer"]) for row in index.lookup("6205")
+    ]
+    assert {record[4] for record in records} <= {1.0, 0.75, 0.5}
+
+
+def test_catalog_search_in_postgres(tmp_path, data_dir) -> None:
+    pytest.importorskip("asyncpg")
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url or not url.startswith("postgresql"):
+        pytest.skip("TEST_DATABASE_URL=postgresql://... не задан")
+
+    (tmp_path / "document_index.json").write_text(
+        '{"d1": {"title": "Подшипник 6205", "path": "a.md", "excerpt": "Радиальный шариковый"},'
+        ' "d2": {"title": "Уплотнения", "path": "b.md", "excerpt": "Для подшипника 6205-2RS"},'
+        ' "d3": {"title": "Смазка", "path": "c.md", "excerpt": "Замена смазки в подшипниках"}}',
+        encoding="utf-8",
+    )
+    (tmp_path / "autocomplete_dict.json").write_text(
+        '{"terms": [{"value": "6205", "type": "bearing_code", "frequency": 10},'
+        ' {"value": "6206", "type": "bearing_code", "frequency": 20},'
+        ' {"value": "SKF", "type": "brand", "frequency": 5}]}',
+        encoding="utf-8",
+    )
+    (tmp_path / "analogs").symlink_to(data_dir / "analogs")
+    (tmp_path / "csv").symlink_to(data_dir / "csv")
+
+    async def scenario():
+        schema = f"catalog_test_{uuid.uuid4().hex[:8]}"
+        admin = Database(url)
+        await admin.connect()
+        await admin.execute(f"CREATE SCHEMA {schema}")
+        # Параметры DSN, неизвестные asyncpg, передаются серверу как настройки сессии
+        db = Database(f"{url}{'&' if '?' in url else '?'}search_path={schema}")
+        await db.connect()
+        try:
+            await import_catalog(db, tmp_path, Path(__file__).resolve().parents[1] / "sql" / "init_catalog.sql")
+            catalog = CatalogSearch(db)
+            return (
+                await catalog.search("подшипник", limit=10),
+                await catalog.search("подшипники", limit=10),
+                await catalog.suggest("62", limit=5),
+                await catalog.lookup_analogs_many(["6205", "нет такого"]),
+            )
+        finally:
+            await db.disconnect()
+            await admin.execute(f"DROP SCHEMA {schema} CASCADE")
+            await admin.disconnect()
+
+    found, word_forms, suggestions, analogs = asyncio.run(scenario())
+
+    index = AnalogIndex(str(data_dir / "analogs"), str(data_dir / "csv" / "master_catalog.csv"))
+    assert [(row["id"], row["relevance"]) for row in found] == [("d1", 1.0), ("d2", 0.5), ("d3", 0.5)]
+    # Подстроки "подшипники" нет ни в одном документе: находятся словоформы
+    assert [(row["id"], row["relevance"]) for row in word_forms] == [("d1", 0.25), ("d2", 0.25), ("d3", 0.25)]
+    assert [row["value"] for row in suggestions] == ["6206", "6205"]
+    assert suggestions[0]["highlight"] == "<b>62</b>06"
+    assert analogs["6205"] == index.lookup("6205")
+    assert analogs["нет такого"] == []
@@ -0,0 +1,59 @@
+"""Tests for the shared repository corpus."""
+
+import pytest
+
+from scripts.corpus import Corpus
+
+
+def _write(path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_single_walk_and_cached_reads(tmp_path) -> None:
+    _write(tmp_path / "root.md", "# Корень")
+    _write(tmp_path / "b" / "two.md", "# Два")
+    _write(tmp_path / "a" / "one.md", "# Один")
+    _write(tmp_path / "a" / "notes.txt", "не markdown")
+    _write(tmp_path / ".hidden" / "skip.md", "# Скрыт")
+    _write(tmp_path / "a" / "__pycache__" / "skip.md", "# Кеш")
+
+    corpus = Corpus(tmp_path, workers=2)
+    assert [e.rel_path for e in corpus.entries()] == ["root.md", "a/one.md", "b/two.md"]
+    assert [e.rel_path for e in corpus.entries(dirs=["b", "a"])] == ["b/two.md", "a/one.md"]
+
+    first = [doc.content for doc in corpus.iter_documents()]
+    second = [doc.content for doc in corpus.iter_documents()]
+    assert first == second == ["# Корень", "# Один", "# Два"]
+    assert corpus.reads == 3
+
+
+def test_changed_stamp_invalidates_cache(tmp_path) -> None:
+    path = tmp_path / "a" / "one.md"
+    _write(path, "# Один")
+    corpus = Corpus(tmp_path)
+    (entry,) = corpus.entries()
+    before = corpus.read(entry)
+
+    _write(path, "# Один, исправлено")
+    (entry,) = Corpus(tmp_path).entries()
+    after = corpus.read(entry)
+
+    assert after.content == "# Один, исправлено"
+    assert after.hash != before.hash
+    assert corpus.reads == 2
+
+
+def test_build_indexes_reads_each_file_once(tmp_path) -> None:
+    pytest.importorskip("sklearn")
+    from scripts.build_indexes import build_indexes
+
+    for n in range(4):
+        _write(tmp_path / "articles" / f"{n}.md", f"# Подшипник 620{n}\n\nподшипник SKF 620{n} шариковый радиальный")
+    _write(tmp_path / "README.md", "# Обзор")
+
+    corpus = build_indexes(str(tmp_path))
+
+    assert corpus.reads == 5
+    for name in ("autocomplete_dict.json", "document_index.json", "similarity_matrix.json"):
+        assert (tmp_path / "data" / name).exists()
@@ -0,0 +1,114 @@
+"""Tests for the vectorized CSV schema validator."""
+
+import json
+
+import pytest
+
+from scripts.validate import csv_validator
+from scripts.validate.csv_validator import TableChecker, TableSchema, ValidationCache, validate_all, validate_table
+
+COLUMNS = {"designation": "string", "d": "number", "D": "number"}
+
+
+def _schema(path, **kwargs) -> TableSchema:
+    options = {"columns": COLUMNS, "unique": ["designation"], "sort_by": ["d", "designation"]}
+    options.update(kwargs)
+    return TableSchema(name="dims", path=path, **options)
+
+
+def _write_schema_dir(tmp_path, tables: dict[str, str]):
+    """Schema directory with one table per CSV content"""
+    schema_dir = tmp_path / "schemas"
+    schema_dir.mkdir()
+    payload = {"tables": []}
+    for name, content in tables.items():
+        path = tmp_path / f"{name}.csv"
+        path.write_text(content, encoding="utf-8")
+        payload["tables"].append(
+            {"name": name, "path": str(path), "columns": COLUMNS, "unique": ["designation"], "sort_by": ["d"]}
+        )
+    (schema_dir / "tables.yaml").write_text(json.dumps(payload), encoding="utf-8")
+    return schema_dir
+
+
+@pytest.fixture(params=[True, False], ids=["pandas", "csv"])
+def parser(request, monkeypatch):
+    """Both readers: the pandas fast path and csv.reader"""
+    monkeypatch.setattr(csv_validator, "FAST_PARSE_MIN_BYTES", 0 if request.param else 1 << 62)
+    return request.param
+
+
+def test_error_messages(tmp_path, parser) -> None:
+    path = tmp_path / "dims.csv"
+    path.write_text(
+        "designation,d,D\n6200,10,30\n6201,12,x\n\n6200,12,32\n6000,,26\n6202,15,35\n",
+        encoding="utf-8",
+    )
+    assert validate_table(_schema(path)) == [
+        "dims: invalid number value 'x' in column D at line 3",
+        "dims: duplicate key ('6200',) at line 4",
+        "dims: sort order violated at line 4 (key (12.0, '6200') after (12.0, '6201'))",
+        "dims: sort order violated at line 5 (key (0.0, '6000') after (12.0, '6200'))",
+    ]
+
+
+def test_header_and_short_rows(tmp_path, parser) -> None:
+    path = tmp_path / "dims.csv"
+    path.write_text('designation,d\n"62,00",10\n6201\n', encoding="utf-8")
+    assert validate_table(_schema(path, sort_by=[])) == [
+        "dims: header mismatch. expected ['designation', 'd', 'D'], found ['designation', 'd']",
+        "dims: missing column D at line 2",
+        "dims: invalid number value 'None' in column d at line 3",
+        "dims: missing column D at line 3",
+    ]
+    assert validate_table(_schema(tmp_path / "missing.csv")) == [f"dims: missing file {tmp_path / 'missing.csv'}"]
+
+
+def test_checker_handles_empty_table(tmp_path) -> None:
+    checker = TableChecker(_schema(tmp_path / "dims.csv"))
+    assert checker.check(b"designation,d,D\n") == []
+    assert checker.check(b"") == [f"dims: {tmp_path / 'dims.csv'} has no header"]
+
+
+def test_validate_all_parallel_and_cached(tmp_path, monkeypatch) -> None:
+    schema_dir = _write_schema_dir(
+        tmp_path,
+        {
+            "first": "designation,d,D\n6200,10,30\n6200,12,32\n",
+            "second": "designation,d,D\n6300,10,35\n6301,9,37\n",
+            "third": "designation,d,D\n6000,10,26\n",
+        },
+    )
+    expected = [
+        "first: duplicate key ('6200',) at line 3",
+        "second: sort order violated at line 3 (key (9.0,) after (10.0,))",
+    ]
+    cache_path = tmp_path / ".cache" / "validation.json"
+    assert validate_all(schema_dir, workers=1, cache=ValidationCache(cache_path)) == expected
+
+    monkeypatch.setattr(csv_validator, "PARALLEL_MIN_BYTES", 0)
+    assert validate_all(schema_dir, workers=2, cache=ValidationCache(None)) == expected
+
+    # Unchanged tables come from the cache file; a changed file is checked again
+    checked = []
+    check = TableChecker.check
+    monkeypatch.setattr(TableChecker, "check", lambda self, data: checked.append(self.schema.name) or check(self, data))
+    cache = ValidationCache(cache_path)
+    assert validate_all(schema_dir, workers=1, cache=cache) == expected
+    assert (cache.hits, cache.misses, checked) == (3, 0, [])
+
+    (tmp_path / "third.csv").write_text("designation,d,D\n6000,10,26\n6000,12,28\n", encoding="utf-8")
+    cache = ValidationCache(cache_path)
+    assert validate_all(schema_dir, workers=1, cache=cache) == expected + ["third: duplicate key ('6000',) at line 3"]
+    assert (cache.hits, cache.misses, checked) == (2, 1, ["third"])
+    assert len(json.loads(cache_path.read_text(encoding="utf-8"))["entries"]) == 3
+
+    cache = ValidationCache(cache_path)
+    validate_all(schema_dir, workers=1, cache=cache, force=True)
+    assert (cache.hits, cache.misses, sorted(checked[1:])) == (0, 3, ["first", "second", "third"])
+
+
+def test_corrupt_cache_is_ignored(tmp_path) -> None:
+    cache_path = tmp_path / "validation.json"
+    cache_path.write_text("{not json", encoding="utf-8")
+    assert ValidationCache(cache_path).entries == {}
@@ -0,0 +1,65 @@
+"""Tests for the curated dataset store and incremental normalization."""
+
+import json
+
+import pytest
+
+from scripts.extract.raw_datasets import load_datasets
+from scripts.update_repo import DatasetState, normalize_datasets
+
+
+def _dataset_dir(tmp_path, rows: str):
+    directory = tmp_path / "datasets"
+    directory.mkdir()
+    index = {
+        "datasets": [
+            {
+                "name": "pairs",
+                "output": "out/pairs.csv",
+                "columns": ["gost", "iso"],
+                "unique": ["gost"],
+                "sort_by": ["iso"],
+            },
+            {"name": "codes", "output": "out/codes.csv", "columns": ["code"], "unique": ["code"], "sort_by": ["code"]},
+        ]
+    }
+    (directory / "index.json").write_text(json.dumps(index), encoding="utf-8")
+    (directory / "pairs.csv").write_text(rows, encoding="utf-8")
+    (directory / "codes.csv").write_text("code\nK\nC\nK\n", encoding="utf-8")
+    return directory
+
+
+def test_shipped_datasets_match_outputs(tmp_path, repo_root) -> None:
+    datasets = load_datasets()
+    rebuilt = normalize_datasets(datasets, root=tmp_path, state=DatasetState(None), workers=1)
+    assert rebuilt == list(datasets)
+    for spec in datasets.values():
+        assert (tmp_path / spec.output).read_bytes() == (repo_root / spec.output).read_bytes()
+
+
+def test_unchanged_datasets_are_skipped(tmp_path) -> None:
+    directory = _dataset_dir(tmp_path, "gost,iso\n2205,NU 205\n180205,6205-2Z\n2205,22205\n")
+    state_path = tmp_path / ".cache" / "datasets.json"
+    datasets = load_datasets(directory)
+
+    assert normalize_datasets(datasets, root=tmp_path, state=DatasetState(state_path), workers=2) == ["pairs", "codes"]
+    assert (tmp_path / "out" / "pairs.csv").read_text(encoding="utf-8") == "gost,iso\n180205,6205-2Z\n2205,NU 205\n"
+    assert (tmp_path / "out" / "codes.csv").read_text(encoding="utf-8") == "code\nC\nK\n"
+    state = DatasetState(state_path)
+    assert (state.entries["pairs"]["written"], state.entries["pairs"]["removed"]) == (2, 1)
+
+    assert normalize_datasets(datasets, root=tmp_path, state=DatasetState(state_path)) == []
+
+    # A changed data file or a hand-edited output is built again
+    (directory / "pairs.csv").write_text("gost,iso\n2205,NU 205\n", encoding="utf-8")
+    (tmp_path / "out" / "codes.csv").write_text("code\nX\n", encoding="utf-8")
+    assert normalize_datasets(datasets, root=tmp_path, state=DatasetState(state_path)) == ["pairs", "codes"]
+    assert (tmp_path / "out" / "codes.csv").read_text(encoding="utf-8") == "code\nC\nK\n"
+
+    assert normalize_datasets(datasets, root=tmp_path, state=DatasetState(state_path), force=True) == ["pairs", "codes"]
+
+
+def test_header_must_match_columns(tmp_path) -> None:
+    directory = _dataset_dir(tmp_path, "iso,gost\nNU 205,2205\n")
+    with pytest.raises(ValueError, match="does not match columns"):
+        list(load_datasets(directory)["pairs"].rows())
@@ -1,15 +1,27 @@
-from scripts.update_repo import _dedupe
+from pathlib import Path
 
+from scripts.extract.raw_datasets import DatasetSpec
+from scripts.update_repo import _write_csv
 
-def test_deduplication_keeps_first_match() -> None:
-    rows = [
-        {"gost": "6205", "iso": "6305", "brand": "", "notes": ""},
-        {"gost": "6205", "iso": "6305", "brand": "SKF", "notes": "duplicate"},
-        {"gost": "7205", "iso": "30205", "brand": "", "notes": ""},
-    ]
 
-    deduped, removed = _dedupe(rows, ["gost", "iso"])
+def test_deduplication_keeps_first_match(tmp_path) -> None:
+    source = tmp_path / "pairs.csv"
+    source.write_text(
+        "gost,iso,brand,notes\n6205,6305,,\n6205,6305,SKF,duplicate\n7205,30205,,\n",
+        encoding="utf-8",
+    )
+    dataset = DatasetSpec(
+        name="pairs",
+        output=Path("out/pairs.csv"),
+        columns=["gost", "iso", "brand", "notes"],
+        unique=["gost", "iso"],
+        sort_by=["gost"],
+        source=source,
+    )
 
-    assert removed == 1
-    assert deduped[0]["iso"] == "6305"
-    assert len(deduped) == 2
+    entry = _write_csv(dataset, root=tmp_path)
+
+    assert (entry["written"], entry["removed"]) == (2, 1)
+    assert (tmp_path / "out" / "pairs.csv").read_text(encoding="utf-8") == (
+        "gost,iso,brand,notes\n6205,6305,,\n7205,30205,,\n"
+    )
@@ -0,0 +1,108 @@
+"""Tests for the bearing designation parser and /designation endpoint."""
+
+from fastapi.testclient import TestClient
+
+from api.app import api
+from api.app.designation import DesignationParser
+
+
+def _parser(tmp_path) -> DesignationParser:
+    prefixes = tmp_path / "prefixes.csv"
+    prefixes.write_text(
+        "code,category,description,source\n"
+        "N,cylindrical_roller,Бурты на внутреннем кольце,x\n"
+        "NJ,cylindrical_roller,Бурты на внутреннем кольце и один на наружном,x\n"
+        "NU,cylindrical_roller,Бурты на наружном кольце,x\n"
+        "NUP,cylindrical_roller,NU со свободным кольцом,x\n",
+        encoding="utf-8",
+    )
+    suffixes = tmp_path / "suffixes.csv"
+    suffixes.write_text(
+        "code,manufacturer,type,description,snr_equivalent,notes,source\n"
+        "2RS,KOYO,sealing,Две контактные манжеты,2RS,,x\n"
+        "ZZ,NSK,shielding,Две металлические шайбы,2Z,,x\n",
+        encoding="utf-8",
+    )
+    return DesignationParser(str(prefixes), str(suffixes))
+
+
+def test_parse_suffixes_longest_match(tmp_path) -> None:
+    parsed = _parser(tmp_path).parse("6205-2RS1/C3")
+
+    assert (parsed.series, parsed.bore_code, parsed.bore_diameter) == ("62", "05", 25.0)
+    assert [part.code for part in parsed.suffixes] == ["2RS1", "C3"]
+    assert parsed.seals == ["2RS1"] and parsed.clearance == "C3"
+    assert parsed.unknown == ()
+
+
+def test_parse_prefix_and_manufacturer(tmp_path) -> None:
+    parser = _parser(tmp_path)
+
+    parsed = parser.parse("skf nup 2204 ecp")
+    assert parsed.manufacturer == "SKF"
+    assert parsed.prefix.code == "NUP"
+    assert (parsed.series, parsed.bore_diameter) == ("22", 20.0)
+    assert [part.code for part in parsed.suffixes] == ["EC", "P"]
+
+    assert parser.parse("608 ZZ").bore_diameter == 8.0
+    assert parser.parse("62/22").bore_diameter == 22.0
+    assert parser.parse("6200").bore_diameter == 10.0
+    assert parser.parse("6205 ZZ").suffixes[0].manufacturers == ("NSK",)
+    assert parser.parse("2RS") is None
+
+
+def test_parse_roller_prefix_three_digit_base(tmp_path) -> None:
+    parser = _parser(tmp_path)
+
+    parsed = parser.parse("NJ 205")
+    assert parsed.prefix.code == "NJ"
+    assert (parsed.series, parsed.bore_code, parsed.bore_diameter) == ("2", "05", 25.0)
+    assert (parser.parse("N 306").series, parser.parse("N 306").bore_diameter) == ("3", 30.0)
+    assert parser.parse("NU200 ECP").bore_diameter == 10.0
+    assert parser.parse("NUP2204").series == "22"
+    # Без префикса трёхзначный номер — миниатюрный подшипник
+    assert (parser.parse("608").series, parser.parse("608").bore_diameter) == ("60", 8.0)
+
+
+def test_parse_slash_suffix_is_not_bore(tmp_path) -> None:
+    parser = _parser(tmp_path)
+
+    parsed = parser.parse("6205/2Z")
+    assert (parsed.base, parsed.series, parsed.bore_code, parsed.bore_diameter) == ("6205", "62", "05", 25.0)
+    assert [part.code for part in parsed.suffixes] == ["2Z"]
+    assert parser.parse("6204/2RS").bore_diameter == 20.0
+    assert parser.parse("6204/2RS").seals == ["2RS"]
+    parsed = parser.parse("608/2RS")
+    assert (parsed.series, parsed.bore_diameter, parsed.seals) == ("60", 8.0, ["2RS"])
+
+    # Диаметр после черты у серии из 2-3 цифр
+    assert (parser.parse("62/22").series, parser.parse("62/22").bore_diameter) == ("62", 22.0)
+    parsed = parser.parse("320/28 X")
+    assert (parsed.series, parsed.bore_code, parsed.bore_diameter) == ("320", "/28", 28.0)
+    assert parser.parse("62/22-2RS").seals == ["2RS"]
+
+
+def test_parse_many_uses_cache(tmp_path) -> None:
+    parser = _parser(tmp_path)
+    column = ["6205-2RS/C3", "6205-2rs/c3", None, "NU205"] * 1000
+
+    parsed = parser.parse_many(column)
+
+    assert len(parsed) == 4000
+    assert parsed[2] is None
+    assert parsed[0].designation == "6205-2RS/C3"
+    assert parsed[1].designation == "6205-2rs/c3"
+    assert parsed[1].normalized == parsed[0].normalized
+    assert parser.cache_info().misses == 2
+
+
+def test_designation_endpoint() -> None:
+    client = TestClient(api.app)
+
+    response = client.get("/designation/6205-2RS1/C3")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["bore_diameter"] == 25.0
+    assert body["clearance"] == "C3"
+
+    assert client.get("/designation/abc").status_code == 422
@@ -0,0 +1,80 @@
+"""Tests for the dimension-based interchangeability index."""
+
+from fastapi.testclient import TestClient
+
+from api.app import api
+from api.app.dimensions import DimensionIndex
+
+
+def _index(tmp_path) -> DimensionIndex:
+    dims = tmp_path / "dims.csv"
+    dims.write_text(
+        "Designation,Type,d,D,B\n"
+        "6205,Радиальный шариковый,25,52,15\n"
+        "6305,Радиальный шариковый,25,62,17\n"
+        "30205,,25,52,16.25\n",
+        encoding="utf-8",
+    )
+    gost = tmp_path / "gost.csv"
+    gost.write_text("designation,d,D,B,source\n205,25,52,15,x\n6205,25,52,15,x\n", encoding="utf-8")
+    types = tmp_path / "types.csv"
+    types.write_text("designation,type\n30205,Конический роликовый\n", encoding="utf-8")
+    return DimensionIndex(
+        sources=[
+            (str(dims), "ISO", "Designation", "Type"),
+            (str(dims), "ISO", "Designation", None),
+            (str(gost), "ГОСТ", "designation", None),
+        ],
+        type_sources={"ISO": str(types)},
+    )
+
+
+def test_match_within_tolerance(tmp_path) -> None:
+    index = _index(tmp_path)
+
+    assert len(index) == 5  # Повтор строки из той же таблицы не дублируется
+    exact = index.match(25, 52, 15)
+    assert [(row["standard"], row["designation"]) for row in exact] == [
+        ("ISO", "6205"),
+        ("ГОСТ", "205"),
+        ("ГОСТ", "6205"),
+    ]
+
+    loose = index.match(25, 52, 15, tol=1.5)
+    assert [row["designation"] for row in loose][-1] == "30205"
+    assert loose[-1]["deviation"] == 1.25
+    assert loose[-1]["type"] == "Конический роликовый"
+
+
+def test_match_type_and_partial_size(tmp_path) -> None:
+    index = _index(tmp_path)
+
+    assert [row["designation"] for row in index.match(d=25, tol=0, bearing_type="радиальный шариковый")] == [
+        "6205",
+        "6305",
+    ]
+    assert [row["designation"] for row in index.match(D=52, B=16, tol=0.5)] == ["30205"]
+    assert index.match(40, 80, 18, tol=0.1) == []
+
+
+def test_match_many(tmp_path) -> None:
+    index = _index(tmp_path)
+
+    results = index.match_many([(25, 62, 17), (25, 52, None), (25, 62, 17)], limit=2)
+
+    assert [row["designation"] for row in results[0]] == ["6305"]
+    assert len(results[1]) == 2
+    assert results[2] == results[0]
+
+
+def test_dimensions_endpoints() -> None:
+    client = TestClient(api.app)
+
+    response = client.get("/dimensions/match", params={"d": 25, "D": 52, "B": 15})
+    assert response.status_code == 200
+    assert "6205" in [row["designation"] for row in response.json()["matches"]]
+    assert client.get("/dimensions/match").status_code == 400
+
+    batch = client.post("/dimensions/match/batch", params={"tol": 0.5}, json=[[25, 52, 15], [10, None, None]])
+    assert batch.status_code == 200
+    assert batch.json()["count"] == 2
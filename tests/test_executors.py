@@ -0,0 +1,38 @@
+"""Tests for the API executor layer."""
+
+import asyncio
+import time
+
+from api.app.executors import ExecutorLayer
+from api.app.export_utils import SearchResultsExporter
+
+
+def test_limit_serializes_requests_of_one_kind() -> None:
+    executors = ExecutorLayer(thread_workers=4, process_workers=0, limits={"export": 1})
+
+    async def scenario():
+        return await asyncio.gather(*(executors.run("export", time.sleep, 0.05) for _ in range(3)))
+
+    try:
+        asyncio.run(scenario())
+        stats = executors.stats()["kinds"]["export"]
+    finally:
+        executors.shutdown()
+
+    assert stats["completed"] == 3
+    assert stats["in_flight"] == 0
+    # Третья задача ждала две предыдущие
+    assert stats["queue_ms_max"] >= 90
+
+
+def test_cpu_bound_work_runs_in_process_pool() -> None:
+    executors = ExecutorLayer(thread_workers=2, process_workers=1)
+    results = [{"id": "doc_1", "title": "Подшипник 6205", "relevance": 1.0}]
+
+    try:
+        csv_data = asyncio.run(executors.run("export", SearchResultsExporter.to_csv, results, cpu_bound=True))
+    finally:
+        executors.shutdown()
+
+    assert csv_data.splitlines()[0] == "id,title,relevance"
+    assert "Подшипник 6205" in csv_data
@@ -0,0 +1,69 @@
+"""Tests for write-only XLSX exports."""
+
+import openpyxl
+
+from api.app import export_utils
+from api.app.export_utils import AnalogsExporter, SearchResultsExporter
+
+
+def test_search_excel_widths_filter_and_relevance_rules() -> None:
+    results = [
+        {"id": "doc_1", "title": "Подшипник 6205-2RS/C3", "relevance": 1.0},
+        {"id": "doc_2", "title": "Подшипник 6305", "relevance": 0.5, "similar_documents": [{"id": "doc_1"}]},
+    ]
+
+    workbook = openpyxl.load_workbook(SearchResultsExporter.to_excel(results))
+    sheet = workbook["Результаты поиска"]
+
+    assert [cell.value for cell in sheet[1]] == ["id", "title", "relevance", "similar_documents"]
+    assert sheet["B2"].value == "Подшипник 6205-2RS/C3"
+    assert sheet["D3"].value == '[{"id": "doc_1"}]'
+    assert sheet[1][0].font.bold
+    assert sheet.column_dimensions["B"].width == len("Подшипник 6205-2RS/C3") + 2
+    assert sheet.auto_filter.ref == "A1:D3"
+    rules = [rule for cf in sheet.conditional_formatting for rule in cf.rules]
+    assert len(rules) == 3
+    assert {str(cf.sqref) for cf in sheet.conditional_formatting} == {"C2:C3"}
+
+
+def test_sheet_streams_rows_with_sampled_widths(monkeypatch) -> None:
+    monkeypatch.setattr(export_utils, "WIDTH_SAMPLE_ROWS", 2)
+    rows = iter(
+        [
+            {"id": "doc_1", "relevance": 1.0},
+            {"id": "doc_2", "relevance": 0.5},
+            {"id": "doc_3_with_a_long_identifier", "relevance": 0.2, "notes": "после выборки"},
+        ]
+    )
+
+    workbook = export_utils._new_workbook()
+    export_utils._write_sheet(workbook, "Лист", rows)
+    sheet = openpyxl.load_workbook(export_utils._save_workbook(workbook))["Лист"]
+
+    assert [[cell.value for cell in row] for row in sheet.iter_rows()] == [
+        ["id", "relevance", None],
+        ["doc_1", 1.0, None],
+        ["doc_2", 0.5, None],
+        ["doc_3_with_a_long_identifier", 0.2, "после выборки"],
+    ]
+    # Ширина — по выборке: длинное значение после нее колонку не расширяет
+    assert sheet.column_dimensions["A"].width == len("doc_1") + 2
+    assert sheet.auto_filter.ref == "A1:C4"
+
+
+def test_batch_excel_one_sheet_per_query() -> None:
+    batch = {"6205": [{"id": "doc_1", "relevance": 1.0}], "6305/C3": [{"id": "doc_2"}], "empty": []}
+
+    workbook = openpyxl.load_workbook(SearchResultsExporter.create_batch_excel(batch))
+
+    assert workbook.sheetnames == ["6205", "6305_C3"]
+
+
+def test_analogs_excel_and_empty_input() -> None:
+    analogs = [{"code": "6205", "standard": "ISO", "manufacturer": "SKF"}]
+
+    sheet = openpyxl.load_workbook(AnalogsExporter.to_excel(analogs))["Аналоги"]
+
+    assert sheet["C2"].value == "SKF"
+    assert AnalogsExporter.to_excel([]) is None
+    assert SearchResultsExporter.to_excel([]) is None
@@ -0,0 +1,50 @@
+"""Tests for streaming search exports."""
+
+import csv
+import io
+import json
+
+from api.app.export_utils import SearchResultsExporter
+from api.app.logic import DocumentSearchEngine
+
+
+def _engine(tmp_path) -> DocumentSearchEngine:
+    documents = {
+        "doc_0": {"title": "Монтаж", "path": "a.md", "excerpt": "Подшипник 6205 на валу"},
+        "doc_1": {"title": "Подшипник 6205", "path": "b.md", "excerpt": ""},
+        "doc_2": {"title": "Смазка", "path": "c.md", "excerpt": "без совпадений"},
+        "doc_3": {"title": "Подшипник 6205-2RS", "path": "d.md", "excerpt": "6205"},
+    }
+    index_path = tmp_path / "document_index.json"
+    index_path.write_text(json.dumps(documents, ensure_ascii=False), encoding="utf-8")
+    return DocumentSearchEngine(str(index_path), str(tmp_path / "missing.json"))
+
+
+def test_iter_search_yields_results_by_relevance(tmp_path) -> None:
+    engine = _engine(tmp_path)
+
+    results = list(engine.iter_search("6205"))
+
+    assert [r["id"] for r in results] == ["doc_1", "doc_3", "doc_0"]
+    assert [r["relevance"] for r in results] == [1.0, 1.0, 0.5]
+    assert engine.search("6205", limit=2) == results[:2]
+
+
+def test_iter_csv_chunks_match_full_export() -> None:
+    results = [{"id": f"doc_{i}", "title": f"Подшипник {i}", "similar": [{"id": "x"}]} for i in range(7)]
+
+    chunks = list(SearchResultsExporter.iter_csv(iter(results), chunk_rows=3))
+
+    assert len(chunks) == 3
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert len(rows) == 7
+    assert json.loads(rows[0]["similar"]) == [{"id": "x"}]
+
+
+def test_iter_json_and_ndjson_are_valid() -> None:
+    results = [{"id": "doc_1", "title": "Подшипник 6205"}, {"id": "doc_2", "title": "Подшипник 6305"}]
+
+    assert json.loads("".join(SearchResultsExporter.iter_json(iter(results)))) == results
+    assert json.loads("".join(SearchResultsExporter.iter_json(iter([])))) == []
+    lines = "".join(SearchResultsExporter.iter_ndjson(iter(results))).splitlines()
+    assert [json.loads(line) for line in lines] == results
@@ -0,0 +1,63 @@
+"""Tests for the database-backed search history (SQLite fallback)."""
+
+import asyncio
+
+from api.app.db import Database
+from api.app.history_store import PersistentSearchHistory
+
+
+def _run(scenario):
+    async def wrapper():
+        history = PersistentSearchHistory(Database("sqlite:///:memory:"), batch_size=1000, flush_interval=60)
+        await history.start()
+        try:
+            return await scenario(history)
+        finally:
+            await history.stop()
+
+    return asyncio.run(wrapper())
+
+
+def test_writes_are_batched_and_popular_queries_aggregated() -> None:
+    async def scenario(history):
+        for user, query in [("u1", "6205"), ("u2", "6205"), ("u2", "6305"), ("u1", "6205")]:
+            history.add_search(user, query, 3)
+        assert history.writer.pending == 4
+        assert await history.get_popular_queries() == []
+
+        assert await history.writer.flush() == 4
+        history.add_search("u3", "6305", 0)
+        await history.writer.flush()
+
+        popular = await history.get_popular_queries(limit=5)
+        user_history = await history.get_user_history("u2")
+        return popular, user_history
+
+    popular, user_history = _run(scenario)
+
+    assert popular == [{"query": "6205", "count": 3}, {"query": "6305", "count": 2}]
+    assert [h["query"] for h in user_history] == ["6305", "6205"]
+
+
+def test_clear_user_history_includes_buffered_rows() -> None:
+    async def scenario(history):
+        history.add_search("u1", "6205", 1)
+        await history.writer.flush()
+        history.add_search("u1", "6305", 1)
+        await history.clear_user_history("u1")
+        return await history.get_user_history("u1")
+
+    assert _run(scenario) == []
+
+
+def test_failed_flush_keeps_rows_in_buffer() -> None:
+    async def scenario(history):
+        history.add_search("u1", "6205", 1)
+        await history.db.execute("DROP TABLE popular_queries")
+        written = await history.writer.flush()
+        rows = await history.db.fetch("SELECT COUNT(*) AS n FROM search_history")
+        pending = history.writer.pending
+        history.writer._buffer.clear()
+        return written, pending, rows[0]["n"]
+
+    assert _run(scenario) == (0, 1, 0)
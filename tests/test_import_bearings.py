@@ -0,0 +1,358 @@
+"""Tests for the COPY-based PostgreSQL importer."""
+
+import csv
+import io
+import os
+import sqlite3
+import uuid
+
+import pytest
+
+from scripts import import_bearings_to_db as importer
+
+
+def test_copy_stream_reads_csv_in_chunks() -> None:
+    rows = [{"a": "1", "b": 'x, "y"'}, {"a": None, "b": "z"}, {"a": "3", "b": None}]
+    stream = importer.CopyStream(rows, ["a", "b"])
+
+    chunks = []
+    while chunk := stream.read(4):
+        assert len(chunk) <= 4
+        chunks.append(chunk)
+
+    assert stream.count == 3
+    assert list(csv.reader(io.StringIO("".join(chunks)))) == [["1", 'x, "y"'], ["", "z"], ["3", ""]]
+
+
+def test_merge_sql_keeps_last_row_per_key() -> None:
+    sql = importer.merge_sql("manufacturers", ["brand", "country"], ("brand",), updated_at=True)
+
+    assert sql == (
+        "INSERT INTO manufacturers (brand, country) "
+        "SELECT DISTINCT ON (brand) brand, country FROM import_stage ORDER BY brand, _line DESC "
+        "ON CONFLICT (brand) DO UPDATE SET country = EXCLUDED.country, updated_at = CURRENT_TIMESTAMP"
+    )
+    assert importer.merge_sql("t", ["code"], ("code",)).endswith("ON CONFLICT (code) DO NOTHING")
+
+
+def test_jobs_read_mapped_columns(data_dir) -> None:
+    jobs = {job.table: job for job in importer.IMPORT_JOBS}
+
+    analogs = list(jobs["analogs"].read_rows(data_dir))
+    assert set(analogs[0]) == set(jobs["analogs"].db_columns)  # Столбцы d/D/B из CSV не загружаются
+    assert analogs[0]["source_standard"] == "GOST" and analogs[0]["target_standard"] == "ISO"
+
+    bearings = {row["iso_designation"]: row for row in jobs["bearings"].read_rows(data_dir)}
+    assert bearings["6000"]["dynamic_load_C_kN"] == "4.55"
+    assert bearings["6000"]["limiting_speed_rpm"] == "30000"
+
+
+def test_diff_rows_against_manifest() -> None:
+    job = importer.ImportJob("tn_ved_codes", [], {"Code": "code", "Description": "description"}, key=("code",))
+    rows = [
+        {"code": "1", "description": "a"},
+        {"code": "2", "description": "b"},
+        {"code": "2", "description": "c"},  # Дубль ключа: действует последняя строка
+        {"code": "3", "description": "d"},
+    ]
+    manifest = {
+        importer.row_key(rows[0], job.key): importer.row_hash(rows[0], job.db_columns),
+        importer.row_key(rows[1], job.key): importer.row_hash(rows[1], job.db_columns),
+        '["9"]': "old",
+    }
+
+    diff = importer.diff_rows(job, rows, manifest)
+
+    assert [row["code"] for row in diff["upserts"]] == ["2", "3"]
+    assert diff["upserts"][0]["description"] == "c"
+    assert (diff["inserted"], diff["updated"], diff["deleted"]) == (1, 1, ['["9"]'])
+    assert importer.diff_rows(job, rows[:1], {key: manifest[key] for key in list(manifest)[:1]})["upserts"] == []
+
+
+def test_typed_columns_coerced_before_copy() -> None:
+    assert importer.coerce_number("4,55", 10, 3) == "4.55"
+    assert importer.coerce_number("30 000", 10, 0) == "30000"
+    assert importer.coerce_number("30000.0", 10, 0) == "30000"
+    assert importer.coerce_number(None, 10, 3) is None
+    for value, scale in [("n/a", 3), ("1e9", 3), ("NaN", 3), ("12.5", 0), ("3000000000", 0)]:
+        with pytest.raises(ValueError):
+            importer.coerce_number(value, 10, scale)
+
+    job = importer.ImportJob(
+        "bearings",
+        [],
+        {"ISO": "iso_designation", "d": "bore_diameter_d", "Speed": "limiting_speed_rpm"},
+        key=("iso_designation",),
+        required=("iso_designation", "bore_diameter_d"),
+        types={"bore_diameter_d": (10, 3), "limiting_speed_rpm": (10, 0)},
+    )
+    rows = [
+        {"iso_designation": "6205", "bore_diameter_d": "25", "limiting_speed_rpm": "18 000"},
+        {"iso_designation": "6206", "bore_diameter_d": "30 мм", "limiting_speed_rpm": None},  # COPY бы упал
+        {"iso_designation": "6207", "bore_diameter_d": "35", "limiting_speed_rpm": "n/a"},
+    ]
+    diff = importer.diff_rows(job, rows, {})
+    assert [row["limiting_speed_rpm"] for row in diff["upserts"]] == ["18000"]
+    assert diff["skipped"] == 2
+
+
+class _RegclassCursor:
+    """Курсор SQLite, отвечающий на to_regclass как PostgreSQL (таблица есть, индекса нет)"""
+
+    def __init__(self, conn):
+        self._cursor = conn.cursor()
+        self.rowcount = 0
+
+    def execute(self, sql: str, params=()):
+        if sql.startswith("SELECT to_regclass"):
+            table, _ = params
+            found = self._cursor.execute("SELECT name FROM sqlite_master WHERE name = ?", (table,)).fetchone()
+            self._result = (found[0] if found else None, None)
+            return
+        self._cursor.execute(sql, params)
+        self.rowcount = self._cursor.rowcount
+
+    def fetchone(self):
+        return self._result
+
+
+def test_duplicates_removed_before_unique_indexes(repo_root) -> None:
+    schema_sql = (repo_root / "data" / "schema" / "bearings_db_schema.sql").read_text(encoding="utf-8")
+    assert ("uq_bearings_iso", "bearings", ["iso_designation"]) in importer.unique_indexes(schema_sql)
+
+    # Таблица после двух запусков прежнего построчного импорта
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE bearings (id INTEGER PRIMARY KEY, iso_designation TEXT, weight_kg TEXT)")
+    conn.executemany(
+        "INSERT INTO bearings (iso_designation, weight_kg) VALUES (?, ?)",
+        [("6205", "0.1"), ("6206", "0.2"), ("6205", "0.12"), ("6206", "0.2"), (None, "1"), (None, "2")],
+    )
+
+    assert importer.remove_duplicates(_RegclassCursor(conn), schema_sql) == {"bearings": 2}
+    rows = conn.execute("SELECT iso_designation, weight_kg FROM bearings ORDER BY id").fetchall()
+    # Остается последняя строка ключа; NULL уникальный индекс не ограничивает
+    assert rows == [("6205", "0.12"), ("6206", "0.2"), (None, "1"), (None, "2")]
+    conn.execute("CREATE UNIQUE INDEX uq_bearings_iso ON bearings(iso_designation)")
+
+
+def test_source_hash_tracks_files(tmp_path) -> None:
+    (tmp_path / "csv").mkdir()
+    path = tmp_path / "csv" / "tn_ved_codes.csv"
+    path.write_text("Code,Description\n1,a\n", encoding="utf-8")
+    job = importer.ImportJob("tn_ved_codes", ["csv/tn_ved_codes.csv"], {"Code": "code"}, key=("code",))
+
+    digest = importer.source_hash(job, tmp_path)
+    assert importer.source_hash(job, tmp_path) == digest
+    path.write_text("Code,Description\n1,b\n", encoding="utf-8")
+    assert importer.source_hash(job, tmp_path) != digest
+
+
+class _FakeCursor:
+    """Курсор, исполняющий запросы импорта над словарями в памяти (без PostgreSQL)"""
+
+    def __init__(self, db: dict):
+        self.db = db
+        self.rowcount = 0
+        self._result: list[tuple] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def close(self):
+        pass
+
+    def copy_expert(self, sql: str, stream):
+        columns = sql[sql.index("(") + 1 : sql.index(")")].split(", ")
+        lines = csv.reader(io.StringIO(stream.read()))
+        self.db["stage"] = [dict(zip(columns, [value or None for value in line])) for line in lines]
+
+    def execute(self, sql: str, params=()):
+        db = self.db
+        if sql.startswith("INSERT INTO tn_ved_codes"):
+            # merge_sql: последняя строка с ключом побеждает
+            for row in db["stage"]:
+                db["tn_ved_codes"][row["code"]] = row
+            self.rowcount = len({row["code"] for row in db["stage"]})
+        elif sql.startswith("DELETE FROM import_manifest WHERE table_name = %s AND row_key"):
+            for key in params[1]:
+                db["manifest"].pop(key)
+        elif sql.startswith("DELETE FROM import_manifest WHERE table_name = %s AND NOT"):
+            for key in set(db["manifest"]) - set(params[1]):
+                db["manifest"].pop(key)
+        elif sql.startswith("DELETE FROM import_manifest"):
+            db["manifest"].clear()
+        elif sql.startswith("INSERT INTO import_sources"):
+            db["sources"][params[0]] = params[1]
+        elif sql.startswith("SELECT to_regclass"):
+            # Все таблицы и индексы схемы уже есть: миграция дублей не нужна
+            self._result = [tuple(params)]
+        elif sql.startswith("SELECT table_name, source_hash"):
+            self._result = list(db["sources"].items())
+        elif sql.startswith("SELECT row_key, row_hash"):
+            self._result = list(db["manifest"].items())
+
+    def execute_values(self, sql: str, values: list[tuple]):
+        if sql.startswith("INSERT INTO import_manifest"):
+            self.db["manifest"].update({key: value for _, key, value in values})
+        elif sql.startswith("DELETE FROM tn_ved_codes"):
+            for (code,) in values:
+                self.db["tn_ved_codes"].pop(code)
+
+    def fetchall(self) -> list[tuple]:
+        return self._result
+
+    def fetchone(self) -> tuple:
+        return self._result[0]
+
+
+class _FakeConnection:
+    def __init__(self, db: dict):
+        self.db = db
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self.db)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_full_import_then_sync_applies_only_changes(tmp_path, monkeypatch) -> None:
+    pytest.importorskip("psycopg2")
+    monkeypatch.setattr(
+        "psycopg2.extras.execute_values", lambda cursor, sql, values, page_size: cursor.execute_values(sql, values)
+    )
+    (tmp_path / "csv").mkdir()
+    path = tmp_path / "csv" / "tn_ved_codes.csv"
+    path.write_text("Code,Description\n1,a\n2,b\n3,c\n", encoding="utf-8")
+    jobs = [job for job in importer.IMPORT_JOBS if job.table == "tn_ved_codes"]
+    db = {"tn_ved_codes": {}, "manifest": {}, "sources": {}}
+
+    def connect():
+        return _FakeConnection(db)
+
+    [stats] = importer.import_all_data(jobs, tmp_path, connect=connect)
+    assert stats["rows"] == 3
+    assert len(db["manifest"]) == 3
+    assert importer.sync_all_data(jobs, tmp_path, connect=connect) == []  # Полный импорт записал хеши
+
+    path.write_text("Code,Description\n1,a\n2,bb\n4,d\n", encoding="utf-8")
+    [stats] = importer.sync_all_data(jobs, tmp_path, connect=connect)
+    assert (stats["inserted"], stats["updated"], stats["deleted"]) == (1, 1, 1)
+    assert {code: row["description"] for code, row in db["tn_ved_codes"].items()} == {"1": "a", "2": "bb", "4": "d"}
+
+    # Строка без обязательного описания пропускается: запись в БД остается в обоих режимах
+    path.write_text("Code,Description\n1,a\n2,\n4,d\n", encoding="utf-8")
+    [stats] = importer.sync_all_data(jobs, tmp_path, connect=connect)
+    assert (stats["skipped"], stats["deleted"]) == (1, 0)
+    [stats] = importer.import_all_data(jobs, tmp_path, connect=connect)
+    assert stats["skipped"] == 1
+    assert set(db["manifest"]) == {'["1"]', '["2"]', '["4"]'}
+    assert {code: row["description"] for code, row in db["tn_ved_codes"].items()} == {"1": "a", "2": "bb", "4": "d"}
+
+
+def test_sync_runs_schema_ddl_first(tmp_path, monkeypatch) -> None:
+    # БД со старой схемой: import_sources есть, но DDL все равно выполняется (добавит import_manifest)
+    calls = []
+    monkeypatch.setattr(importer, "create_schema", lambda conn: calls.append(conn) or False)
+    db = {"tn_ved_codes": {}, "manifest": {}, "sources": {}}
+    assert importer.sync_all_data(importer.IMPORT_JOBS, tmp_path, connect=lambda: _FakeConnection(db)) == []
+    assert len(calls) == 1
+
+
+@pytest.fixture
+def pg_connect():
+    """Подключения к отдельной схеме тестовой БД (TEST_DATABASE_URL) со структурой справочника"""
+    psycopg2 = pytest.importorskip("psycopg2")
+    dsn = os.getenv("TEST_DATABASE_URL")
+    if not dsn:
+        pytest.skip("TEST_DATABASE_URL не задан")
+
+    schema = f"import_test_{uuid.uuid4().hex[:8]}"
+    admin = psycopg2.connect(dsn)
+    admin.autocommit = True
+    admin.cursor().execute(f"CREATE SCHEMA {schema}")
+
+    def connect():
+        return psycopg2.connect(dsn, options=f"-c search_path={schema}")
+
+    try:
+        conn = connect()
+        assert importer.create_schema(conn)
+        conn.close()
+        yield connect
+    finally:
+        admin.cursor().execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+
+def _fetch(connect, sql: str) -> list[tuple]:
+    conn = connect()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(sql)
+            return cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def test_import_into_postgres(data_dir, pg_connect) -> None:
+    first = {stats["table"]: stats for stats in importer.import_all_data(data_dir=data_dir, connect=pg_connect)}
+    again = {stats["table"]: stats for stats in importer.import_all_data(data_dir=data_dir, connect=pg_connect)}
+    assert set(first) == {job.table for job in importer.IMPORT_JOBS}
+    assert first["bearings"]["rows"] == again["bearings"]["rows"] > 0
+
+    # Повторный импорт обновляет записи; бренды из разных файлов сливаются по ключу
+    assert _fetch(pg_connect, "SELECT count(*), count(DISTINCT iso_designation) FROM bearings") == [
+        (first["bearings"]["rows"], first["bearings"]["rows"])
+    ]
+    assert _fetch(pg_connect, "SELECT count(*) FROM manufacturers") == [(first["manufacturers"]["merged"],)]
+    assert _fetch(pg_connect, "SELECT limiting_speed_rpm FROM bearings WHERE iso_designation = '6000'") == [(30000,)]
+
+
+def test_sync_applies_only_changes(tmp_path, pg_connect) -> None:
+    (tmp_path / "csv").mkdir()
+    path = tmp_path / "csv" / "tn_ved_codes.csv"
+    path.write_text("Code,Description\n1,a\n2,b\n3,c\n", encoding="utf-8")
+    jobs = [job for job in importer.IMPORT_JOBS if job.table == "tn_ved_codes"]
+
+    [stats] = importer.sync_all_data(jobs, tmp_path, connect=pg_connect)
+    assert (stats["inserted"], stats["updated"], stats["deleted"]) == (3, 0, 0)
+    assert importer.sync_all_data(jobs, tmp_path, connect=pg_connect) == []  # Файлы не менялись
+
+    path.write_text("Code,Description\n1,a\n2,bb\n4,d\n", encoding="utf-8")
+    [stats] = importer.sync_all_data(jobs, tmp_path, connect=pg_connect)
+    assert (stats["inserted"], stats["updated"], stats["deleted"]) == (1, 1, 1)
+    assert _fetch(pg_connect, "SELECT code, description FROM tn_ved_codes ORDER BY code") == [
+        ("1", "a"),
+        ("2", "bb"),
+        ("4", "d"),
+    ]
+    assert _fetch(pg_connect, "SELECT count(*) FROM import_manifest") == [(3,)]
+
+
+def test_create_schema_migrates_duplicates(pg_connect) -> None:
+    # Как в БД прежнего импорта: уникального индекса нет, строки задублированы
+    conn = pg_connect()
+    with conn.cursor() as cursor:
+        cursor.execute("DROP INDEX uq_units_type_series")
+        cursor.execute(
+            "INSERT INTO bearing_units (unit_type, series, description) "
+            "VALUES ('UCP', '200', 'old'), ('UCP', '200', 'new'), ('UCF', '200', 'x')"
+        )
+    conn.commit()
+
+    assert importer.create_schema(conn)
+    conn.close()
+    assert _fetch(pg_connect, "SELECT unit_type, description FROM bearing_units ORDER BY unit_type") == [
+        ("UCF", "x"),
+        ("UCP", "new"),
+    ]
@@ -0,0 +1,84 @@
+"""Tests for hot-reload of API search indexes."""
+
+import json
+import os
+
+from api.app.index_manager import IndexManager
+
+
+def _write_index(path, titles: list[str]) -> None:
+    documents = {
+        f"doc_{idx}": {"id": f"doc_{idx}", "title": title, "path": f"{idx}.md", "excerpt": ""}
+        for idx, title in enumerate(titles)
+    }
+    path.write_text(json.dumps(documents, ensure_ascii=False), encoding="utf-8")
+    # Гарантируем смену отметки даже на ФС с грубым разрешением mtime
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _manager(tmp_path) -> IndexManager:
+    return IndexManager(
+        dict_path=str(tmp_path / "autocomplete_dict.json"),
+        index_path=str(tmp_path / "document_index.json"),
+        similarity_path=str(tmp_path / "similarity_matrix.json"),
+        poll_interval=0,
+    )
+
+
+def test_reload_swaps_generation_on_change(tmp_path) -> None:
+    _write_index(tmp_path / "document_index.json", ["Подшипник 6205"])
+    manager = _manager(tmp_path)
+    assert manager.current.number == 1
+    assert not manager.reload()
+
+    _write_index(tmp_path / "document_index.json", ["Подшипник 6205", "Подшипник 6305"])
+    assert manager.reload()
+
+    assert manager.current.number == 2
+    assert len(manager.current.search.documents) == 2
+    assert manager.stats()["current"]["load_time_ms"] >= 0
+
+
+def test_retired_generation_kept_until_last_reader(tmp_path) -> None:
+    _write_index(tmp_path / "document_index.json", ["Подшипник 6205"])
+    manager = _manager(tmp_path)
+
+    with manager.acquire() as old:
+        manager.reload(force=True)
+        assert old.retired
+        assert old.search.search("6205")
+        assert [g["generation"] for g in manager.stats()["retired"]] == [1]
+
+    assert manager.stats()["retired"] == []
+    assert manager.current.number == 2
+
+
+def test_empty_generation_keeps_current(tmp_path) -> None:
+    _write_index(tmp_path / "document_index.json", ["Подшипник 6205"])
+    manager = _manager(tmp_path)
+    assert manager.current.memory_bytes is None
+    assert manager.current.index_bytes == (tmp_path / "document_index.json").stat().st_size
+
+    # Индекс перезаписан пустым (или прочитан во время записи) — остается прежнее поколение
+    _write_index(tmp_path / "document_index.json", [])
+    assert not manager.reload()
+    assert manager.current.number == 1
+    assert manager.current.search.search("6205")
+    assert not manager.has_changes()
+
+    _write_index(tmp_path / "document_index.json", ["Подшипник 6305"])
+    assert manager.reload()
+    assert [doc["title"] for doc in manager.current.search.search("6305")] == ["Подшипник 6305"]
+
+
+def test_trace_memory_measures_generation(tmp_path) -> None:
+    _write_index(tmp_path / "document_index.json", ["Подшипник 6205"] * 100)
+    manager = IndexManager(
+        dict_path=str(tmp_path / "autocomplete_dict.json"),
+        index_path=str(tmp_path / "document_index.json"),
+        similarity_path=str(tmp_path / "similarity_matrix.json"),
+        poll_interval=0,
+        trace_memory=True,
+    )
+    assert manager.current.memory_bytes > 0
@@ -0,0 +1,120 @@
+"""Tests for the external-sort CSV normalizer."""
+
+import csv
+import random
+
+import pytest
+
+from scripts import normalize_csv as normalizer
+from scripts.normalize_csv import NormalizeStats, normalize_csv, normalize_rows, schema_rules
+from scripts.sort_nomenclature import sort_nomenclature, verify_sorting
+from scripts.validate.csv_validator import load_schemas
+
+HEADER = ["brand", "name", "size", "line"]
+
+
+def _rows(count: int, seed: int = 7) -> list[list[str]]:
+    rng = random.Random(seed)
+    return [
+        [
+            rng.choice(["SKF", "FAG", "NSK"]),
+            rng.choice(["6205", "6206", "6305"]),
+            rng.choice(["", "5", "25", "9.5"]),
+            str(i),
+        ]
+        for i in range(count)
+    ]
+
+
+def _expected(rows, sort_by, unique, numeric=()):
+    """In-memory reference: first row per key, then a stable sort"""
+    seen, kept = set(), []
+    for row in rows:
+        key = tuple(row[HEADER.index(name)] for name in unique)
+        if unique and key in seen:
+            continue
+        seen.add(key)
+        kept.append(row)
+
+    def sort_key(row):
+        return tuple(
+            float(row[HEADER.index(name)] or 0) if name in numeric else row[HEADER.index(name)] for name in sort_by
+        )
+
+    return sorted(kept, key=sort_key)
+
+
+@pytest.mark.parametrize(
+    "sort_by,unique",
+    [
+        (["brand", "name"], ["brand", "name"]),
+        (["size", "brand"], ["brand", "name"]),
+        ([], ["name"]),
+        (["name"], []),
+    ],
+)
+def test_matches_in_memory_normalization(sort_by, unique, monkeypatch) -> None:
+    monkeypatch.setattr(normalizer, "MAX_FANIN", 3)
+    rows = _rows(200)
+    stats = NormalizeStats()
+    result = list(
+        normalize_rows(iter(rows), HEADER, sort_by, unique, numeric=["size"], stats=stats, chunk_rows=17, workers=1)
+    )
+
+    expected = _expected(rows, sort_by, unique, numeric=["size"])
+    assert result == expected
+    # 12 runs of 17 rows; survivors ordered by another key get one more run
+    runs = 12 + (bool(unique) and sort_by != unique)
+    assert (stats.rows, stats.written, stats.removed, stats.runs) == (200, len(expected), 200 - len(expected), runs)
+
+
+def test_normalize_csv_in_place_with_workers(tmp_path) -> None:
+    rows = _rows(500, seed=3)
+    path = tmp_path / "nomenclature.csv"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+        f.write("\nSKF, 6205 ,1\n")
+
+    stats = normalize_csv(path, path, ["brand", "name"], ["brand", "name"], strip_keys=True, chunk_rows=64, workers=2)
+
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        assert next(reader) == HEADER
+        result = list(reader)
+    assert result == _expected(rows, ["brand", "name"], ["brand", "name"])
+    # The short row "SKF, 6205 " (padded, after a skipped blank line) duplicates SKF 6205 once keys are stripped
+    assert (stats.rows, stats.written, stats.removed) == (501, len(result), 501 - len(result))
+    seen, duplicates = set(), []
+    for line, row in enumerate(rows, start=2):
+        if (row[0], row[1]) in seen:
+            duplicates.append((line, (row[0], row[1])))
+        seen.add((row[0], row[1]))
+    assert stats.duplicates == duplicates[:10]
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_unknown_columns_and_schema_rules(schemas_dir) -> None:
+    with pytest.raises(ValueError, match="missing"):
+        list(normalize_rows(iter([]), HEADER, ["missing"], []))
+
+    schema = next(table for table in load_schemas(schemas_dir) if table.name == "gost_dimensions")
+    rules = schema_rules(schema)
+    assert rules["numeric"] == ["d", "D", "B"] and rules["unique"] == schema.unique
+
+
+def test_sort_nomenclature(tmp_path) -> None:
+    path = tmp_path / "nomenclature.csv"
+    path.write_text("Brand,Product Name,Factory\nSKF,6206,a\nFAG,6205,b\nSKF,6205,c\nSKF,6205,d\n", encoding="utf-8")
+
+    sort_nomenclature(path, path, chunk_rows=2, workers=1)
+
+    assert path.read_text(encoding="utf-8").splitlines() == [
+        "Brand,Product Name,Factory",
+        "FAG,6205,b",
+        "SKF,6205,c",
+        "SKF,6205,d",
+        "SKF,6206,a",
+    ]
+    assert verify_sorting(path)
@@ -0,0 +1,118 @@
+"""Tests for the SQLite read model of the reference tables."""
+
+import csv
+import os
+import shutil
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.app import api, reference_db
+from api.app.analogs import AnalogIndex
+from api.app.reference_db import ReferenceDB, fts_query
+from scripts.build_reference_db import build_reference_db, sql_columns
+
+
+def _read_csv(path) -> list[dict]:
+    with open(path, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.fixture
+def copied_root(tmp_path, data_dir):
+    """Копия таблиц аналогов, мастер-каталога и ISO во временном корне"""
+    for name in ("analogs", "csv", "iso"):
+        shutil.copytree(data_dir / name, tmp_path / "data" / name)
+    return tmp_path
+
+
+def test_sql_columns_and_fts_query() -> None:
+    assert sql_columns(["designation", "d", "D", "B", "b"]) == ["designation", "d", "D_2", "B", "b_2"]
+    assert fts_query('6205 "2RS') == '"6205"* """2RS"*'
+
+
+def test_read_model_matches_csv(tmp_path, repo_root, schemas_dir) -> None:
+    output = tmp_path / "reference.db"
+    counts = build_reference_db(output, schemas_dir, repo_root)
+    db = ReferenceDB(str(output))
+
+    assert {"gost_dimensions", "iso_prefixes", "master_catalog", "analogs_gost_to_iso"} <= set(counts)
+    assert db.root == str(repo_root)
+    for table in db.tables.values():
+        assert db.read_csv(str(repo_root / table["path"])) == _read_csv(repo_root / table["path"])
+    assert db.tables["gost_dimensions"]["sql_columns"] == ["designation", "d", "D_2", "B", "source"]
+
+    found = db.search("iso_prefixes", "втулк масл")
+    expected = {
+        row["code"]
+        for row in _read_csv(repo_root / "data" / "iso" / "prefixes.csv")
+        if "втулк" in row["description"].lower() and "масл" in row["description"].lower()
+    }
+    assert expected and {row["code"] for row in found} == expected
+    with pytest.raises(ValueError):
+        db.search("unknown", "6205")
+
+    plan = db.query("EXPLAIN QUERY PLAN SELECT * FROM master_catalog m JOIN analogs_gost_to_iso a ON a.GOST = m.GOST")
+    assert any("USING INDEX" in row["detail"] for row in plan)
+
+    with pytest.raises(sqlite3.OperationalError):
+        db.query("DELETE FROM iso_prefixes")
+    db.close()
+
+
+def test_stale_table_falls_back_to_csv(copied_root, schemas_dir) -> None:
+    output = copied_root / "data" / "reference.db"
+    build_reference_db(output, schemas_dir, copied_root)
+    db = ReferenceDB(str(output))
+    path = copied_root / "data" / "iso" / "prefixes.csv"
+    assert db.read_csv(str(path)) == _read_csv(path)
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("XX,test,Новый префикс,test\n")
+    assert db.read_csv(str(path)) is None
+    assert db.read_csv(str(copied_root / "data" / "nomenclature.csv")) is None
+    db.close()
+
+
+def test_analog_index_reads_read_model(copied_root, schemas_dir, data_dir, monkeypatch) -> None:
+    output = copied_root / "reference.db"
+    build_reference_db(output, schemas_dir, copied_root)
+    # CSV больше не нужны: таблицы читаются из файла БД
+    for name in ("analogs", "csv"):
+        shutil.rmtree(copied_root / "data" / name)
+
+    monkeypatch.setattr(reference_db, "_default", ReferenceDB(str(output)))
+    monkeypatch.setattr(reference_db, "_default_loaded", True)
+    index = AnalogIndex(
+        os.path.join(copied_root, "data", "analogs"), os.path.join(copied_root, "data", "csv", "master_catalog.csv")
+    )
+    expected = AnalogIndex(str(data_dir / "analogs"), str(data_dir / "csv" / "master_catalog.csv"))
+
+    assert len(index) == len(expected)
+    assert index.lookup("6205") == expected.lookup("6205")
+
+
+def test_reference_search_uses_indexes_and_fts(copied_root, schemas_dir, monkeypatch) -> None:
+    output = copied_root / "reference.db"
+    build_reference_db(output, schemas_dir, copied_root)
+    db = ReferenceDB(str(output))
+
+    assert "ISO" in db.tables["master_catalog"]["indexed_columns"]
+    plan = db.query('EXPLAIN QUERY PLAN SELECT * FROM master_catalog WHERE "ISO" IN (?, ?)', ("6205", "6205"))
+    assert any("USING INDEX" in row["detail"] for row in plan)
+
+    found = db.find("6205")
+    assert [row["ISO"] for row in found["master_catalog"]] == ["6205"]
+    assert {row["ISO"] for row in found["analogs_gost_to_iso"]} == {"6205"}
+    assert db.find("  ") == {}
+    assert "iso_prefixes" in db.search_all("втулк")
+
+    monkeypatch.setattr(reference_db, "_default", db)
+    monkeypatch.setattr(reference_db, "_default_loaded", True)
+    response = TestClient(api.app).get("/reference/search", params={"q": "6205"})
+    assert response.status_code == 200
+    assert response.json()["exact"]["master_catalog"] == found["master_catalog"]
+
+    monkeypatch.setattr(reference_db, "_default", None)
+    assert TestClient(api.app).get("/reference/search", params={"q": "6205"}).status_code == 503
@@ -0,0 +1,63 @@
+"""Tests for the bounded in-memory search history."""
+
+from api.app.logic import SearchHistory
+
+
+class _Clock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_user_history_is_ring_buffer_newest_first() -> None:
+    history = SearchHistory(max_per_user=3, clock=_Clock())
+    for query in ["6205", "6305", "6405", "6505"]:
+        history.add_search("u1", query, 1)
+
+    assert [h["query"] for h in history.get_user_history("u1")] == ["6505", "6405", "6305"]
+    assert [h["query"] for h in history.get_user_history("u1", limit=1)] == ["6505"]
+    assert history.get_user_history("unknown") == []
+
+
+def test_least_recent_user_evicted() -> None:
+    history = SearchHistory(max_users=2, clock=_Clock())
+    history.add_search("u1", "6205", 1)
+    history.add_search("u2", "6205", 1)
+    history.add_search("u1", "6305", 1)
+    history.add_search("u3", "6405", 1)
+
+    assert history.get_user_history("u2") == []
+    assert len(history.get_user_history("u1")) == 2
+
+
+def test_popular_queries_incremental_and_clear() -> None:
+    history = SearchHistory(clock=_Clock())
+    for user, query in [("u1", "6205"), ("u2", "6205"), ("u2", "6305"), ("u3", "6205"), ("u3", "6305"), ("u3", "nu")]:
+        history.add_search(user, query, 1)
+
+    assert history.get_popular_queries(limit=2) == [{"query": "6205", "count": 3}, {"query": "6305", "count": 2}]
+    assert history.total_searches == 6
+    assert history.unique_queries == 3
+
+    history.clear_user_history("u3")
+    assert history.get_popular_queries() == [{"query": "6205", "count": 2}, {"query": "6305", "count": 1}]
+    assert history.total_searches == 3
+    assert history.get_user_history("u3") == []
+
+
+def test_retention_expires_old_minutes() -> None:
+    clock = _Clock()
+    history = SearchHistory(retention_days=1, clock=clock)
+    history.add_search("u1", "6205", 1)
+    history.add_search("u1", "6205", 1)
+
+    clock.now += 12 * 3600
+    history.add_search("u1", "6305", 1)
+    assert history.get_popular_queries()[0] == {"query": "6205", "count": 2}
+
+    clock.now += 13 * 3600
+    assert history.get_popular_queries() == [{"query": "6305", "count": 1}]
+    assert history.total_searches == 1
+    assert [h["query"] for h in history.get_user_history("u1")] == ["6305"]
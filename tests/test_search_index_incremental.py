@@ -0,0 +1,95 @@
+"""Tests for the incremental search index build."""
+
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from scripts.build_search_index import SearchIndexBuilder, document_id  # noqa: E402
+from scripts.corpus import Corpus  # noqa: E402
+
+TOPICS = {
+    "ball": "шариковый подшипник радиальный сепаратор дорожка качения",
+    "roller": "роликовый подшипник цилиндрический ролик борт кольцо",
+    "belt": "ремень клиновой шкив натяжение профиль",
+    "seal": "сальник манжета уплотнение кромка пружина",
+}
+
+
+def _write_repo(root) -> None:
+    for topic, words in TOPICS.items():
+        for n in range(3):
+            path = root / "articles" / topic / f"{topic}_{n}.md"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"# {topic} {n}\n\n{words} вариант{n} {words}\n", encoding="utf-8")
+
+
+def _build(root, full: bool = False) -> SearchIndexBuilder:
+    builder = SearchIndexBuilder(repo_root=str(root), top_k=3, workers=1)
+    builder.extract_documents()
+    builder.compute_document_similarity(full=full)
+    builder.save_similarity_matrix(str(root / "data" / "similarity_matrix.json"))
+    builder.save_document_index(str(root / "data" / "document_index.json"))
+    builder.save_manifest()
+    return builder
+
+
+def _neighbours(builder: SearchIndexBuilder, rel_path: str) -> set[str]:
+    return {sim["doc_id"] for sim in builder.similarity_matrix[document_id(rel_path)]["similar"]}
+
+
+def test_ids_are_stable_and_unchanged_files_are_not_read(tmp_path, monkeypatch) -> None:
+    _write_repo(tmp_path)
+    first = _build(tmp_path)
+    assert document_id("articles/ball/ball_0.md") in first.documents
+
+    def fail(*args):
+        raise AssertionError("unchanged file was read")
+
+    monkeypatch.setattr(Corpus, "_load", fail)
+    second = _build(tmp_path)
+
+    assert second.changed_ids == set()
+    assert second.similarity_matrix == first.similarity_matrix
+    index = json.loads((tmp_path / "data" / "document_index.json").read_text(encoding="utf-8"))
+    assert set(index) == set(first.documents)
+
+
+def test_edit_and_removal_update_neighbours(tmp_path) -> None:
+    _write_repo(tmp_path)
+    _build(tmp_path)
+
+    # Статья о ремнях переписана в статью о сальниках, одна статья о сальниках удалена
+    (tmp_path / "articles" / "belt" / "belt_0.md").write_text(
+        f"# belt 0\n\n{TOPICS['seal']} {TOPICS['seal']}\n", encoding="utf-8"
+    )
+    (tmp_path / "articles" / "seal" / "seal_2.md").unlink()
+    builder = _build(tmp_path)
+
+    assert builder.changed_ids == {document_id("articles/belt/belt_0.md")}
+    assert builder.removed_ids == {document_id("articles/seal/seal_2.md")}
+
+    seal_ids = {document_id(f"articles/seal/seal_{n}.md") for n in range(2)}
+    assert seal_ids <= _neighbours(builder, "articles/belt/belt_0.md")
+    assert document_id("articles/belt/belt_0.md") in _neighbours(builder, "articles/seal/seal_0.md")
+    assert document_id("articles/belt/belt_0.md") not in _neighbours(builder, "articles/belt/belt_1.md")
+    assert all(
+        document_id("articles/seal/seal_2.md") not in {s["doc_id"] for s in entry["similar"]}
+        for entry in builder.similarity_matrix.values()
+    )
+
+
+def test_frozen_vectorizer_matches_full_fit(tmp_path) -> None:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    from scripts.build_search_index import VECTORIZER_PARAMS
+
+    texts = [f"{words} {words}" for words in TOPICS.values()]
+    vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+    expected = vectorizer.fit_transform(texts).toarray()
+    vocabulary = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+
+    actual = SearchIndexBuilder._vectorize(texts, vocabulary, vectorizer.idf_.tolist()).toarray()
+    np.testing.assert_allclose(actual, expected)
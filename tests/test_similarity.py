@@ -0,0 +1,73 @@
+"""Tests for blockwise top-k document similarity."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+from sklearn.metrics.pairwise import cosine_similarity  # noqa: E402
+
+from scripts.similarity import top_k_similar  # noqa: E402
+
+TEXTS = [
+    "шариковый подшипник 6205 радиальный",
+    "шариковый подшипник 6305 радиальный",
+    "роликовый подшипник NU 205 цилиндрический",
+    "роликовый подшипник NU 305 цилиндрический",
+    "ремень клиновой SPZ",
+    "ремень поликлиновой PJ",
+    "сальник армированный",
+]
+
+
+def test_matches_dense_cosine_for_any_block_size_and_product() -> None:
+    matrix = TfidfVectorizer().fit_transform(TEXTS)
+    dense = cosine_similarity(matrix)
+    np.fill_diagonal(dense, -1)
+
+    for block_rows, dense_bytes in [(1, 0), (3, 0), (3, 2**20), (len(TEXTS), 2**20)]:
+        indices, scores = top_k_similar(matrix, k=2, workers=1, block_rows=block_rows, dense_bytes=dense_bytes)
+        assert indices.shape == (len(TEXTS), 2)
+        for row in range(len(TEXTS)):
+            assert row not in indices[row]
+            np.testing.assert_allclose(scores[row], np.sort(dense[row])[::-1][:2], rtol=1e-5)
+            assert scores[row][0] >= scores[row][1]
+
+
+def test_k_larger_than_corpus() -> None:
+    matrix = TfidfVectorizer().fit_transform(TEXTS[:2])
+    indices, scores = top_k_similar(matrix, k=5, workers=1)
+    assert indices.tolist() == [[1], [0]]
+
+
+def test_dense_budget_shared_by_worker_processes(monkeypatch) -> None:
+    import scripts.similarity as similarity
+
+    created = []
+
+    class _InlinePool:
+        """Пул без процессов: запоминает параметры и считает блоки в текущем процессе"""
+
+        def __init__(self, max_workers, initializer, initargs):
+            created.append((max_workers, initargs[1]))
+            initializer(*initargs)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            similarity._release_worker()
+
+        def map(self, fn, *iterables):
+            return map(fn, *iterables)
+
+    monkeypatch.setattr(similarity, "ProcessPoolExecutor", _InlinePool)
+    matrix = TfidfVectorizer().fit_transform(TEXTS)
+    copy_bytes = matrix.shape[0] * matrix.shape[1] * 4
+
+    top_k_similar(matrix, k=2, workers=2, block_rows=1, dense_bytes=copy_bytes)
+    top_k_similar(matrix, k=2, workers=2, block_rows=1, dense_bytes=2 * copy_bytes)
+    monkeypatch.setattr(similarity.os, "cpu_count", lambda: 64)
+    top_k_similar(matrix, k=2, block_rows=1, dense_bytes=0)
+    assert created == [(2, False), (2, True), (similarity.DEFAULT_MAX_WORKERS, False)]
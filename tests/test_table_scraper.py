@@ -12,9 +12,17 @@ Or from tests directory:
     cd tests && python test_table_scraper.py
 """
 
+import asyncio
+import json
 import sys
+import tempfile
+import threading
+import time
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
 
 
 def _import_table_scraper():
@@ -25,7 +33,9 @@ def _import_table_scraper():
         sys.path.insert(0, sources_path)
 
     from table_scraper import (
+        AsyncCrawler,
         TableCell,
+        TokenBucket,
         clean_text,
         derive_headers,
         extract_tables,
@@ -33,11 +43,30 @@ def _import_table_scraper():
         table_to_records,
     )
 
-    return TableCell, extract_tables, derive_headers, table_to_records, clean_text, normalize_url
+    return (
+        TableCell,
+        extract_tables,
+        derive_headers,
+        table_to_records,
+        clean_text,
+        normalize_url,
+        AsyncCrawler,
+        TokenBucket,
+    )
 
 
 # Import the module components
-TableCell, extract_tables, derive_headers, table_to_records, clean_text, normalize_url = _import_table_scraper()
+(
+    TableCell,
+    extract_tables,
+    derive_headers,
+    table_to_records,
+    clean_text,
+    normalize_url,
+    AsyncCrawler,
+    TokenBucket,
+) = _import_table_scraper()
+table_scraper = sys.modules["table_scraper"]
 
 
 class TestCleanText(unittest.TestCase):
@@ -192,5 +221,217 @@ class TestTableToRecords(unittest.TestCase):
         self.assertEqual(records[0], {"a": "1", "b": ""})
 
 
+PAGES = 5
+
+
+class _TableHandler(BaseHTTPRequestHandler):
+    """Paginated table: every page links to all pages; pages carry an ETag"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        page = int(parse_qs(urlparse(self.path).query).get("page", ["1"])[0])
+        etag = f'"page-{page}"'
+        if page in self.server.failing_pages:
+            status, body = 500, b"error"
+        elif self.headers.get("If-None-Match") == etag:
+            status, body = 304, b""
+        else:
+            links = "".join(f'<a href="table.php?page={n}#top">{n}</a>' for n in range(1, PAGES + 1))
+            rows = "".join(f"<tr><td>{page}-{i}</td><td>{page}</td></tr>" for i in range(2))
+            status = 200
+            body = f"<table><tr><th>Designation</th><th>Page</th></tr>{rows}</table>{links}".encode()
+        self.server.requests.append((page, self.client_address[1], status))
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _LocalServerTestCase(unittest.TestCase):
+    """Local HTTP server with the paginated table (no network access needed)"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _TableHandler)
+        cls.server.daemon_threads = True
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/table.php?page=1"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests = []
+        self.server.failing_pages = set()
+
+    def _crawl(self, **kwargs):
+        options = {"rate": 0, "retry_delay": 0}
+        options.update(kwargs)
+        crawler = AsyncCrawler(**options)
+        return asyncio.run(crawler.crawl(self.url)), crawler.stats
+
+    def _expected(self, pages):
+        return [{"designation": f"{page}-{i}", "page": str(page)} for page in pages for i in range(2)]
+
+
+class TestAsyncCrawler(_LocalServerTestCase):
+    """Crawler against the local server"""
+
+    def test_crawls_pages_in_discovery_order(self):
+        rows, stats = self._crawl(concurrency=3)
+        self.assertEqual(rows, self._expected(range(1, PAGES + 1)))
+        self.assertEqual(sorted(page for page, _, _ in self.server.requests), list(range(1, PAGES + 1)))
+        self.assertEqual(stats.fetched, PAGES)
+
+        self.server.requests = []
+        rows, _ = self._crawl(concurrency=3, max_pages=3)
+        self.assertEqual(rows, self._expected(range(1, 4)))
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_reuses_keep_alive_connection(self):
+        _, stats = self._crawl(concurrency=1)
+        self.assertEqual(stats.connections, 1)
+        self.assertEqual(len({port for _, port, _ in self.server.requests}), 1)
+
+    def test_conditional_requests_use_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first, stats = self._crawl(cache_dir=Path(cache_dir))
+            self.assertEqual((stats.fetched, stats.not_modified), (PAGES, 0))
+            second, stats = self._crawl(cache_dir=Path(cache_dir))
+            self.assertEqual((stats.fetched, stats.not_modified), (0, PAGES))
+        self.assertEqual(first, second)
+        self.assertEqual([status for _, _, status in self.server.requests], [200] * PAGES + [304] * PAGES)
+
+    def test_failed_page_is_retried_and_skipped(self):
+        self.server.failing_pages = {3}
+        rows, stats = self._crawl(max_retries=2)
+        self.assertEqual(rows, self._expected([1, 2, 4, 5]))
+        self.assertEqual(stats.failed, 1)
+        self.assertEqual(sum(1 for page, _, _ in self.server.requests if page == 3), 2)
+
+
+class TestNDJSONCrawl(_LocalServerTestCase):
+    """Incremental NDJSON output with checkpoints"""
+
+    def setUp(self):
+        super().setUp()
+        self.scraper = table_scraper
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output = Path(self.tmp.name) / "rows.ndjson"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _crawl_to_ndjson(self, **kwargs):
+        options = {"rate": 0, "retry_delay": 0, "concurrency": 1, "checkpoint_every": 2}
+        options.update(kwargs)
+        return self.scraper.crawl_to_ndjson(self.url, self.output, **options)
+
+    def _lines(self, path=None):
+        path = path or self.output
+        return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+    def test_resume_after_crash(self):
+        parse = self.scraper.iter_primary_table_records
+
+        def crash_on_page_4(html, *args):
+            if "<td>4-0</td>" in html:
+                raise RuntimeError("crash")
+            return parse(html, *args)
+
+        self.output.write_text('{"previous": "crawl"}\n', encoding="utf-8")
+        with mock.patch.object(self.scraper, "iter_primary_table_records", crash_on_page_4):
+            with self.assertRaises(RuntimeError):
+                self._crawl_to_ndjson()
+        # The output is untouched; page 3 was written to the partial file after the last checkpoint (2 pages)
+        self.assertEqual(self._lines(), [{"previous": "crawl"}])
+        self.assertEqual(self._lines(self.scraper.partial_path(self.output)), self._expected([1, 2, 3]))
+        state = json.loads(self.scraper.checkpoint_path(self.output).read_text(encoding="utf-8"))
+        self.assertEqual((state["done"], state["rows"]), (2, 4))
+
+        self.server.requests = []
+        self.assertEqual(self._crawl_to_ndjson(resume=True), 2 * PAGES)
+        self.assertEqual(self._lines(), self._expected(range(1, PAGES + 1)))
+        self.assertEqual([page for page, _, _ in self.server.requests], [3, 4, 5])
+        self.assertFalse(self.scraper.partial_path(self.output).exists())
+
+        # A finished crawl is not repeated
+        self.server.requests = []
+        self.assertEqual(self._crawl_to_ndjson(resume=True), 2 * PAGES)
+        self.assertEqual(self.server.requests, [])
+
+    def test_failed_crawl_keeps_existing_output(self):
+        self.output.write_text('{"previous": "crawl"}\n', encoding="utf-8")
+        self.server.failing_pages = {1}
+        self.assertEqual(self._crawl_to_ndjson(max_retries=1), 0)
+        self.assertEqual(self._lines(), [{"previous": "crawl"}])
+        self.assertFalse(self.scraper.partial_path(self.output).exists())
+
+        with self.assertRaises(ValueError):
+            self._crawl_to_ndjson(checkpoint_every=0)
+
+    def test_matches_json_crawl(self):
+        self.assertEqual(self._crawl_to_ndjson(concurrency=3), 2 * PAGES)
+        rows, _ = self._crawl(concurrency=3)
+        self.assertEqual(self._lines(), rows)
+
+
+class TestStreamingExtraction(unittest.TestCase):
+    """Streaming parser yields the same records as the full table extraction"""
+
+    def test_same_records_as_full_extraction(self):
+        pages = [
+            "<table><tr><td>menu</td></tr></table><table><tr><th>Brand</th><th>Country</th></tr>"
+            "<tr><td>SKF</td><td>Sweden</td></tr><tr><td>FAG</td></tr></table>",
+            "<table><tr><td>6205</td><td>25</td></tr><tr><th>Designation</th><th>d</th></tr>"
+            "<tr><td>6206</td><td>30</td></tr></table>",
+            "<table><tr><td>a &amp; b</td><td>c</td></tr></table><p>no more tables</p>",
+            "<div>no tables</div>",
+        ]
+        for html in pages:
+            expected = table_to_records(table_scraper.select_primary_table(extract_tables(html)) or [])
+            for chunk_size in (1, 5, 1 << 16):
+                self.assertEqual(list(table_scraper.iter_primary_table_records(html, chunk_size)), expected)
+
+    def test_rows_of_dropped_outer_table_are_skipped(self):
+        # The outer table is dropped once the nested one closes: its rows must not leak into the next table
+        html = (
+            "<table><tr><td>nav</td></tr><tr><td><table><tr><td>x</td></tr></table></td></tr></table>"
+            "<table><tr><th>Code</th><th>d</th></tr><tr><td>6205</td><td>25</td></tr></table>"
+        )
+        expected = table_to_records(table_scraper.select_primary_table(extract_tables(html)))
+        self.assertEqual(expected, [{"code": "6205", "d": "25"}])
+        for chunk_size in (1, 5, 1 << 16):
+            self.assertEqual(list(table_scraper.iter_primary_table_records(html, chunk_size)), expected)
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Per-host rate limit"""
+
+    def _elapsed(self, bucket, count):
+        async def acquire_all():
+            await asyncio.gather(*(bucket.acquire() for _ in range(count)))
+
+        started = time.perf_counter()
+        asyncio.run(acquire_all())
+        return time.perf_counter() - started
+
+    def test_spaces_concurrent_requests(self):
+        # The first token is available at once, the other four wait 1/20 s each in turn
+        self.assertGreaterEqual(self._elapsed(TokenBucket(rate=20), 5), 0.19)
+
+    def test_zero_rate_is_unlimited(self):
+        self.assertLess(self._elapsed(TokenBucket(rate=0), 100), 0.1)
+
+
 if __name__ == "__main__":
     unittest.main()